@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class OsasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'osas'
+
+    def ready(self):
+        # Registers the archive index, identity cache and image variant receivers
+        from . import archive, identity, images  # noqa: F401
+        from .roles import sync_role_groups
+
+        # Keep the role groups in step with new models/permissions after every migrate
+        post_migrate.connect(sync_role_groups, sender=self, dispatch_uid='osas.sync_role_groups')
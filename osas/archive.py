@@ -0,0 +1,1007 @@
+"""
+Archive index and archive type registry.
+
+Every archivable model has an ArchiveType in ARCHIVE_TYPES describing how its
+records are titled in the index, who may list, view and restore them, how they
+serialize for the detail modal and how they are restored. ArchiveEntry rows are
+kept in step by the post_save/post_delete receivers below and by
+reindex_archive() for the bulk_update()/update() paths, so the dashboard and the
+listing endpoint page through one narrow indexed table instead of loading every
+archived row of every model. Types with `cold_storage` set can be moved out of
+the hot tables and media tree once they are old (see osas/coldstorage.py);
+find() gives the detail view a read-only copy of a frozen record, and warm()
+thaws it for the retrieve view.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .coldstorage import COLD_FILES, COLD_ROWS, load_frozen, thaw
+from .file_metadata import prefetch_metadata
+from .models import AccomplishmentRecord, Announcement, ArchiveEntry, Complaint, CustomUser, Downloadable, \
+    NSTPFile, NSTPStudentInfo, OJTCompany, Organization, Scholarship, ScholarshipApplication, StudentAdmission
+from .pagination import KeysetPaginator
+
+ARCHIVE_PAGE_SIZE = 25
+ARCHIVE_FIELDS = {'is_archived', 'archived_at', 'archived_by'}
+
+
+class ArchiveType:
+    key = ''
+    model = None
+    label = ''
+    # Context name suffix on the dashboard (archived_<slot>) and row template variable
+    slot = ''
+    row_var = ''
+    select_related = ('archived_by',)
+    title_related = ()
+    # Unit user types allowed to restore besides superusers and whoever archived the record
+    restore_user_types = ()
+    # Field holding the student/author the record belongs to
+    owner_field = None
+    # COLD_ROWS, COLD_FILES or None (never frozen); child relations frozen along with COLD_ROWS records
+    cold_storage = None
+    cold_children = ()
+    # File fields the row templates show sizes of; their metadata is fetched per page
+    file_fields = ()
+
+    @property
+    def row_template(self):
+        return f'osas/sections/archived/{self.key}-row.html'
+
+    def archived(self):
+        return self.model.objects.filter(is_archived=True)
+
+    def visible(self, roles):
+        """
+        Archived records `roles` may list: None means all of them, otherwise a
+        queryset (possibly .none()).
+        """
+        return None
+
+    def title(self, obj):
+        raise NotImplementedError
+
+    def owner_id(self, obj):
+        return getattr(obj, f'{self.owner_field}_id') if self.owner_field else None
+
+    def can_view(self, roles, obj):
+        if roles.user.pk in (obj.archived_by_id, self.owner_id(obj)):
+            return True
+        visible = self.visible(roles)
+        return visible is None or visible.filter(pk=obj.pk).exists()
+
+    def can_restore(self, roles, obj):
+        return (roles.is_superuser or roles.user_type in self.restore_user_types
+                or obj.archived_by_id == roles.user.pk)
+
+    def serialize(self, item):
+        raise NotImplementedError
+
+    def restore(self, item, user):
+        """Unarchive `item`; returns the activity log line"""
+        item.is_archived = False
+        item.archived_at = None
+        item.archived_by = None
+        item.save()
+        return f"{user.first_name} retrieved {self.label}: {self.title(item)}"
+
+    # ---- Index ----
+    def entry_for(self, obj):
+        return ArchiveEntry(
+            item_type=self.key,
+            object_id=obj.pk,
+            title=self.title(obj)[:255],
+            archived_at=obj.archived_at,
+            archived_by_id=obj.archived_by_id,
+            owner_id=self.owner_id(obj),
+        )
+
+    def entry_filter(self, roles):
+        """Q over ArchiveEntry for the entries of this type `roles` may list, or None for none at all"""
+        condition = Q(item_type=self.key)
+        visible = self.visible(roles)
+        if visible is None:
+            return condition
+        if self.cold_storage == COLD_ROWS:
+            # Frozen rows are gone from the model table; fall back to what the entry remembers
+            frozen = ~Q(cold_bundle='') & (Q(owner=roles.user) | Q(archived_by=roles.user))
+            return condition & (Q(object_id__in=visible.values('pk')) | frozen)
+        if visible.query.is_empty():
+            return None
+        return condition & Q(object_id__in=visible.values('pk'))
+
+    def hydrate(self, entries):
+        """The archived records behind `entries`, in the same order; stale entries are dropped"""
+        ids = [entry.object_id for entry in entries]
+        objects = self.archived().select_related(*self.select_related).in_bulk(ids)
+        if self.cold_storage == COLD_ROWS:
+            objects.update(load_frozen([entry for entry in entries if entry.is_cold and entry.object_id not in objects]))
+        records = [objects[pk] for pk in ids if pk in objects]
+        if self.file_fields:
+            prefetch_metadata(records, *self.file_fields)
+        return records
+
+    def find(self, pk):
+        """The archived record `pk` (a read-only copy from its bundle if frozen), or None"""
+        obj = self.archived().filter(pk=pk).first()
+        if obj is None and self.cold_storage == COLD_ROWS:
+            entry = ArchiveEntry.objects.filter(item_type=self.key, object_id=pk).exclude(cold_bundle='').first()
+            if entry is not None:
+                obj = load_frozen([entry])[pk]
+        return obj
+
+    def warm(self, obj):
+        """The live record for `obj`, thawed out of cold storage first if it was frozen"""
+        if not self.cold_storage:
+            return obj
+        entry = getattr(obj, '_frozen_entry', None) or ArchiveEntry.objects.filter(
+            item_type=self.key, object_id=obj.pk
+        ).exclude(cold_bundle='').first()
+        if entry is None:
+            return obj
+        thaw(entry)
+        return self.archived().select_related(*self.select_related).get(pk=obj.pk)
+
+
+# ----------------------------------------------------- Types ----------------------------------------------------------
+class ArchivedUser(ArchiveType):
+    key = 'user'
+    model = CustomUser
+    label = 'user'
+    slot = 'users'
+    row_var = 'user'
+    select_related = ('archived_by', 'organization_account')
+
+    def visible(self, roles):
+        return None if roles.is_superuser else self.model.objects.none()
+
+    def title(self, obj):
+        return f"{obj.get_full_name() or obj.username} @{obj.username}"
+
+    def can_restore(self, roles, obj):
+        return roles.is_superuser
+
+    def serialize(self, item):
+        # Base user data
+        data = {
+            'id': item.id,
+            'username': item.username,
+            'first_name': item.first_name,
+            'last_name': item.last_name,
+            'email': item.email,
+            'user_type_display': item.get_user_type_display(),
+            'gender_display': item.get_gender_display(),
+            'birth_date': item.birth_date.strftime('%B %d, %Y') if item.birth_date else None,
+            'phone_number': item.phone_number,
+            'address': item.address,
+            'is_active': item.is_active,
+            'is_verified': item.is_verified,
+            'date_joined': item.date_joined.strftime('%B %d, %Y %H:%M'),
+            'last_login': item.last_login.strftime('%B %d, %Y %H:%M') if item.last_login else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'profile_picture': item.profile_picture.url if item.profile_picture else None,
+
+            # Student-specific fields
+            'student_number': item.student_number,
+            'course': str(item.course) if item.course else None,
+            'year_level': item.year_level,
+            'section': item.section,
+
+            # OSAS staff-specific fields
+            'department': item.department,
+            'position': item.position,
+
+            # Verification documents
+            'id_photo_url': item.id_photo.url if item.id_photo else None,
+            'cor_photo_url': item.cor_photo.url if item.cor_photo else None,
+
+            # Type indicators
+            'is_student': item.is_student,
+            'is_osas_unit': item.is_osas_unit,
+            'is_organization': item.is_organization,
+        }
+
+        # Add display name based on user type
+        if item.is_organization and hasattr(item, 'organization_account'):
+            org = item.organization_account
+            data['display_name'] = org.organization_name
+        else:
+            data['display_name'] = f"{item.first_name} {item.last_name}".strip() or item.username
+
+        # Add organization-specific data if this is an organization user
+        if item.is_organization and hasattr(item, 'organization_account'):
+            org = item.organization_account
+            data.update({
+                'organization_name': org.organization_name,
+                'organization_acronym': org.organization_acronym,
+                'organization_type': org.get_organization_type_display(),
+                'organization_email': org.organization_email,
+                'organization_status': org.organization_status,
+                'organization_status_display': dict(org.ORGANIZATION_STATUS_CHOICES).get(org.organization_status,
+                                                                                         'Unknown'),
+                'organization_valid_from': org.organization_valid_from.strftime(
+                    '%B %d, %Y') if org.organization_valid_from else None,
+                'organization_valid_until': org.organization_valid_until.strftime(
+                    '%B %d, %Y') if org.organization_valid_until else None,
+                'organization_adviser_name': org.organization_adviser_name,
+                'organization_adviser_department': org.organization_adviser_department,
+                'organization_adviser_email': org.organization_adviser_email,
+                'organization_adviser_phone': org.organization_adviser_phone,
+                'organization_member_count': org.organization_member_count,
+                'organization_has_minimum_members': org.organization_has_minimum_members,
+                'organization_members': org.organization_members or [],
+
+                # Organization document URLs
+                'organization_logo_url': org.organization_logo.url if org.organization_logo else None,
+                'organization_calendar_activities_url': org.organization_calendar_activities.url if org.organization_calendar_activities else None,
+                'organization_adviser_cv_url': org.organization_adviser_cv.url if org.organization_adviser_cv else None,
+                'organization_cog_url': org.organization_cog.url if org.organization_cog else None,
+                'organization_group_picture_url': org.organization_group_picture.url if org.organization_group_picture else None,
+                'organization_cbl_url': org.organization_cbl.url if org.organization_cbl else None,
+                'organization_list_members_url': org.organization_list_members.url if org.organization_list_members else None,
+                'organization_acceptance_letter_url': org.organization_acceptance_letter.url if org.organization_acceptance_letter else None,
+                'organization_ar_url': org.organization_ar.url if org.organization_ar else None,
+                'organization_previous_calendar_url': org.organization_previous_calendar.url if org.organization_previous_calendar else None,
+                'organization_financial_report_url': org.organization_financial_report.url if org.organization_financial_report else None,
+                'organization_coa_url': org.organization_coa.url if org.organization_coa else None,
+                'organization_member_biodata_url': org.organization_member_biodata.url if org.organization_member_biodata else None,
+                'organization_good_moral_url': org.organization_good_moral.url if org.organization_good_moral else None,
+            })
+        return data
+
+    def restore(self, item, user):
+        item.is_archived = False
+        item.is_active = True
+        item.archived_at = None
+        item.archived_by = None
+        item.save()
+
+        if item.user_type == 15 and hasattr(item, 'organization_account'):
+            organization = item.organization_account
+            organization.is_archived = False
+            organization.is_active = True
+            organization.archived_at = None
+            organization.archived_by = None
+            organization._organization_status = 'cancelled'
+            organization.save()
+            return (f"{user.first_name} retrieved organization user: {item.get_full_name()} and linked "
+                    f"organization: {organization.organization_name} (Status set to: cancelled)")
+
+        return f"{user.first_name} retrieved user: {item.get_full_name()}"
+
+
+class ArchivedAnnouncement(ArchiveType):
+    key = 'announcement'
+    model = Announcement
+    label = 'announcement'
+    slot = 'announcements'
+    row_var = 'announcement'
+    select_related = ('archived_by', 'author')
+
+    def visible(self, roles):
+        return None if roles.is_superuser else self.archived().filter(author=roles.user)
+
+    def title(self, obj):
+        return obj.title
+
+    def can_restore(self, roles, obj):
+        return roles.is_superuser or obj.author_id == roles.user.pk
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'title': item.title,
+            'content': item.content,
+            'category_display': item.get_category_display(),
+            'author_name': item.author.get_full_name(),
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'publish_date': item.publish_date.strftime('%B %d, %Y %H:%M') if item.publish_date else None,
+            'link': item.link,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'images': [{
+                'url': img.image.url,
+                'caption': img.caption
+            } for img in item.images.all()]
+        }
+        return data
+
+
+class ArchivedDownloadable(ArchiveType):
+    key = 'downloadable'
+    model = Downloadable
+    label = 'downloadable'
+    slot = 'downloadables'
+    row_var = 'downloadable'
+    select_related = ('archived_by', 'created_by')
+    file_fields = ('file',)
+
+    def visible(self, roles):
+        return None if roles.is_superuser else self.archived().filter(created_by=roles.user)
+
+    def title(self, obj):
+        return obj.title
+
+    def can_restore(self, roles, obj):
+        return roles.is_superuser or obj.created_by_id == roles.user.pk
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'title': item.title,
+            'description': item.description,
+            'category_display': item.get_category_display(),
+            'file_name': item.get_file_name(),
+            'file_size': item.get_file_size(),
+            'file_url': item.file.url,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'created_by': item.created_by.get_full_name(),
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+        }
+        return data
+
+
+class ArchivedComplaint(ArchiveType):
+    key = 'complaint'
+    model = Complaint
+    label = 'complaint'
+    slot = 'complaints'
+    row_var = 'complaint'
+    select_related = ('archived_by', 'created_by')
+    restore_user_types = (1, 11)
+    owner_field = 'created_by'
+    cold_storage = COLD_ROWS
+    cold_children = ('documents', 'images', 'hearings')
+
+    def visible(self, roles):
+        return None if roles.in_units(11) else self.archived().filter(created_by=roles.user)
+
+    def title(self, obj):
+        return f"{obj.reference_number} {obj.title}"
+
+    def can_restore(self, roles, obj):
+        return super().can_restore(roles, obj) or obj.created_by_id == roles.user.pk
+
+    def serialize(self, item):
+        # Prepare course data
+        respondent_course_data = None
+
+        if item.respondent_course:
+            respondent_course_data = {
+                'id': item.respondent_course.id,
+                'name': item.respondent_course.name,
+                'subtext': item.respondent_course.subtext,
+                'logo_url': item.respondent_course.logo.url if item.respondent_course.logo else None
+            }
+
+        data = {
+            'id': item.id,
+            'reference_number': item.reference_number,
+            'title': item.title,
+            'status': item.status,
+            'status_display': item.get_status_display(),
+            'statement': item.statement,
+            'notes': item.notes,
+            'complainant_first_name': item.complainant_first_name,
+            'complainant_last_name': item.complainant_last_name,
+            'complainant_email': item.complainant_email,
+            'complainant_phone': item.complainant_phone,
+            'complainant_address': item.complainant_address,
+            'complainant_instructor_name': item.complainant_instructor_name,
+            'respondent_first_name': item.respondent_first_name,
+            'respondent_last_name': item.respondent_last_name,
+            'respondent_type': item.respondent_type,
+            'respondent_type_display': item.get_respondent_type_display(),
+            'respondent_course': respondent_course_data,
+            'respondent_year': item.respondent_year,
+            'respondent_section': item.respondent_section,
+            'respondent_department': item.respondent_department,
+            'incident_date': item.incident_date.strftime('%B %d, %Y') if item.incident_date else None,
+            'incident_time': item.incident_time.strftime('%H:%M') if item.incident_time else None,
+            'incident_location': item.incident_location,
+            'witnesses': item.witnesses,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'created_by': item.created_by.get_full_name() if item.created_by else None,
+
+            'documents': [{
+                'id': doc.id,
+                'file_url': doc.file.url,
+                'file_name': doc.file.name.split('/')[-1],
+                'description': doc.description,
+                'uploaded_at': doc.uploaded_at.strftime('%B %d, %Y %H:%M')
+            } for doc in item.documents.all()],
+
+            'images': [{
+                'id': img.id,
+                'image_url': img.image.url,
+                'caption': img.caption,
+                'uploaded_at': img.uploaded_at.strftime('%B %d, %Y %H:%M')
+            } for img in item.images.all()],
+        }
+        return data
+
+    def restore(self, item, user):
+        item.is_archived = False
+        item.status = 'under_review'
+        item.archived_at = None
+        item.archived_by = None
+
+        retrieval_note = f"\n\nRetrieved on {timezone.now().strftime('%Y-%m-%d %H:%M')} by {user.get_full_name()}"
+        if item.notes:
+            item.notes += retrieval_note
+        else:
+            item.notes = retrieval_note.strip()
+        item.save()
+        return f"{user.first_name} retrieved complaint: {item.reference_number} and set status to Under Review"
+
+
+class ArchivedScholarship(ArchiveType):
+    key = 'scholarship'
+    model = Scholarship
+    label = 'scholarship'
+    slot = 'scholarships'
+    row_var = 'scholarship'
+    select_related = ('archived_by', 'created_by', 'application_form')
+    restore_user_types = (1, 5)
+
+    def visible(self, roles):
+        if roles.is_superuser:
+            return None
+        return self.archived().filter(Q(created_by=roles.user) | Q(archived_by=roles.user))
+
+    def title(self, obj):
+        return obj.name
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'name': item.name,
+            'description': item.description,
+            'scholarship_type': item.scholarship_type,
+            'scholarship_type_display': item.get_scholarship_type_display(),
+            'benefits': item.benefits,
+            'requirements': item.requirements,
+            'is_active': item.is_active,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'created_by': item.created_by.get_full_name() if item.created_by else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'application_form': {
+                'title': item.application_form.title if item.application_form else None,
+                'file_url': item.application_form.file.url if item.application_form else None,
+                'file_name': item.application_form.get_file_name() if item.application_form else None,
+            } if item.application_form else None
+        }
+        return data
+
+
+class ArchivedScholarshipApplication(ArchiveType):
+    key = 'scholarship-application'
+    model = ScholarshipApplication
+    label = 'scholarship application'
+    slot = 'scholarship_applications'
+    row_var = 'application'
+    select_related = ('student', 'scholarship', 'archived_by')
+    title_related = ('student', 'scholarship')
+    restore_user_types = (1, 5)
+    owner_field = 'student'
+    cold_storage = COLD_ROWS
+
+    def visible(self, roles):
+        if roles.is_superuser:
+            return None
+        return self.archived().filter(
+            Q(student=roles.user) |
+            Q(archived_by=roles.user) |
+            Q(scholarship__created_by=roles.user)
+        )
+
+    def title(self, obj):
+        return f"{obj.student.get_full_name()} - {obj.scholarship.name}"
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'status': item.status,
+            'status_display': item.get_status_display(),
+            'application_date': item.application_date.strftime('%B %d, %Y %H:%M'),
+            'status_update_date': item.status_update_date.strftime(
+                '%B %d, %Y %H:%M') if item.status_update_date else None,
+            'notes': item.notes,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'student': {
+                'full_name': item.student.get_full_name(),
+                'student_number': item.student.student_number,
+                'course': str(item.student.course) if item.student.course else None,
+                'email': item.student.email,
+                'phone_number': item.student.phone_number,
+                'profile_picture': item.student.profile_picture.url if item.student.profile_picture else None,
+            },
+            'scholarship': {
+                'name': item.scholarship.name,
+                'description': item.scholarship.description,
+                'type_display': item.scholarship.get_scholarship_type_display(),
+            },
+            'application_form_url': item.application_form.url if item.application_form else None,
+            'cog_url': item.cog.url if item.cog else None,
+            'cor_url': item.cor.url if item.cor else None,
+            'id_photo_url': item.id_photo.url if item.id_photo else None,
+            'other_documents_url': item.other_documents.url if item.other_documents else None,
+        }
+        return data
+
+    def restore(self, item, user):
+        super().restore(item, user)
+        return f"{user.first_name} retrieved scholarship application for {item.student.get_full_name()}"
+
+
+class ArchivedAdmission(ArchiveType):
+    key = 'admission'
+    model = StudentAdmission
+    label = 'student admission'
+    slot = 'admissions'
+    row_var = 'admission'
+    select_related = ('archived_by', 'course')
+    restore_user_types = (1, 12)
+    owner_field = 'user'
+    cold_storage = COLD_ROWS
+
+    def visible(self, roles):
+        if roles.in_units(12):
+            return None
+        return self.archived().filter(Q(user=roles.user) | Q(archived_by=roles.user))
+
+    def title(self, obj):
+        return f"{obj.control_no} {obj.first_name} {obj.last_name}".strip()
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'control_no': item.control_no,
+            'student_type_display': item.get_student_type_display(),
+            'course': {
+                'id': item.course.id if item.course else None,
+                'name': item.course.name if item.course else None,
+            },
+            'status_display': item.get_status_display(),
+            'date': item.date.strftime('%B %d, %Y'),
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'remarks': item.remarks,
+            'admission_portal_registration': item.admission_portal_registration,
+
+            # Student type specific fields
+            'strand': item.strand,
+            'grade11_report_card': item.grade11_report_card.url if item.grade11_report_card else None,
+            'certificate_of_enrollment': item.certificate_of_enrollment.url if item.certificate_of_enrollment else None,
+            'grade12_report_card': item.grade12_report_card.url if item.grade12_report_card else None,
+            'form137': item.form137.url if item.form137 else None,
+
+            # Transferee specific fields
+            'curriculum_type_display': item.get_curriculum_type_display() if item.curriculum_type else None,
+            'first_year_first_semester_display': item.get_first_year_first_semester_display() if item.first_year_first_semester else None,
+            'first_year_second_semester_display': item.get_first_year_second_semester_display() if item.first_year_second_semester else None,
+            'second_year_first_semester_display': item.get_second_year_first_semester_display() if item.second_year_first_semester else None,
+            'other_semester_info': item.other_semester_info,
+            'transcript_of_grades': item.transcript_of_grades.url if item.transcript_of_grades else None,
+            'good_moral_certificate': item.good_moral_certificate.url if item.good_moral_certificate else None,
+            'honorable_dismissal': item.honorable_dismissal.url if item.honorable_dismissal else None,
+            'nbi_police_clearance': item.nbi_police_clearance.url if item.nbi_police_clearance else None,
+        }
+        return data
+
+    def restore(self, item, user):
+        super().restore(item, user)
+        return f"{user.first_name} retrieved student admission: {item.control_no}"
+
+
+class ArchivedNSTPStudent(ArchiveType):
+    key = 'nstp-student'
+    model = NSTPStudentInfo
+    label = 'NSTP student'
+    slot = 'nstp_students'
+    row_var = 'student'
+    select_related = ('user', 'archived_by')
+    restore_user_types = (1, 2)
+
+    def visible(self, roles):
+        if roles.in_units(2):
+            return None
+        return self.archived().filter(Q(user=roles.user) | Q(archived_by=roles.user))
+
+    def title(self, obj):
+        return f"{obj.last_name}, {obj.first_name} ({obj.student_number})"
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'first_name': item.first_name,
+            'last_name': item.last_name,
+            'middle_name': item.middle_name,
+            'student_number': item.student_number,
+            'program': item.program,
+            'gender': item.gender,
+            'gender_display': item.get_gender_display(),
+            'birth_date': item.birth_date.strftime('%B %d, %Y') if item.birth_date else None,
+            'contact_number': item.contact_number,
+            'email_address': item.email_address,
+            'street_or_barangay': item.street_or_barangay,
+            'municipality_or_city': item.municipality_or_city,
+            'province': item.province,
+            'approval_status': item.approval_status,
+            'approval_status_display': item.get_approval_status_display(),
+            'semester': item.semester,
+            'semester_display': item.get_semester_display(),
+            'academic_year': item.academic_year,
+            'remarks': item.remarks,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'user': {
+                'full_name': item.user.get_full_name(),
+                'profile_picture': item.user.profile_picture.url if item.user.profile_picture else None,
+                'email': item.user.email,
+            }
+        }
+        return data
+
+
+class ArchivedNSTPFile(ArchiveType):
+    key = 'nstp-file'
+    model = NSTPFile
+    label = 'NSTP file'
+    slot = 'nstp_files'
+    row_var = 'nstp_file'
+    select_related = ('archived_by', 'created_by')
+    file_fields = ('file',)
+    restore_user_types = (1, 2)
+
+    def visible(self, roles):
+        return None if roles.in_units(2) else self.model.objects.none()
+
+    def title(self, obj):
+        return obj.title
+
+    def can_restore(self, roles, obj):
+        return super().can_restore(roles, obj) or obj.created_by_id == roles.user.pk
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'title': item.title,
+            'description': item.description,
+            'category_display': item.get_category_display(),
+            'semester_display': item.get_semester_display(),
+            'school_year': item.school_year,
+            'file_name': item.get_file_name(),
+            'file_size': item.get_file_size(),
+            'file_url': item.file.url,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'created_by': item.created_by.get_full_name(),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+        }
+        return data
+
+
+class ArchivedOJTCompany(ArchiveType):
+    key = 'ojt-company'
+    model = OJTCompany
+    label = 'OJT company'
+    slot = 'ojt_companies'
+    row_var = 'company'
+    restore_user_types = (1, 13)
+
+    def visible(self, roles):
+        return None if roles.is_superuser else self.archived().filter(archived_by=roles.user)
+
+    def title(self, obj):
+        return obj.name
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'name': item.name,
+            'address': item.address,
+            'contact_number': item.contact_number,
+            'description': item.description or "",
+            'website': item.website or "",
+            'email': item.email or "",
+            'status': item.display_status,  # Use display_status property
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else "",
+            'status_updated_at': item.status_updated_at.strftime(
+                '%B %d, %Y %H:%M') if item.status_updated_at else "",
+            'status_updated_by': item.status_updated_by.get_full_name() if item.status_updated_by else "",
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else "",
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else "System",
+        }
+        return data
+
+
+class ArchivedOrganization(ArchiveType):
+    key = 'organization'
+    model = Organization
+    label = 'organization'
+    slot = 'organizations'
+    row_var = 'organization'
+    restore_user_types = (10,)
+    owner_field = 'user_account'
+    cold_storage = COLD_FILES
+
+    def visible(self, roles):
+        if roles.in_units(10):
+            return None
+        if roles.is_organization and roles.organization:
+            return self.archived().filter(pk=roles.organization.pk)
+        return self.model.objects.none()
+
+    def title(self, obj):
+        if obj.organization_acronym:
+            return f"{obj.organization_name} ({obj.organization_acronym})"
+        return obj.organization_name
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'organization_name': item.organization_name,
+            'organization_acronym': item.organization_acronym,
+            'organization_description': item.organization_description,
+            'organization_mission': item.organization_mission,
+            'organization_vision': item.organization_vision,
+            'organization_type_display': item.get_organization_type_display(),
+            'organization_email': item.organization_email,
+            'organization_status': item.organization_status,
+            'organization_status_display': dict(item.ORGANIZATION_STATUS_CHOICES).get(item.organization_status,
+                                                                                      'Unknown'),
+            'organization_valid_from': item.organization_valid_from.strftime(
+                '%B %d, %Y') if item.organization_valid_from else None,
+            'organization_valid_until': item.organization_valid_until.strftime(
+                '%B %d, %Y') if item.organization_valid_until else None,
+            'organization_adviser_name': item.organization_adviser_name,
+            'organization_adviser_department': item.organization_adviser_department,
+            'organization_adviser_email': item.organization_adviser_email,
+            'organization_adviser_phone': item.organization_adviser_phone,
+            'organization_member_count': item.organization_member_count,
+            'organization_has_minimum_members': item.organization_has_minimum_members,
+            'all_requirements_submitted': item.all_requirements_submitted,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'organization_members': item.organization_members or [],
+
+            # Document URLs
+            'organization_logo_url': item.organization_logo.url if item.organization_logo else None,
+            'organization_calendar_activities_url': item.organization_calendar_activities.url if item.organization_calendar_activities else None,
+            'organization_adviser_cv_url': item.organization_adviser_cv.url if item.organization_adviser_cv else None,
+            'organization_cog_url': item.organization_cog.url if item.organization_cog else None,
+            'organization_group_picture_url': item.organization_group_picture.url if item.organization_group_picture else None,
+            'organization_cbl_url': item.organization_cbl.url if item.organization_cbl else None,
+            'organization_list_members_url': item.organization_list_members.url if item.organization_list_members else None,
+            'organization_acceptance_letter_url': item.organization_acceptance_letter.url if item.organization_acceptance_letter else None,
+            'organization_ar_url': item.organization_ar.url if item.organization_ar else None,
+            'organization_previous_calendar_url': item.organization_previous_calendar.url if item.organization_previous_calendar else None,
+            'organization_financial_report_url': item.organization_financial_report.url if item.organization_financial_report else None,
+            'organization_coa_url': item.organization_coa.url if item.organization_coa else None,
+            'organization_member_biodata_url': item.organization_member_biodata.url if item.organization_member_biodata else None,
+            'organization_good_moral_url': item.organization_good_moral.url if item.organization_good_moral else None,
+        }
+        return data
+
+    def restore(self, item, user):
+        item.is_archived = False
+        item.archived_at = None
+        item.archived_by = None
+        item.is_active = True
+        item._organization_status = 'cancelled'
+        item.save()
+
+        if item.user_account:
+            user_account = item.user_account
+            user_account.is_archived = False
+            user_account.is_active = True
+            user_account.archived_at = None
+            user_account.archived_by = None
+            user_account.save()
+            return (f"{user.first_name} retrieved organization: {item.organization_name} and its linked user "
+                    f"account - Status set to CANCELLED")
+
+        return f"{user.first_name} retrieved organization: {item.organization_name} - Status set to CANCELLED"
+
+
+class ArchivedAccomplishmentReport(ArchiveType):
+    key = 'accomplishment-report'
+    model = AccomplishmentRecord
+    label = 'accomplishment report'
+    slot = 'accomplishment_reports'
+    row_var = 'report'
+    select_related = ('organization', 'submitted_by', 'archived_by')
+    restore_user_types = (1, 10)
+
+    def visible(self, roles):
+        if roles.in_units(10):
+            return None
+        if roles.is_organization and roles.organization:
+            return self.archived().filter(organization=roles.organization)
+        return self.model.objects.none()
+
+    def title(self, obj):
+        return obj.title
+
+    def can_restore(self, roles, obj):
+        # Whoever archived a report may restore it only from the organization account
+        return (roles.is_superuser or roles.user_type in self.restore_user_types
+                or (roles.is_organization and obj.archived_by_id == roles.user.pk))
+
+    def serialize(self, item):
+        data = {
+            'id': item.id,
+            'title': item.title,
+            'record_type': item.record_type,
+            'record_type_display': item.get_record_type_display(),
+            'date_conducted': item.date_conducted.strftime('%B %d, %Y'),
+            'venue': item.venue,
+            'semester': item.semester,
+            'semester_display': item.get_semester_display(),
+            'school_year': item.school_year,
+            'objectives': item.objectives,
+            'outcomes': item.outcomes,
+            'number_of_participants': item.number_of_participants,
+            'duration_hours': float(item.duration_hours),
+            'budget_utilized': float(item.budget_utilized) if item.budget_utilized else None,
+            'archive_reason': item.archive_reason,
+            'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
+            'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
+            'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
+            'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
+            'submitted_by': item.submitted_by.get_full_name() if item.submitted_by else None,
+            'organization': {
+                'name': item.organization.organization_name if item.organization else None,
+                'acronym': item.organization.organization_acronym if item.organization else None,
+            } if item.organization else None,
+            'main_report': {
+                'url': item.main_report.url if item.main_report else None,
+                'name': item.main_report.name.split('/')[-1] if item.main_report else None,
+            },
+            'supporting_files': [{
+                'id': file.id,
+                'url': file.file.url,
+                'name': file.filename,
+                'description': file.description,
+                'uploaded_at': file.uploaded_at.strftime('%B %d, %Y %H:%M')
+            } for file in item.supporting_files.all()]
+        }
+        return data
+
+    def restore(self, item, user):
+        item.archive_reason = None
+        return super().restore(item, user)
+
+
+ARCHIVE_TYPES = {
+    archive_type.key: archive_type
+    for archive_type in (
+        ArchivedUser(),
+        ArchivedAnnouncement(),
+        ArchivedDownloadable(),
+        ArchivedComplaint(),
+        ArchivedScholarship(),
+        ArchivedScholarshipApplication(),
+        ArchivedAdmission(),
+        ArchivedNSTPStudent(),
+        ArchivedNSTPFile(),
+        ArchivedOJTCompany(),
+        ArchivedOrganization(),
+        ArchivedAccomplishmentReport(),
+    )
+}
+ARCHIVE_TYPES_BY_MODEL = {archive_type.model: archive_type for archive_type in ARCHIVE_TYPES.values()}
+
+
+# ---------------------------------------------------- Listing ---------------------------------------------------------
+def archive_entries(roles, item_type=None, query=''):
+    """Index entries visible to `roles`, newest first, optionally of one type and matching `query`"""
+    archive_types = [ARCHIVE_TYPES[item_type]] if item_type else ARCHIVE_TYPES.values()
+    conditions = [archive_type.entry_filter(roles) for archive_type in archive_types]
+    conditions = [condition for condition in conditions if condition is not None]
+    if not conditions:
+        return ArchiveEntry.objects.none()
+
+    condition = conditions[0]
+    for other in conditions[1:]:
+        condition |= other
+    entries = ArchiveEntry.objects.filter(condition)
+
+    if query:
+        entries = entries.filter(title__icontains=query)
+    return entries.select_related('archived_by').order_by('-archived_at', '-id')
+
+
+def archive_page(roles, item_type=None, query='', cursor=None, per_page=ARCHIVE_PAGE_SIZE, with_count=False):
+    return KeysetPaginator(archive_entries(roles, item_type, query), per_page).page(cursor, with_count=with_count)
+
+
+def entry_payload(entry):
+    return {
+        'type': entry.item_type,
+        'id': entry.object_id,
+        'title': entry.title,
+        'archived_at': entry.archived_at.isoformat() if entry.archived_at else None,
+        'archived_by': entry.archived_by.get_full_name() if entry.archived_by else None,
+        'is_cold': entry.is_cold,
+    }
+
+
+# ----------------------------------------------------- Index ----------------------------------------------------------
+def reindex_archive(model, pks=None):
+    """Bring the index in line with `model` rows (all of them, or just `pks`)"""
+    archive_type = ARCHIVE_TYPES_BY_MODEL[model]
+    records = model.objects.all()
+    # Frozen rows are not in the table any more; their entries are still valid
+    stale = ArchiveEntry.objects.filter(item_type=archive_type.key, cold_bundle='')
+    if pks is not None:
+        records = records.filter(pk__in=pks)
+        stale = stale.filter(object_id__in=pks)
+
+    archived = list(records.filter(is_archived=True).select_related(*archive_type.title_related))
+    with transaction.atomic():
+        stale.exclude(object_id__in=[obj.pk for obj in archived]).delete()
+        ArchiveEntry.objects.bulk_create(
+            [archive_type.entry_for(obj) for obj in archived],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['item_type', 'object_id'],
+            update_fields=['title', 'archived_at', 'archived_by', 'owner'],
+        )
+    return len(archived)
+
+
+def index_record(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields is not None and not ARCHIVE_FIELDS.intersection(update_fields):
+        return
+
+    archive_type = ARCHIVE_TYPES_BY_MODEL[sender]
+    if instance.is_archived:
+        entry = archive_type.entry_for(instance)
+        ArchiveEntry.objects.update_or_create(
+            item_type=entry.item_type,
+            object_id=entry.object_id,
+            defaults={
+                'title': entry.title,
+                'archived_at': entry.archived_at,
+                'archived_by_id': entry.archived_by_id,
+                'owner_id': entry.owner_id,
+            },
+        )
+    elif not created:
+        entries = ArchiveEntry.objects.filter(item_type=archive_type.key, object_id=instance.pk)
+        if archive_type.cold_storage == COLD_FILES:
+            # Unarchived by some other path while its files were frozen: bring them back first
+            for entry in entries.exclude(cold_bundle=''):
+                for (label, pk, field), stored in thaw(entry).items():
+                    if label == instance._meta.label_lower and pk == instance.pk:
+                        setattr(instance, field, stored)
+        entries.delete()
+
+
+def unindex_record(sender, instance, **kwargs):
+    if getattr(instance, '_moving_to_cold', False):
+        return  # freeze() keeps the entry pointing at the bundle
+    ArchiveEntry.objects.filter(item_type=ARCHIVE_TYPES_BY_MODEL[sender].key, object_id=instance.pk).delete()
+
+
+for _model in ARCHIVE_TYPES_BY_MODEL:
+    post_save.connect(index_record, sender=_model, dispatch_uid=f'osas.archive.index.{_model.__name__}')
+    post_delete.connect(unindex_record, sender=_model, dispatch_uid=f'osas.archive.unindex.{_model.__name__}')
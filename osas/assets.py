@@ -0,0 +1,171 @@
+"""
+Static asset pipeline.
+
+`collectstatic` runs through BundledStaticFilesStorage:
+
+1. our own CSS and JavaScript (under css/ and js/) is minified, with rcssmin
+   and rjsmin when they are installed, and only copied otherwise;
+2. every bundle in BUNDLES is built from its sources, in order, so a page
+   loads one stylesheet and one script instead of dozens;
+3. WhiteNoise's CompressedManifestStaticFilesStorage then gives every file a
+   content-hashed name and writes .gz and, with Brotli installed, .br copies.
+
+WhiteNoiseMiddleware serves the hashed names with a far-future immutable
+Cache-Control and picks the compressed copy the browser accepts, so repeat page
+loads only fetch what changed since the last deploy.
+
+Templates include a bundle with {% asset_bundle 'js/dashboard/dashboard.bundle.js' %}
+(osas_assets tag library). While STATIC_BUNDLES is off, the default with DEBUG,
+the tag emits one tag per source file instead, so edits show up without running
+collectstatic.
+"""
+import json
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # Optional; bundles are still concatenated without them
+    rcssmin = rjsmin = None
+
+# Bundle path -> sources, in load order. Bundles sit next to their sources so relative url()s keep working.
+BUNDLES = {
+    'css/dashboard/dashboard.bundle.css': (
+        'css/dashboard/dashboard.css',
+        'css/dashboard/spaces.css',
+        'css/dashboard/analytics.css',
+        'css/dashboard/export-nstp.css',
+        'css/dashboard/admission-section.css',
+        'css/dashboard/footer-edit.css',
+        'css/dashboard/nstp-files.css',
+        'css/dashboard/calendar.css',
+        'css/dashboard/nstp-enlistment.css',
+        'css/dashboard/ojt-applications.css',
+        'css/dashboard/company-section.css',
+        'css/dashboard/complaint-section.css',
+        'css/dashboard/modals.css',
+        'css/dashboard/toast.css',
+        'css/dashboard/home-section.css',
+        'css/dashboard/profile-section.css',
+        'css/dashboard/scholarship-section.css',
+        'css/dashboard/organization.css',
+        'css/dashboard/org-certificate.css',
+        'css/dashboard/org-accomplishment-report.css',
+        'css/dashboard/users-section.css',
+        'css/dashboard/announcement-section.css',
+        'css/dashboard/downloadables-section.css',
+        'css/dashboard/ojt-records-section.css',
+        'css/dashboard/archived.css',
+    ),
+    'js/dashboard/dashboard.bundle.js': (
+        'js/dashboard/home-section.js',
+        'js/dashboard/analytics-section.js',
+        'js/dashboard/profile.js',
+        'js/dashboard/complaint-section.js',
+        'js/dashboard/ojt-companies-crud.js',
+        'js/dashboard/ojt-applications-crud.js',
+        'js/dashboard/ojt-reports-crud.js',
+        'js/dashboard/users-crud.js',
+        'js/dashboard/admission-crud.js',
+        'js/dashboard/nstp-crud.js',
+        'js/dashboard/nstp-files-crud.js',
+        'js/dashboard/downloadables-crud.js',
+        'js/dashboard/announcements-crud.js',
+        'js/dashboard/scholarship-crud.js',
+        'js/dashboard/scholarship-application-crud.js',
+        'js/dashboard/chunked-upload.js',
+        'js/dashboard/organizations-crud.js',
+        'js/dashboard/org-certificate.js',
+        'js/dashboard/org-accomplishment-report.js',
+        'js/dashboard/archived.js',
+        'js/dashboard/calendar.js',
+        'js/dashboard/sidebar.js',
+        'js/dashboard/logout.js',
+    ),
+    # Included by every public page through core/navbar.html
+    'js/core/navbar.bundle.js': (
+        'js/core/navbar.js',
+        'js/core/login.js',
+    ),
+}
+
+# Only our own assets are minified; admin and editor packages ship their own builds
+MINIFIED_PREFIXES = ('css/', 'js/')
+
+# A script bundle inserts each of its sources as an inline <script> of its own, in order. Like separate
+# tags they share globals, but an error at the top of one (say an element missing for this role) no
+# longer stops the scripts after it, as it would in one concatenated script.
+SCRIPT_BUNDLE = """(function () {
+    function run(name, source) {
+        var script = document.createElement('script');
+        script.text = source + '\\n//# sourceURL=' + name;
+        document.head.appendChild(script);
+    }
+%s
+})();
+"""
+
+
+def minify(name, content):
+    extension = posixpath.splitext(name)[1]
+    if extension == '.css' and rcssmin is not None:
+        return rcssmin.cssmin(content)
+    if extension == '.js' and rjsmin is not None:
+        return rjsmin.jsmin(content)
+    return content
+
+
+def minifiable(name):
+    return name.startswith(MINIFIED_PREFIXES) and name.endswith(('.css', '.js')) and '.min.' not in name
+
+
+def build_bundle(name, sources):
+    """Contents of the bundle `name` from its (name, content) `sources`"""
+    if name.endswith('.css'):
+        return '\n'.join(content for _, content in sources)
+    return SCRIPT_BUNDLE % '\n'.join(
+        f"    run({json.dumps(settings.STATIC_URL + source)}, {json.dumps(content)});" for source, content in sources
+    )
+
+
+class BundledStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Minifies our assets and builds BUNDLES before hashing and compressing everything"""
+
+    def _read_source(self, paths, name):
+        if name not in paths:
+            raise ValueError(f"The static file '{name}' could not be found.")
+        storage, path = paths[name]
+        with storage.open(path) as source:
+            return source.read().decode('utf-8')
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # A template referring to a file that doesn't exist gets its plain URL, a 404 as before hashing,
+            # rather than failing the whole page
+            return name
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content.encode('utf-8')))
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            for name in [name for name in paths if minifiable(name)]:
+                # From the original, not the collected copy, which an earlier run minified already
+                self._replace(name, minify(name, self._read_source(paths, name)))
+                paths[name] = (self, name)
+
+            for name, sources in BUNDLES.items():
+                contents = [(source, self._read_source(paths, source)) for source in sources]
+                self._replace(name, build_bundle(name, contents))
+                paths[name] = (self, name)
+
+        yield from super().post_process(paths, dry_run, **options)
@@ -0,0 +1,187 @@
+"""
+Async variants of the high-fanout read-only JSON endpoints.
+
+Under ASGI (osas_system/asgi.py turns ASYNC_VIEWS on) urls.py routes these
+endpoints here instead of to their sync twins in views.py. They build the same
+responses from the same helpers, but wait on the database and the cache through
+the async ORM and cache API, so a worker keeps serving other requests meanwhile
+instead of holding a thread per request.
+
+Django 4.2 has no request.auser() and its csrf_exempt/require_http_methods
+decorators and LoginRequiredMixin only wrap sync views, so the user is loaded
+with _authenticated() and methods are checked with _require_methods().
+"""
+import json
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.db.models import Prefetch
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.views import View
+
+from .identity import aidentity_taken, athrottled
+from .images import avariant_widths
+from .models import Announcement, AnnouncementImage, Course, UserActivityLog
+from .pagination import KeysetPaginator, aget_page
+from .projections import project
+from .serializers import FastJsonResponse
+from .views import (
+    activities_payload, activity_overview_counts, activity_overview_payload, activity_user_choices,
+    activity_users_queryset, announcement_api_payload, announcement_calendar_entries,
+    availability_throttled_response, email_problem, filter_activities, username_problem,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _require_methods(*methods):
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+        return inner
+    return decorator
+
+
+async def _authenticated(request):
+    """Whether the request is signed in; loads request.user, session and all, off the event loop"""
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+# ---- Announcements ----
+async def all_announcements_api(request):
+    announcements = Announcement.objects.filter(
+        is_published=True,
+        is_archived=False
+    ).order_by('-publish_date').select_related('author').prefetch_related(
+        # Announcement.get_first_image() would query each row again
+        Prefetch('images', queryset=AnnouncementImage.objects.order_by('pk'), to_attr='ordered_images')
+    )
+    announcements = [ann async for ann in announcements]
+    first_images = [ann.ordered_images[0] if ann.ordered_images else None for ann in announcements]
+    widths = await avariant_widths(image.image if image else None for image in first_images)
+
+    data = [announcement_api_payload(*row) for row in zip(announcements, first_images, widths)]
+    return JsonResponse(data, safe=False)
+
+
+class AnnouncementCalendarAPI(View):
+    async def get(self, request):
+        if not await _authenticated(request):
+            return redirect_to_login(request.get_full_path())
+
+        announcements = Announcement.objects.filter(
+            is_published=True,
+            is_archived=False
+        ).order_by('-created_at').select_related('author')
+
+        announcements_data = []
+        async for announcement in announcements:
+            announcements_data.extend(announcement_calendar_entries(announcement))
+
+        return JsonResponse(announcements_data, safe=False)
+
+
+# ---- Courses ----
+async def get_courses(request):
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({
+            'success': True,
+            'courses': [course async for course in Course.objects.values('id', 'name')]
+        })
+    return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
+
+
+# ---- Activity log ----
+@_require_methods('GET')
+async def recent_activities(request):
+    if not await _authenticated(request):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    activities = project(filter_activities(request.GET).order_by('-timestamp', '-id'), 'activities')
+    if 'cursor' in request.GET:
+        page_obj = await KeysetPaginator(activities, 50).apage(
+            request.GET.get('cursor'), with_count=request.GET.get('with_count') == '1'
+        )
+    else:
+        page_obj = await aget_page(activities, request.GET.get('page', 1), 50)
+
+    return FastJsonResponse(activities_payload(request, page_obj))
+
+
+@_require_methods('GET')
+async def activity_users(request):
+    if not await _authenticated(request):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    users = [user async for user in activity_users_queryset()]
+    return JsonResponse(activity_user_choices(users), safe=False)
+
+
+@_require_methods('GET')
+async def activity_log_overview(request):
+    if not await _authenticated(request):
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    counts = await UserActivityLog.objects.aaggregate(**activity_overview_counts())
+    return JsonResponse(activity_overview_payload(counts))
+
+
+# ---- Availability checks ----
+async def _availability(request, scope, field, problem, kind, taken_message, available_message):
+    if await athrottled(request, scope):
+        return availability_throttled_response()
+
+    try:
+        value = json.loads(request.body).get(field, '').strip()
+        if kind != 'username':
+            value = value.lower()
+
+        message = problem(value)
+        if message:
+            return JsonResponse({'available': False, 'message': message})
+        if await aidentity_taken(kind, value):
+            return JsonResponse({'available': False, 'message': taken_message})
+        return JsonResponse({'available': True, 'message': available_message})
+
+    except Exception:
+        logger.exception("Error checking %s availability", kind)
+        return JsonResponse({
+            'available': False,
+            'message': f"Error checking {kind.replace('_', ' ')} availability"
+        }, status=500)
+
+
+@_require_methods('POST')
+async def check_username_availability(request):
+    return await _availability(
+        request, 'username-availability', 'username', username_problem, 'username',
+        'This username is already taken', 'Username is available',
+    )
+
+
+@_require_methods('POST')
+async def check_email_availability(request):
+    return await _availability(
+        request, 'email-availability', 'email', lambda email: email_problem(email, 'Email is required'), 'email',
+        'This email is already registered', 'Email is available',
+    )
+
+
+@_require_methods('POST')
+async def check_organization_email_availability(request):
+    return await _availability(
+        request, 'organization-email-availability', 'email',
+        lambda email: email_problem(email, 'Organization email is required'), 'organization_email',
+        'This organization email is already registered', 'Organization email is available',
+    )
+
+
+# Posted before signing in, like their sync twins
+check_username_availability.csrf_exempt = True
+check_email_availability.csrf_exempt = True
+check_organization_email_availability.csrf_exempt = True
@@ -0,0 +1,329 @@
+"""
+Bulk approve/archive actions for the dashboard tables.
+
+Each BulkAction selects its rows by id list or by an allow-listed filter, applies
+the change in memory, writes it back with one bulk_update inside a transaction,
+records one activity entry per row with bulk_create and queues the notification
+emails as a single batch (see osas/notifications.py).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .archive import reindex_archive
+from .models import CustomUser, NSTPStudentInfo, Organization, ScholarshipApplication, StudentAdmission, \
+    UserActivityLog
+from .notifications import ACCOUNT_EMAIL_FROM, queue_emails, render_email
+from .roles import bulk_assign_role_groups
+
+BULK_ACTION_LIMIT = 1000
+
+
+class BulkActionError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class BulkAction:
+    model = None
+    verb = ''
+    update_fields = ()
+    filter_fields = ()
+    select_related = ()
+    # Unit user types allowed besides superusers/OSAS Staff; None means superusers only
+    user_types = None
+    # Whether rows the action skipped still get their in-memory changes written
+    save_skipped = False
+
+    def has_permission(self, roles):
+        if self.user_types is None:
+            return roles.is_superuser
+        return roles.in_units(*self.user_types)
+
+    def get_queryset(self):
+        return self.model.objects.filter(is_archived=False)
+
+    def clean(self, params):
+        """Validate extra request parameters (decision, notes, ...)"""
+        return {'notes': (params.get('notes') or '').strip()}
+
+    def apply(self, obj, request, options):
+        """Change `obj` in memory; return a reason string to skip it"""
+        raise NotImplementedError
+
+    def describe(self, obj, request, options):
+        raise NotImplementedError
+
+    def after_update(self, objects, request, options):
+        pass
+
+    def emails(self, objects, request, options):
+        return []
+
+    def select(self, ids=None, filters=None):
+        queryset = self.get_queryset()
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+        elif filters:
+            unknown = set(filters) - set(self.filter_fields)
+            if unknown:
+                raise BulkActionError(f"Cannot filter on: {', '.join(sorted(unknown))}")
+            queryset = queryset.filter(**filters)
+        else:
+            raise BulkActionError('Select at least one item or provide a filter')
+
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset.select_for_update(of=('self',)).order_by('pk')
+
+    def run(self, request, ids=None, filters=None, params=None):
+        options = self.clean(params or {})
+
+        with transaction.atomic():
+            objects = list(self.select(ids, filters)[:BULK_ACTION_LIMIT + 1])
+            if len(objects) > BULK_ACTION_LIMIT:
+                raise BulkActionError(f'At most {BULK_ACTION_LIMIT} items can be processed at once')
+
+            updated, skipped = [], []
+            for obj in objects:
+                reason = self.apply(obj, request, options)
+                if reason:
+                    skipped.append({'id': obj.pk, 'reason': reason})
+                else:
+                    updated.append(obj)
+
+            to_save = objects if self.save_skipped else updated
+            if to_save:
+                self.model.objects.bulk_update(to_save, self.update_fields, batch_size=500)
+            self.after_update(updated, request, options)
+
+            UserActivityLog.objects.bulk_create([
+                UserActivityLog(user=request.user, activity=self.describe(obj, request, options))
+                for obj in updated
+            ], batch_size=500)
+
+            queue_emails(self.emails(updated, request, options))
+
+        if ids:
+            found = {obj.pk for obj in objects}
+            skipped.extend({'id': pk, 'reason': 'Not found'} for pk in ids if pk not in found)
+
+        return {
+            'success': True,
+            'message': f'{len(updated)} item(s) {self.verb} successfully.',
+            'updated': [obj.pk for obj in updated],
+            'skipped': skipped,
+        }
+
+
+class ArchiveAction(BulkAction):
+    verb = 'archived'
+    update_fields = ('is_archived', 'archived_at', 'archived_by')
+
+    def apply(self, obj, request, options):
+        obj.is_archived = True
+        obj.archived_at = timezone.now()
+        obj.archived_by = request.user
+
+    def after_update(self, objects, request, options):
+        # bulk_update() sends no post_save, so the archive index is refreshed here
+        reindex_archive(self.model, [obj.pk for obj in objects])
+
+
+# ---- Users ----
+class ApproveUsers(BulkAction):
+    model = CustomUser
+    verb = 'approved'
+    update_fields = ('is_verified', 'is_superuser', 'is_staff')
+    filter_fields = ('user_type', 'course')
+
+    def get_queryset(self):
+        return CustomUser.objects.filter(is_verified=False, is_archived=False)
+
+    def apply(self, user, request, options):
+        user.is_verified = True
+        # Same flags as ApproveUserView.assign_role_permissions
+        if user.user_type == 1:
+            user.is_superuser = True
+            user.is_staff = True
+        elif user.user_type in range(2, 14) or user.user_type == 16:
+            user.is_staff = True
+
+    def after_update(self, users, request, options):
+        bulk_assign_role_groups(users)
+
+    def describe(self, user, request, options):
+        return f"{request.user.first_name} approved user: {user.username}"
+
+    def emails(self, users, request, options):
+        return [
+            render_email(
+                'Your Account Has Been Approved',
+                'emails/account_approved.html',
+                {
+                    'user': user,
+                    'site_name': 'CvSU Office of the Student Affairs and Services Bacoor City Campus',
+                },
+                user.email,
+                from_email=ACCOUNT_EMAIL_FROM,
+            )
+            for user in users
+        ]
+
+
+class ArchiveUsers(ArchiveAction):
+    model = CustomUser
+    update_fields = ('is_archived', 'is_active', 'archived_at', 'archived_by')
+    filter_fields = ('user_type', 'course', 'is_verified')
+    select_related = ('organization_account',)
+
+    def apply(self, user, request, options):
+        if user.pk == request.user.pk:
+            return 'You cannot archive your own account'
+        if user.is_superuser:
+            return 'Cannot archive a super-admin account.'
+        super().apply(user, request, options)
+        user.is_active = False
+
+    def linked_organization(self, user):
+        return user.organization_account if user.user_type == 15 else None
+
+    def after_update(self, users, request, options):
+        super().after_update(users, request, options)
+        organization_ids = [org.pk for org in map(self.linked_organization, users) if org]
+        if organization_ids:
+            Organization.objects.filter(pk__in=organization_ids).update(
+                is_archived=True,
+                is_active=False,
+                archived_at=timezone.now(),
+                archived_by=request.user,
+                _organization_status='inactive',
+            )
+            reindex_archive(Organization, organization_ids)
+
+    def describe(self, user, request, options):
+        organization = self.linked_organization(user)
+        if organization:
+            return (f"{request.user.first_name} archived organization: {organization.organization_name} "
+                    f"along with its user account")
+        return f"{request.user.first_name} archived the user account for: {user.username}"
+
+
+# ---- Admissions ----
+class ApproveAdmissions(BulkAction):
+    model = StudentAdmission
+    verb = 'approved'
+    update_fields = ('status', 'remarks')
+    filter_fields = ('student_type', 'course', 'status')
+    user_types = (12,)
+    save_skipped = True
+
+    def get_queryset(self):
+        return StudentAdmission.objects.filter(is_archived=False).exclude(status='done')
+
+    def apply(self, admission, request, options):
+        admission.evaluate_requirements()
+        if admission.status != 'complete':
+            return 'Cannot approve admission with incomplete requirements'
+
+        admission.status = 'done'
+        notes = options['notes']
+        if notes:
+            if admission.remarks:
+                admission.remarks = f"{admission.remarks}\n\nAdmin Notes: {notes}"
+            else:
+                admission.remarks = f"Admin Notes: {notes}"
+
+    def describe(self, admission, request, options):
+        return f"{request.user.get_full_name()} approved admission {admission.control_no}"
+
+
+class ArchiveAdmissions(ArchiveAction):
+    model = StudentAdmission
+    filter_fields = ('student_type', 'course', 'status')
+    user_types = (12,)
+
+    def describe(self, admission, request, options):
+        return f"{request.user.get_full_name()} archived student admission: {admission.control_no}"
+
+
+# ---- NSTP ----
+class DecideNSTPEnlistments(BulkAction):
+    model = NSTPStudentInfo
+    update_fields = ('approval_status', 'remarks')
+    filter_fields = ('semester', 'academic_year', 'program', 'approval_status')
+    user_types = (2,)
+
+    def __init__(self, status):
+        self.status = status
+        self.verb = status
+
+    def apply(self, enlistment, request, options):
+        enlistment.approval_status = self.status
+        if options['notes']:
+            enlistment.remarks = options['notes']
+
+    def describe(self, enlistment, request, options):
+        return f"{request.user.get_full_name()} {self.status} NSTP enlistment for {enlistment.student_number}"
+
+
+class ArchiveNSTPEnlistments(ArchiveAction):
+    model = NSTPStudentInfo
+    filter_fields = ('semester', 'academic_year', 'program', 'approval_status')
+    user_types = (2,)
+
+    def describe(self, enlistment, request, options):
+        return f"{request.user.get_full_name()} archived NSTP enlistment for {enlistment.student_number}"
+
+
+# ---- Scholarship applications ----
+class DecideScholarshipApplications(BulkAction):
+    model = ScholarshipApplication
+    update_fields = ('status', 'notes', 'status_updated_by', 'status_update_date')
+    filter_fields = ('scholarship', 'status')
+    select_related = ('student', 'scholarship')
+    user_types = (5,)
+
+    def __init__(self, decision):
+        self.decision = decision
+        self.verb = decision
+
+    def apply(self, application, request, options):
+        application.status = self.decision
+        application.notes = options['notes']
+        application.status_updated_by = request.user
+        application.status_update_date = timezone.now()
+
+    def describe(self, application, request, options):
+        return f"{request.user.get_full_name()} {self.decision} scholarship application {application.id}"
+
+    def emails(self, applications, request, options):
+        return [
+            render_email(
+                f"Your Scholarship Application for {application.scholarship.name} has been {self.decision}",
+                'emails/scholarship_decision.html',
+                {
+                    'student_name': application.student.get_full_name(),
+                    'scholarship_name': application.scholarship.name,
+                    'decision': self.decision,
+                    'notes': options['notes'],
+                    'status_update_date': application.status_update_date.strftime("%B %d, %Y"),
+                    'status_updated_by': request.user.get_full_name(),
+                },
+                application.student.email,
+            )
+            for application in applications
+        ]
+
+
+BULK_ACTIONS = {
+    ('users', 'approve'): ApproveUsers(),
+    ('users', 'archive'): ArchiveUsers(),
+    ('admissions', 'approve'): ApproveAdmissions(),
+    ('admissions', 'archive'): ArchiveAdmissions(),
+    ('nstp-enlistments', 'approve'): DecideNSTPEnlistments('approved'),
+    ('nstp-enlistments', 'reject'): DecideNSTPEnlistments('rejected'),
+    ('nstp-enlistments', 'archive'): ArchiveNSTPEnlistments(),
+    ('scholarship-applications', 'approve'): DecideScholarshipApplications('approved'),
+    ('scholarship-applications', 'reject'): DecideScholarshipApplications('rejected'),
+}
@@ -0,0 +1,125 @@
+"""
+Streaming ZIP bundles.
+
+bundle_response() answers with a ZIP of stored media files built while it is
+sent: each file is read in STREAM_CHUNK_SIZE pieces and every piece goes out as
+soon as zipfile has framed it, so memory stays bounded by one chunk and no
+archive is ever written to disk. Since the output can't be seeked back into,
+zipfile follows each member with a data descriptor; sizes come from the stored
+metadata (osas/file_metadata.py) up front, which settles ZIP64 per member.
+
+Members are stored, not deflated: uploads are PDFs, images and Office files
+that are compressed already. Files missing from storage are listed in
+MISSING.txt instead of failing the download halfway through.
+"""
+import posixpath
+import re
+import zipfile
+from itertools import islice
+
+from django.core.files.storage import default_storage
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header
+from django.utils.text import capfirst
+
+from .file_metadata import lookup
+from .media import STREAM_CHUNK_SIZE
+
+LOOKUP_BATCH_SIZE = 200
+UNSAFE_NAME_CHARACTERS = re.compile(r'[\x00-\x1f/\\:*?"<>|]+')
+
+
+class _Sink:
+    """Write-only file object collecting what zipfile writes until the response takes it"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def safe_name(text):
+    """`text` usable as a file or folder name in the archive, spaces and punctuation kept"""
+    return UNSAFE_NAME_CHARACTERS.sub('_', text).strip(' .') or '_'
+
+
+def _unique(arcname, used):
+    """`arcname`, or `arcname (2).ext`, ... if the bundle has it already"""
+    root, extension = posixpath.splitext(arcname)
+    candidate, number = arcname, 1
+    while candidate in used:
+        number += 1
+        candidate = f"{root} ({number}){extension}"
+    used.add(candidate)
+    return candidate
+
+
+def record_entries(obj, folder, fields):
+    """(arcname, stored name) for the non-empty file fields of `obj`, under `folder` and named after the field"""
+    folder = safe_name(folder) if folder else ''
+    for field_name in fields:
+        value = getattr(obj, field_name)
+        if not value:
+            continue
+        label = capfirst(obj._meta.get_field(field_name).verbose_name)
+        arcname = f"{label} - {posixpath.basename(value.name)}"
+        yield (f"{folder}/{arcname}" if folder else arcname), value.name
+
+
+def stream_zip(entries):
+    """Yield a ZIP archive of the (arcname, stored name) `entries` piece by piece"""
+    sink = _Sink()
+    date_time = timezone.localtime().timetuple()[:6]
+    used = set()
+    missing = []
+    entries = iter(entries)
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        while True:
+            batch = list(islice(entries, LOOKUP_BATCH_SIZE))
+            if not batch:
+                break
+            found = lookup(name for _, name in batch)
+            for arcname, name in batch:
+                metadata = found.get(name)
+                if metadata is None:
+                    missing.append(arcname)
+                    continue
+                member = zipfile.ZipInfo(_unique(arcname, used), date_time)
+                member.file_size = metadata.size  # Lets zipfile decide on ZIP64 before the data
+                try:
+                    source = default_storage.open(name, 'rb')
+                except OSError:
+                    missing.append(arcname)
+                    continue
+                with source, archive.open(member, 'w') as target:
+                    for data in iter(lambda: source.read(STREAM_CHUNK_SIZE), b''):
+                        target.write(data)
+                        yield sink.take()
+                yield sink.take()
+
+        if missing:
+            archive.writestr(zipfile.ZipInfo(_unique('MISSING.txt', used), date_time),
+                             "These files could not be found:\n" + "\n".join(missing) + "\n")
+    yield sink.take()
+
+
+def bundle_response(entries, filename):
+    """Streamed ZIP download of `entries`, see stream_zip()"""
+    response = StreamingHttpResponse(stream_zip(entries), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, safe_name(filename))
+    response['X-Accel-Buffering'] = 'no'  # Let nginx pass the pieces on instead of buffering the archive
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
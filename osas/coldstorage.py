@@ -0,0 +1,261 @@
+"""
+Cold-storage tier for long-archived records.
+
+freeze() copies an archived record into the zip bundle for its archive year
+under ARCHIVE_COLD_ROOT, then removes it from the hot side:
+
+* 'rows' types (admissions, scholarship applications, complaints) store the
+  serialized row and its child rows plus every uploaded file, and the rows are
+  deleted from their tables;
+* 'files' types (organizations, which other records point at) keep their row
+  and only move the files out, blanking the file fields.
+
+The ArchiveEntry keeps the bundle name and the record's prefix inside it, so
+the archive listing and the detail modal still show frozen records (read back
+from the bundle), and thaw() puts rows and files back when a record is
+retrieved. Bundles are append-only, so a thawed record stays in its bundle (and
+is stored again if it is frozen again) until compact_bundles(), run by
+freeze_archives, rewrites the bundle without it.
+"""
+import json
+import os
+import shutil
+import uuid
+import zipfile
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import ArchiveEntry
+
+COLD_ROWS = 'rows'
+COLD_FILES = 'files'
+
+
+class ColdStorageError(Exception):
+    pass
+
+
+def bundle_name(year):
+    return f'{year}/archive-{year}.zip'
+
+
+def bundle_path(name):
+    return os.path.join(settings.ARCHIVE_COLD_ROOT, name)
+
+
+@contextmanager
+def _locked(path, exclusive):
+    """Writers of a bundle exclude each other and its readers"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _stored_files(obj):
+    for field in obj._meta.concrete_fields:
+        if isinstance(field, models.FileField):
+            name = getattr(obj, field.name).name
+            if name:
+                yield field.name, name
+
+
+def _check_references(obj):
+    """Null out references to rows deleted while `obj` was frozen; refuse if a required one is gone"""
+    for field in obj._meta.concrete_fields:
+        if not field.many_to_one and not field.one_to_one:
+            continue
+        value = getattr(obj, field.attname)
+        if value is None or field.related_model._default_manager.filter(pk=value).exists():
+            continue
+        if not field.null:
+            raise ColdStorageError(
+                f"This record cannot be restored because its {field.verbose_name} no longer exists."
+            )
+        setattr(obj, field.attname, None)
+
+
+# ---- Freezing ----
+def freeze(archive_type, entry):
+    """Move one archived record into its year's bundle and off the hot tables/media tree"""
+    obj = archive_type.archived().get(pk=entry.object_id)
+    objects = [obj]
+    if archive_type.cold_storage == COLD_ROWS:
+        for relation in archive_type.cold_children:
+            objects.extend(getattr(obj, relation).all())
+
+    key = f'{entry.item_type}/{entry.object_id}-{uuid.uuid4().hex[:8]}'
+    name = bundle_name((entry.archived_at or timezone.now()).year)
+    path = bundle_path(name)
+    files = []
+
+    with _locked(path, exclusive=True):
+        with zipfile.ZipFile(path, 'a', zipfile.ZIP_DEFLATED) as bundle:
+            if archive_type.cold_storage == COLD_ROWS:
+                bundle.writestr(f'{key}/record.json', serializers.serialize('json', objects))
+            for item in objects:
+                for field, stored in _stored_files(item):
+                    if not default_storage.exists(stored):
+                        continue
+                    with default_storage.open(stored, 'rb') as source, \
+                            bundle.open(f'{key}/files/{stored}', 'w', force_zip64=True) as target:
+                        shutil.copyfileobj(source, target)
+                    files.append({'model': item._meta.label_lower, 'pk': item.pk, 'field': field, 'name': stored})
+            bundle.writestr(f'{key}/manifest.json', json.dumps({'mode': archive_type.cold_storage, 'files': files}))
+
+        # Committed before the lock is released, or compact_bundle() could drop the record as unreferenced
+        with transaction.atomic():
+            ArchiveEntry.objects.filter(pk=entry.pk).update(cold_bundle=name, cold_key=key, cold_at=timezone.now())
+            if archive_type.cold_storage == COLD_ROWS:
+                obj._moving_to_cold = True
+                obj.delete()
+            else:
+                blanked = defaultdict(dict)
+                for file in files:
+                    blanked[(file['model'], file['pk'])][file['field']] = ''
+                for (label, pk), values in blanked.items():
+                    apps.get_model(label).objects.filter(pk=pk).update(**values)
+            transaction.on_commit(lambda: _delete_hot_files(files))
+    return len(files)
+
+
+def _delete_hot_files(files):
+    for file in files:
+        default_storage.delete(file['name'])
+
+
+def freeze_candidates(archive_types, days=None):
+    """Hot entries archived more than `days` ago (and not thawed since)"""
+    cutoff = timezone.now() - timedelta(days=settings.ARCHIVE_COLD_AFTER_DAYS if days is None else days)
+    return ArchiveEntry.objects.filter(
+        item_type__in=[archive_type.key for archive_type in archive_types],
+        cold_bundle='',
+        archived_at__lt=cutoff,
+    ).exclude(thawed_at__gte=cutoff).order_by('archived_at', 'id')
+
+
+# ---- Reading and thawing ----
+def load_frozen(entries):
+    """In-memory (unsaved) copies of frozen rows, keyed by object id, for listing and permission checks"""
+    by_bundle = defaultdict(list)
+    for entry in entries:
+        by_bundle[entry.cold_bundle].append(entry)
+
+    records = {}
+    for name, group in by_bundle.items():
+        path = bundle_path(name)
+        with _locked(path, exclusive=False), zipfile.ZipFile(path) as bundle:
+            for entry in group:
+                record = bundle.read(f'{entry.cold_key}/record.json')
+                obj, *children = [deserialized.object for deserialized in serializers.deserialize('json', record)]
+                _attach_children(obj, children)
+                obj._frozen_entry = entry
+                records[entry.object_id] = obj
+    return records
+
+
+def _attach_children(obj, children):
+    """Serve `obj`'s reverse relations from its frozen child rows; their tables no longer hold them"""
+    obj._prefetched_objects_cache = {}
+    for relation in obj._meta.related_objects:
+        if not relation.one_to_many:
+            continue
+        queryset = relation.related_model._default_manager.none()
+        queryset._result_cache = [
+            child for child in children
+            if isinstance(child, relation.related_model) and getattr(child, relation.field.attname) == obj.pk
+        ]
+        queryset._prefetch_done = True
+        obj._prefetched_objects_cache[relation.get_cache_name()] = queryset
+
+
+def thaw(entry):
+    """
+    Put a frozen record's rows and files back and mark its entry hot again.
+    Returns {(model label, pk, field): stored name} for the restored files.
+    """
+    path = bundle_path(entry.cold_bundle)
+    restored = {}
+    with _locked(path, exclusive=False), zipfile.ZipFile(path) as bundle, transaction.atomic():
+        manifest = json.loads(bundle.read(f'{entry.cold_key}/manifest.json'))
+        if manifest['mode'] == COLD_ROWS:
+            for deserialized in serializers.deserialize('json', bundle.read(f'{entry.cold_key}/record.json')):
+                _check_references(deserialized.object)
+                deserialized.save()
+
+        for file in manifest['files']:
+            # Streamed out of the bundle; a frozen video must not be read into memory whole
+            with bundle.open(f"{entry.cold_key}/files/{file['name']}") as source:
+                # Storage picks a new name if something took the old one in the meantime
+                stored = default_storage.save(file['name'], File(source, name=file['name']))
+            if manifest['mode'] == COLD_FILES or stored != file['name']:
+                apps.get_model(file['model']).objects.filter(pk=file['pk']).update(**{file['field']: stored})
+            restored[(file['model'], file['pk'], file['field'])] = stored
+
+        ArchiveEntry.objects.filter(pk=entry.pk).update(
+            cold_bundle='', cold_key='', cold_at=None, thawed_at=timezone.now()
+        )
+    entry.cold_bundle = entry.cold_key = ''
+    return restored
+
+
+# ---- Compacting ----
+def _record_key(member):
+    """The cold_key a bundle member belongs to: '<item type>/<object id>-<suffix>'"""
+    return '/'.join(member.split('/', 2)[:2])
+
+
+def compact_bundle(name):
+    """Rewrite bundle `name` without the records thawed out of it; returns the bytes reclaimed"""
+    path = bundle_path(name)
+    with _locked(path, exclusive=True):
+        if not os.path.exists(path):
+            return 0
+        before = os.path.getsize(path)
+        live = set(ArchiveEntry.objects.filter(cold_bundle=name).values_list('cold_key', flat=True))
+        with zipfile.ZipFile(path) as bundle:
+            members = bundle.infolist()
+            if all(_record_key(member.filename) in live for member in members):
+                return 0
+            if not live:
+                os.remove(path)
+                return before
+
+            with zipfile.ZipFile(path + '.compacting', 'w', zipfile.ZIP_DEFLATED) as compacted:
+                for member in members:
+                    if _record_key(member.filename) in live:
+                        with bundle.open(member) as source, \
+                                compacted.open(member.filename, 'w', force_zip64=True) as target:
+                            shutil.copyfileobj(source, target)
+        os.replace(path + '.compacting', path)
+        return before - os.path.getsize(path)
+
+
+def compact_bundles():
+    """compact_bundle() every bundle under ARCHIVE_COLD_ROOT; returns the bytes reclaimed"""
+    reclaimed = 0
+    for directory, _, files in os.walk(settings.ARCHIVE_COLD_ROOT):
+        for file in files:
+            if file.endswith('.zip'):
+                name = os.path.relpath(os.path.join(directory, file), settings.ARCHIVE_COLD_ROOT)
+                reclaimed += compact_bundle(name.replace(os.sep, '/'))
+    return reclaimed
@@ -0,0 +1,147 @@
+"""
+Stored file metadata.
+
+When the deduplicating storage (osas/storage.py) first stores some content it
+records the blob's size, SHA-256, MIME type sniffed from the leading bytes and,
+for images, the displayed dimensions; every name sharing the content shares
+them. file_metadata() reads them for a FieldFile without touching the disk, and
+prefetch_metadata() does so for a page of rows in one query. Files stored
+before the blob store fall back to stat() and their extension until
+`dedupe_media` moves them in.
+"""
+import mimetypes
+import os
+from typing import NamedTuple, Optional
+
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image
+
+from .uploads import MAGIC_NUMBERS, SNIFF_BYTES
+
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+
+
+class FileMetadata(NamedTuple):
+    size: int
+    content_type: str
+    sha256: str = ''
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def kind(self):
+        """pdf, word, excel, powerpoint, image, video, archive or file"""
+        return file_kind(self.content_type)
+
+
+# ---- Sniffing ----
+def _guess_type(name):
+    return mimetypes.guess_type(name)[0] or DEFAULT_CONTENT_TYPE
+
+
+def sniff(path, name=''):
+    """(content_type, width, height) of the file at `path`; `name` only settles look-alike types"""
+    with open(path, 'rb') as source:
+        head = source.read(SNIFF_BYTES)
+
+    # Several types share a signature (jpg/jpeg, doc/xls/ppt, docx/xlsx/pptx/zip, mp4/mov): prefer the name's
+    candidates = [extension for extension, check in MAGIC_NUMBERS.items() if check(head)]
+    extension = os.path.splitext(name)[1].lower().lstrip('.')
+    if extension in candidates or not candidates:
+        content_type = _guess_type(name)
+    elif 'zip' in candidates:
+        content_type = 'application/zip'  # Can't tell which Office format without opening it
+    else:
+        content_type = _guess_type(f'file.{candidates[0]}')
+
+    width = height = None
+    if content_type.startswith('image/'):
+        try:
+            with Image.open(path) as image:
+                width, height = image.size
+                if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+                    width, height = height, width  # Stored sideways
+        except (OSError, ValueError, Image.DecompressionBombError):
+            pass
+    return content_type, width, height
+
+
+# ---- Lookups ----
+def lookup(names):
+    """{name: FileMetadata} for the given stored names; missing files are left out"""
+    from .models import StoredFile  # models.py uses this module
+
+    names = {name for name in names if name}
+    found = {
+        name: FileMetadata(size, content_type or _guess_type(name), sha256, width, height)
+        for name, size, content_type, sha256, width, height in StoredFile.objects.filter(name__in=names).values_list(
+            'name', 'blob__size', 'blob__content_type', 'blob__sha256', 'blob__width', 'blob__height'
+        )
+    }
+    for name in names - found.keys():
+        # A plain file from before the blob store
+        try:
+            found[name] = FileMetadata(default_storage.size(name), _guess_type(name))
+        except (OSError, ValueError):
+            pass
+    return found
+
+
+def prefetch_metadata(objects, *fields):
+    """Look up the metadata of the named file fields of all `objects` at once"""
+    files = [getattr(obj, field) for obj in objects for field in fields]
+    files = [value for value in files if value]
+    found = lookup(value.name for value in files)
+    for value in files:
+        # The FieldFile stays cached on its instance, so file_metadata() finds this
+        value._metadata = (value.name, found.get(value.name))
+
+
+def file_metadata(value):
+    """FileMetadata of a FieldFile (None when empty or missing)"""
+    if not value:
+        return None
+    name, metadata = getattr(value, '_metadata', (None, None))
+    if name != value.name:  # Not looked up yet, or a new file was saved since
+        metadata = lookup([value.name]).get(value.name)
+        value._metadata = (value.name, metadata)
+    return metadata
+
+
+def file_size(value):
+    """Size in bytes of a FieldFile from its metadata; 0 when empty or missing"""
+    metadata = file_metadata(value)
+    return metadata.size if metadata else 0
+
+
+# ---- Display ----
+FILE_KINDS = (
+    ('application/pdf', 'pdf'),
+    ('application/msword', 'word'),
+    ('application/vnd.openxmlformats-officedocument.wordprocessingml', 'word'),
+    ('application/vnd.ms-excel', 'excel'),
+    ('application/vnd.openxmlformats-officedocument.spreadsheetml', 'excel'),
+    ('application/vnd.ms-powerpoint', 'powerpoint'),
+    ('application/vnd.openxmlformats-officedocument.presentationml', 'powerpoint'),
+    ('application/zip', 'archive'),
+    ('application/x-7z-compressed', 'archive'),
+    ('application/vnd.rar', 'archive'),
+    ('image/', 'image'),
+    ('video/', 'video'),
+)
+
+
+def file_kind(content_type):
+    for prefix, kind in FILE_KINDS:
+        if content_type.startswith(prefix):
+            return kind
+    return 'file'
+
+
+def format_file_size(size):
+    if size < 1024:
+        return f"{size} bytes"
+    elif size < 1024 * 1024:
+        return f"{round(size / 1024, 1)} KB"
+    else:
+        return f"{round(size / (1024 * 1024), 1)} MB"
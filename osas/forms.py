@@ -18,6 +18,7 @@ from .models import CustomUser, Downloadable, Announcement, AnnouncementImage, A
     StudentAdmission, AdmissionPageContent, NSTPStudentInfo, NSTPFile, NSTPPageContent, \
     Course, ClinicPageContent, OJTCompany, \
     OJTPageContent, Organization, SDSPageContent, AccomplishmentRecord
+from .identity import filter_iexact
 
 
 # --------------------------------------------- Custom User & Login Form -----------------------------------------------
@@ -161,7 +162,7 @@ class CustomUserCreationForm(UserCreationForm):
 
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if email and CustomUser.objects.filter(email__iexact=email).exists():
+        if email and filter_iexact(CustomUser.objects.all(), 'email', email).exists():
             raise forms.ValidationError("This email is already in use. Please use a different email address.")
         return email
 
@@ -280,6 +281,17 @@ class CustomUserCreationForm(UserCreationForm):
         return user
 
 
+class UserImportForm(CustomUserCreationForm):
+    """CustomUserCreationForm for spreadsheet rows (osas/imports.py), which carry no photo uploads"""
+    UPLOAD_FIELDS = ('profile_picture', 'id_photo', 'cor_photo')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for field in self.UPLOAD_FIELDS:
+            self._errors.pop(field, None)
+        return cleaned_data
+
+
 class CustomUserUpdateForm(UserChangeForm):
     first_name = forms.CharField(
         validators=[RegexValidator(
@@ -348,7 +360,7 @@ class CustomUserUpdateForm(UserChangeForm):
 
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if email and CustomUser.objects.filter(email__iexact=email).exclude(id=self.instance.id).exists():
+        if email and filter_iexact(CustomUser.objects.exclude(id=self.instance.id), 'email', email).exists():
             raise forms.ValidationError("This email is already in use. Please use a different email address.")
         return email
 
@@ -2029,12 +2041,12 @@ class OrganizationCreateForm(forms.ModelForm):
             username = username.strip()
 
             # Check Organization model
-            org_query = Organization.objects.filter(username__iexact=username)
+            org_query = filter_iexact(Organization.objects.all(), 'username', username)
             if self.instance and self.instance.pk:
                 org_query = org_query.exclude(pk=self.instance.pk)
 
             # Check CustomUser model
-            user_query = CustomUser.objects.filter(username__iexact=username)
+            user_query = filter_iexact(CustomUser.objects.all(), 'username', username)
 
             if org_query.exists() or user_query.exists():
                 raise ValidationError("This username is already taken. Please choose a different one.")
@@ -2285,20 +2297,20 @@ class OrganizationCreateForm(forms.ModelForm):
         password = self.cleaned_data['password']
         organization.password = make_password(password)
 
-        # Set organization members from JSON
-        members_json = self.cleaned_data.get('organization_members_json')
-        if members_json:
-            try:
-                organization.organization_members = json.loads(members_json)
-            except json.JSONDecodeError:
-                organization.organization_members = []
-
         # Set status to pending
         organization.organization_status = 'pending'
 
         if commit:
             organization.save()
 
+            # Write organization members from JSON
+            members_json = self.cleaned_data.get('organization_members_json')
+            if members_json:
+                try:
+                    organization.set_organization_members(json.loads(members_json))
+                except json.JSONDecodeError:
+                    organization.set_organization_members([])
+
         return organization
 
 
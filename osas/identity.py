@@ -0,0 +1,150 @@
+"""
+Case-insensitive identity lookups (usernames and emails).
+
+Lookups compare LOWER(column) against the lowered value so PostgreSQL can use
+the functional Lower() indexes declared on CustomUser and Organization; a plain
+__iexact compiles to UPPER(...) and scans the table. Results are cached briefly
+and dropped whenever a user or organization is saved or deleted. The a-prefixed
+variants do the same for async views (see osas/async_views.py).
+
+Both the cache and the availability throttle only work when every worker
+process shares one cache backend; check_shared_cache() refuses to start on a
+per-process one outside DEBUG.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Error, Tags, register
+from django.db.models.functions import Lower
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CustomUser, Organization
+
+# kind -> (model, field) pairs checked for that kind of identity
+IDENTITY_SOURCES = {
+    'username': ((Organization, 'username'), (CustomUser, 'username')),
+    'email': ((CustomUser, 'email'),),
+    'organization_email': ((Organization, 'organization_email'),),
+}
+
+TAKEN_CACHE_TIMEOUT = 60
+AVAILABLE_CACHE_TIMEOUT = 15
+
+AVAILABILITY_THROTTLE_LIMIT = 60
+AVAILABILITY_THROTTLE_WINDOW = 60
+
+# Backends that keep entries inside one process
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def filter_iexact(queryset, field, value):
+    """queryset.filter(<field>__iexact=value) in a form the Lower() index can serve"""
+    alias = f'{field}_lower'
+    return queryset.alias(**{alias: Lower(field)}).filter(**{alias: value.lower()})
+
+
+def _identity_key(kind, value):
+    digest = hashlib.md5(value.lower().encode('utf-8')).hexdigest()
+    return f'osas:identity:{kind}:{digest}'
+
+
+def identity_taken(kind, value):
+    """Whether any user/organization already holds `value` for this kind (case-insensitive)"""
+    key = _identity_key(kind, value)
+    taken = cache.get(key)
+    if taken is None:
+        taken = any(
+            filter_iexact(model.objects.all(), field, value).exists()
+            for model, field in IDENTITY_SOURCES[kind]
+        )
+        cache.set(key, taken, TAKEN_CACHE_TIMEOUT if taken else AVAILABLE_CACHE_TIMEOUT)
+    return taken
+
+
+async def aidentity_taken(kind, value):
+    """identity_taken() for async views"""
+    key = _identity_key(kind, value)
+    taken = await cache.aget(key)
+    if taken is None:
+        taken = False
+        for model, field in IDENTITY_SOURCES[kind]:
+            if await filter_iexact(model.objects.all(), field, value).aexists():
+                taken = True
+                break
+        await cache.aset(key, taken, TAKEN_CACHE_TIMEOUT if taken else AVAILABLE_CACHE_TIMEOUT)
+    return taken
+
+
+def forget_identities(instance):
+    keys = []
+    for kind, sources in IDENTITY_SOURCES.items():
+        for model, field in sources:
+            value = getattr(instance, field, None) if isinstance(instance, model) else None
+            if value:
+                keys.append(_identity_key(kind, value))
+    if keys:
+        cache.delete_many(keys)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Organization)
+def invalidate_identity_cache(sender, instance, **kwargs):
+    forget_identities(instance)
+
+
+def client_ip(request):
+    """
+    The client's address. Entries of X-Forwarded-For left of the ones our own
+    proxies appended are whatever the client sent, so only the one added by the
+    outermost of TRUSTED_PROXY_COUNT proxies is believed.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies:
+        forwarded = [entry.strip() for entry in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        if len(forwarded) >= proxies and forwarded[-proxies]:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def throttled(request, scope, limit=AVAILABILITY_THROTTLE_LIMIT, window=AVAILABILITY_THROTTLE_WINDOW):
+    """Fixed-window per-client rate limit; True once the client exceeds `limit` calls in `window` seconds"""
+    key = f'osas:throttle:{scope}:{client_ip(request)}'
+    if cache.add(key, 1, window):
+        return False
+    try:
+        return cache.incr(key) > limit
+    except ValueError:  # Window expired between add() and incr()
+        cache.add(key, 1, window)
+        return False
+
+
+async def athrottled(request, scope, limit=AVAILABILITY_THROTTLE_LIMIT, window=AVAILABILITY_THROTTLE_WINDOW):
+    """throttled() for async views"""
+    key = f'osas:throttle:{scope}:{client_ip(request)}'
+    if await cache.aadd(key, 1, window):
+        return False
+    try:
+        return await cache.aincr(key) > limit
+    except ValueError:  # Window expired between aadd() and aincr()
+        await cache.aadd(key, 1, window)
+        return False
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PER_PROCESS_CACHES:
+        return []
+    return [Error(
+        f"The default cache ({backend}) is not shared between worker processes.",
+        hint="With N workers the availability throttle allows N times its limit and cache invalidations reach "
+             "one worker only; use DatabaseCache or RedisCache (see CACHES in settings).",
+        id='osas.E001',
+    )]
@@ -0,0 +1,349 @@
+"""
+Uploaded image processing: ingest normalization and responsive variants.
+
+After an uploaded image is saved, queue_images() hands it to a small worker
+pool once the transaction commits:
+
+* images in NORMALIZED_FIELDS (identity documents, announcement, complaint and
+  clinic gallery photos) are normalized in place first: EXIF orientation
+  applied, metadata stripped, downscaled to IMAGE_INGEST_MAX_DIMENSION and
+  re-encoded; the byte savings are recorded as an ImageIngest row;
+* images in IMAGE_FIELDS are rendered at each of VARIANT_WIDTHS narrower than
+  the original, as WebP and as a JPEG fallback. Variants sit next to the
+  original as `<name>.w<width>.<ext>`, so they share its media permission rule
+  (see original_name()) and its directory.
+
+The widths that exist for an image are cached, which keeps variant_url() and
+srcset() free of storage calls in list views; the `osas_images` template tags
+and serializers.ImageField build on them. Async views look the widths up with
+avariant_widths() and pass them in. Images that have no variants yet
+simply fall back to the original.
+"""
+import io
+import logging
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connection, transaction
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_save
+from PIL import ExifTags, Image, ImageOps
+
+from .file_metadata import lookup
+from .models import AnnouncementImage, ClinicPageContent, ComplaintImage, Course, CustomUser, ImageIngest, Organization
+
+logger = logging.getLogger('osas')
+
+VARIANT_WIDTHS = (320, 640, 1280)
+# (extension, Pillow format, save options)
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+VARIANT_CACHE_TIMEOUT = 60 * 60 * 24
+_VARIANT_SUFFIX = re.compile(r'\.w\d+\.(?:webp|jpg)$')
+
+# Image fields that get variants, per model
+IMAGE_FIELDS = {
+    AnnouncementImage: ('image',),
+    ComplaintImage: ('image',),
+    Course: ('logo',),
+    CustomUser: ('profile_picture',),
+    Organization: ('organization_logo', 'organization_group_picture'),
+}
+# Image fields normalized on upload, per model; ClinicPageContent.gallery_images is normalized too
+NORMALIZED_FIELDS = {
+    AnnouncementImage: ('image',),
+    ComplaintImage: ('image',),
+    CustomUser: ('id_photo', 'cor_photo'),
+}
+# Pillow format -> save options; other formats (GIF, BMP, ...) are stored as uploaded
+INGEST_FORMATS = {
+    'JPEG': {'quality': settings.IMAGE_INGEST_JPEG_QUALITY, 'optimize': True, 'progressive': True},
+    'MPO': {'quality': settings.IMAGE_INGEST_JPEG_QUALITY, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': settings.IMAGE_INGEST_JPEG_QUALITY},
+}
+
+_pool = ThreadPoolExecutor(max_workers=settings.IMAGE_INGEST_WORKERS, thread_name_prefix='osas-images')
+
+
+# ---- Names ----
+def stored_name(value):
+    """Storage name of a FieldFile, or of a media path/URL string as kept in ClinicPageContent.gallery_images"""
+    if isinstance(value, FieldFile):
+        return value.name or ''
+    value = (value or '').lstrip('/')
+    media_prefix = settings.MEDIA_URL.lstrip('/')
+    return value[len(media_prefix):] if value.startswith(media_prefix) else ''
+
+
+def variant_name(name, width, extension):
+    return f'{name}.w{width}.{extension}'
+
+
+def original_name(name):
+    """The image a variant was rendered from (or `name` itself)"""
+    return _VARIANT_SUFFIX.sub('', name)
+
+
+def _cache_key(name):
+    return f'osas:image-variants:{name}'
+
+
+def variant_widths(name):
+    """Widths rendered for the stored image `name`, smallest first"""
+    if not name:
+        return []
+    widths = cache.get(_cache_key(name))
+    if widths is None:
+        widths = [width for width in VARIANT_WIDTHS if default_storage.exists(variant_name(name, width, 'webp'))]
+        cache.set(_cache_key(name), widths, VARIANT_CACHE_TIMEOUT)
+    return widths
+
+
+async def avariant_widths(values):
+    """variant_widths() of each FieldFile or media path in `values`, for async views: one cache read, and
+    only the misses leave the event loop"""
+    names = [stored_name(value) for value in values]
+    cached = await cache.aget_many([_cache_key(name) for name in names if name])
+    widths = []
+    for name in names:
+        found = cached.get(_cache_key(name)) if name else []
+        if found is None:
+            found = await sync_to_async(variant_widths)(name)
+        widths.append(found)
+    return widths
+
+
+def variant_url(value, width, extension='webp', widths=None):
+    """URL of the smallest variant at least `width` wide, else the largest one, else the original"""
+    name = stored_name(value)
+    if not name:
+        return ''
+    if widths is None:
+        widths = variant_widths(name)
+    if not widths:
+        return default_storage.url(name)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    return default_storage.url(variant_name(name, chosen, extension))
+
+
+def srcset(value, extension='webp', widths=None):
+    name = stored_name(value)
+    if widths is None:
+        widths = variant_widths(name)
+    return ', '.join(f'{default_storage.url(variant_name(name, width, extension))} {width}w' for width in widths)
+
+
+# ---- Rendering ----
+def _flatten(image):
+    """RGB copy for JPEG; transparent areas become white"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _rendered(name, widths):
+    """Whether every variant of `name` at `widths` is stored already"""
+    return all(
+        default_storage.exists(variant_name(name, width, extension))
+        for width in widths for extension, _, _ in VARIANT_FORMATS
+    )
+
+
+def generate_variants(name, force=False):
+    """Render the missing variants of the stored image `name`; returns the widths that exist afterwards"""
+    if not force:
+        # The blob store knows the displayed width, so finished images need neither opening nor decoding
+        metadata = lookup([name]).get(name)
+        if metadata and metadata.width:
+            widths = [w for w in VARIANT_WIDTHS if w < metadata.width]
+            if _rendered(name, widths):
+                cache.set(_cache_key(name), widths, VARIANT_CACHE_TIMEOUT)
+                return widths
+
+    try:
+        with default_storage.open(name, 'rb') as source:
+            image = Image.open(source)  # Reads the header only
+            width = image.width
+            if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+                width = image.height  # Stored sideways
+            widths = [w for w in VARIANT_WIDTHS if w < width]
+            if not force and _rendered(name, widths):
+                cache.set(_cache_key(name), widths, VARIANT_CACHE_TIMEOUT)
+                return widths
+            if widths:
+                # Let the JPEG decoder downscale while reading instead of decoding full size
+                scale = widths[-1] / width
+                image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+                image = ImageOps.exif_transpose(image)
+                image.load()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning(f"Cannot render variants for {name}", exc_info=True)
+        cache.set(_cache_key(name), [], VARIANT_CACHE_TIMEOUT)
+        return []
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.mode in ('LA', 'P') else 'RGB')
+
+    # Largest first, each width resized from the previous one
+    for width in reversed(widths):
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+        for extension, image_format, options in VARIANT_FORMATS:
+            target = variant_name(name, width, extension)
+            if default_storage.exists(target):
+                if not force:
+                    continue
+                default_storage.delete(target)
+            buffer = io.BytesIO()
+            (image if image_format == 'WEBP' else _flatten(image)).save(buffer, image_format, **options)
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+
+    cache.set(_cache_key(name), widths, VARIANT_CACHE_TIMEOUT)
+    return widths
+
+
+# ---- Ingest normalization ----
+def normalize_image(name):
+    """
+    Normalize the stored image `name` in place, once; returns its ImageIngest row
+    (None when it cannot be decoded). The re-encoded file is only kept when it is
+    smaller, or when orientation, size or metadata had to change.
+    """
+    ingest = ImageIngest.objects.filter(name=name).first()
+    if ingest:
+        return ingest
+
+    path = default_storage.path(name)
+    try:
+        original_size = os.path.getsize(path)
+        with Image.open(path) as source:
+            image_format = source.format
+            original_width, original_height = source.size
+            if image_format not in INGEST_FORMATS:
+                image = None
+            else:
+                had_metadata = bool(source.getexif()) or any(
+                    key in source.info for key in ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+                )
+                # A CMYK profile no longer applies once the pixels are converted to RGB
+                icc_profile = source.info.get('icc_profile') if source.mode != 'CMYK' else None
+                limit = settings.IMAGE_INGEST_MAX_DIMENSION
+                if max(source.size) > limit:
+                    # Let the JPEG decoder downscale while reading instead of decoding full size
+                    scale = limit / max(source.size)
+                    source.draft(source.mode, (math.ceil(source.width * scale), math.ceil(source.height * scale)))
+                image = ImageOps.exif_transpose(source)
+                if max(image.size) > limit:
+                    image.thumbnail((limit, limit), Image.Resampling.LANCZOS)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning(f"Cannot normalize {name}", exc_info=True)
+        return None
+
+    stored_size = original_size
+    if image is not None:
+        options = dict(INGEST_FORMATS[image_format])
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        if image_format in ('JPEG', 'MPO'):
+            image_format = 'JPEG'
+            image = _flatten(image)
+
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+        changed = image.size != (original_width, original_height) or had_metadata
+        if changed or buffer.tell() < original_size:
+            # Same name and extension, so no model needs updating; the storage swaps the content atomically
+            default_storage.replace(name, ContentFile(buffer.getvalue()))
+            stored_size = buffer.tell()
+        width, height = image.size
+    else:
+        width, height = original_width, original_height
+
+    try:
+        ingest = ImageIngest.objects.create(
+            name=name, original_size=original_size, stored_size=stored_size,
+            original_width=original_width, original_height=original_height, width=width, height=height,
+        )
+    except IntegrityError:  # Normalized concurrently from another process
+        return ImageIngest.objects.filter(name=name).first()
+    logger.info(f"Normalized {name}: {original_size} -> {stored_size} bytes")
+    return ingest
+
+
+# ---- Worker pool ----
+def _process(name, normalize, render):
+    try:
+        if normalize:
+            normalize_image(name)
+        if render:
+            generate_variants(name)
+        else:
+            # Marks the image as handled for queue_images(); it has no variants
+            cache.set(_cache_key(name), [], VARIANT_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception(f"Failed to process uploaded image {name}")
+    finally:
+        connection.close()
+
+
+def queue_images(normalize=(), render=()):
+    """Normalize and/or render variants for the given stored names once the current transaction commits"""
+    # Images handled (or probed) recently are in the variant cache; normalized ones have an ImageIngest row for good
+    normalize = {name for name in normalize if name and cache.get(_cache_key(name)) is None}
+    normalize -= set(ImageIngest.objects.filter(name__in=normalize).values_list('name', flat=True))
+    render = {name for name in render if name and cache.get(_cache_key(name)) is None}
+    names = sorted(normalize | render)
+    if not names:
+        return
+
+    def submit():
+        for name in names:
+            _pool.submit(_process, name, name in normalize, name in render)
+
+    transaction.on_commit(submit)
+
+
+# ---- Receivers ----
+def image_names(instance, fields=None):
+    if isinstance(instance, ClinicPageContent):
+        return [stored_name(item.get('image')) for item in instance.gallery_images or []]
+    if fields is None:
+        fields = IMAGE_FIELDS.get(type(instance), ()) + NORMALIZED_FIELDS.get(type(instance), ())
+    # A field still on its default (CustomUser.profile_picture's 'default.png') shares one file across rows
+    return [
+        getattr(instance, field).name for field in fields
+        if getattr(instance, field).name != instance._meta.get_field(field).default
+    ]
+
+
+def process_uploaded_images(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if sender is ClinicPageContent:
+        if update_fields is None or 'gallery_images' in update_fields:
+            names = image_names(instance)
+            queue_images(normalize=names, render=names)
+        return
+
+    rendered = IMAGE_FIELDS.get(sender, ())
+    normalized = NORMALIZED_FIELDS.get(sender, ())
+    if update_fields is not None:
+        rendered = [field for field in rendered if field in update_fields]
+        normalized = [field for field in normalized if field in update_fields]
+    queue_images(normalize=image_names(instance, normalized), render=image_names(instance, rendered))
+
+
+for _model in {*IMAGE_FIELDS, *NORMALIZED_FIELDS, ClinicPageContent}:
+    post_save.connect(process_uploaded_images, sender=_model, dispatch_uid=f'osas.images.process.{_model.__name__}')
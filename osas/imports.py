@@ -0,0 +1,416 @@
+"""
+Spreadsheet imports for NSTP enlistments, user accounts and OJT companies.
+
+Rows are streamed from XLSX (openpyxl read-only mode) or CSV, validated one at
+a time with the same form class the single-record view uses, and written in
+batches with bulk_create. Every run is an ImportJob: small files are imported
+during the request, larger ones are left pending for the run_import_jobs
+command (scheduled from cron every minute) while the dashboard polls the job for
+progress. A job that reports no progress for IMPORT_STALE_AFTER (its process was
+killed, or nothing picks pending jobs up) is marked failed so polling stops.
+A dry run validates every row and writes nothing.
+"""
+import csv
+import io
+import logging
+import os
+import re
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.forms import ModelChoiceField
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from .forms import NSTPStudentInfoForm, OJTCompanyForm, UserImportForm
+from .models import Course, CustomUser, ImportJob, NSTPStudentInfo, OJTCompany, UserActivityLog
+
+logger = logging.getLogger('osas')
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_BYTES = 20 * 1024 * 1024
+# Uploads up to this size are imported during the request; larger ones by run_import_jobs
+IMPORT_INLINE_MAX_BYTES = 256 * 1024
+# Progress is saved every IMPORT_BATCH_SIZE rows; a job silent for longer than this is dead
+IMPORT_STALE_AFTER = timedelta(minutes=15)
+IMPORT_MAX_STORED_ERRORS = 500
+IMPORT_EXTENSIONS = ('.xlsx', '.csv')
+
+
+class ImportFileError(Exception):
+    pass
+
+
+# ---- Reading rows ----
+def normalize_header(value):
+    return re.sub(r'[^a-z0-9]+', '_', str(value or '').strip().lower()).strip('_')
+
+
+def cell_to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'on' if value else ''
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def iter_rows(fileobj, filename):
+    """Yield (row number, {column: text}) for every non-blank row after the header row"""
+    extension = os.path.splitext(filename)[1].lower()
+    workbook = None
+
+    if extension == '.csv':
+        rows = csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+    elif extension == '.xlsx':
+        try:
+            workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception:
+            raise ImportFileError('The file is not a readable .xlsx workbook')
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ImportFileError('Upload an .xlsx or .csv file')
+
+    try:
+        header = next(rows, None)
+        if not header or not any(header):
+            raise ImportFileError('The first row must contain the column names')
+        columns = [normalize_header(value) for value in header]
+
+        for number, values in enumerate(rows, start=2):
+            texts = [cell_to_text(value) for value in values]
+            if any(texts):
+                yield number, {column: text for column, text in zip(columns, texts) if column}
+    except UnicodeDecodeError:
+        raise ImportFileError('CSV files must be saved as UTF-8')
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def form_errors(form):
+    return {field: [str(error) for error in errors] for field, errors in form.errors.items()}
+
+
+# ---- Importers ----
+class Importer:
+    kind = ''
+    label = ''
+    model = None
+    form_class = None
+    columns = ()
+    # Column groups that must not repeat within one file (blank values are ignored)
+    unique_together = ()
+    # Unit user types allowed besides superusers/OSAS Staff; None means superusers only
+    user_types = None
+
+    def __init__(self, job):
+        self.job = job
+        self.choice_maps = self.build_choice_maps()
+
+    @classmethod
+    def has_permission(cls, roles):
+        if cls.user_types is None:
+            return roles.is_superuser
+        return roles.in_units(*cls.user_types)
+
+    def make_form(self, data):
+        return self.form_class(data=data)
+
+    def build_choice_maps(self):
+        """Let spreadsheets use choice labels ("1st Semester") as well as stored values ("1st")"""
+        choice_maps = {}
+        for name, field in self.make_form({}).fields.items():
+            if isinstance(field, ModelChoiceField) or not getattr(field, 'choices', None):
+                continue
+            choice_maps[name] = {
+                str(label).strip().lower(): str(value) for value, label in field.choices if value not in ('', None)
+            }
+        return choice_maps
+
+    def prepare(self, row):
+        for name, labels in self.choice_maps.items():
+            value = row.get(name)
+            if value and value.lower() in labels:
+                row[name] = labels[value.lower()]
+        return row
+
+    def build(self, form):
+        return form.save(commit=False)
+
+    def check_batch(self, batch):
+        """{row number: errors} for rows of [(row number, instance)] that clash with existing records"""
+        return {}
+
+    def after_create(self, instances):
+        pass
+
+
+class NSTPEnlistmentImporter(Importer):
+    kind = 'nstp-enlistments'
+    label = 'NSTP enlistments'
+    model = NSTPStudentInfo
+    form_class = NSTPStudentInfoForm
+    columns = tuple(
+        name for name in NSTPStudentInfoForm.base_fields if name not in ('is_archived', 'archived_at', 'archived_by')
+    )
+    unique_together = (('student_number', 'semester', 'academic_year'),)
+    user_types = (2,)
+
+    def check_batch(self, batch):
+        # Every enlistment belongs to a student account; skip ones already on file
+        numbers = {enlistment.student_number for _, enlistment in batch}
+        users = dict(
+            CustomUser.objects.filter(user_type=14, student_number__in=numbers).values_list('student_number', 'pk')
+        )
+        existing = set(
+            NSTPStudentInfo.objects.filter(student_number__in=numbers)
+            .values_list('student_number', 'semester', 'academic_year')
+        )
+
+        conflicts = {}
+        for number, enlistment in batch:
+            enlistment.user_id = users.get(enlistment.student_number)
+            if enlistment.user_id is None:
+                conflicts[number] = {'student_number': ['No student account has this student number.']}
+            elif (enlistment.student_number, enlistment.semester, enlistment.academic_year) in existing:
+                conflicts[number] = {
+                    '__all__': ['An enlistment for this student, semester and academic year already exists.']
+                }
+        return conflicts
+
+
+class UserAccountImporter(Importer):
+    kind = 'users'
+    label = 'user accounts'
+    model = CustomUser
+    form_class = UserImportForm
+    columns = (
+        'username', 'password', 'first_name', 'last_name', 'email', 'user_type', 'gender', 'birth_date',
+        'phone_number', 'address', 'student_number', 'course', 'year_level', 'section', 'department',
+        'osas_position',
+    )
+    unique_together = (('username',), ('email',), ('student_number',))
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.courses = {name.lower(): pk for pk, name in Course.objects.values_list('pk', 'name')}
+
+    def prepare(self, row):
+        row = super().prepare(row)
+        # Accounts default to students; one password column fills both confirmation fields
+        row['user_type'] = row.get('user_type') or '14'
+        row.setdefault('password1', row.get('password', ''))
+        row.setdefault('password2', row['password1'])
+
+        course = row.get('course', '')
+        if course and not course.isdigit():
+            row['course'] = self.courses.get(course.lower(), course)
+        return row
+
+    def build(self, form):
+        user = form.save(commit=False)
+        # CustomUser.save() is skipped by bulk_create
+        if user.user_type == 1:
+            user.is_superuser = True
+        return user
+
+
+class OJTCompanyImporter(Importer):
+    kind = 'ojt-companies'
+    label = 'OJT companies'
+    model = OJTCompany
+    form_class = OJTCompanyForm
+    columns = tuple(OJTCompanyForm.Meta.fields)
+    unique_together = (('name',),)
+    user_types = (13, 16)
+
+    def prepare(self, row):
+        row = super().prepare(row)
+        row['status'] = row.get('status') or OJTCompany._meta.get_field('status').default
+        return row
+
+    def build(self, form):
+        company = form.save(commit=False)
+        company.status_updated_by = self.job.created_by
+        return company
+
+    def check_batch(self, batch):
+        names = {company.name.lower() for _, company in batch}
+        existing = set(
+            OJTCompany.objects.annotate(name_lower=Lower('name')).filter(name_lower__in=names)
+            .values_list('name_lower', flat=True)
+        )
+        return {
+            number: {'name': ['A company with this name already exists.']}
+            for number, company in batch if company.name.lower() in existing
+        }
+
+
+IMPORTERS = {importer.kind: importer for importer in (NSTPEnlistmentImporter, UserAccountImporter, OJTCompanyImporter)}
+
+
+# ---- Running jobs ----
+class ImportRun:
+    def __init__(self, job):
+        self.job = job
+        self.importer = IMPORTERS[job.kind](job)
+        self.seen = {columns: set() for columns in self.importer.unique_together}
+        self.batch = []
+        self.processed_rows = 0
+        self.created_count = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, number, errors):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_STORED_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
+
+    def duplicate_errors(self, cleaned_data):
+        errors = {}
+        for columns in self.importer.unique_together:
+            key = tuple(str(cleaned_data.get(column) or '').lower() for column in columns)
+            if not all(key):
+                continue
+            if key in self.seen[columns]:
+                errors[columns[0]] = [f"Duplicate of an earlier row ({', '.join(columns)})."]
+            else:
+                self.seen[columns].add(key)
+        return errors
+
+    def add_row(self, number, row):
+        self.processed_rows += 1
+        form = self.importer.make_form(self.importer.prepare(row))
+        if not form.is_valid():
+            self.add_error(number, form_errors(form))
+            return
+
+        duplicates = self.duplicate_errors(form.cleaned_data)
+        if duplicates:
+            self.add_error(number, duplicates)
+            return
+
+        self.batch.append((number, self.importer.build(form)))
+        if len(self.batch) >= IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        batch, self.batch = self.batch, []
+        if batch:
+            conflicts = self.importer.check_batch(batch)
+            for number, errors in conflicts.items():
+                self.add_error(number, errors)
+
+            instances = [instance for number, instance in batch if number not in conflicts]
+            if instances and not self.job.dry_run:
+                with transaction.atomic():
+                    instances = self.importer.model.objects.bulk_create(instances, batch_size=IMPORT_BATCH_SIZE)
+                    self.importer.after_create(instances)
+            self.created_count += len(instances)
+
+        ImportJob.objects.filter(pk=self.job.pk).update(
+            processed_rows=self.processed_rows,
+            created_count=self.created_count,
+            error_count=self.error_count,
+            updated_at=timezone.now(),
+        )
+
+    def run(self):
+        with self.job.file.open('rb') as fileobj:
+            for number, row in iter_rows(fileobj, self.job.file.name):
+                self.add_row(number, row)
+        self.flush()
+
+
+def run_import(job):
+    job.status = 'running'
+    job.save(update_fields=['status'])
+    run = ImportRun(job)
+
+    try:
+        run.run()
+        job.status = 'done'
+        verb = 'would be imported' if job.dry_run else 'imported'
+        job.message = f"{run.created_count} {run.importer.label} {verb}, {run.error_count} row(s) with errors"
+    except ImportFileError as e:
+        job.status = 'failed'
+        job.message = str(e)
+    except Exception as e:
+        logger.exception(f"Import job {job.pk} failed")
+        job.status = 'failed'
+        job.message = f"The import stopped at row {run.processed_rows + 1}: {str(e)}"
+
+    job.processed_rows = run.processed_rows
+    job.created_count = run.created_count
+    job.error_count = run.error_count
+    job.errors = sorted(run.errors, key=lambda entry: entry['row'])
+    job.finished_at = timezone.now()
+    job.save()
+
+    if job.created_by and run.created_count and not job.dry_run:
+        UserActivityLog.objects.create(
+            user=job.created_by,
+            activity=f"{job.created_by.first_name} imported {run.created_count} {run.importer.label} "
+                     f"from {os.path.basename(job.file.name)}"
+        )
+    return job
+
+
+def start_import(job):
+    """Import small files now; larger ones stay pending for run_import_jobs"""
+    if job.file.size <= IMPORT_INLINE_MAX_BYTES:
+        return run_import(job)
+    return job
+
+
+def run_pending_imports():
+    """Run pending jobs oldest first, each claimed so that overlapping runs skip it; returns them"""
+    finished = []
+    for pk in ImportJob.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True):
+        if ImportJob.objects.filter(pk=pk, status='pending').update(status='running', updated_at=timezone.now()):
+            finished.append(run_import(ImportJob.objects.select_related('created_by').get(pk=pk)))
+    return finished
+
+
+def fail_stale_imports(jobs=None):
+    """Mark unfinished jobs that reported no progress for IMPORT_STALE_AFTER as failed; returns how many"""
+    jobs = ImportJob.objects.all() if jobs is None else jobs
+    return jobs.filter(
+        status__in=('pending', 'running'),
+        updated_at__lt=timezone.now() - IMPORT_STALE_AFTER,
+    ).update(
+        status='failed',
+        message="The import stopped before finishing. Please upload the file again.",
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def job_payload(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'dry_run': job.dry_run,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'processed_rows': job.processed_rows,
+        'created_count': job.created_count,
+        'error_count': job.error_count,
+        'errors': job.errors,
+        'message': job.message,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def template_csv(kind):
+    output = io.StringIO()
+    csv.writer(output).writerow(IMPORTERS[kind].columns)
+    return output.getvalue()
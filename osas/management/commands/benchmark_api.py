@@ -0,0 +1,124 @@
+import http.client
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# The GET endpoints osas/async_views.py serves under ASGI
+DEFAULT_PATHS = (
+    '/api/announcements/all/',
+    '/api/announcements/',
+    '/get-courses/',
+    '/analytics/recent-activities/',
+    '/analytics/activity-overview/',
+    '/analytics/activity-users/',
+)
+DEFAULT_TARGETS = ('wsgi=http://127.0.0.1:8000', 'asgi=http://127.0.0.1:8001')
+
+
+def _percentile(latencies, fraction):
+    """`fraction` percentile of sorted `latencies`"""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+class Command(BaseCommand):
+    help = ("Load the JSON endpoints of running deployments, usually the WSGI and the ASGI service (see "
+            "osas_system/asgi.py), at increasing concurrency and report throughput and latency for each.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', metavar='NAME=URL',
+                            help=f"Deployment to load; repeatable. Default: {' '.join(DEFAULT_TARGETS)}.")
+        parser.add_argument('--path', action='append',
+                            help="Endpoint to request, in turn with the others; repeatable. Default: the async ones.")
+        parser.add_argument('--concurrency', default='1,10,50,100,200',
+                            help="Comma-separated numbers of clients sending requests at once.")
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per concurrency level.")
+        parser.add_argument('--session', default='',
+                            help="Session cookie of a signed-in user; the calendar and activity log need one.")
+        parser.add_argument('--timeout', type=float, default=30, help="Seconds before a request counts as failed.")
+
+    def parse_targets(self, targets):
+        parsed = []
+        for target in targets:
+            name, separator, url = target.partition('=')
+            url = urlsplit(url)
+            if not separator or url.scheme not in ('http', 'https') or not url.hostname:
+                raise CommandError(f"--target must look like wsgi=http://127.0.0.1:8000, not {target!r}.")
+            parsed.append((name, url))
+        return parsed
+
+    def connect(self, url, timeout):
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(url.hostname, url.port, timeout=timeout)
+
+    def client(self, url, paths, headers, counter, total, timeout):
+        """Send requests over one kept-alive connection until `total` have been taken from `counter`"""
+        results = []
+        connection = None
+        for number in counter:
+            if number >= total:
+                break
+            if connection is None:
+                connection = self.connect(url, timeout)
+            started = time.perf_counter()
+            try:
+                connection.request('GET', url.path.rstrip('/') + paths[number % len(paths)], headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = 200 <= response.status < 300  # A redirect to the login page is a failure too
+                if response.will_close:
+                    connection.close()
+                    connection = None
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+                connection = None
+            results.append((time.perf_counter() - started, ok))
+        if connection is not None:
+            connection.close()
+        return results
+
+    def run_level(self, url, paths, headers, clients, total, timeout):
+        """(requests per second, sorted latencies, failures) of `total` requests from `clients` at once"""
+        counter = itertools.count()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            futures = [pool.submit(self.client, url, paths, headers, counter, total, timeout) for _ in range(clients)]
+            results = [result for future in futures for result in future.result()]
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _ in results)
+        return len(results) / elapsed, latencies, sum(1 for _, ok in results if not ok)
+
+    def handle(self, *args, **options):
+        targets = self.parse_targets(options['target'] or DEFAULT_TARGETS)
+        paths = options['path'] or DEFAULT_PATHS
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError("--concurrency must be comma-separated numbers, like 1,10,50.")
+        if min(levels) < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency and --requests must be at least 1.")
+
+        headers = {'X-Requested-With': 'XMLHttpRequest'}  # get_courses answers XHRs only
+        if options['session']:
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={options['session']}"
+        else:
+            self.stderr.write("No --session given: endpoints that need a signed-in user will count as failed.")
+
+        self.stdout.write(f"{'target':<10}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+                          f"{'failed':>8}")
+        for name, url in targets:
+            # One pass over the paths first, so caches are warm and connections to the database open
+            self.client(url, paths, headers, itertools.count(), len(paths), options['timeout'])
+            for clients in levels:
+                rate, latencies, failed = self.run_level(
+                    url, paths, headers, clients, options['requests'], options['timeout']
+                )
+                self.stdout.write(
+                    f"{name:<10}{clients:>8}{rate:>10.1f}{_percentile(latencies, 0.5) * 1000:>10.1f}"
+                    f"{_percentile(latencies, 0.95) * 1000:>10.1f}{_percentile(latencies, 0.99) * 1000:>10.1f}"
+                    f"{failed:>8}"
+                )
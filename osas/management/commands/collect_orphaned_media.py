@@ -0,0 +1,234 @@
+import hashlib
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from osas.images import original_name, stored_name
+from osas.models import StoredBlob, StoredFile
+from osas.storage import BLOB_DIRECTORY
+
+RUN_FORMAT = '%Y%m%d-%H%M%S'
+
+
+class ReferenceSet:
+    """Stored names kept as 64-bit BLAKE2 digests instead of strings; a collision can only keep a file"""
+
+    def __init__(self):
+        self.keys = set()
+
+    @staticmethod
+    def key(name):
+        return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'big')
+
+    def add(self, name):
+        self.keys.add(self.key(name))
+
+    def __contains__(self, name):
+        # Image variants live as long as their original
+        return self.key(name) in self.keys or self.key(original_name(name)) in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def json_media_names(value):
+    """Media names inside a JSON value, e.g. the 'media/...' paths in ClinicPageContent.gallery_images"""
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        for item in value:
+            yield from json_media_names(item)
+    elif isinstance(value, str):
+        name = stored_name(value)
+        if name:
+            yield name
+
+
+def scan_files(path):
+    """(entry, relative name) for every file below `path`, depth first, via os.scandir"""
+    stack = ['']
+    while stack:
+        relative = stack.pop()
+        with os.scandir(os.path.join(path, relative)) as entries:
+            for entry in entries:
+                name = f'{relative}/{entry.name}' if relative else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry, name
+
+
+class Command(BaseCommand):
+    help = ("Mark every media name referenced by a FileField or a JSON field, then quarantine unreferenced "
+            "media files older than the grace period and delete quarantined runs past their retention.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be quarantined.")
+        parser.add_argument('--grace-hours', type=int, default=settings.MEDIA_GC_GRACE_HOURS,
+                            help=f"Keep files younger than this (default: {settings.MEDIA_GC_GRACE_HOURS}).")
+        parser.add_argument('--quarantine-days', type=int, default=settings.MEDIA_GC_QUARANTINE_DAYS,
+                            help=f"Delete quarantined files after this (default: {settings.MEDIA_GC_QUARANTINE_DAYS}).")
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        self.run_root = os.path.join(settings.MEDIA_GC_QUARANTINE_ROOT, timezone.localtime().strftime(RUN_FORMAT))
+        self.orphans = self.orphan_bytes = self.recent = 0
+
+        started = time.monotonic()
+        references, rows = self.mark()
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Marked {len(references)} referenced name(s) from {rows} row(s) in {elapsed:.1f}s "
+                          f"({rows / max(elapsed, 1e-6):.0f} rows/s).")
+
+        started = time.monotonic()
+        scanned, scanned_bytes = self.sweep_plain(references)
+        stored, stored_bytes = self.sweep_stored(references)
+        blobs, blob_bytes = self.sweep_blobs()
+        scanned, scanned_bytes = scanned + stored + blobs, scanned_bytes + stored_bytes + blob_bytes
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Swept {scanned} file(s), {scanned_bytes / 1024 / 1024:.1f} MB in {elapsed:.1f}s "
+                          f"({scanned / max(elapsed, 1e-6):.0f} files/s); {self.recent} within the grace period.")
+
+        purged = 0 if self.dry_run else self.purge_quarantine(options['quarantine_days'])
+        verb = "would be quarantined" if self.dry_run else f"quarantined in {self.run_root}"
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.orphans} orphaned file(s), {self.orphan_bytes / 1024 / 1024:.1f} MB {verb}; "
+            f"{purged} expired quarantine run(s) deleted."
+        ))
+
+    # ---- Mark ----
+    def mark(self):
+        references = ReferenceSet()
+        rows = 0
+        for model in apps.get_models():
+            fields = [
+                field for field in model._meta.concrete_fields
+                if isinstance(field, (models.FileField, models.JSONField))
+            ]
+            if not fields:
+                continue
+            for field in fields:
+                if isinstance(field, models.FileField) and isinstance(field.default, str):
+                    references.add(field.default)  # Placeholder files rows start out with
+
+            values = model._base_manager.values_list(*(field.attname for field in fields))
+            for row in values.iterator(chunk_size=2000):
+                rows += 1
+                for field, value in zip(fields, row):
+                    if not value:
+                        continue
+                    if isinstance(field, models.FileField):
+                        references.add(value)
+                    else:
+                        for name in json_media_names(value):
+                            references.add(name)
+        return references, rows
+
+    # ---- Sweep ----
+    def quarantine(self, name, size, source=None):
+        """Move the plain file `name` (or copy `source`, a blob) into this run's quarantine directory"""
+        self.orphans += 1
+        self.orphan_bytes += size
+        if self.dry_run:
+            return False
+        target = os.path.join(self.run_root, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if source is None:
+            shutil.move(default_storage.plain_path(name), target)
+        else:
+            try:
+                os.link(source, target)  # Blobs stay shared until the last name goes
+            except OSError:
+                shutil.copy2(source, target)
+        return True
+
+    def sweep_plain(self, references):
+        scanned = scanned_bytes = 0
+        root = default_storage.location
+        if not os.path.isdir(root):
+            return scanned, scanned_bytes
+        for entry, name in scan_files(root):
+            if name.startswith(BLOB_DIRECTORY + '/'):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            scanned += 1
+            scanned_bytes += stat.st_size
+            if name in references:
+                continue
+            if stat.st_mtime > self.cutoff:
+                self.recent += 1
+                continue
+            self.quarantine(name, stat.st_size)
+        return scanned, scanned_bytes
+
+    def sweep_stored(self, references):
+        """Names in the deduplicating storage; dropping one releases its blob reference"""
+        scanned = scanned_bytes = 0
+        cutoff = datetime.fromtimestamp(self.cutoff, tz=timezone.utc)
+        stored = StoredFile.objects.values_list('name', 'created_at', 'blob_id', 'blob__size')
+        orphaned = []
+        for name, created_at, digest, size in stored.iterator(chunk_size=2000):
+            scanned += 1
+            scanned_bytes += size
+            if name in references:
+                continue
+            if created_at > cutoff:
+                self.recent += 1
+                continue
+            orphaned.append((name, digest, size))
+
+        # Deleted after the scan; the server-side cursor must not see rows vanish
+        for name, digest, size in orphaned:
+            if self.quarantine(name, size, source=default_storage.blob_path(digest)):
+                default_storage.delete(name)
+        return scanned, scanned_bytes
+
+    def sweep_blobs(self):
+        """Blob files without a StoredBlob row (left by rolled back saves) and stale spool files"""
+        scanned = scanned_bytes = 0
+        root = os.path.join(default_storage.location, BLOB_DIRECTORY)
+        if not os.path.isdir(root):
+            return scanned, scanned_bytes
+        known = {int(digest[:16], 16) for digest in StoredBlob.objects.values_list('sha256', flat=True).iterator()}
+        for entry, name in scan_files(root):
+            stat = entry.stat(follow_symlinks=False)
+            scanned += 1
+            scanned_bytes += stat.st_size
+            digest = entry.name
+            if not name.startswith('tmp/') and len(digest) == 64 and int(digest[:16], 16) in known:
+                continue
+            if stat.st_mtime > self.cutoff:
+                self.recent += 1
+                continue
+            if len(digest) == 64 and StoredBlob.objects.filter(pk=digest).exists():
+                continue  # Stored since the blob list was read
+            self.orphans += 1
+            self.orphan_bytes += stat.st_size
+            if not self.dry_run:
+                os.remove(entry.path)  # Content no name refers to; nothing to restore it as
+        return scanned, scanned_bytes
+
+    def purge_quarantine(self, days):
+        root = settings.MEDIA_GC_QUARANTINE_ROOT
+        if not os.path.isdir(root):
+            return 0
+        expiry = timezone.localtime().replace(tzinfo=None) - timedelta(days=days)
+        purged = 0
+        for entry in os.scandir(root):
+            try:
+                run = datetime.strptime(entry.name, RUN_FORMAT)
+            except ValueError:
+                continue  # Not ours
+            if entry.is_dir() and run < expiry:
+                shutil.rmtree(entry.path)
+                purged += 1
+        return purged
@@ -0,0 +1,78 @@
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from osas.file_metadata import sniff
+from osas.models import StoredBlob, StoredFile
+from osas.storage import BLOB_DIRECTORY, HASH_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = ("Move media files saved before deduplicating storage into the blob store, keeping one copy of "
+            "each distinct content, fill in missing blob metadata and report the space used.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only hash the files and report the savings.")
+
+    def plain_names(self):
+        root = default_storage.location
+        for directory, subdirectories, files in os.walk(root):
+            if directory == root and BLOB_DIRECTORY in subdirectories:
+                subdirectories.remove(BLOB_DIRECTORY)
+            for file_name in files:
+                yield os.path.relpath(os.path.join(directory, file_name), root).replace(os.sep, '/')
+
+    def handle(self, *args, **options):
+        names = sorted(self.plain_names())
+
+        if options['dry_run']:
+            seen = set(StoredBlob.objects.values_list('sha256', flat=True))
+            total = duplicate = 0
+            for name in names:
+                digest = hashlib.sha256()
+                with open(os.path.join(default_storage.location, name), 'rb') as source:
+                    for data in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+                        digest.update(data)
+                size = os.path.getsize(os.path.join(default_storage.location, name))
+                total += size
+                if digest.hexdigest() in seen:
+                    duplicate += size
+                seen.add(digest.hexdigest())
+            self.stdout.write(
+                f"{len(names)} plain file(s), {total / 1024 / 1024:.1f} MB; "
+                f"{duplicate / 1024 / 1024:.1f} MB would be saved."
+            )
+            return
+
+        adopted = 0
+        for name in names:
+            try:
+                if default_storage.adopt(name):
+                    adopted += 1
+            except OSError as error:
+                self.stderr.write(f"{name}: {error}")
+
+        described = 0
+        for blob in StoredBlob.objects.filter(content_type='').iterator():
+            # Blobs stored before metadata was recorded
+            name = blob.files.values_list('name', flat=True).first() or ''
+            try:
+                blob.content_type, blob.width, blob.height = sniff(default_storage.blob_path(blob.pk), name)
+            except OSError as error:
+                self.stderr.write(f"{blob.pk}: {error}")
+                continue
+            blob.save(update_fields=['content_type', 'width', 'height'])
+            described += 1
+        if described:
+            self.stdout.write(f"Metadata filled in for {described} blob(s).")
+
+        referenced = StoredFile.objects.aggregate(total=Sum('blob__size'))['total'] or 0
+        stored = StoredBlob.objects.aggregate(total=Sum('size'))['total'] or 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{adopted} file(s) moved into the blob store. {StoredFile.objects.count()} name(s) share "
+            f"{StoredBlob.objects.count()} blob(s): {referenced / 1024 / 1024:.1f} MB referenced, "
+            f"{stored / 1024 / 1024:.1f} MB on disk ({(referenced - stored) / 1024 / 1024:.1f} MB saved)."
+        ))
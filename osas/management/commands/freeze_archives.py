@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from osas.archive import ARCHIVE_TYPES
+from osas.coldstorage import compact_bundles, freeze, freeze_candidates
+from osas.file_metadata import format_file_size
+
+
+class Command(BaseCommand):
+    help = ("Move records archived longer than ARCHIVE_COLD_AFTER_DAYS (and their files) "
+            "into the per-year cold-storage bundles, then drop retrieved records from the bundles.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('types', nargs='*', help="Archive types to freeze (default: every type with cold storage).")
+        parser.add_argument('--days', type=int, help=f"Minimum archive age in days "
+                                                     f"(default: {settings.ARCHIVE_COLD_AFTER_DAYS}).")
+        parser.add_argument('--limit', type=int, help="Freeze at most this many records.")
+        parser.add_argument('--dry-run', action='store_true', help="List the records that would be frozen.")
+        parser.add_argument('--no-compact', action='store_true',
+                            help="Leave retrieved records in the bundles instead of rewriting them.")
+
+    def handle(self, *args, **options):
+        cold_types = {key: archive_type for key, archive_type in ARCHIVE_TYPES.items() if archive_type.cold_storage}
+        unknown = set(options['types']) - set(cold_types)
+        if unknown:
+            raise CommandError(f"No cold storage for: {', '.join(sorted(unknown))}")
+
+        archive_types = [cold_types[key] for key in options['types']] or list(cold_types.values())
+        entries = freeze_candidates(archive_types, options['days'])
+        if options['limit']:
+            entries = entries[:options['limit']]
+
+        frozen = failed = 0
+        for entry in entries.iterator():
+            if options['dry_run']:
+                self.stdout.write(f"{entry.item_type} #{entry.object_id}: {entry.title}")
+                continue
+            try:
+                files = freeze(ARCHIVE_TYPES[entry.item_type], entry)
+            except ARCHIVE_TYPES[entry.item_type].model.DoesNotExist:
+                # Index entry without an archived row behind it
+                entry.delete()
+                continue
+            except OSError as e:
+                failed += 1
+                self.stderr.write(f"{entry.item_type} #{entry.object_id}: {e}")
+                continue
+            frozen += 1
+            self.stdout.write(f"{entry.item_type} #{entry.object_id}: frozen with {files} file(s)")
+
+        if not options['dry_run']:
+            style = self.style.ERROR if failed else self.style.SUCCESS
+            self.stdout.write(style(f"{frozen} record(s) moved to cold storage, {failed} failed."))
+            if not options['no_compact']:
+                self.stdout.write(f"{format_file_size(compact_bundles())} of retrieved records removed from bundles.")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from osas.images import IMAGE_FIELDS, generate_variants, image_names
+from osas.models import ClinicPageContent
+
+
+class Command(BaseCommand):
+    help = "Render the responsive WebP/JPEG variants of every uploaded image that does not have them yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Re-render variants that already exist.")
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, fields in IMAGE_FIELDS.items():
+            has_image = Q()
+            for field in fields:
+                has_image |= Q(**{f'{field}__gt': ''})
+            for row in model.objects.filter(has_image).only(*fields).iterator():
+                names.update(image_names(row, fields))
+        for page in ClinicPageContent.objects.all():
+            names.update(image_names(page))
+        names.discard('')
+
+        rendered = 0
+        for name in sorted(names):
+            widths = generate_variants(name, force=options['force'])
+            if widths:
+                rendered += 1
+                self.stdout.write(f"{name}: {', '.join(map(str, widths))}")
+        self.stdout.write(self.style.SUCCESS(f"{rendered} of {len(names)} image(s) have variants."))
@@ -0,0 +1,45 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from osas.imports import IMPORT_EXTENSIONS, IMPORTERS, run_import
+from osas.models import CustomUser, ImportJob
+
+
+class Command(BaseCommand):
+    help = "Import NSTP enlistments, user accounts or OJT companies from an .xlsx or .csv file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument('--dry-run', action='store_true', help="Validate every row without saving anything.")
+        parser.add_argument('--user', help="Username recorded as the importer in the activity log.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f"No such file: {path}")
+        if not path.lower().endswith(IMPORT_EXTENSIONS):
+            raise CommandError("Only .xlsx and .csv files can be imported")
+
+        created_by = None
+        if options['user']:
+            created_by = CustomUser.objects.filter(username=options['user']).first()
+            if created_by is None:
+                raise CommandError(f"No such user: {options['user']}")
+
+        job = ImportJob(kind=options['kind'], dry_run=options['dry_run'], created_by=created_by)
+        with open(path, 'rb') as fileobj:
+            job.file.save(os.path.basename(path), File(fileobj), save=True)
+
+        run_import(job)
+
+        for entry in job.errors:
+            for field, messages in entry['errors'].items():
+                self.stdout.write(f"Row {entry['row']} {field}: {' '.join(messages)}")
+        if job.error_count > len(job.errors):
+            self.stdout.write(f"... {job.error_count - len(job.errors)} more row(s) with errors")
+
+        style = self.style.SUCCESS if job.status == 'done' else self.style.ERROR
+        self.stdout.write(style(job.message))
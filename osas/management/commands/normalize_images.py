@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q, Sum
+
+from osas.images import NORMALIZED_FIELDS, image_names, normalize_image
+from osas.models import ClinicPageContent, ImageIngest
+
+
+class Command(BaseCommand):
+    help = ("Normalize uploaded photos that predate ingest normalization (orientation, metadata, "
+            "IMAGE_INGEST_MAX_DIMENSION) and report the space saved.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help="Normalize at most this many images.")
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, fields in NORMALIZED_FIELDS.items():
+            has_image = Q()
+            for field in fields:
+                has_image |= Q(**{f'{field}__gt': ''})
+            for row in model.objects.filter(has_image).only(*fields).iterator():
+                names.update(image_names(row, fields))
+        for page in ClinicPageContent.objects.all():
+            names.update(image_names(page))
+        names.discard('')
+
+        pending = sorted(names - set(ImageIngest.objects.filter(name__in=names).values_list('name', flat=True)))
+        if options['limit']:
+            pending = pending[:options['limit']]
+
+        failed = 0
+        for name in pending:
+            ingest = normalize_image(name)
+            if ingest is None:
+                failed += 1
+                self.stderr.write(f"{name}: not a readable image")
+                continue
+            self.stdout.write(f"{name}: {ingest.original_size} -> {ingest.stored_size} bytes")
+
+        totals = ImageIngest.objects.aggregate(original=Sum('original_size'), stored=Sum('stored_size'))
+        saved = (totals['original'] or 0) - (totals['stored'] or 0)
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{len(pending) - failed} image(s) normalized, {failed} failed; "
+            f"{saved / (1024 * 1024):.1f} MB saved across all ingested images."
+        ))
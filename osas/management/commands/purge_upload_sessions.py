@@ -0,0 +1,35 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from osas.models import UploadSession
+from osas.resumable import discard_session
+
+
+class Command(BaseCommand):
+    help = ("Delete chunked upload sessions idle for longer than UPLOAD_SESSION_EXPIRY_HOURS, "
+            "and completed ones whose file has already been attached to a record.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, help=f"Idle time before a session expires "
+                                                      f"(default: {settings.UPLOAD_SESSION_EXPIRY_HOURS}).")
+
+    def handle(self, *args, **options):
+        hours = settings.UPLOAD_SESSION_EXPIRY_HOURS if options['hours'] is None else options['hours']
+        cutoff = timezone.now() - timedelta(hours=hours)
+
+        expired = consumed = 0
+        for session in UploadSession.objects.iterator():
+            if session.updated_at < cutoff:
+                discard_session(session)
+                expired += 1
+            elif session.status == 'complete' and not os.path.exists(session.path):
+                session.delete()
+                consumed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{expired} expired and {consumed} consumed upload session(s) removed."
+        ))
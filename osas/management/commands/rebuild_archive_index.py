@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from osas.archive import ARCHIVE_TYPES, reindex_archive
+
+
+class Command(BaseCommand):
+    help = "Rebuild the archive index from the is_archived flags of every archivable model."
+
+    def add_arguments(self, parser):
+        parser.add_argument('types', nargs='*', help="Archive types to rebuild (default: all).")
+
+    def handle(self, *args, **options):
+        unknown = set(options['types']) - set(ARCHIVE_TYPES)
+        if unknown:
+            raise CommandError(f"Unknown archive type(s): {', '.join(sorted(unknown))}")
+
+        for key in options['types'] or ARCHIVE_TYPES:
+            count = reindex_archive(ARCHIVE_TYPES[key].model)
+            self.stdout.write(f"{key}: {count} archived record(s) indexed")
+        self.stdout.write(self.style.SUCCESS("Archive index rebuilt."))
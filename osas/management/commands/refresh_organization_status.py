@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from osas.models import Organization
+
+
+class Command(BaseCommand):
+    help = (
+        "Materialize date-driven organization status transitions (active/pending -> expired, "
+        "expired -> pending for future periods). Schedule daily, e.g. from cron: "
+        "5 0 * * * python manage.py refresh_organization_status"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help="Evaluate transitions as of this date (YYYY-MM-DD). Defaults to today."
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format")
+
+        result = Organization.refresh_organization_statuses(today=today)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Organization statuses refreshed: {result['expired']} expired, "
+            f"{result['pending']} moved to pending"
+        ))
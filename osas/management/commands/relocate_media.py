@@ -0,0 +1,98 @@
+import posixpath
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from osas.images import VARIANT_FORMATS, VARIANT_WIDTHS, variant_name
+from osas.models import ImageIngest
+from osas.upload_paths import UploadTo, upload_layout
+
+
+def upload_fields():
+    for model in apps.get_app_config('osas').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and isinstance(field.upload_to, UploadTo):
+                yield model, field
+
+
+class Command(BaseCommand):
+    help = ("Move uploaded files that are not in the UPLOAD_PATH_LAYOUT directory layout into it and update "
+            "the rows that reference them. Files are relocated one by one, so an interrupted run can simply be "
+            "started again; files already in place are skipped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Names read per query (default: 500).")
+        parser.add_argument('--limit', type=int, help="Relocate at most this many files.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the files that would move.")
+
+    def handle(self, *args, **options):
+        self.layout = upload_layout()
+        self.fields = list(upload_fields())
+        relocated = 0
+        limit = options['limit']
+
+        for model, field in self.fields:
+            prefix = field.upload_to.prefix
+            names = model.objects.filter(**{f'{field.name}__startswith': prefix.split('%')[0]})
+            if isinstance(field.default, str):
+                names = names.exclude(**{field.name: field.default})  # Shared placeholder file
+            names = names.order_by(field.name).values_list(field.name, flat=True).distinct()
+
+            moved = missing = 0
+            last = ''
+            while limit is None or relocated < limit:
+                batch = list(names.filter(**{f'{field.name}__gt': last})[:options['batch_size']])
+                if not batch:
+                    break
+                last = batch[-1]
+                for name in batch:
+                    if limit is not None and relocated >= limit:
+                        break
+                    if self.layout.matches(prefix, name):
+                        continue
+                    if not default_storage.exists(name):
+                        missing += 1
+                        continue
+                    if not options['dry_run']:
+                        self.relocate(model, field, name)
+                    moved += 1
+                    relocated += 1
+
+            if moved or missing:
+                self.stdout.write(f"{model.__name__}.{field.name}: {moved} relocated, {missing} missing")
+
+        verb = "would be relocated" if options['dry_run'] else "relocated"
+        self.stdout.write(self.style.SUCCESS(f"{relocated} file(s) {verb}."))
+
+    def relocate(self, model, field, name):
+        """Alias the file (and its image variants) under the new name, repoint the rows, then drop the old name"""
+        prefix = field.upload_to.prefix
+        new_name = default_storage.alias(
+            name, self.layout.generate(prefix, posixpath.basename(name)), max_length=field.max_length
+        )
+        variants = [
+            (variant_name(name, width, extension), variant_name(new_name, width, extension))
+            for width in VARIANT_WIDTHS for extension, _, _ in VARIANT_FORMATS
+            if default_storage.exists(variant_name(name, width, extension))
+        ]
+        for old_variant, new_variant in variants:
+            default_storage.alias(old_variant, new_variant)
+
+        with transaction.atomic():
+            model.objects.filter(**{field.name: name}).update(**{field.name: new_name})
+            ImageIngest.objects.filter(name=name).update(name=new_name)
+
+        if not self.still_referenced(name):
+            default_storage.delete(name)
+            for old_variant, _ in variants:
+                default_storage.delete(old_variant)
+
+    def still_referenced(self, name):
+        # Only fields under the same top-level directory can hold the name
+        top = name.split('/')[0] + '/'
+        return any(
+            model.objects.filter(**{field.name: name}).exists()
+            for model, field in self.fields if field.upload_to.prefix.startswith(top)
+        )
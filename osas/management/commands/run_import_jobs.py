@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from osas.imports import fail_stale_imports, run_pending_imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the spreadsheet imports uploaded through the dashboard that were too large to import during the "
+        "request, and fail the ones that stopped reporting progress. Schedule every minute, e.g. from cron: "
+        "* * * * * python manage.py run_import_jobs"
+    )
+
+    def handle(self, *args, **options):
+        stale = fail_stale_imports()
+        if stale:
+            self.stdout.write(self.style.WARNING(f"{stale} stalled import job(s) marked failed."))
+
+        for job in run_pending_imports():
+            style = self.style.SUCCESS if job.status == 'done' else self.style.ERROR
+            self.stdout.write(style(f"Import job {job.pk}: {job.message}"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from osas.roles import backfill_role_groups, sync_role_groups
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update the auth groups that hold each role's permissions. "
+        "Runs automatically after migrate; run it by hand after changing the role rules in osas/roles.py."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--assign-users',
+            action='store_true',
+            help="Also add verified users and approved organizations to their role groups "
+                 "(one-off backfill for accounts approved before role groups existed)."
+        )
+
+    def handle(self, *args, **options):
+        summary = sync_role_groups()
+
+        for name, count in summary.items():
+            self.stdout.write(f"{name}: {count} permissions")
+
+        self.stdout.write(self.style.SUCCESS(f"Synchronized {len(summary)} role groups"))
+
+        if options['assign_users']:
+            assigned = backfill_role_groups()
+            self.stdout.write(self.style.SUCCESS(f"Checked {assigned} role group memberships"))
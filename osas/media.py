@@ -0,0 +1,231 @@
+"""
+Protected media.
+
+Every /media/ request goes through protected_media(): files under a prefix in
+MEDIA_RULES are only handed out after the rule's permission check, the rest are
+public. send_file() then answers conditional requests itself (ETag and
+Last-Modified, 304) and leaves the transfer to the front proxy when one is
+configured:
+
+* PROTECTED_MEDIA_SERVER = 'nginx': X-Accel-Redirect to PROTECTED_MEDIA_INTERNAL_URL,
+  which must be an `internal` location aliased to MEDIA_ROOT;
+* PROTECTED_MEDIA_SERVER = 'apache': X-Sendfile with the absolute path (mod_xsendfile);
+* otherwise Django streams the file, honouring single-range Range requests.
+
+The proxy must not serve MEDIA_ROOT at /media/ directly any more, or the rules
+are bypassed.
+"""
+import mimetypes
+import os
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .images import original_name
+from .models import AccomplishmentRecord, Complaint, CustomUser, ImportJob, Organization, ScholarshipApplication, \
+    StudentAdmission
+from .storage import BLOB_DIRECTORY
+
+STREAM_CHUNK_SIZE = 64 * 1024
+PUBLIC_MEDIA_MAX_AGE = 60 * 60
+
+
+# ---- Permission rules ----
+def _file_filter(model, name):
+    """Q matching rows of `model` that reference the stored file `name` in any file field"""
+    condition = Q(pk__in=[])
+    for field in model._meta.concrete_fields:
+        if field.get_internal_type() in ('FileField', 'ImageField'):
+            condition |= Q(**{field.name: name})
+    return condition
+
+
+def can_read_complaint_file(roles, name):
+    complaints = Complaint.objects.filter(Q(documents__file=name) | Q(images__image=name))
+    if roles.in_units(11):
+        return complaints.exists()
+    return complaints.filter(created_by=roles.user).exists()
+
+
+def can_read_scholarship_file(roles, name):
+    applications = ScholarshipApplication.objects.filter(_file_filter(ScholarshipApplication, name))
+    if roles.in_units(5):
+        return applications.exists()
+    return applications.filter(Q(student=roles.user) | Q(scholarship__created_by=roles.user)).exists()
+
+
+def can_read_admission_file(roles, name):
+    admissions = StudentAdmission.objects.filter(_file_filter(StudentAdmission, name))
+    if roles.in_units(12):
+        return admissions.exists()
+    return admissions.filter(user=roles.user).exists()
+
+
+def can_read_verification_file(roles, name):
+    if roles.is_admin:
+        return True
+    return CustomUser.objects.filter(_file_filter(CustomUser, name), pk=roles.user.pk).exists()
+
+
+def can_read_import_file(roles, name):
+    return roles.is_superuser or ImportJob.objects.filter(file=name, created_by=roles.user).exists()
+
+
+def can_read_accomplishment_file(roles, name):
+    records = AccomplishmentRecord.objects.filter(Q(main_report=name) | Q(supporting_files__file=name))
+    if roles.in_units(10):
+        return records.exists()
+    return bool(roles.organization) and records.filter(organization=roles.organization).exists()
+
+
+def can_read_organization_file(roles, name):
+    if '/logos/' in name:
+        return True  # Shown on the public organization pages
+    if roles.in_units(10):
+        return True
+    return bool(roles.organization) and Organization.objects.filter(
+        _file_filter(Organization, name), pk=roles.organization.pk
+    ).exists()
+
+
+# Upload prefix -> check(roles, name); files under any other prefix are public
+MEDIA_RULES = (
+    ('complaints/', can_read_complaint_file),
+    ('scholarships/applications/', can_read_scholarship_file),
+    ('admission_docs/', can_read_admission_file),
+    ('verification_ids/', can_read_verification_file),
+    ('verification_cor/', can_read_verification_file),
+    ('imports/', can_read_import_file),
+    ('accomplishment_records/', can_read_accomplishment_file),
+    ('organizations/', can_read_organization_file),
+)
+
+
+def media_rule(name):
+    for prefix, check in MEDIA_RULES:
+        if name.startswith(prefix):
+            return check
+    return None
+
+
+# ---- Sending ----
+def _parse_range(header, size):
+    """(start, end) for a single satisfiable byte range, None to send everything, False if unsatisfiable"""
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[6:].strip().partition('-')
+    try:
+        if not start:
+            length = int(end)
+            if length <= 0:
+                return False
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _range_applies(request, etag, mtime):
+    """If-Range: only serve a partial response for the representation the client already has"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+def _stream(path, start, length):
+    with open(path, 'rb') as fileobj:
+        fileobj.seek(start)
+        while length > 0:
+            chunk = fileobj.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def send_file(request, name, filename=None, as_attachment=False, public=False):
+    """Response for the stored media file `name`, offloaded to the front proxy when configured"""
+    try:
+        path = default_storage.path(name)
+        stat = os.stat(path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404("File not found")
+
+    size, mtime = stat.st_size, stat.st_mtime
+    # Same format nginx uses, so the validator survives switching PROTECTED_MEDIA_SERVER
+    etag = f'"{int(mtime):x}-{size:x}"'
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if response is None:
+        server = settings.PROTECTED_MEDIA_SERVER
+        if server == 'nginx':
+            response = HttpResponse(content_type=content_type)
+            # The file's place on disk: deduplicated content lives in the blob store, not under `name`
+            location = os.path.relpath(path, default_storage.location).replace(os.sep, '/')
+            response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_INTERNAL_URL + quote(location)
+        elif server == 'apache':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = path
+        else:
+            byte_range = _parse_range(request.headers.get('Range'), size)
+            if byte_range is not None and not _range_applies(request, etag, mtime):
+                byte_range = None
+
+            if byte_range is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+            elif byte_range:
+                start, end = byte_range
+                response = StreamingHttpResponse(_stream(path, start, end - start + 1), status=206,
+                                                 content_type=content_type)
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+                response['Content-Length'] = str(end - start + 1)
+            else:
+                response = FileResponse(open(path, 'rb'), content_type=content_type)
+            response['Accept-Ranges'] = 'bytes'
+
+        if filename or as_attachment:
+            response['Content-Disposition'] = content_disposition_header(
+                as_attachment, filename or os.path.basename(name)
+            )
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    if public:
+        patch_cache_control(response, public=True, max_age=PUBLIC_MEDIA_MAX_AGE)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def protected_media(request, path):
+    """Serves MEDIA_URL; files under a MEDIA_RULES prefix need a signed-in user that passes the rule"""
+    # Rules match by prefix, so only a path already in canonical form may be checked: storage would
+    # resolve public/../complaints/... or ./complaints/... to a protected file
+    if posixpath.normpath(path) != path or path.startswith('/') or '..' in path.split('/'):
+        raise Http404("File not found")
+    if path.startswith(BLOB_DIRECTORY + '/'):
+        raise Http404("File not found")  # Blobs are only reachable through the names that reference them
+    check = media_rule(path)
+    if check is not None:
+        if not request.user.is_authenticated:
+            return HttpResponseForbidden("Permission denied")
+        # Image variants are readable by whoever may read the original
+        if not (request.user.is_superuser or check(request.user_roles, original_name(path))):
+            return HttpResponseForbidden("Permission denied")
+    return send_file(request, path, public=check is None)
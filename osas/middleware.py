@@ -0,0 +1,76 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .roles import UserRoles
+from .uploads import upload_rules
+
+
+# Every middleware here works both ways, so under ASGI a request reaches the async views in
+# osas/async_views.py without being handed to a thread in between (see osas_system/asgi.py).
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that also runs async. Static files are still served
+    from a thread; everything else is passed straight on to the async handler.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class UserRolesMiddleware(MiddlewareMixin):
+    """
+    Attach request.user_roles: the user's role flags and organization, resolved on
+    first use and shared by every view helper and template in the request.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.user_roles = SimpleLazyObject(lambda: UserRoles(request.user))
+
+
+class UploadLimitMiddleware(MiddlewareMixin):
+    """
+    Reject POSTs whose files broke an UPLOAD_RULES limit (see osas/uploads.py)
+    before the view, or the CSRF check, sees the truncated request.
+    Must come before CsrfViewMiddleware.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST' or not upload_rules(request):
+            return None
+
+        request.FILES  # Parse the body through UploadLimitHandler now
+        rejections = getattr(request, 'upload_rejections', None)
+        if not rejections:
+            return None
+
+        message = next(iter(rejections.values()))
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            errors = {field: [error] for field, error in rejections.items()}
+            return JsonResponse({'success': False, 'error': message, 'errors': errors}, status=413)
+        messages.error(request, message)
+        return redirect(request.META.get('HTTP_REFERER') or request.path)
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:04
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def materialize_organization_status(apps, schema_editor):
+    Organization = apps.get_model('osas', 'Organization')
+    today = timezone.now().date()
+    Organization.objects.filter(
+        _organization_status__in=['active', 'pending'],
+        organization_valid_until__lt=today
+    ).update(_organization_status='expired')
+    Organization.objects.filter(
+        _organization_status='expired',
+        organization_valid_from__gt=today
+    ).update(_organization_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0010_ojtcompany_status_ojtcompany_status_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='ojtcompany',
+            options={'ordering': ['-created_at'], 'verbose_name_plural': 'OJT Companies'},
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='user_type',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'OSAS Staff'), (2, 'NSTP'), (3, 'Clinic'), (4, 'Alumni'), (5, 'Scholarship'), (6, 'Culture and Arts'), (7, 'Sports Development'), (8, 'Guidance Counseling'), (9, 'Student Welfare Services'), (10, 'Student Development Services'), (11, 'Misdeamenor'), (12, 'Admission'), (13, 'Job Placement'), (14, 'Student'), (15, 'Organization'), (16, 'OJT Adviser')], null=True),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['is_archived', '_organization_status'], name='osas_organi_is_arch_d8bc5a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['_organization_status', 'organization_valid_until'], name='osas_organi_organiz_69345d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['organization_valid_from'], name='osas_organi_organiz_e5d5be_idx'),
+        ),
+        migrations.RunPython(materialize_organization_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+MEMBER_FIELDS = {'first_name': 100, 'last_name': 100, 'position': 100, 'email': 254, 'student_id': 50}
+
+
+def copy_members_to_table(apps, schema_editor):
+    Organization = apps.get_model('osas', 'Organization')
+    OrganizationMember = apps.get_model('osas', 'OrganizationMember')
+
+    for organization in Organization.objects.exclude(organization_members__isnull=True).iterator():
+        members = organization.organization_members
+        if not isinstance(members, list):
+            continue
+
+        rows = [
+            OrganizationMember(
+                organization=organization,
+                **{field: str(member.get(field) or '').strip()[:length] for field, length in MEMBER_FIELDS.items()}
+            )
+            for member in members
+            if isinstance(member, dict)
+        ]
+        OrganizationMember.objects.bulk_create(rows)
+
+        Organization.objects.filter(pk=organization.pk).update(
+            member_count=sum(1 for row in rows if row.first_name and row.last_name)
+        )
+
+
+def copy_members_to_json(apps, schema_editor):
+    Organization = apps.get_model('osas', 'Organization')
+    OrganizationMember = apps.get_model('osas', 'OrganizationMember')
+
+    for organization in Organization.objects.iterator():
+        members = OrganizationMember.objects.filter(organization=organization).order_by('id')
+        organization.organization_members = [
+            dict({field: getattr(member, field) for field in MEMBER_FIELDS}, id=index)
+            for index, member in enumerate(members, start=1)
+        ]
+        organization.save(update_fields=['organization_members'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0011_organization_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='member_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.CreateModel(
+            name='OrganizationMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(blank=True, max_length=100)),
+                ('last_name', models.CharField(blank=True, max_length=100)),
+                ('position', models.CharField(blank=True, max_length=100)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('student_id', models.CharField(blank=True, max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='osas.organization')),
+            ],
+            options={
+                'verbose_name': 'Organization Member',
+                'verbose_name_plural': 'Organization Members',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['organization', 'last_name', 'first_name'], name='osas_organi_organiz_8cdb4d_idx'), models.Index(fields=['student_id'], name='osas_organi_student_ce5966_idx')],
+            },
+        ),
+        migrations.RunPython(copy_members_to_table, copy_members_to_json),
+        migrations.RemoveField(
+            model_name='organization',
+            name='organization_members',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0012_organization_member_table'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useractivitylog',
+            index=models.Index(fields=['timestamp', 'id'], name='osas_userac_timesta_976d5e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivitylog',
+            index=models.Index(fields=['user', 'timestamp'], name='osas_userac_user_id_5f4d53_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:17
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0013_activity_log_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='customuser_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='customuser_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='org_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(django.db.models.functions.text.Lower('organization_email'), name='org_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0014_identity_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=30)),
+                ('year', models.PositiveIntegerField()),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='certificate_number',
+            field=models.CharField(blank=True, editable=False, max_length=15, null=True, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='referencecounter',
+            constraint=models.UniqueConstraint(fields=('scope', 'year'), name='unique_reference_counter'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0016_import_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(max_length=40)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item_type', '-archived_at', '-id'], name='archive_entry_type_recent_idx'), models.Index(fields=['-archived_at', '-id'], name='archive_entry_recent_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archiveentry',
+            constraint=models.UniqueConstraint(fields=('item_type', 'object_id'), name='unique_archive_entry'),
+        ),
+    ]
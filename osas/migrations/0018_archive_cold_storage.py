@@ -0,0 +1,40 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0017_archive_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archiveentry',
+            name='cold_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archiveentry',
+            name='cold_bundle',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='archiveentry',
+            name='cold_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='archiveentry',
+            name='owner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archiveentry',
+            name='thawed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
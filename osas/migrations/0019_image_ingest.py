@@ -0,0 +1,27 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0018_archive_cold_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageIngest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('original_size', models.PositiveBigIntegerField()),
+                ('stored_size', models.PositiveBigIntegerField()),
+                ('original_width', models.PositiveIntegerField()),
+                ('original_height', models.PositiveIntegerField()),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
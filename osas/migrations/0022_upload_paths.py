@@ -0,0 +1,235 @@
+# Generated by Django 4.2.26 on 2026-10-19 13:53
+
+import django.core.validators
+from django.db import migrations, models
+import osas.upload_paths
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osas', '0021_stored_blob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='accomplishmentrecord',
+            name='main_report',
+            field=models.FileField(help_text='Main accomplishment report document', upload_to=osas.upload_paths.UploadTo('accomplishment_records/%Y/%m/main_reports/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='announcementimage',
+            name='image',
+            field=models.ImageField(upload_to=osas.upload_paths.UploadTo('announcements/images/%Y/%m/%d/')),
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='certificate_file',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('certificates/%Y/%m/')),
+        ),
+        migrations.AlterField(
+            model_name='complaintdocument',
+            name='file',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('complaints/documents/%Y/%m/%d/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'gif'])]),
+        ),
+        migrations.AlterField(
+            model_name='complaintimage',
+            name='image',
+            field=models.ImageField(upload_to=osas.upload_paths.UploadTo('complaints/images/%Y/%m/%d/')),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('course_logos/')),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='cor_photo',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('verification_cor/'), verbose_name='Certificate of Registration (COR)'),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='id_photo',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('verification_ids/')),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='profile_picture',
+            field=models.ImageField(blank=True, default='default.png', null=True, upload_to=osas.upload_paths.UploadTo('profile_pics/')),
+        ),
+        migrations.AlterField(
+            model_name='downloadable',
+            name='file',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('downloadables/')),
+        ),
+        migrations.AlterField(
+            model_name='footercontent',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('footer/')),
+        ),
+        migrations.AlterField(
+            model_name='homepagecontent',
+            name='logo',
+            field=models.ImageField(blank=True, default='images/cvsu-logo.png', null=True, upload_to=osas.upload_paths.UploadTo('home/')),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='file',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('imports/%Y/%m/')),
+        ),
+        migrations.AlterField(
+            model_name='nstpfile',
+            name='file',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('nstp_files/')),
+        ),
+        migrations.AlterField(
+            model_name='nstppagecontent',
+            name='about_image',
+            field=models.ImageField(default='nstp/default-about.jpg', help_text='Recommended size: 800x600px', upload_to=osas.upload_paths.UploadTo('nstp/')),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_acceptance_letter',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/acceptance_letters/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_adviser_cv',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/adviser_documents/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_ar',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/accomplishment_reports/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Accomplishment Report'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_calendar_activities',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/calendar_activities/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_cbl',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/constitution/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Constitution and By-Laws'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_coa',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Certificate of Assessment'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_cog',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Certificate of Grades'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_financial_report',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/financial_reports/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_good_moral',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Good Moral Certificate'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_group_picture',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/group_photos/')),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_list_members',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/member_lists/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_logo',
+            field=models.ImageField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/logos/')),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_member_biodata',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/member_biodata/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Biodata/CV of Members'),
+        ),
+        migrations.AlterField(
+            model_name='organization',
+            name='organization_previous_calendar',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('organizations/%Y/%m/school_year_%Y/previous_calendars/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='scholarshipapplication',
+            name='application_form',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('scholarships/applications/forms/')),
+        ),
+        migrations.AlterField(
+            model_name='scholarshipapplication',
+            name='cog',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('scholarships/applications/cog/'), verbose_name='Certificate of Grades'),
+        ),
+        migrations.AlterField(
+            model_name='scholarshipapplication',
+            name='cor',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('scholarships/applications/cor/'), verbose_name='Certificate of Registration'),
+        ),
+        migrations.AlterField(
+            model_name='scholarshipapplication',
+            name='id_photo',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('scholarships/applications/ids/')),
+        ),
+        migrations.AlterField(
+            model_name='scholarshipapplication',
+            name='other_documents',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('scholarships/applications/others/')),
+        ),
+        migrations.AlterField(
+            model_name='scholarshippagecontent',
+            name='hero_image',
+            field=models.ImageField(blank=True, default='scholarship/images/default.jpg', null=True, upload_to=osas.upload_paths.UploadTo('scholarship/images/')),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='certificate_of_enrollment',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/enrollment/'), verbose_name='Certificate of Enrollment'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='form137',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/form137/'), verbose_name='Form 137'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='good_moral_certificate',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/good_moral/'), verbose_name='Certificate of Good Moral Character'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='grade11_report_card',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/grade11/'), verbose_name='Grade 11 Report Card'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='grade12_report_card',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/grade12/'), verbose_name='Grade 12 Report Card'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='honorable_dismissal',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/dismissal/'), verbose_name='Honorable Dismissal'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='nbi_police_clearance',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/clearance/'), verbose_name='NBI or Police Clearance'),
+        ),
+        migrations.AlterField(
+            model_name='studentadmission',
+            name='transcript_of_grades',
+            field=models.FileField(blank=True, null=True, upload_to=osas.upload_paths.UploadTo('admission_docs/transcripts/'), verbose_name='Transcript of Grades or Certificate of Grades'),
+        ),
+        migrations.AlterField(
+            model_name='supportingfile',
+            name='file',
+            field=models.FileField(upload_to=osas.upload_paths.UploadTo('accomplishment_records/%Y/%m/supporting_files/'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'xls', 'xlsx', 'mp4', 'avi', 'mov', 'zip'])]),
+        ),
+    ]
@@ -1,25 +1,47 @@
 import json
-import string
-from datetime import date, datetime
+import os
+import uuid
+from datetime import date, datetime, timedelta
 
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.hashers import check_password
 from django.core.exceptions import ValidationError
 from django.core.files.storage import FileSystemStorage
-from django.db.models import Count, F, Q
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Lower
 from django.utils import timezone
-import random
 from django.core.validators import MinLengthValidator, FileExtensionValidator, MinValueValidator, MaxValueValidator, \
     RegexValidator
 from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext as _
 
+from .file_metadata import file_metadata, format_file_size
+from .references import ADMISSION_SCOPE, COMPLAINT_SCOPE, issue_reference
+from .upload_paths import UploadTo
+
+
+# ---------------------------------------------- Reference Numbers -----------------------------------------------------
+class ReferenceCounter(models.Model):
+    """Last issued reference number per scope and year (see osas/references.py)"""
+    scope = models.CharField(max_length=30)
+    year = models.PositiveIntegerField()
+    value = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'year'], name='unique_reference_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.year}: {self.value}"
+
 
 class Course(models.Model):
     name = models.CharField(max_length=200)
     subtext = models.CharField(max_length=200, blank=True)
-    logo = models.ImageField(upload_to='course_logos/', blank=True, null=True)
+    logo = models.ImageField(upload_to=UploadTo('course_logos/'), blank=True, null=True)
 
     def __str__(self):
         return self.name
@@ -86,7 +108,8 @@ class CustomUser(AbstractUser):
 
     # Common fields for all users
     user_type = models.PositiveSmallIntegerField(choices=USER_TYPE_CHOICES, null=True, blank=True)
-    profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True, default='default.png')
+    profile_picture = models.ImageField(upload_to=UploadTo('profile_pics/'), null=True, blank=True,
+                                        default='default.png')
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, blank=True)
     birth_date = models.DateField(null=True, blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
@@ -105,8 +128,8 @@ class CustomUser(AbstractUser):
     department = models.CharField(max_length=100, blank=True, null=True)
 
     # Verification documents
-    id_photo = models.ImageField(upload_to='verification_ids/', null=True, blank=True)
-    cor_photo = models.ImageField(upload_to='verification_cor/', null=True, blank=True,
+    id_photo = models.ImageField(upload_to=UploadTo('verification_ids/'), null=True, blank=True)
+    cor_photo = models.ImageField(upload_to=UploadTo('verification_cor/'), null=True, blank=True,
                                   verbose_name="Certificate of Registration (COR)")
 
     # Other fields
@@ -117,6 +140,13 @@ class CustomUser(AbstractUser):
     archived_by = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL,
                                     related_name='archived_users')
 
+    class Meta(AbstractUser.Meta):
+        # Case-insensitive identity lookups (see osas/identity.py)
+        indexes = [
+            models.Index(Lower('username'), name='customuser_username_lower_idx'),
+            models.Index(Lower('email'), name='customuser_email_lower_idx'),
+        ]
+
     def __str__(self):
         return self.get_full_name() or self.username
 
@@ -361,88 +391,88 @@ class Organization(models.Model):
 
     # Organization Documents
     organization_calendar_activities = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/calendar_activities/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/calendar_activities/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_logo = models.ImageField(
-        upload_to='organizations/%Y/%m/school_year_%Y/logos/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/logos/'),
         blank=True,
         null=True
     )
     organization_adviser_cv = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/adviser_documents/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/adviser_documents/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_cog = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/certificates/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'),
         verbose_name="Certificate of Grades",
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_group_picture = models.ImageField(
-        upload_to='organizations/%Y/%m/school_year_%Y/group_photos/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/group_photos/'),
         blank=True,
         null=True
     )
     organization_cbl = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/constitution/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/constitution/'),
         verbose_name="Constitution and By-Laws",
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_list_members = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/member_lists/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/member_lists/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_acceptance_letter = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/acceptance_letters/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/acceptance_letters/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_ar = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/accomplishment_reports/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/accomplishment_reports/'),
         verbose_name="Accomplishment Report",
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_previous_calendar = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/previous_calendars/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/previous_calendars/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_financial_report = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/financial_reports/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/financial_reports/'),
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_coa = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/certificates/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'),
         verbose_name="Certificate of Assessment",
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_member_biodata = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/member_biodata/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/member_biodata/'),
         verbose_name="Biodata/CV of Members",
         blank=True,
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     organization_good_moral = models.FileField(
-        upload_to='organizations/%Y/%m/school_year_%Y/certificates/',
+        upload_to=UploadTo('organizations/%Y/%m/school_year_%Y/certificates/'),
         verbose_name="Good Moral Certificate",
         blank=True,
         null=True,
@@ -460,13 +490,8 @@ class Organization(models.Model):
     organization_approved_at = models.DateTimeField(null=True, blank=True)
     organization_rejection_reason = models.TextField(blank=True, null=True)
 
-    # Organization Members (as JSON field)
-    organization_members = models.JSONField(
-        default=list,
-        blank=True,
-        null=True,
-        help_text="Store organization members as JSON"
-    )
+    # Denormalized count of valid OrganizationMember rows, kept in sync on member writes
+    member_count = models.PositiveIntegerField(default=0, db_index=True)
 
     renew_count = models.IntegerField(default=0, help_text="Number of times the organization has renewed")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -486,49 +511,91 @@ class Organization(models.Model):
     def __str__(self):
         return f"{self.organization_name} ({self.organization_acronym})"
 
-    @property
-    def organization_status(self):
-        today = timezone.now().date()
-
-        # If we don't have valid dates, return the stored status
+    # Uploads checked by all_requirements_submitted
+    ORGANIZATION_REQUIRED_DOCUMENTS = (
+        'organization_calendar_activities',
+        'organization_logo',
+        'organization_adviser_cv',
+        'organization_cog',
+        'organization_group_picture',
+        'organization_cbl',
+        'organization_list_members',
+        'organization_acceptance_letter',
+        'organization_ar',
+        'organization_previous_calendar',
+        'organization_good_moral',
+        'organization_member_biodata',
+    )
+    STUDENT_ORGANIZATION_REQUIRED_DOCUMENTS = (
+        'organization_financial_report',
+        'organization_coa',
+    )
+
+    # Statuses set by staff decisions; date checks never override them
+    ORGANIZATION_MANUAL_STATUSES = ('rejected', 'inactive', 'cancelled')
+
+    def derive_organization_status(self, today=None):
+        """Return the status implied by the stored status and the validity dates"""
+        today = today or timezone.now().date()
+        status = self._organization_status
+
+        # If we don't have valid dates, keep the stored status
         if not self.organization_valid_from or not self.organization_valid_until:
-            return self._organization_status
-
-        # If organization is rejected, keep it as rejected (manual override)
-        if self._organization_status == 'rejected':
-            return 'rejected'
+            return status
 
-        # If organization is inactive, keep it as inactive (manual override)
-        if self._organization_status == 'inactive':
-            return 'inactive'
+        # Rejected, inactive and cancelled are manual overrides
+        if status in self.ORGANIZATION_MANUAL_STATUSES:
+            return status
 
         # Check if organization has EXPIRED
         if self.organization_valid_until < today:
             return 'expired'
 
-        # Check if organization is currently within valid period
-        if self.organization_valid_from <= today <= self.organization_valid_until:
-            # Only become active if it was manually approved
-            if self._organization_status == 'active':
-                return 'active'
-            # If it's pending and within dates, it stays pending until manual approval
-            elif self._organization_status == 'pending':
-                return 'pending'
-            # If it was expired but dates are now valid, it stays expired until re-approval
-            elif self._organization_status == 'expired':
-                return 'expired'
-
-        # Check if organization validity is in the FUTURE
-        if self.organization_valid_from > today:
+        # An expired organization renewed for a FUTURE period waits for re-approval
+        if status == 'expired' and self.organization_valid_from > today:
             return 'pending'
 
-        # Fallback to stored status
-        return self._organization_status
+        return status
+
+    @property
+    def organization_status(self):
+        return self.derive_organization_status()
 
     @organization_status.setter
     def organization_status(self, value):
         self._organization_status = value
 
+    @classmethod
+    def refresh_organization_statuses(cls, today=None):
+        """
+        Materialize date-driven status transitions in the status column.
+        Runs as two set-based UPDATEs so it is safe to schedule daily.
+        """
+        today = today or timezone.now().date()
+        now = timezone.now()
+
+        expired = cls.objects.filter(
+            _organization_status__in=['active', 'pending'],
+            organization_valid_until__lt=today
+        ).update(_organization_status='expired', updated_at=now)
+
+        pending = cls.objects.filter(
+            _organization_status='expired',
+            organization_valid_from__gt=today
+        ).update(_organization_status='pending', updated_at=now)
+
+        return {'expired': expired, 'pending': pending}
+
+    @classmethod
+    def renewal_due(cls, within_days=30, today=None):
+        """Active organizations whose registration ends within the next `within_days` days"""
+        today = today or timezone.now().date()
+        return cls.objects.filter(
+            is_archived=False,
+            _organization_status='active',
+            organization_valid_until__range=(today, today + timedelta(days=within_days))
+        ).order_by('organization_valid_until')
+
     @property
     def organization_is_active(self):
         today = timezone.now().date()
@@ -546,18 +613,23 @@ class Organization(models.Model):
 
     @property
     def organization_member_count(self):
-        if not self.organization_members:
-            return 0
-        # Ensure organization_members is a list and count valid members
-        if isinstance(self.organization_members, list):
-            # Count members that have at least first_name and last_name
-            valid_members = [
-                member for member in self.organization_members
-                if member and isinstance(member, dict) and
-                member.get('first_name') and member.get('last_name')
-            ]
-            return len(valid_members)
-        return 0
+        return self.member_count
+
+    @property
+    def organization_members(self):
+        """Members as a list of dicts, in the shape the dashboard scripts expect"""
+        return [member.as_dict() for member in self.members.all()]
+
+    def refresh_member_count(self):
+        """Recompute member_count with a single UPDATE against the member table"""
+        valid_members = OrganizationMember.objects.valid().filter(
+            organization=OuterRef('pk')
+        ).order_by().values('organization').annotate(total=Count('id')).values('total')
+
+        Organization.objects.filter(pk=self.pk).update(
+            member_count=Coalesce(Subquery(valid_members), 0)
+        )
+        self.refresh_from_db(fields=['member_count'])
 
     @property
     def organization_has_minimum_members(self):
@@ -571,27 +643,11 @@ class Organization(models.Model):
 
     @property
     def all_requirements_submitted(self):
-        required_docs = [
-            'organization_calendar_activities',
-            'organization_logo',
-            'organization_adviser_cv',
-            'organization_cog',
-            'organization_group_picture',
-            'organization_cbl',
-            'organization_list_members',
-            'organization_acceptance_letter',
-            'organization_ar',
-            'organization_previous_calendar',
-            'organization_good_moral',
-            'organization_member_biodata',
-        ]
+        required_docs = list(self.ORGANIZATION_REQUIRED_DOCUMENTS)
 
         # Add student-specific requirements
         if self.organization_type == 'student':
-            required_docs.extend([
-                'organization_financial_report',
-                'organization_coa'
-            ])
+            required_docs.extend(self.STUDENT_ORGANIZATION_REQUIRED_DOCUMENTS)
 
         # Check if all required documents are uploaded
         for doc_field in required_docs:
@@ -622,41 +678,44 @@ class Organization(models.Model):
         return dict(self.ORGANIZATION_POSITION_CHOICES).get(self.organization_position, 'Organization Member')
 
     def add_organization_member(self, member_data):
-        if not self.organization_members:
-            self.organization_members = []
-
         # Validate member data
         required_fields = ['first_name', 'last_name', 'position']
         for field in required_fields:
             if field not in member_data:
                 raise ValidationError(f"Member data must contain {field}")
 
-        # Add unique ID for the member
-        member_data['id'] = len(self.organization_members) + 1
-        member_data['added_at'] = timezone.now().isoformat()
-
-        self.organization_members.append(member_data)
-        self.save()
+        member = OrganizationMember.objects.create(
+            organization=self,
+            **OrganizationMember.fields_from_dict(member_data)
+        )
+        self.refresh_member_count()
+        return member
 
     def remove_organization_member(self, member_id):
-        if not self.organization_members:
-            raise ValidationError("No members to remove")
-
-        self.organization_members = [m for m in self.organization_members if m.get('id') != member_id]
-        self.save()
+        deleted, _ = self.members.filter(id=member_id).delete()
+        if not deleted:
+            raise ValidationError("Member not found")
+        self.refresh_member_count()
 
     def update_organization_member(self, member_id, member_data):
-        if not self.organization_members:
-            raise ValidationError("No members to update")
-
-        for i, member in enumerate(self.organization_members):
-            if member.get('id') == member_id:
-                self.organization_members[i].update(member_data)
-                self.organization_members[i]['updated_at'] = timezone.now().isoformat()
-                self.save()
-                return
-
-        raise ValidationError("Member not found")
+        updated = self.members.filter(id=member_id).update(
+            updated_at=timezone.now(),
+            **OrganizationMember.fields_from_dict(member_data, partial=True)
+        )
+        if not updated:
+            raise ValidationError("Member not found")
+        self.refresh_member_count()
+
+    @transaction.atomic
+    def set_organization_members(self, members_data):
+        """Replace the member list with the submitted one (create and edit forms)"""
+        self.members.all().delete()
+        OrganizationMember.objects.bulk_create([
+            OrganizationMember(organization=self, **OrganizationMember.fields_from_dict(member_data))
+            for member_data in members_data or []
+            if isinstance(member_data, dict)
+        ])
+        self.refresh_member_count()
 
     def organization_approve_registration(self, approved_by):
         if not self.can_be_approved:
@@ -754,9 +813,91 @@ class Organization(models.Model):
                 f"The following documents are required: {', '.join(missing_docs)}"
             )
 
+    def save(self, *args, **kwargs):
+        # Keep the stored status in sync with the validity dates on every write
+        self._organization_status = self.derive_organization_status()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and '_organization_status' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['_organization_status']
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Organization"
         verbose_name_plural = "Organizations"
+        indexes = [
+            models.Index(fields=['is_archived', '_organization_status']),
+            models.Index(fields=['_organization_status', 'organization_valid_until']),
+            models.Index(fields=['organization_valid_from']),
+            models.Index(Lower('username'), name='org_username_lower_idx'),
+            models.Index(Lower('organization_email'), name='org_email_lower_idx'),
+        ]
+
+
+class OrganizationMemberQuerySet(models.QuerySet):
+    def valid(self):
+        """Members that have both a first and a last name"""
+        return self.exclude(first_name='').exclude(last_name='')
+
+
+class OrganizationMember(models.Model):
+    MEMBER_FIELDS = ('first_name', 'last_name', 'position', 'email', 'student_id')
+
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name='members'
+    )
+    first_name = models.CharField(max_length=100, blank=True)
+    last_name = models.CharField(max_length=100, blank=True)
+    position = models.CharField(max_length=100, blank=True)
+    email = models.EmailField(blank=True)
+    student_id = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrganizationMemberQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Organization Member"
+        verbose_name_plural = "Organization Members"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['organization', 'last_name', 'first_name']),
+            models.Index(fields=['student_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.first_name} {self.last_name} ({self.organization.organization_acronym})"
+
+    @classmethod
+    def fields_from_dict(cls, member_data, partial=False):
+        """Map a submitted member dict onto model fields; ValidationError if a value can't be stored"""
+        fields = {}
+        for field in cls.MEMBER_FIELDS:
+            if partial and field not in member_data:
+                continue
+            value = member_data.get(field)
+            if value is None:
+                value = ''
+            elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                value = str(value).strip()
+            else:
+                raise ValidationError(f"Member {field.replace('_', ' ')} must be text")
+            max_length = cls._meta.get_field(field).max_length
+            if len(value) > max_length:
+                raise ValidationError(f"Member {field.replace('_', ' ')} must be at most {max_length} characters")
+            fields[field] = value
+        return fields
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'position': self.position,
+            'email': self.email,
+            'student_id': self.student_id,
+        }
 
 
 class Certificate(models.Model):
@@ -768,12 +909,13 @@ class Certificate(models.Model):
 
     # Certificate file
     certificate_file = models.FileField(
-        upload_to='certificates/%Y/%m/',
+        upload_to=UploadTo('certificates/%Y/%m/'),
         blank=True,
         null=True
     )
 
     # Certificate details
+    certificate_number = models.CharField(max_length=15, unique=True, null=True, blank=True, editable=False)
     issue_date = models.DateField()
     venue = models.CharField(max_length=255)
 
@@ -895,7 +1037,7 @@ class AccomplishmentRecord(models.Model):
 
     # Main report file (required)
     main_report = models.FileField(
-        upload_to='accomplishment_records/%Y/%m/main_reports/',
+        upload_to=UploadTo('accomplishment_records/%Y/%m/main_reports/'),
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])],
         help_text="Main accomplishment report document"
     )
@@ -1021,7 +1163,7 @@ class SupportingFile(models.Model):
     )
 
     file = models.FileField(
-        upload_to='accomplishment_records/%Y/%m/supporting_files/',
+        upload_to=UploadTo('accomplishment_records/%Y/%m/supporting_files/'),
         validators=[FileExtensionValidator(
             allowed_extensions=[
                 'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png',
@@ -1053,6 +1195,12 @@ class UserActivityLog(models.Model):
     activity = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),
+            models.Index(fields=['user', 'timestamp']),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.activity}"
 
@@ -1071,7 +1219,7 @@ class Downloadable(models.Model):
 
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='downloadables/')
+    file = models.FileField(upload_to=UploadTo('downloadables/'))
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='created_downloadables')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1089,22 +1237,14 @@ class Downloadable(models.Model):
         return self.file.name.split('/')[-1]
 
     def get_file_size(self):
-        try:
-            size = self.file.size
-            if size < 1024:
-                return f"{size} bytes"
-            elif size < 1024 * 1024:
-                return f"{round(size / 1024, 1)} KB"
-            else:
-                return f"{round(size / (1024 * 1024), 1)} MB"
-        except:
-            return "N/A"
+        metadata = file_metadata(self.file)
+        return format_file_size(metadata.size) if metadata else "N/A"
 
 
 # ------------------------------------------------ Announcement Section ------------------------------------------------
 class AnnouncementImage(models.Model):
     announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='announcements/images/%Y/%m/%d/')
+    image = models.ImageField(upload_to=UploadTo('announcements/images/%Y/%m/%d/'))
     caption = models.CharField(max_length=200, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -1243,7 +1383,7 @@ class Announcement(models.Model):
 
 # ---------------------------------------------- Editable Pages Section ------------------------------------------------
 class HomePageContent(models.Model):
-    logo = models.ImageField(upload_to='home/', null=True, blank=True, default='images/cvsu-logo.png')
+    logo = models.ImageField(upload_to=UploadTo('home/'), null=True, blank=True, default='images/cvsu-logo.png')
     title = models.CharField(max_length=200, default="Cavite State University - Bacoor City Campus")
     tagline = models.CharField(max_length=200, default="Office of Student Affairs and Services")
 
@@ -1329,7 +1469,7 @@ class StudentDisciplineContent(models.Model):
 
 
 class FooterContent(models.Model):
-    logo = models.ImageField(upload_to='footer/', null=True, blank=True)
+    logo = models.ImageField(upload_to=UploadTo('footer/'), null=True, blank=True)
     campus_name = models.CharField(max_length=200, default="Cavite State University - Bacoor City Campus")
     description = models.TextField(
         default="Brief Description Here..."
@@ -1373,7 +1513,7 @@ class ScholarshipPageContent(models.Model):
                 "Find the perfect financial support for your educational journey."
     )
     hero_image = models.ImageField(
-        upload_to='scholarship/images/',
+        upload_to=UploadTo('scholarship/images/'),
         null=True,
         blank=True,
         default='scholarship/images/default.jpg'
@@ -1430,7 +1570,8 @@ class NSTPPageContent(models.Model):
     about_text = models.TextField(
         default="The National Service Training Program (NSTP) is a program aimed at enhancing civic consciousness and defense preparedness in the youth..."
     )
-    about_image = models.ImageField(upload_to='nstp/', default='nstp/default-about.jpg', help_text="Recommended size: 800x600px")
+    about_image = models.ImageField(upload_to=UploadTo('nstp/'), default='nstp/default-about.jpg',
+                                    help_text="Recommended size: 800x600px")
 
     # Programs
     programs = models.JSONField(default=list)
@@ -1934,18 +2075,7 @@ class Complaint(models.Model):
 
     def generate_reference_number(self):
         """ Reference Number format: ABC-123456-X"""
-        while True:
-            # 3 random uppercase letters
-            letters = ''.join([random.choice(string.ascii_uppercase) for _ in range(3)])
-            # 6 random digits
-            numbers = ''.join([random.choice(string.digits) for _ in range(6)])
-            # 1 random checksum letter
-            checksum = random.choice(string.ascii_uppercase)
-
-            ref_num = f"{letters}-{numbers}-{checksum}"
-
-            if not Complaint.objects.filter(reference_number=ref_num).exists():
-                return ref_num
+        return issue_reference(COMPLAINT_SCOPE)
 
     def get_next_hearing(self):
         """
@@ -2048,7 +2178,7 @@ class Complaint(models.Model):
 class ComplaintDocument(models.Model):
     complaint = models.ForeignKey(Complaint, related_name='documents', on_delete=models.CASCADE)
     file = models.FileField(
-        upload_to='complaints/documents/%Y/%m/%d/',
+        upload_to=UploadTo('complaints/documents/%Y/%m/%d/'),
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'gif'])
         ]
@@ -2062,7 +2192,7 @@ class ComplaintDocument(models.Model):
 
 class ComplaintImage(models.Model):
     complaint = models.ForeignKey(Complaint, related_name='images', on_delete=models.CASCADE)
-    image = models.ImageField(upload_to='complaints/images/%Y/%m/%d/')
+    image = models.ImageField(upload_to=UploadTo('complaints/images/%Y/%m/%d/'))
     caption = models.CharField(max_length=255, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
@@ -2129,11 +2259,12 @@ class ScholarshipApplication(models.Model):
     notes = models.TextField(blank=True)
 
     # Documents - using FileField since you might want to keep submitted documents separate from templates
-    application_form = models.FileField(upload_to='scholarships/applications/forms/')
-    cog = models.FileField(upload_to='scholarships/applications/cog/', verbose_name="Certificate of Grades")
-    cor = models.FileField(upload_to='scholarships/applications/cor/', verbose_name="Certificate of Registration")
-    id_photo = models.FileField(upload_to='scholarships/applications/ids/')
-    other_documents = models.FileField(upload_to='scholarships/applications/others/', null=True, blank=True)
+    application_form = models.FileField(upload_to=UploadTo('scholarships/applications/forms/'))
+    cog = models.FileField(upload_to=UploadTo('scholarships/applications/cog/'), verbose_name="Certificate of Grades")
+    cor = models.FileField(upload_to=UploadTo('scholarships/applications/cor/'),
+                           verbose_name="Certificate of Registration")
+    id_photo = models.FileField(upload_to=UploadTo('scholarships/applications/ids/'))
+    other_documents = models.FileField(upload_to=UploadTo('scholarships/applications/others/'), null=True, blank=True)
 
     is_archived = models.BooleanField(default=False)
     archived_at = models.DateTimeField(null=True, blank=True)
@@ -2145,6 +2276,8 @@ class ScholarshipApplication(models.Model):
         related_name='archived_applicants'
     )
 
+    DOCUMENT_FIELDS = ('application_form', 'cog', 'cor', 'id_photo', 'other_documents')
+
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.scholarship.name}"
 
@@ -2212,13 +2345,13 @@ class StudentAdmission(models.Model):
 
     # Fields specific to Current Grade 12
     grade11_report_card = models.FileField(
-        upload_to='admission_docs/grade11/',
+        upload_to=UploadTo('admission_docs/grade11/'),
         blank=True,
         null=True,
         verbose_name="Grade 11 Report Card"
     )
     certificate_of_enrollment = models.FileField(
-        upload_to='admission_docs/enrollment/',
+        upload_to=UploadTo('admission_docs/enrollment/'),
         blank=True,
         null=True,
         verbose_name="Certificate of Enrollment"
@@ -2226,13 +2359,13 @@ class StudentAdmission(models.Model):
 
     # Fields specific to SHS Graduate
     grade12_report_card = models.FileField(
-        upload_to='admission_docs/grade12/',
+        upload_to=UploadTo('admission_docs/grade12/'),
         blank=True,
         null=True,
         verbose_name="Grade 12 Report Card"
     )
     form137 = models.FileField(
-        upload_to='admission_docs/form137/',
+        upload_to=UploadTo('admission_docs/form137/'),
         blank=True,
         null=True,
         verbose_name="Form 137"
@@ -2273,25 +2406,25 @@ class StudentAdmission(models.Model):
         verbose_name="Others"
     )
     transcript_of_grades = models.FileField(
-        upload_to='admission_docs/transcripts/',
+        upload_to=UploadTo('admission_docs/transcripts/'),
         blank=True,
         null=True,
         verbose_name="Transcript of Grades or Certificate of Grades"
     )
     good_moral_certificate = models.FileField(
-        upload_to='admission_docs/good_moral/',
+        upload_to=UploadTo('admission_docs/good_moral/'),
         blank=True,
         null=True,
         verbose_name="Certificate of Good Moral Character"
     )
     honorable_dismissal = models.FileField(
-        upload_to='admission_docs/dismissal/',
+        upload_to=UploadTo('admission_docs/dismissal/'),
         blank=True,
         null=True,
         verbose_name="Honorable Dismissal"
     )
     nbi_police_clearance = models.FileField(
-        upload_to='admission_docs/clearance/',
+        upload_to=UploadTo('admission_docs/clearance/'),
         blank=True,
         null=True,
         verbose_name="NBI or Police Clearance"
@@ -2306,11 +2439,28 @@ class StudentAdmission(models.Model):
         related_name='archived_admission'
     )
 
+    # Requirement uploads across all student types
+    DOCUMENT_FIELDS = (
+        'grade11_report_card', 'certificate_of_enrollment', 'grade12_report_card', 'form137', 'transcript_of_grades',
+        'good_moral_certificate', 'honorable_dismissal', 'nbi_police_clearance',
+    )
+
+    def save(self, *args, **kwargs):
+        # Applicants normally enter the control number from the admission portal
+        if not self.control_no:
+            self.control_no = issue_reference(ADMISSION_SCOPE)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.control_no} - {self.get_student_type_display()}"
 
     def update_status(self):
         """Update the status based on submitted requirements"""
+        self.evaluate_requirements()
+        self.save()
+
+    def evaluate_requirements(self):
+        """Set status and remarks from the submitted requirements without saving"""
         missing_requirements = []
 
         # Check common requirement for all student types
@@ -2356,8 +2506,6 @@ class StudentAdmission(models.Model):
             self.status = 'complete'
             self.remarks = "All requirements submitted"
 
-        self.save()
-
     def get_required_fields(self):
         """Return a list of required fields based on student type"""
         if self.student_type == 'current_grade12':
@@ -2609,7 +2757,7 @@ class NSTPFile(models.Model):
 
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='nstp_files/')
+    file = models.FileField(upload_to=UploadTo('nstp_files/'))
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     semester = models.CharField(max_length=20, choices=SEMESTER_CHOICES)
     school_year = models.CharField(
@@ -2636,16 +2784,8 @@ class NSTPFile(models.Model):
         return self.file.name.split('/')[-1]
 
     def get_file_size(self):
-        try:
-            size = self.file.size
-            if size < 1024:
-                return f"{size} bytes"
-            elif size < 1024 * 1024:
-                return f"{round(size / 1024, 1)} KB"
-            else:
-                return f"{round(size / (1024 * 1024), 1)} MB"
-        except:
-            return "N/A"
+        metadata = file_metadata(self.file)
+        return format_file_size(metadata.size) if metadata else "N/A"
 
     class Meta:
         verbose_name = 'NSTP File'
@@ -2711,3 +2851,171 @@ class OJTCompany(models.Model):
         ordering = ['-created_at']
 
 
+
+
+# ---------------------------------------------------- Import Jobs -----------------------------------------------------
+class ImportJob(models.Model):
+    """One spreadsheet import (see osas/imports.py); progress is polled by the dashboard"""
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    kind = models.CharField(max_length=30)
+    file = models.FileField(upload_to=UploadTo('imports/%Y/%m/'))
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped with every batch of progress; see fail_stale_imports()
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} import #{self.pk} ({self.status})"
+
+
+# ------------------------------------------------ Archive Index -------------------------------------------------------
+class ArchiveEntry(models.Model):
+    """One row per archived record of any archivable model (see osas/archive.py)"""
+    item_type = models.CharField(max_length=40)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    archived_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    # Student/author the record belongs to; lets owners still see it once its row is in cold storage
+    owner = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+
+    # Cold storage: bundle under ARCHIVE_COLD_ROOT and the record's prefix inside it; blank while hot
+    cold_bundle = models.CharField(max_length=100, blank=True)
+    cold_key = models.CharField(max_length=100, blank=True)
+    cold_at = models.DateTimeField(null=True, blank=True)
+    thawed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='unique_archive_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['item_type', '-archived_at', '-id'], name='archive_entry_type_recent_idx'),
+            models.Index(fields=['-archived_at', '-id'], name='archive_entry_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item_type} #{self.object_id}: {self.title}"
+
+    @property
+    def is_cold(self):
+        return bool(self.cold_bundle)
+
+
+# ---------------------------------------------------- Image Ingest ----------------------------------------------------
+class ImageIngest(models.Model):
+    """Outcome of normalizing one uploaded image (see osas/images.py)"""
+    name = models.CharField(max_length=255, unique=True)
+    original_size = models.PositiveBigIntegerField()
+    stored_size = models.PositiveBigIntegerField()
+    original_width = models.PositiveIntegerField()
+    original_height = models.PositiveIntegerField()
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.original_size} -> {self.stored_size} bytes"
+
+    @property
+    def saved_bytes(self):
+        return self.original_size - self.stored_size
+
+
+# -------------------------------------------------- Upload Sessions ---------------------------------------------------
+class UploadSession(models.Model):
+    """A resumable chunked upload (see osas/resumable.py); form posts reference completed ones by id"""
+    STATUS_CHOICES = (
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='upload_sessions')
+    # UPLOAD_RULES entry the file is meant for
+    view_name = models.CharField(max_length=100)
+    field_name = models.CharField(max_length=100)
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='upload_session_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.received}/{self.size} bytes, {self.status})"
+
+    @property
+    def path(self):
+        return os.path.join(settings.UPLOAD_SESSION_ROOT, f'{self.pk}.part')
+
+
+# ------------------------------------------------ Deduplicated Storage ------------------------------------------------
+class StoredBlob(models.Model):
+    """One unique file content in the deduplicating media storage (see osas/storage.py)"""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.PositiveBigIntegerField()
+    # Sniffed when the content is first stored (see osas/file_metadata.py); dimensions only for images
+    content_type = models.CharField(max_length=100, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # StoredFile names pointing here; the blob file is removed once this drops to zero
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256} ({self.size} bytes, {self.ref_count} references)"
+
+
+class StoredFile(models.Model):
+    """Maps a media name, as kept in FileFields, to the blob holding its content"""
+    name = models.CharField(max_length=255, unique=True)
+    blob = models.ForeignKey(StoredBlob, on_delete=models.PROTECT, related_name='files')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} -> {self.blob_id}"
@@ -0,0 +1,46 @@
+"""
+Batched email notifications.
+
+Bulk actions build their messages while the rows are being updated and hand them
+to queue_emails(), which sends them over a single SMTP connection from a
+background thread once the transaction commits.
+"""
+import logging
+import threading
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+logger = logging.getLogger('osas')
+
+ACCOUNT_EMAIL_FROM = 'CvSU OSAS Bacoor City Campus <noreply@domain-name.com>'
+
+
+def render_email(subject, template_name, context, recipient, from_email=None):
+    html_message = render_to_string(template_name, context)
+    message = EmailMultiAlternatives(subject, strip_tags(html_message), from_email, [recipient])
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def send_batch(messages):
+    try:
+        with get_connection() as connection:
+            sent = connection.send_messages(messages)
+        logger.info(f"Sent {sent} of {len(messages)} notification emails")
+    except Exception:
+        logger.exception(f"Failed to send {len(messages)} notification emails")
+
+
+def queue_emails(messages):
+    """Send `messages` in one batch after the current transaction commits"""
+    messages = [message for message in messages if all(message.to)]
+    if not messages:
+        return
+
+    def start():
+        threading.Thread(target=send_batch, args=(messages,), daemon=True).start()
+
+    transaction.on_commit(start)
@@ -0,0 +1,281 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import F, Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+COUNT_CACHE_TIMEOUT = 60
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return parse_datetime(value['dt'])
+        if 'd' in value:
+            return parse_date(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+    return value
+
+
+def _count_key(queryset):
+    """Cache key for the queryset's count, or None when it can't match anything"""
+    try:
+        signature = str(queryset.query)
+    except EmptyResultSet:
+        return None
+    return 'osas:count:' + hashlib.md5(signature.encode('utf-8')).hexdigest()
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """COUNT(*) for a queryset, cached per filter signature (the compiled SQL)"""
+    key = _count_key(queryset)
+    if key is None:
+        return 0
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+async def acached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """cached_count() for async views"""
+    key = _count_key(queryset)
+    if key is None:
+        return 0
+    count = await cache.aget(key)
+    if count is None:
+        count = await queryset.acount()
+        await cache.aset(key, count, timeout)
+    return count
+
+
+async def aget_page(queryset, number, per_page):
+    """Paginator(queryset, per_page).get_page(number) for async views"""
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount()  # Settles the cached property, so num_pages needs no query
+    try:
+        number = paginator.validate_number(number)
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+    bottom = (number - 1) * per_page
+    return Page([row async for row in queryset[bottom:bottom + per_page]], number, paginator)
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, next_cursor, prev_cursor, total_count=None):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total_count = total_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over (sort columns..., pk).
+
+    The sort columns are taken from the queryset's own order_by (or the model's
+    Meta.ordering), so the existing sort/direction request parameters keep working.
+    Each page is a single indexed range scan; no COUNT(*) and no OFFSET.
+    NULLs always sort last so the ordering is deterministic on every backend.
+    """
+
+    def __init__(self, queryset, per_page=10):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.pk_name = queryset.model._meta.pk.name
+        self.ordering = self._resolve_ordering(queryset)
+
+    def _resolve_ordering(self, queryset):
+        terms = list(queryset.query.order_by) or list(queryset.model._meta.ordering or [])
+        ordering = []
+        for term in terms:
+            if not isinstance(term, str) or term == '?':
+                continue
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = self.pk_name
+            ordering.append((name, descending))
+            if name == self.pk_name:
+                break
+
+        if not ordering or ordering[-1][0] != self.pk_name:
+            descending = ordering[0][1] if ordering else True
+            ordering.append((self.pk_name, descending))
+        return ordering
+
+    @property
+    def signature(self):
+        return ','.join(('-' if descending else '') + name for name, descending in self.ordering)
+
+    def _order_expressions(self, reverse=False):
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        expressions = []
+        for name, descending in self.ordering:
+            if descending != reverse:
+                expressions.append(F(name).desc(**nulls))
+            else:
+                expressions.append(F(name).asc(**nulls))
+        return expressions
+
+    def _comes_after(self, name, descending, value):
+        if value is None:
+            return Q(pk__in=[])  # Nothing sorts after a NULL
+        lookup = 'lt' if descending else 'gt'
+        return Q(**{f'{name}__{lookup}': value}) | Q(**{f'{name}__isnull': True})
+
+    def _comes_before(self, name, descending, value):
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        lookup = 'gt' if descending else 'lt'
+        return Q(**{f'{name}__{lookup}': value})
+
+    def _equals(self, name, value):
+        if value is None:
+            return Q(**{f'{name}__isnull': True})
+        return Q(**{name: value})
+
+    def _boundary(self, values, forward):
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            compare = self._comes_after if forward else self._comes_before
+            condition |= prefix & compare(name, descending, value)
+            prefix &= self._equals(name, value)
+        return condition
+
+    def _values_for(self, obj):
+        values = []
+        for name, _ in self.ordering:
+            if isinstance(obj, dict):
+                values.append(obj.get(name))
+                continue
+            value = obj
+            for part in name.split('__'):
+                value = getattr(value, part, None) if value is not None else None
+            if hasattr(value, '_meta'):
+                value = value.pk
+            values.append(value)
+        return values
+
+    def encode_cursor(self, obj, direction):
+        payload = {
+            's': self.signature,
+            'k': [_encode_value(value) for value in self._values_for(obj)],
+            'r': direction,
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return (values, direction), or (None, 'n') for a missing or stale cursor"""
+        if not cursor:
+            return None, 'n'
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, TypeError, binascii.Error):
+            return None, 'n'
+
+        if not isinstance(payload, dict) or payload.get('s') != self.signature:
+            return None, 'n'
+        values = [_decode_value(value) for value in payload.get('k', [])]
+        if len(values) != len(self.ordering):
+            return None, 'n'
+        return values, payload.get('r', 'n')
+
+    def _window(self, cursor):
+        """(queryset of the rows to fetch, cursor values, forward) for the page at `cursor`"""
+        values, direction = self.decode_cursor(cursor)
+        forward = direction != 'p'
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._boundary(values, forward))
+        queryset = queryset.order_by(*self._order_expressions(reverse=not forward))
+        return queryset[:self.per_page + 1], values, forward
+
+    def page(self, cursor=None, with_count=False):
+        queryset, values, forward = self._window(cursor)
+        total_count = cached_count(self.queryset) if with_count else None
+        return self._page(list(queryset), values, forward, total_count)
+
+    async def apage(self, cursor=None, with_count=False):
+        """page() for async views"""
+        queryset, values, forward = self._window(cursor)
+        rows = [row async for row in queryset]
+        total_count = await acached_count(self.queryset) if with_count else None
+        return self._page(rows, values, forward, total_count)
+
+    def _page(self, rows, values, forward, total_count):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            has_next, has_previous = has_more, values is not None
+        else:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+
+        next_cursor = self.encode_cursor(rows[-1], 'n') if rows and has_next else None
+        prev_cursor = self.encode_cursor(rows[0], 'p') if rows and has_previous else None
+
+        return KeysetPage(rows, has_next, has_previous, next_cursor, prev_cursor, total_count)
+
+
+def pagination_payload(page, count_key='total_count'):
+    """JSON pagination block for either a numbered Page or a KeysetPage"""
+    if isinstance(page, KeysetPage):
+        return {
+            'has_previous': page.has_previous(),
+            'has_next': page.has_next(),
+            'next_cursor': page.next_cursor,
+            'prev_cursor': page.prev_cursor,
+            count_key: page.total_count,
+        }
+
+    return {
+        'has_previous': page.has_previous(),
+        'has_next': page.has_next(),
+        'current_page': page.number,
+        'num_pages': page.paginator.num_pages,
+        count_key: page.paginator.count,
+        'start_index': page.start_index(),
+        'end_index': page.end_index(),
+    }
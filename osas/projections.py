@@ -0,0 +1,123 @@
+"""
+Column projections for the dashboard list endpoints and exports.
+
+Each list declares the columns its JSON rows (or export rows) actually read.
+project() applies them with select_related()/only() so wide rows (file fields,
+long text, JSON) stay in the database; project_values() returns plain dicts
+for exports that don't need model methods.
+
+Keep a projection in sync with its serializer: touching a column that is not
+listed here costs one extra query per row.
+"""
+from .models import Organization
+
+_PERSON_NAME = ('first_name', 'last_name', 'username')
+
+
+def _related(prefix, fields):
+    return tuple(f'{prefix}__{field}' for field in fields)
+
+
+LIST_PROJECTIONS = {
+    'users': {
+        'related': ('organization_account',),
+        'fields': (
+            'id', 'first_name', 'last_name', 'username', 'user_type', 'is_verified', 'is_active',
+            'date_joined', 'organization_account__organization_name',
+        ),
+    },
+    'admissions': {
+        'related': ('user', 'course'),
+        'fields': (
+            'id', 'control_no', 'student_type', 'status', 'remarks', 'created_at',
+            'user', 'course', 'course__name',
+        ) + _related('user', _PERSON_NAME),
+    },
+    'announcements': {
+        'related': ('author',),
+        'fields': (
+            'id', 'title', 'category', 'is_published', 'created_at', 'author',
+        ) + _related('author', _PERSON_NAME),
+    },
+    'complaints': {
+        'fields': (
+            'id', 'reference_number', 'title', 'complainant_first_name', 'complainant_last_name',
+            'incident_date', 'created_at', 'updated_at', 'status', 'created_by',
+        ),
+    },
+    'nstp_enlistments': {
+        'fields': (
+            'id', 'student_number', 'first_name', 'last_name', 'program', 'semester',
+            'approval_status', 'created_at',
+        ),
+    },
+    'nstp_files': {
+        'fields': (
+            'id', 'title', 'description', 'category', 'semester', 'school_year', 'created_at', 'file',
+        ),
+    },
+    'scholarships': {
+        'fields': ('id', 'name', 'scholarship_type', 'is_active', 'created_at'),
+    },
+    'scholarship_applications': {
+        'related': ('student', 'scholarship'),
+        'fields': (
+            'id', 'application_date', 'status', 'application_form', 'cog', 'cor',
+            'student', 'scholarship', 'scholarship__name',
+        ) + _related('student', _PERSON_NAME),
+    },
+    'ojt_companies': {
+        'fields': (
+            'id', 'name', 'address', 'contact_number', 'email', 'description', 'website', 'status',
+            'is_archived', 'created_at', 'updated_at',
+        ),
+    },
+    'organizations': {
+        'fields': (
+            'id', 'organization_name', 'organization_acronym', 'organization_email', 'organization_type',
+            '_organization_status', 'organization_valid_from', 'organization_valid_until', 'renew_count',
+            'member_count', 'created_at',
+        ) + Organization.ORGANIZATION_REQUIRED_DOCUMENTS + Organization.STUDENT_ORGANIZATION_REQUIRED_DOCUMENTS,
+    },
+    'certificates': {
+        'related': ('organization', 'generated_by'),
+        'fields': (
+            'id', 'certificate_number', 'issue_date', 'venue', 'certificate_file', 'created_at', 'updated_at',
+            'organization', 'organization__organization_name', 'organization__organization_acronym',
+            'organization__organization_type', 'generated_by',
+        ) + _related('generated_by', _PERSON_NAME),
+    },
+    'accomplishment_reports': {
+        'related': ('organization', 'submitted_by'),
+        'fields': (
+            'id', 'title', 'record_type', 'date_conducted', 'venue', 'semester', 'school_year',
+            'number_of_participants', 'duration_hours', 'budget_utilized', 'main_report', 'created_at',
+            'organization', 'organization__organization_name', 'organization__organization_acronym',
+            'organization__user_account', 'submitted_by',
+        ) + _related('submitted_by', _PERSON_NAME),
+    },
+    'activities': {
+        'related': ('user',),
+        'fields': (
+            'id', 'activity', 'timestamp', 'user', 'user__user_type',
+        ) + _related('user', _PERSON_NAME),
+    },
+}
+
+
+def project(queryset, name):
+    """Restrict a list queryset to the joins and columns declared for `name`"""
+    projection = LIST_PROJECTIONS[name]
+    queryset = queryset.select_related(None)
+    if projection.get('related'):
+        queryset = queryset.select_related(*projection['related'])
+    return queryset.only(*projection['fields'])
+
+
+def project_values(queryset, name):
+    """Same projection as flat dicts (related columns keyed as `fk__column`)"""
+    fields = [
+        field for field in LIST_PROJECTIONS[name]['fields']
+        if field not in LIST_PROJECTIONS[name].get('related', ())
+    ]
+    return queryset.select_related(None).values(*fields)
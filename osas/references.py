@@ -0,0 +1,86 @@
+"""
+Reference numbers in the ``ABC-123456-X`` format.
+
+Each number comes from a per-(scope, year) counter row that is incremented by
+a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so issuing one is one
+round trip with no existence probes or retries. The counter value is encoded as
+
+    ABC    - year and millions block: (year - 2000) * 26 + value // 1_000_000, base 26
+    123456 - value % 1_000_000
+    X      - check letter over the first nine characters (see check_letter())
+
+e.g. the first complaint of 2026 is BAA-000001-U. Scopes keep separate counters,
+so each model's references are unique on their own.
+"""
+import string
+
+from django.db import connection
+from django.utils import timezone
+
+COMPLAINT_SCOPE = 'complaint'
+ADMISSION_SCOPE = 'admission'
+CERTIFICATE_SCOPE = 'certificate'
+
+BASE_YEAR = 2000
+BLOCK_SIZE = 1_000_000
+LETTERS = string.ascii_uppercase
+
+# Odd and never 13, so every weight is invertible mod 26: any single mistyped
+# character changes the check letter, and so does any swap of two adjacent
+# digits. Neighbouring weights differ by an even number, though, so swapping two
+# adjacent prefix letters 13 apart (A and N, B and O, ...) goes unnoticed.
+CHECK_WEIGHTS = (1, 3, 5, 7, 9, 11, 15, 17, 19)
+
+
+def _char_value(char):
+    return int(char) if char.isdigit() else LETTERS.index(char)
+
+
+def check_letter(body):
+    """Check letter for the nine reference characters (letters and digits, no dashes)"""
+    total = sum(weight * _char_value(char) for weight, char in zip(CHECK_WEIGHTS, body))
+    return LETTERS[total % 26]
+
+
+def encode_reference(year, value):
+    index = (year - BASE_YEAR) * 26 + value // BLOCK_SIZE
+    if value < 1 or year < BASE_YEAR or index >= 26 ** 3:
+        raise ValueError(f"Cannot encode reference number {value} for {year}")
+
+    prefix = ''.join(LETTERS[index // 26 ** power % 26] for power in (2, 1, 0))
+    digits = f"{value % BLOCK_SIZE:06d}"
+    return f"{prefix}-{digits}-{check_letter(prefix + digits)}"
+
+
+def is_valid_reference(reference):
+    """Whether `reference` is well formed and its check letter matches"""
+    parts = (reference or '').upper().split('-')
+    if len(parts) != 3:
+        return False
+    prefix, digits, check = parts
+    if len(prefix) != 3 or not all(char in LETTERS for char in prefix):
+        return False
+    if len(digits) != 6 or not digits.isdigit() or len(check) != 1:
+        return False
+    return check_letter(prefix + digits) == check
+
+
+def next_counter_value(scope, year):
+    """Increment and return the counter for (scope, year), creating it at 1"""
+    from .models import ReferenceCounter
+
+    table = connection.ops.quote_name(ReferenceCounter._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (scope, year, value) VALUES (%s, %s, 1) "
+            f"ON CONFLICT (scope, year) DO UPDATE SET value = {table}.value + 1 "
+            f"RETURNING value",
+            [scope, year]
+        )
+        return cursor.fetchone()[0]
+
+
+def issue_reference(scope, year=None):
+    """Next reference number for `scope` (defaults to the current year)"""
+    year = year or timezone.localdate().year
+    return encode_reference(year, next_counter_value(scope, year))
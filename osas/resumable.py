@@ -0,0 +1,241 @@
+"""
+Resumable chunked uploads.
+
+Large form files are sent ahead of the form in chunks, each with its byte
+offset and SHA-256, into an UploadSession under UPLOAD_SESSION_ROOT. A dropped
+connection only loses the chunk in flight: the client asks for the session's
+offset and carries on from there. Sessions are limited by the same
+UPLOAD_RULES entry as a direct upload of that field.
+
+The form post then carries `<field>_upload_id` values instead of the files.
+ChunkedUploadMixin attaches those completed sessions to request.FILES before
+the view runs; storage moves the assembled file into place instead of copying
+it. purge_upload_sessions removes stale and consumed sessions.
+
+A chunk is written while holding an flock on the session's .part file, not a
+database lock, so a slow client never keeps a connection idle in a transaction;
+the offset is then saved with a conditional UPDATE. Each user may have at most
+UPLOAD_SESSION_MAX_OPEN unfinished sessions totalling UPLOAD_SESSION_MAX_OPEN_BYTES.
+"""
+import hashlib
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import Count, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import UploadSession
+from .uploads import MAGIC_NUMBERS, SNIFF_BYTES, UPLOAD_RULES, field_label
+
+UPLOAD_ID_SUFFIX = '_upload_id'
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class UploadSessionError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def session_payload(session):
+    return {
+        'id': str(session.pk),
+        'file_name': session.file_name,
+        'size': session.size,
+        'offset': session.received,
+        'complete': session.status == 'complete',
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+    }
+
+
+# ---- Sessions ----
+def start_session(user, view_name, field_name, file_name, size, sha256='', content_type=''):
+    rule = UPLOAD_RULES.get(view_name, {}).get(field_name)
+    if rule is None:
+        raise UploadSessionError("Chunked uploads are not accepted for this field.")
+    extension = os.path.splitext(file_name)[1].lower().lstrip('.')
+    if extension not in rule.types:
+        raise UploadSessionError(f"Invalid file type for {field_label(field_name)}. Allowed: {rule.types_text()}.")
+    if size <= 0:
+        raise UploadSessionError("The file is empty.")
+    if size > rule.max_size:
+        raise UploadSessionError(
+            f"File size too large for {field_label(field_name)}. Maximum size is {rule.size_text()}.", status=413
+        )
+
+    # Only sessions that could still be resumed hold space; purge_upload_sessions removes the rest
+    unfinished = UploadSession.objects.filter(
+        user=user, status='open',
+        updated_at__gte=timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_EXPIRY_HOURS),
+    ).aggregate(count=Count('pk'), size=Sum('size'))
+    if unfinished['count'] >= settings.UPLOAD_SESSION_MAX_OPEN:
+        raise UploadSessionError("Too many unfinished uploads; finish or cancel one first.", status=429)
+    if (unfinished['size'] or 0) + size > settings.UPLOAD_SESSION_MAX_OPEN_BYTES:
+        raise UploadSessionError("Your unfinished uploads are too large; finish or cancel one first.", status=429)
+
+    session = UploadSession.objects.create(
+        user=user, view_name=view_name, field_name=field_name, file_name=os.path.basename(file_name)[:255],
+        content_type=content_type[:100], size=size, sha256=sha256.lower(),
+    )
+    os.makedirs(settings.UPLOAD_SESSION_ROOT, exist_ok=True)
+    open(session.path, 'wb').close()
+    return session
+
+
+@contextmanager
+def _locked_part(path):
+    """The session's .part file opened for writing, or UploadSessionError while another chunk holds it"""
+    try:
+        part = open(path, 'r+b')
+    except FileNotFoundError:
+        raise UploadSessionError("Upload session not found.", status=404)
+    with part:
+        if fcntl:
+            try:
+                fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadSessionError("Another chunk of this upload is still being received.", status=409)
+        yield part
+
+
+def write_chunk(session_id, user, offset, stream, length, sha256):
+    """Append one chunk at `offset`; returns the updated session"""
+    if length <= 0 or length > settings.UPLOAD_CHUNK_SIZE:
+        raise UploadSessionError(f"Chunks must be 1 to {settings.UPLOAD_CHUNK_SIZE} bytes.")
+
+    session = UploadSession.objects.filter(pk=session_id, user=user).first()
+    if session is None:
+        raise UploadSessionError("Upload session not found.", status=404)
+
+    # The flock serializes retried/parallel chunks of the same session, so the row read under it is current
+    with _locked_part(session.path) as part:
+        session.refresh_from_db(fields=['received', 'status'])
+        if session.status == 'complete':
+            raise UploadSessionError("This upload is already complete.", status=409, offset=session.received)
+        if offset != session.received or offset + length > session.size:
+            raise UploadSessionError("Chunk does not continue the upload.", status=409, offset=session.received)
+
+        digest = hashlib.sha256()
+        # Drop whatever a previously interrupted chunk left past the offset
+        part.truncate(offset)
+        part.seek(offset)
+        remaining = length
+        while remaining:
+            data = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            digest.update(data)
+            part.write(data)
+            remaining -= len(data)
+        if remaining or digest.hexdigest() != sha256.lower():
+            part.truncate(offset)
+            raise UploadSessionError("Chunk checksum mismatch; send it again.", status=422, offset=offset)
+        part.flush()
+
+        session.received = offset + length
+        failure = _complete(session) if session.received == session.size else None
+        UploadSession.objects.filter(pk=session.pk, received=offset).update(
+            received=session.received, status=session.status, updated_at=timezone.now()
+        )
+    if failure:
+        raise failure
+    return session
+
+
+def _complete(session):
+    """Check the assembled file and mark the session complete; returns an UploadSessionError otherwise"""
+    rule = UPLOAD_RULES[session.view_name][session.field_name]
+    digest = hashlib.sha256()
+    with open(session.path, 'rb') as part:
+        head = part.read(SNIFF_BYTES)
+        digest.update(head)
+        for data in iter(lambda: part.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(data)
+
+    if not any(MAGIC_NUMBERS[extension](head) for extension in rule.types):
+        session.received = 0
+        open(session.path, 'wb').close()
+        return UploadSessionError(f"{field_label(session.field_name)} is not a valid {rule.types_text()} file.")
+    if session.sha256 and digest.hexdigest() != session.sha256:
+        session.received = 0
+        open(session.path, 'wb').close()
+        return UploadSessionError("File checksum mismatch; the upload was restarted.", status=422, offset=0)
+    session.status = 'complete'
+    return None
+
+
+def discard_session(session):
+    try:
+        os.remove(session.path)
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+# ---- Form posts ----
+class AssembledUpload(UploadedFile):
+    """A completed session's file; FileSystemStorage moves it into place like a TemporaryUploadedFile"""
+
+    def __init__(self, session):
+        super().__init__(open(session.path, 'rb'), session.file_name, session.content_type or None, session.size)
+        self.session = session
+
+    def temporary_file_path(self):
+        return self.session.path
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # The file was moved into storage and its temp name is gone
+            pass
+
+
+def attach_uploads(request, view_name):
+    """Add the completed sessions named by `<field>_upload_id` values to request.FILES; returns an error or None"""
+    wanted = {}
+    for key in request.POST:
+        if key.endswith(UPLOAD_ID_SUFFIX):
+            field_name = key[:-len(UPLOAD_ID_SUFFIX)]
+            for session_id in request.POST.getlist(key):
+                try:
+                    wanted[uuid.UUID(session_id)] = field_name
+                except ValueError:
+                    return f"Invalid upload reference for {field_label(field_name)}."
+    if not wanted:
+        return None
+
+    sessions = {
+        session.pk: session for session in UploadSession.objects.filter(
+            pk__in=list(wanted), user=request.user, view_name=view_name, status='complete'
+        )
+    }
+
+    for session_id, field_name in wanted.items():
+        session = sessions.get(session_id)
+        if session is None or session.field_name != field_name or not os.path.exists(session.path):
+            return f"The upload for {field_label(field_name)} has expired; please attach the file again."
+        request.FILES.appendlist(field_name, AssembledUpload(session))
+    return None
+
+
+class ChunkedUploadMixin:
+    """Lets the view's form posts reference completed upload sessions; put it after LoginRequiredMixin"""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'POST' and request.user.is_authenticated:
+            error = attach_uploads(request, request.resolver_match.view_name)
+            if error:
+                return JsonResponse({'success': False, 'error': error, 'message': error}, status=400)
+        return super().dispatch(request, *args, **kwargs)
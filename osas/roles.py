@@ -0,0 +1,311 @@
+"""
+Role-to-permission registry.
+
+Every CustomUser.USER_TYPE_CHOICES role (except OSAS Staff, who are superusers)
+and the approved-organization role map to one auth.Group. The groups are built
+by sync_role_groups() (run from post_migrate and the sync_role_groups
+management command), so approving an account is a single groups.add().
+"""
+import logging
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger('osas')
+
+ORGANIZATION_ROLE = 'organization'
+
+# Granted when an organization registration is approved (full CRUD on each model)
+ORGANIZATION_ROLE_MODELS = ('organization', 'announcement', 'certificate', 'accomplishmentrecord', 'supportingfile')
+
+# Group permission sets live in the default cache, which every worker shares (CACHES in settings; osas.identity
+# refuses a per-process one), so invalidate_group_permissions() reaches all of them at once. The timeout only
+# bounds changes that bypass the m2m_changed signal, such as raw SQL or loaddata
+GROUP_PERMISSION_CACHE_TIMEOUT = 300
+
+_group_ids = {}
+
+
+def role_group_name(role):
+    from .models import CustomUser
+
+    if role == ORGANIZATION_ROLE:
+        return 'Role: Approved Organization'
+    return f"Role: {dict(CustomUser.USER_TYPE_CHOICES)[role]}"
+
+
+def registered_roles():
+    """Every role that owns a group; OSAS Staff (1) are superusers and need none"""
+    from .models import CustomUser
+
+    return [role for role, _ in CustomUser.USER_TYPE_CHOICES if role != 1] + [ORGANIZATION_ROLE]
+
+
+def should_assign_permission(perm, role):
+    """Whether a user of the given user_type is granted `perm` on approval"""
+    perm_name = perm.name.lower()
+    codename = perm.codename.lower()
+    content_type = perm.content_type.model.lower()
+
+    # Organization - Give full access to user types 1 and 10
+    if 'organization' in content_type or 'organization' in perm_name:
+        return role in [1, 10]
+
+    # Students (#14) get NO announcement permissions at all
+    if role == 14 and ('announcement' in perm_name or 'announcement' in content_type):
+        return False
+
+    # OJT Adviser (16) gets ALL announcement permissions (view, add, change, delete)
+    if role == 16 and ('announcement' in perm_name or 'announcement' in content_type):
+        return True
+
+    # Common permissions for all non-superadmin roles (except students and OJT Adviser)
+    if role != 14 and ('announcement' in perm_name or 'announcement' in content_type):
+        return True
+
+    # OJT Permissions
+    if ('ojt' in perm_name or 'ojt' in codename or
+            'on-the-job' in perm_name or 'on_the_job' in codename or
+            'ojtcompany' in content_type or 'ojtapplication' in content_type or
+            'ojtreport' in content_type or 'ojtrequirement' in content_type):
+
+        if role in [1, 13, 16]:  # Super Admin, Job Placement, OJT Adviser
+            return True
+
+        # Student (type 14) permissions
+        elif role == 14:
+            # View only for OJT Company
+            if 'ojtcompany' in codename:
+                return 'view' in codename
+
+            # All access for OJT Application, Reports and Requirements
+            return any(name in codename for name in ('ojtapplication', 'ojtreport', 'ojtrequirement'))
+
+        return False
+
+    # Student Admission permissions for specific roles
+    if 'student admission' in perm_name or 'studentadmission' in codename:
+        return role in [1, 12, 14]  # Super Admin, Admission, Student
+
+    # Scholarship Role (5) gets all scholarship permissions
+    if role == 5 and ('scholarship' in perm_name or 'scholarship' in codename):
+        return True
+
+    # All roles get complaint permissions
+    if 'complaint' in perm_name or 'complaint' in codename:
+        return True
+
+    # Only OSAS Staff, NSTP, and Student can access
+    if 'nstpstudentinfo' in codename:
+        return role in [1, 2, 14]
+
+    if 'nstpfile' in codename:
+        return role in [1, 2]
+
+    is_downloadable = 'downloadable' in perm_name or 'downloadable' in content_type
+    can_view_or_add = 'downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name)
+
+    # OJT Adviser permissions - all downloadables plus content type viewing
+    if role == 16 and (is_downloadable or 'view content type' in perm_name):
+        return True
+
+    # Scholarship, SDS and Job Placement get ALL downloadable permissions
+    if role in [5, 10, 13]:
+        return is_downloadable or can_view_or_add
+
+    # Other OSAS units can view and add downloadables
+    if role in [2, 3, 4, 6, 7, 8, 9, 11, 12]:
+        return can_view_or_add
+
+    if role == 14:  # Student
+        return (('downloadable' in perm_name and 'view' in perm_name) or
+                ('scholarship application' in perm_name and
+                 ('view' in perm_name or 'change' in perm_name or 'delete' in perm_name)))
+
+    return False
+
+
+def role_permissions(role, all_permissions):
+    if role == ORGANIZATION_ROLE:
+        return [
+            perm for perm in all_permissions
+            if perm.content_type.app_label == 'osas' and perm.content_type.model in ORGANIZATION_ROLE_MODELS
+        ]
+    return [perm for perm in all_permissions if should_assign_permission(perm, role)]
+
+
+def sync_role_groups(verbosity=0, **kwargs):
+    """Create or update one group per role; safe to run repeatedly"""
+    all_permissions = list(Permission.objects.select_related('content_type'))
+    summary = {}
+
+    for role in registered_roles():
+        group, _ = Group.objects.get_or_create(name=role_group_name(role))
+        permissions = role_permissions(role, all_permissions)
+        group.permissions.set(permissions)
+        _group_ids[role] = group.pk
+        summary[group.name] = len(permissions)
+
+        if verbosity >= 2:
+            print(f"{group.name}: {len(permissions)} permissions")
+
+    return summary
+
+
+def get_role_group_id(role):
+    """Group id for a role, cached for the life of the process"""
+    group_id = _group_ids.get(role)
+    if group_id is None:
+        group_id = Group.objects.filter(name=role_group_name(role)).values_list('pk', flat=True).first()
+        if group_id is None:
+            logger.warning("Role groups missing; running sync_role_groups()")
+            sync_role_groups()
+            group_id = _group_ids[role]
+        _group_ids[role] = group_id
+    return group_id
+
+
+def assign_role_group(user, role=None):
+    """
+    Put the user in the group for `role` (defaults to user.user_type). A user-type
+    role replaces any other user-type role group; the organization role is additive.
+    """
+    role = user.user_type if role is None else role
+
+    if role != ORGANIZATION_ROLE:
+        other_roles = [other for other in registered_roles() if other not in (role, ORGANIZATION_ROLE)]
+        stale = list(user.groups.filter(name__in=[role_group_name(other) for other in other_roles]))
+        if stale:
+            user.groups.remove(*stale)
+
+    if role in registered_roles():
+        user.groups.add(get_role_group_id(role))
+
+
+def backfill_role_groups():
+    """Put already-verified users and approved organizations into their role groups"""
+    from .models import CustomUser, Organization
+
+    membership = CustomUser.groups.through
+    rows = []
+    for role in registered_roles():
+        if role == ORGANIZATION_ROLE:
+            user_ids = Organization.objects.filter(
+                user_account__isnull=False, organization_approved_at__isnull=False
+            ).values_list('user_account_id', flat=True)
+        else:
+            user_ids = CustomUser.objects.filter(user_type=role, is_verified=True).values_list('pk', flat=True)
+
+        group_id = get_role_group_id(role)
+        rows.extend(membership(customuser_id=user_id, group_id=group_id) for user_id in user_ids)
+
+    membership.objects.bulk_create(rows, ignore_conflicts=True, batch_size=1000)
+    return len(rows)
+
+
+def bulk_assign_role_groups(users):
+    """assign_role_group() for many users at once; also drops their direct permissions"""
+    from .models import CustomUser
+
+    users = [user for user in users if user.user_type in registered_roles()]
+    if not users:
+        return
+
+    user_ids = [user.pk for user in users]
+    CustomUser.user_permissions.through.objects.filter(customuser_id__in=user_ids).delete()
+
+    membership = CustomUser.groups.through
+    user_type_group_ids = [get_role_group_id(role) for role in registered_roles() if role != ORGANIZATION_ROLE]
+    membership.objects.filter(customuser_id__in=user_ids, group_id__in=user_type_group_ids).delete()
+    membership.objects.bulk_create(
+        [membership(customuser_id=user.pk, group_id=get_role_group_id(user.user_type)) for user in users],
+        ignore_conflicts=True, batch_size=1000
+    )
+
+
+class UserRoles:
+    """Role flags for one authenticated user, resolved once per request (request.user_roles)"""
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = user.is_authenticated
+        self.user_type = getattr(user, 'user_type', None)
+        self.is_superuser = user.is_superuser
+        self.is_admin = self.is_superuser or self.user_type == 1
+        self.is_organization = self.user_type == 15
+        self.is_student = self.user_type == 14
+        self.organization = user.organization if self.is_authenticated else None
+
+    def in_units(self, *user_types):
+        """Superusers, OSAS Staff or any of the given user types"""
+        return self.is_admin or self.user_type in user_types
+
+
+# ---- Permission checks ----
+def _group_permissions_key(group_id):
+    return f'osas:group-perms:{group_id}'
+
+
+class RoleGroupBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with its organization and
+    course, and caches each group's permission set instead of joining per user.
+    """
+
+    def get_user(self, user_id):
+        from .models import CustomUser
+
+        try:
+            user = CustomUser._default_manager.select_related('organization_account', 'course').get(pk=user_id)
+        except CustomUser.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def _cached_group_permissions(self, user_obj):
+        group_ids = list(user_obj.groups.values_list('pk', flat=True))
+        if not group_ids:
+            return set()
+
+        cached = cache.get_many([_group_permissions_key(group_id) for group_id in group_ids])
+        missing = [group_id for group_id in group_ids if _group_permissions_key(group_id) not in cached]
+        perms = set().union(*cached.values()) if cached else set()
+
+        if missing:
+            by_group = {group_id: set() for group_id in missing}
+            rows = Permission.objects.filter(group__in=missing).values_list(
+                'group', 'content_type__app_label', 'codename'
+            )
+            for group_id, app_label, codename in rows:
+                by_group[group_id].add(f"{app_label}.{codename}")
+            cache.set_many(
+                {_group_permissions_key(group_id): codes for group_id, codes in by_group.items()},
+                GROUP_PERMISSION_CACHE_TIMEOUT
+            )
+            perms = perms.union(*by_group.values())
+
+        return perms
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_group_perm_cache'):
+            if user_obj.is_superuser:
+                user_obj._group_perm_cache = super().get_group_permissions(user_obj)
+            else:
+                user_obj._group_perm_cache = self._cached_group_permissions(user_obj)
+        return user_obj._group_perm_cache
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Group):
+        cache.delete(_group_permissions_key(instance.pk))
+    elif pk_set:
+        cache.delete_many([_group_permissions_key(group_id) for group_id in pk_set])
+    else:
+        cache.delete_many([_group_permissions_key(group_id) for group_id in Group.objects.values_list('pk', flat=True)])
@@ -0,0 +1,581 @@
+"""
+Row serializers for the dashboard AJAX lists.
+
+A ListSerializer declares its output as (json_key, Field) pairs. Choice labels
+are resolved once per class, permission flags once per request (get_flags), so
+the per-row cost is plain attribute access. FastJsonResponse encodes with
+orjson when it is installed and falls back to Django's encoder otherwise.
+"""
+import json
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.encoding import force_str
+
+from .file_metadata import file_metadata, file_size, prefetch_metadata
+from .images import srcset, variant_url
+from .models import (CustomUser, StudentAdmission, Announcement, Complaint, NSTPStudentInfo, NSTPFile, Scholarship,
+                     ScholarshipApplication, OJTCompany, Organization, Certificate, AccomplishmentRecord,
+                     UserActivityLog)
+
+try:
+    import orjson
+except ImportError:  # Optional fast path
+    orjson = None
+
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def json_dumps(data):
+    """Encode to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_django_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+class FastJsonResponse(HttpResponse):
+    """Drop-in for JsonResponse(dict) backed by json_dumps()"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=json_dumps(data), **kwargs)
+
+
+# ---- Fields ----
+class Field:
+    """
+    Reads a dotted attribute path (defaults to the JSON key). Bound methods at the
+    end of the path are called. `default` replaces None and empty strings.
+    """
+
+    def __init__(self, source=None, default=None):
+        self.source = source
+        self.default = default
+
+    def bind(self, name, model):
+        self.name = name
+        self.path = (self.source or name).split('.')
+
+    def get_value(self, obj):
+        value = obj
+        for attr in self.path:
+            if value is None:
+                return None
+            try:
+                value = getattr(value, attr)
+            except ObjectDoesNotExist:
+                return None
+        if callable(value):
+            value = value()
+        return value
+
+    def to_representation(self, value):
+        return value
+
+    def serialize(self, obj, serializer):
+        value = self.get_value(obj)
+        if value is None or value == '':
+            return value if self.default is None else self.default
+        return self.to_representation(value)
+
+
+class ChoiceField(Field):
+    """get_FOO_display() through a label map built once from the model field"""
+
+    def bind(self, name, model):
+        super().bind(name, model)
+        field = None
+        for attr in self.path:
+            field = model._meta.get_field(attr)
+            model = field.related_model
+        self.labels = dict(field.flatchoices)
+
+    def to_representation(self, value):
+        return force_str(self.labels.get(value, value), strings_only=True)
+
+
+class IsoField(Field):
+    def to_representation(self, value):
+        return value.isoformat()
+
+
+class DateFormatField(Field):
+    def __init__(self, date_format, source=None, default=None):
+        super().__init__(source, default)
+        self.date_format = date_format
+
+    def to_representation(self, value):
+        return value.strftime(self.date_format)
+
+
+class FileUrlField(Field):
+    def serialize(self, obj, serializer):
+        value = self.get_value(obj)
+        return value.url if value else self.default
+
+
+class FileSizeField(Field):
+    """Size from the stored file metadata; list it in the serializer's file_fields"""
+
+    def serialize(self, obj, serializer):
+        value = self.get_value(obj)
+        return file_size(value) if value else self.default
+
+
+class ImageField(Field):
+    """Original URL plus the responsive variants (see osas/images.py) of an uploaded image"""
+
+    def serialize(self, obj, serializer):
+        value = self.get_value(obj)
+        return image_payload(value) if value else self.default
+
+
+def image_payload(value, widths=None):
+    """URLs of an image and its variants; `widths` as looked up already by an async view"""
+    return {
+        'url': value.url,
+        'thumbnail': variant_url(value, 320, widths=widths),
+        'srcset': srcset(value, widths=widths),
+        'srcset_jpeg': srcset(value, 'jpg', widths=widths),
+    }
+
+
+class FlagField(Field):
+    """A per-request flag from serializer.get_flags()"""
+
+    def serialize(self, obj, serializer):
+        return serializer.flags[self.source or self.name]
+
+
+class ConstantField(Field):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def serialize(self, obj, serializer):
+        return self.value
+
+
+class MethodField(Field):
+    """Calls func(obj, serializer) for values that depend on several columns"""
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+
+    def serialize(self, obj, serializer):
+        return self.func(obj, serializer)
+
+
+class ListSerializer:
+    model = None
+    fields = ()
+    # File fields whose metadata (osas/file_metadata.py) is looked up for the whole page at once
+    file_fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, field in cls.fields:
+            field.bind(name, cls.model)
+
+    def __init__(self, request, **context):
+        self.request = request
+        self.user = request.user
+        self.context = context
+        self.flags = self.get_flags()
+
+    def get_flags(self):
+        return {}
+
+    def serialize(self, objects):
+        fields = self.fields
+        if self.file_fields:
+            objects = list(objects)
+            prefetch_metadata(objects, *self.file_fields)
+        return [{name: field.serialize(obj, self) for name, field in fields} for obj in objects]
+
+
+def _crud_flags(user, model_name):
+    return {
+        'can_view': user.has_perm(f'osas.view_{model_name}'),
+        'can_edit': user.has_perm(f'osas.change_{model_name}'),
+        'can_delete': user.has_perm(f'osas.delete_{model_name}'),
+    }
+
+
+# ---- Dashboard lists ----
+def _user_names(user):
+    """(first_name, last_name, display_name) as shown in the users table"""
+    if user.is_organization and hasattr(user, 'organization_account'):
+        display_name = user.organization_account.organization_name
+        return display_name, '', display_name
+    first_name = user.first_name or ''
+    last_name = user.last_name or ''
+    return first_name, last_name, f"{first_name} {last_name}".strip() or user.username
+
+
+class UserListSerializer(ListSerializer):
+    model = CustomUser
+    fields = (
+        ('id', Field()),
+        ('first_name', MethodField(lambda user, s: _user_names(user)[0])),
+        ('last_name', MethodField(lambda user, s: _user_names(user)[1])),
+        ('display_name', MethodField(lambda user, s: _user_names(user)[2])),
+        ('username', Field()),
+        ('user_type', ChoiceField()),
+        ('is_verified', Field()),
+        ('is_active', Field()),
+        ('date_joined', IsoField()),
+        ('is_organization', Field()),
+        ('can_edit', FlagField()),
+        ('can_delete', FlagField()),
+        ('can_view', FlagField()),
+        ('can_approve', MethodField(lambda user, s: not user.is_verified and s.flags['can_edit'])),
+    )
+
+    def get_flags(self):
+        return _crud_flags(self.user, 'customuser')
+
+
+class AdmissionListSerializer(ListSerializer):
+    model = StudentAdmission
+    fields = (
+        ('id', Field()),
+        ('control_no', Field()),
+        ('student_name', MethodField(
+            lambda a, s: f"{a.user.last_name}, {a.user.first_name}" if a.user else '(No user associated)'
+        )),
+        ('student_type', Field()),
+        ('student_type_display', ChoiceField('student_type')),
+        ('course', Field('course.name', default='')),
+        ('status', Field()),
+        ('status_display', ChoiceField('status')),
+        ('remarks', Field()),
+        ('created_at', IsoField()),
+        ('can_approve', FlagField()),
+        ('can_edit', MethodField(lambda a, s: s.flags['not_student'] or a.status != 'done')),
+        ('can_archive', MethodField(lambda a, s: s.flags['not_student'] or a.status != 'done')),
+    )
+
+    def get_flags(self):
+        return {
+            'can_approve': self.user.is_superuser or self.user.user_type in [1, 12],
+            'not_student': not self.user.is_student,
+        }
+
+
+def _can_manage_announcement(flag):
+    return lambda a, s: s.flags[flag] and (a.author_id == s.user.id or s.user.is_superuser)
+
+
+class AnnouncementListSerializer(ListSerializer):
+    model = Announcement
+    fields = (
+        ('id', Field()),
+        ('title', Field()),
+        ('category', ChoiceField()),
+        ('category_value', Field('category')),
+        ('author_name', Field('author.get_full_name')),
+        ('created_at', IsoField()),
+        ('is_published', Field()),
+        ('can_view', FlagField()),
+        ('can_edit', MethodField(_can_manage_announcement('change'))),
+        ('can_delete', MethodField(_can_manage_announcement('delete'))),
+    )
+
+    def get_flags(self):
+        return {
+            'can_view': self.user.has_perm('osas.view_announcement'),
+            'change': self.user.has_perm('osas.change_announcement'),
+            'delete': self.user.has_perm('osas.delete_announcement'),
+        }
+
+
+def _next_hearing_display(complaint, serializer):
+    next_hearing = complaint.next_hearing
+    if not next_hearing:
+        return None
+    return (f"{next_hearing.schedule_date.strftime('%b %d, %Y')} "
+            f"{next_hearing.schedule_time.strftime('%I:%M %p')}")
+
+
+def _owner_or_complaint_admin(complaint, serializer):
+    return complaint.created_by_id == serializer.user.id or serializer.flags['is_admin']
+
+
+class ComplaintListSerializer(ListSerializer):
+    """Pass status=<requested tab> as context; resolved tabs never offer "resolve" """
+    model = Complaint
+    fields = (
+        ('id', Field()),
+        ('reference_number', Field()),
+        ('title', Field()),
+        ('complainant_first_name', Field()),
+        ('complainant_last_name', Field()),
+        ('incident_date', IsoField()),
+        ('created_at', IsoField()),
+        ('updated_at', IsoField()),
+        ('status', Field()),
+        ('status_display', ChoiceField('status')),
+        ('next_hearing_display', MethodField(_next_hearing_display)),
+        ('hearing_count', MethodField(lambda c, s: getattr(c, 'hearing_count', 0))),
+        ('can_view', MethodField(_owner_or_complaint_admin)),
+        ('can_edit', MethodField(_owner_or_complaint_admin)),
+        ('can_delete', MethodField(_owner_or_complaint_admin)),
+        ('can_resolve', FlagField()),
+    )
+
+    def get_flags(self):
+        is_admin = self.user.is_superuser or self.user.user_type in [1, 11]
+        return {
+            'is_admin': is_admin,
+            'can_resolve': is_admin and self.context.get('status') != 'resolved',
+        }
+
+
+class NSTPEnlistmentListSerializer(ListSerializer):
+    model = NSTPStudentInfo
+    fields = (
+        ('id', Field()),
+        ('student_number', Field()),
+        ('first_name', Field()),
+        ('last_name', Field()),
+        ('program', Field()),
+        ('semester', Field()),
+        ('approval_status', Field()),
+        ('approval_status_display', ChoiceField('approval_status')),
+        ('created_at', DateFormatField('%Y-%m-%d')),
+        ('can_approve', FlagField()),
+        ('can_edit', MethodField(lambda e, s: e.approval_status == 'pending' or s.flags['can_approve'])),
+        ('can_archive', MethodField(lambda e, s: e.approval_status == 'pending' or s.flags['can_approve'])),
+    )
+
+    def get_flags(self):
+        return {'can_approve': self.user.is_superuser or self.user.user_type in [1, 2]}
+
+
+NSTP_FILE_ICONS = {
+    'pdf': 'bx bxs-file-pdf',
+    'word': 'bx bxs-file-doc',
+    'excel': 'bx bxs-file-xls',
+}
+
+
+def _file_icon(nstp_file, serializer):
+    metadata = file_metadata(nstp_file.file)
+    return NSTP_FILE_ICONS.get(metadata.kind if metadata else '', 'bx bxs-file')
+
+
+class NSTPFileListSerializer(ListSerializer):
+    model = NSTPFile
+    fields = (
+        ('id', Field()),
+        ('title', Field()),
+        ('description', Field(default="No description provided")),
+        ('category', Field()),
+        ('category_display', ChoiceField('category')),
+        ('semester', Field()),
+        ('semester_display', ChoiceField('semester')),
+        ('school_year', Field()),
+        ('created_at', IsoField()),
+        ('file_url', FileUrlField('file')),
+        ('file_size', FileSizeField('file')),
+        ('file_icon', MethodField(_file_icon)),
+        ('can_view', FlagField()),
+        ('can_edit', FlagField()),
+        ('can_delete', FlagField()),
+    )
+    file_fields = ('file',)
+
+    def get_flags(self):
+        return _crud_flags(self.user, 'nstpfile')
+
+
+class ScholarshipListSerializer(ListSerializer):
+    model = Scholarship
+    fields = (
+        ('id', Field()),
+        ('name', Field()),
+        ('type', Field('scholarship_type')),
+        ('type_display', ChoiceField('scholarship_type')),
+        ('is_active', Field()),
+        ('created_at', IsoField()),
+        ('can_view', FlagField()),
+        ('can_edit', FlagField()),
+        ('can_delete', FlagField()),
+    )
+
+    def get_flags(self):
+        return _crud_flags(self.user, 'scholarship')
+
+
+class ScholarshipApplicationListSerializer(ListSerializer):
+    model = ScholarshipApplication
+    fields = (
+        ('id', Field()),
+        ('student_name', Field('student.get_full_name', default='Unknown')),
+        ('scholarship_name', Field('scholarship.name', default='Unknown')),
+        ('application_date', IsoField()),
+        ('status', Field()),
+        ('status_display', ChoiceField('status')),
+        ('application_form_url', FileUrlField('application_form')),
+        ('cog_url', FileUrlField('cog')),
+        ('cor_url', FileUrlField('cor')),
+        ('can_approve', FlagField()),
+        ('can_edit', MethodField(lambda a, s: a.status == 'pending' or s.flags['can_approve'])),
+        ('can_archive', MethodField(lambda a, s: a.status == 'pending' or s.flags['can_approve'])),
+    )
+
+    def get_flags(self):
+        return {'can_approve': self.user.is_superuser or self.user.user_type in [1, 5]}
+
+
+class OJTCompanyListSerializer(ListSerializer):
+    model = OJTCompany
+    fields = (
+        ('id', Field()),
+        ('name', Field()),
+        ('address', Field()),
+        ('contact_number', Field()),
+        ('email', Field(default='')),
+        ('description', Field(default='')),
+        ('website', Field(default='')),
+        ('status', Field()),
+        ('status_display', ChoiceField('status')),
+        ('is_archived', Field()),
+        ('created_at', IsoField()),
+        ('updated_at', IsoField()),
+        ('can_edit', FlagField('can_manage')),
+        ('can_archive', FlagField('can_manage')),
+        ('can_change_status', FlagField('can_manage')),
+        ('can_view', ConstantField(True)),
+        ('current_user_type', FlagField()),
+        ('is_superuser', FlagField()),
+    )
+
+    def get_flags(self):
+        return {
+            # User type 1 (Super Admin) and 13 (Job Placement) can edit/archive/change status
+            'can_manage': self.user.is_superuser or self.user.user_type in [1, 13],
+            'current_user_type': self.user.user_type,
+            'is_superuser': self.user.is_superuser,
+        }
+
+
+class OrganizationListSerializer(ListSerializer):
+    model = Organization
+    fields = (
+        ('id', Field()),
+        ('organization_name', Field()),
+        ('organization_acronym', Field()),
+        ('organization_email', Field()),
+        ('organization_type', Field()),
+        ('organization_type_display', ChoiceField('organization_type')),
+        ('organization_status', Field()),
+        ('organization_status_display', ChoiceField('_organization_status')),
+        ('organization_valid_until', IsoField()),
+        ('renew_count', Field()),
+        ('organization_member_count', Field()),
+        ('organization_logo_url', FileUrlField('organization_logo')),
+        ('organization_logo', ImageField()),
+        ('created_at', IsoField()),
+        ('all_requirements_submitted', Field()),
+        ('organization_needs_renewal', Field()),
+        ('can_edit', FlagField()),
+        ('can_archive', FlagField('can_edit')),
+        ('can_approve', MethodField(
+            lambda org, s: s.flags['can_edit'] and org.organization_status == 'pending'
+                           and org.all_requirements_submitted
+        )),
+        ('can_renew', MethodField(
+            lambda org, s: s.flags['can_edit'] and (org.organization_status == 'expired'
+                                                    or org.organization_needs_renewal)
+        )),
+        ('can_reactivate', MethodField(
+            lambda org, s: s.flags['can_edit'] and org.organization_status == 'cancelled'
+        )),
+        ('can_view', ConstantField(True)),
+    )
+
+    def get_flags(self):
+        return {'can_edit': self.user.is_superuser or self.user.user_type in [1, 10]}
+
+
+def _certificate_file_type(certificate, serializer):
+    name = certificate.certificate_file.name if certificate.certificate_file else ''
+    return 'pdf' if name.lower().endswith('.pdf') else 'image'
+
+
+class CertificateListSerializer(ListSerializer):
+    model = Certificate
+    fields = (
+        ('id', Field()),
+        ('certificate_number', Field()),
+        ('organization_name', Field('organization.organization_name')),
+        ('organization_acronym', Field('organization.organization_acronym')),
+        ('organization_type', Field('organization.organization_type')),
+        ('organization_type_display', ChoiceField('organization.organization_type')),
+        ('issue_date', IsoField()),
+        ('venue', Field()),
+        ('certificate_url', FileUrlField('certificate_file')),
+        ('file_type', MethodField(_certificate_file_type)),
+        ('created_at', IsoField()),
+        ('generated_by', Field('generated_by.get_full_name', default='System')),
+        ('can_download', ConstantField(True)),
+        ('can_view', ConstantField(True)),
+    )
+
+
+def _can_edit_report(report, serializer):
+    if serializer.flags['is_admin']:
+        return True
+    is_owner = bool(report.organization and report.organization.user_account_id
+                    and report.organization.user_account_id == serializer.user.id)
+    return serializer.flags['is_organization'] and is_owner
+
+
+class AccomplishmentReportListSerializer(ListSerializer):
+    model = AccomplishmentRecord
+    fields = (
+        ('id', Field()),
+        ('title', Field()),
+        ('organization_name', Field('organization.organization_name', default='N/A')),
+        ('organization_acronym', Field('organization.organization_acronym', default='N/A')),
+        ('record_type', Field()),
+        ('record_type_display', ChoiceField('record_type')),
+        ('date_conducted', IsoField()),
+        ('venue', Field(default='Not specified')),
+        ('semester', Field()),
+        ('semester_display', ChoiceField('semester')),
+        ('school_year', Field()),
+        ('number_of_participants', Field()),
+        ('duration_hours', MethodField(lambda r, s: float(r.duration_hours))),
+        ('budget_utilized', MethodField(lambda r, s: float(r.budget_utilized) if r.budget_utilized else None)),
+        ('submitted_by', Field('submitted_by.get_full_name', default='Unknown')),
+        ('submitted_at', IsoField('created_at')),
+        ('has_main_report', MethodField(lambda r, s: bool(r.main_report))),
+        ('can_edit', MethodField(_can_edit_report)),
+        ('can_archive', MethodField(_can_edit_report)),
+        ('can_view', ConstantField(True)),
+    )
+
+    def get_flags(self):
+        return {
+            'is_admin': self.user.is_superuser or self.user.user_type in [1, 10],
+            'is_organization': self.user.user_type == 15,
+        }
+
+
+class ActivityListSerializer(ListSerializer):
+    model = UserActivityLog
+    fields = (
+        ('id', Field()),
+        ('user', Field('user.get_full_name')),
+        ('activity', Field()),
+        ('timestamp', IsoField()),
+        ('user_type', ChoiceField('user.user_type')),
+        ('ip_address', MethodField(lambda a, s: getattr(a, 'ip_address', None))),
+        ('details', MethodField(lambda a, s: getattr(a, 'details', None))),
+    )
@@ -0,0 +1,232 @@
+"""
+Deduplicating media storage.
+
+DedupFileSystemStorage is the default storage. Every saved file is hashed
+(SHA-256) while it is spooled, and its content is kept once as a blob under
+`_blobs/<ab>/<cd>/<sha256>` in MEDIA_ROOT. The names FileFields keep are
+unchanged (`upload_to` still applies): a StoredFile row maps each name to its
+StoredBlob, and the blob's ref_count tracks how many names point at it. A blob
+is removed only after the delete that dropped it to zero references commits.
+
+Blobs also carry the content's sniffed MIME type and image dimensions (see
+osas/file_metadata.py), filled when the content is first stored.
+
+Names without a StoredFile row are plain files under MEDIA_ROOT, as before;
+`dedupe_media` moves those into the blob store. path() resolves a name to the
+blob, so code that reads files by path keeps working; nothing may write to
+path() in place, replace() swaps a name's content instead.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .file_metadata import sniff
+from .models import StoredBlob, StoredFile
+
+BLOB_DIRECTORY = '_blobs'
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class DedupFileSystemStorage(FileSystemStorage):
+
+    # ---- Blobs ----
+    def blob_path(self, digest):
+        return os.path.join(self.location, BLOB_DIRECTORY, digest[:2], digest[2:4], digest)
+
+    def plain_path(self, name):
+        """Where `name` would be as a plain file; path() resolves stored names to their blob instead"""
+        return FileSystemStorage.path(self, name)
+
+    def _remove_plain(self, name):
+        try:
+            os.remove(self.plain_path(name))
+        except FileNotFoundError:
+            pass
+
+    def _spool(self, content):
+        """(sha256, size, path) of a file holding `content` that the storage may move or remove"""
+        digest = hashlib.sha256()
+        if hasattr(content, 'temporary_file_path'):
+            # Already on disk (large uploads, assembled chunked uploads): hash it and move it, like FileSystemStorage
+            path = content.temporary_file_path()
+            with open(path, 'rb') as source:
+                for data in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(data)
+            return digest.hexdigest(), os.path.getsize(path), path
+
+        directory = os.path.join(self.location, BLOB_DIRECTORY, 'tmp')
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=directory, suffix='.upload')
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for data in content.chunks():
+                    if isinstance(data, str):
+                        data = data.encode()
+                    digest.update(data)
+                    target.write(data)
+                    size += len(data)
+        except BaseException:
+            os.remove(path)
+            raise
+        return digest.hexdigest(), size, path
+
+    def _link(self, name, digest, size, source, replace=False):
+        """
+        Point `name` at the blob `digest`, moving `source` into the blob store
+        unless that content is stored already. Must run inside an atomic block.
+        Raises FileExistsError if `name` is taken and `replace` is False.
+        """
+        StoredBlob.objects.get_or_create(sha256=digest, defaults={'size': size})
+        # Serializes against _collect() removing the same blob
+        blob = StoredBlob.objects.select_for_update().get(pk=digest)
+        if not blob.content_type:
+            blob.content_type, blob.width, blob.height = sniff(source, name)
+            blob.save(update_fields=['content_type', 'width', 'height'])
+
+        stored = StoredFile.objects.select_for_update().filter(name=name).first()
+        if stored is None:
+            if not replace and os.path.lexists(self.plain_path(name)):
+                raise FileExistsError(name)
+            try:
+                with transaction.atomic():
+                    StoredFile.objects.create(name=name, blob_id=digest)
+            except IntegrityError:
+                raise FileExistsError(name)
+            if replace:
+                # A plain file the name used to be; its blob now shadows it
+                transaction.on_commit(lambda: self._remove_plain(name))
+        elif not replace:
+            raise FileExistsError(name)
+        elif stored.blob_id == digest:
+            os.remove(source)
+            return
+        else:
+            previous = stored.blob_id
+            stored.blob_id = digest
+            stored.save(update_fields=['blob'])
+            self._release(previous)
+        StoredBlob.objects.filter(pk=digest).update(ref_count=F('ref_count') + 1)
+
+        target = self.blob_path(digest)
+        if os.path.exists(target):
+            os.remove(source)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            file_move_safe(source, target, allow_overwrite=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(target, self.file_permissions_mode)
+
+    def _release(self, digest):
+        StoredBlob.objects.filter(pk=digest).update(ref_count=F('ref_count') - 1)
+        # Only once the delete is final; a rolled back transaction still needs the blob
+        transaction.on_commit(lambda: self._collect(digest))
+
+    def _collect(self, digest):
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(pk=digest, ref_count__lte=0).first()
+            if blob is None:
+                return
+            blob.delete()
+            try:
+                os.remove(self.blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    # ---- Storage API ----
+    def _save(self, name, content):
+        digest, size, source = self._spool(content)
+        try:
+            while True:
+                try:
+                    with transaction.atomic():
+                        self._link(name, digest, size, source)
+                    break
+                except FileExistsError:
+                    # Taken since get_available_name(); same retry as FileSystemStorage
+                    name = self.get_available_name(name)
+        finally:
+            if os.path.exists(source) and not hasattr(content, 'temporary_file_path'):
+                os.remove(source)
+        return name.replace('\\', '/')
+
+    def replace(self, name, content):
+        """Give the existing `name` new content without renaming it"""
+        digest, size, source = self._spool(content)
+        try:
+            with transaction.atomic():
+                self._link(name, digest, size, source, replace=True)
+        finally:
+            if os.path.exists(source) and not hasattr(content, 'temporary_file_path'):
+                os.remove(source)
+
+    def adopt(self, name):
+        """Move the plain file `name` into the blob store; returns the blob's sha256, or None if it is stored already"""
+        if StoredFile.objects.filter(name=name).exists():
+            return None
+        path = self.plain_path(name)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as source:
+            for data in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+                digest.update(data)
+        with transaction.atomic():
+            # Moves (or, for a duplicate, removes) the plain file itself; no copy is made
+            self._link(name, digest.hexdigest(), os.path.getsize(path), path, replace=True)
+        return digest.hexdigest()
+
+    def alias(self, name, new_name, max_length=None):
+        """Make the content of `name` available under `new_name` too, without copying it; returns the name used"""
+        self.adopt(name)
+        digest = StoredFile.objects.values_list('blob_id', flat=True).get(name=name)
+        while True:
+            new_name = self.get_available_name(new_name, max_length=max_length)
+            try:
+                with transaction.atomic():
+                    StoredBlob.objects.select_for_update().get(pk=digest)
+                    StoredFile.objects.create(name=new_name, blob_id=digest)
+                    StoredBlob.objects.filter(pk=digest).update(ref_count=F('ref_count') + 1)
+                return new_name
+            except IntegrityError:
+                continue
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None:
+                return self._remove_plain(name)
+            stored.delete()
+            self._release(stored.blob_id)
+
+    def exists(self, name):
+        return StoredFile.objects.filter(name=name).exists() or os.path.lexists(self.plain_path(name))
+
+    def path(self, name):
+        digest = StoredFile.objects.filter(name=name).values_list('blob_id', flat=True).first()
+        if digest is not None:
+            return self.blob_path(digest)
+        return super().path(name)
+
+    def listdir(self, path):
+        """Plain entries plus stored names; the blob store itself is not listed"""
+        try:
+            directories, files = super().listdir(path)
+        except FileNotFoundError:
+            directories, files = [], []
+        prefix = path.strip('/') + '/' if path.strip('/') else ''
+        if not prefix:
+            directories = [directory for directory in directories if directory != BLOB_DIRECTORY]
+
+        directories, files = set(directories), set(files)
+        for name in StoredFile.objects.filter(name__startswith=prefix).values_list('name', flat=True).iterator():
+            head, separator, _ = name[len(prefix):].partition('/')
+            (directories if separator else files).add(head)
+        return sorted(directories), sorted(files)
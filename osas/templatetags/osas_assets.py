@@ -0,0 +1,20 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from osas.assets import BUNDLES
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset_bundle(name):
+    """
+    {% asset_bundle 'css/dashboard/dashboard.bundle.css' %}: the <link> or
+    <script> tag of a bundle from osas/assets.py, or one per source file while
+    STATIC_BUNDLES is off.
+    """
+    names = [name] if settings.STATIC_BUNDLES else BUNDLES[name]
+    tag = '<link rel="stylesheet" href="{}">' if name.endswith('.css') else '<script src="{}"></script>'
+    return format_html_join('\n    ', tag, ((static(source),) for source in names))
@@ -0,0 +1,37 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from osas.images import srcset, stored_name, variant_url
+
+register = template.Library()
+
+
+@register.filter
+def image_variant(value, width):
+    """{{ organization.organization_logo|image_variant:320 }}: URL of the variant closest to `width`"""
+    return variant_url(value, int(width))
+
+
+@register.simple_tag
+def responsive_image(value, alt='', sizes='100vw', **attrs):
+    """
+    <picture> with WebP and JPEG srcsets of an uploaded image (a FieldFile or a
+    media path), falling back to a plain <img> until its variants exist.
+    Extra keyword arguments become <img> attributes, e.g. class="org-logo".
+    """
+    name = stored_name(value)
+    if not name:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    img_attrs = format_html_join('', ' {}="{}"', ((key.replace('_', '-'), val) for key, val in attrs.items()))
+    original = default_storage.url(name)
+
+    webp = srcset(value, 'webp')
+    if not webp:
+        return format_html('<img src="{}" alt="{}"{}>', original, alt, img_attrs)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}"{}></picture>',
+        webp, sizes, original, srcset(value, 'jpg'), sizes, alt, img_attrs,
+    )
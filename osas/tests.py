@@ -1,3 +1,285 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+
+from .bulk import BULK_ACTIONS, BulkActionError
+from .media import MEDIA_RULES, can_read_import_file, media_rule, protected_media
+from .models import CustomUser, ImportJob, StoredBlob, StoredFile
+from .pagination import KeysetPaginator
+from .references import encode_reference, is_valid_reference, issue_reference, next_counter_value
+from .roles import UserRoles
+from .storage import DedupFileSystemStorage
+
+
+def make_user(username, user_type=14, **fields):
+    return CustomUser.objects.create_user(
+        username=username, email=f'{username}@example.com', password='password', user_type=user_type, **fields
+    )
+
+
+# ---- Deduplicating storage ----
+class DedupStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = DedupFileSystemStorage(location=self.location)
+
+    def blob(self, name):
+        return StoredBlob.objects.get(pk=StoredFile.objects.get(name=name).blob_id)
+
+    def test_identical_content_shares_one_blob(self):
+        first = self.storage.save('docs/a.txt', ContentFile(b'same content'))
+        second = self.storage.save('docs/b.txt', ContentFile(b'same content'))
+
+        self.assertEqual(self.blob(first).pk, self.blob(second).pk)
+        self.assertEqual(self.blob(first).ref_count, 2)
+        self.assertEqual(StoredBlob.objects.count(), 1)
+        with self.storage.open(second) as stored:
+            self.assertEqual(stored.read(), b'same content')
+
+    def test_taken_name_gets_a_new_one(self):
+        first = self.storage.save('docs/a.txt', ContentFile(b'one'))
+        second = self.storage.save('docs/a.txt', ContentFile(b'two'))
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.blob(first).ref_count, 1)
+
+    def test_replace_moves_the_reference(self):
+        name = self.storage.save('docs/a.txt', ContentFile(b'old'))
+        old_blob = self.blob(name).pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.replace(name, ContentFile(b'new'))
+
+        self.assertEqual(self.blob(name).ref_count, 1)
+        self.assertFalse(StoredBlob.objects.filter(pk=old_blob).exists())
+        self.assertFalse(os.path.exists(self.storage.blob_path(old_blob)))
+        with self.storage.open(name) as stored:
+            self.assertEqual(stored.read(), b'new')
+
+    def test_replace_with_the_same_content_keeps_the_count(self):
+        name = self.storage.save('docs/a.txt', ContentFile(b'same'))
+        self.storage.replace(name, ContentFile(b'same'))
+        self.assertEqual(self.blob(name).ref_count, 1)
+
+    def test_delete_removes_the_blob_with_its_last_name(self):
+        first = self.storage.save('docs/a.txt', ContentFile(b'shared'))
+        second = self.storage.save('docs/b.txt', ContentFile(b'shared'))
+        digest = self.blob(first).pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(first)
+        self.assertEqual(StoredBlob.objects.get(pk=digest).ref_count, 1)
+        self.assertTrue(os.path.exists(self.storage.blob_path(digest)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.storage.delete(second)
+        self.assertFalse(StoredBlob.objects.filter(pk=digest).exists())
+        self.assertFalse(os.path.exists(self.storage.blob_path(digest)))
+        self.assertFalse(self.storage.exists(second))
+
+    def test_rolled_back_delete_keeps_the_blob(self):
+        name = self.storage.save('docs/a.txt', ContentFile(b'kept'))
+        digest = self.blob(name).pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.storage.delete(name)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.blob(name).ref_count, 1)
+        self.assertTrue(os.path.exists(self.storage.blob_path(digest)))
+
+
+# ---- Reference numbers ----
+class ReferenceTests(TestCase):
+    def test_counters_are_sequential_per_scope_and_year(self):
+        self.assertEqual([next_counter_value('test', 2026) for _ in range(3)], [1, 2, 3])
+        self.assertEqual(next_counter_value('other', 2026), 1)
+        self.assertEqual(next_counter_value('test', 2027), 1)
+        self.assertEqual(next_counter_value('test', 2026), 4)
+
+    def test_issued_references_follow_the_counter(self):
+        self.assertEqual(issue_reference('test', 2026), encode_reference(2026, 1))
+        self.assertEqual(issue_reference('test', 2026), encode_reference(2026, 2))
+
+    def test_encoding(self):
+        self.assertEqual(encode_reference(2026, 1), 'BAA-000001-U')
+        self.assertTrue(encode_reference(2026, 1_000_000).startswith('BAB-000000-'))
+        self.assertTrue(encode_reference(2027, 1).startswith('BBA-'))
+        with self.assertRaises(ValueError):
+            encode_reference(2026, 0)
+
+    def test_check_letter_catches_single_character_errors(self):
+        reference = encode_reference(2026, 123456)
+        self.assertTrue(is_valid_reference(reference))
+        self.assertTrue(is_valid_reference(reference.lower()))
+        for position, char in enumerate(reference):
+            if char == '-':
+                continue
+            alphabet = '0123456789' if char.isdigit() else 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+            for replacement in alphabet.replace(char, ''):
+                mistyped = reference[:position] + replacement + reference[position + 1:]
+                self.assertFalse(is_valid_reference(mistyped), mistyped)
+
+    def test_check_letter_catches_adjacent_digit_swaps(self):
+        reference = encode_reference(2026, 123456)
+        prefix, digits, check = reference.split('-')
+        for position in range(5):
+            if digits[position] == digits[position + 1]:
+                continue
+            swapped = digits[:position] + digits[position + 1] + digits[position] + digits[position + 2:]
+            self.assertFalse(is_valid_reference(f'{prefix}-{swapped}-{check}'), swapped)
+
+    def test_malformed_references(self):
+        for reference in ('', None, 'BAA-000001', 'BA1-000001-U', 'BAA-00001A-U', 'BAA-000001-UU'):
+            self.assertFalse(is_valid_reference(reference), reference)
+
+
+# ---- Keyset pagination ----
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        birth_dates = [date(2001, 5, 1), None, date(2000, 1, 1), date(2001, 5, 1), None, date(1999, 12, 31), None]
+        self.users = [make_user(f'keyset{index}', birth_date=birth_date)
+                      for index, birth_date in enumerate(birth_dates)]
+        self.queryset = CustomUser.objects.filter(username__startswith='keyset').order_by('birth_date')
+
+    def expected(self):
+        dated = sorted((user for user in self.users if user.birth_date), key=lambda user: (user.birth_date, user.pk))
+        undated = sorted((user for user in self.users if not user.birth_date), key=lambda user: user.pk)
+        return [user.pk for user in dated + undated]
+
+    def walk(self, paginator, cursor=None, backward=False):
+        pages = []
+        while True:
+            page = paginator.page(cursor)
+            pages.append([user.pk for user in page])
+            cursor = page.prev_cursor if backward else page.next_cursor
+            if cursor is None:
+                return pages
+
+    def test_forward_pages_cover_every_row_once_with_nulls_last(self):
+        paginator = KeysetPaginator(self.queryset, per_page=2)
+        pages = self.walk(paginator)
+        self.assertEqual([pk for page in pages for pk in page], self.expected())
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_backward_pages_mirror_the_forward_ones(self):
+        paginator = KeysetPaginator(self.queryset, per_page=2)
+        forward = [paginator.page()]
+        while forward[-1].has_next():
+            forward.append(paginator.page(forward[-1].next_cursor))
+
+        backward = self.walk(paginator, forward[-1].prev_cursor, backward=True)
+        self.assertEqual(backward, [[user.pk for user in page] for page in reversed(forward[:-1])])
+        self.assertFalse(paginator.page(forward[1].prev_cursor).has_previous())
+
+    def test_descending_order(self):
+        paginator = KeysetPaginator(self.queryset.order_by('-birth_date'), per_page=3)
+        dated = sorted((user for user in self.users if user.birth_date), key=lambda user: (user.birth_date, user.pk),
+                       reverse=True)
+        undated = sorted((user for user in self.users if not user.birth_date), key=lambda user: user.pk, reverse=True)
+        pages = self.walk(paginator)
+        self.assertEqual([pk for page in pages for pk in page], [user.pk for user in dated + undated])
+
+    def test_stale_or_garbage_cursor_starts_over(self):
+        paginator = KeysetPaginator(self.queryset, per_page=2)
+        other = KeysetPaginator(self.queryset.order_by('username'), per_page=2)
+        first = [user.pk for user in paginator.page()]
+        for cursor in ('not-a-cursor', other.page().next_cursor):
+            self.assertEqual([user.pk for user in paginator.page(cursor)], first)
+
+    def test_count_only_on_request(self):
+        paginator = KeysetPaginator(self.queryset, per_page=2)
+        self.assertIsNone(paginator.page().total_count)
+        self.assertEqual(paginator.page(with_count=True).total_count, len(self.users))
+
+
+# ---- Protected media ----
+class ProtectedMediaTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, path, user=None):
+        request = self.factory.get('/media/' + path)
+        request.user = user or AnonymousUser()
+        request.user_roles = UserRoles(request.user)
+        return protected_media(request, path)
+
+    def test_rules_match_by_prefix(self):
+        for prefix, check in MEDIA_RULES:
+            self.assertIs(media_rule(prefix + 'file.pdf'), check)
+        self.assertIsNone(media_rule('announcements/images/photo.jpg'))
+
+    def test_protected_files_need_a_signed_in_user(self):
+        self.assertEqual(self.get('complaints/documents/evidence.pdf').status_code, 403)
+
+    def test_non_canonical_paths_are_refused(self):
+        for path in ('announcements/../complaints/evidence.pdf', './complaints/evidence.pdf',
+                     'complaints//evidence.pdf', '/complaints/evidence.pdf', 'complaints/./evidence.pdf',
+                     '_blobs/ab/cd/abcd'):
+            with self.assertRaises(Http404, msg=path):
+                self.get(path)
+
+    def test_import_files_are_readable_by_their_uploader_only(self):
+        owner, stranger = make_user('importer', user_type=3), make_user('stranger', user_type=3)
+        ImportJob.objects.create(kind='users', file='imports/2026/10/users.csv', created_by=owner)
+
+        self.assertTrue(can_read_import_file(UserRoles(owner), 'imports/2026/10/users.csv'))
+        self.assertFalse(can_read_import_file(UserRoles(stranger), 'imports/2026/10/users.csv'))
+        self.assertEqual(self.get('imports/2026/10/users.csv', stranger).status_code, 403)
+
+
+# ---- Bulk actions ----
+class BulkActionTests(TestCase):
+    def test_permissions(self):
+        approve_users = BULK_ACTIONS[('users', 'approve')]
+        approve_admissions = BULK_ACTIONS[('admissions', 'approve')]
+        superuser = make_user('root', user_type=1, is_superuser=True)
+        admissions, scholarships = make_user('admissions', 12), make_user('grants', 5)
+
+        self.assertTrue(approve_users.has_permission(UserRoles(superuser)))
+        self.assertFalse(approve_users.has_permission(UserRoles(admissions)))
+        self.assertTrue(approve_admissions.has_permission(UserRoles(superuser)))
+        self.assertTrue(approve_admissions.has_permission(UserRoles(admissions)))
+        self.assertFalse(approve_admissions.has_permission(UserRoles(scholarships)))
+
+    def test_view_refuses_users_without_permission(self):
+        self.client.force_login(make_user('grants', 5))
+        response = self.client.post('/bulk/admissions/approve/', {'ids': [1]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_only_allow_listed_filters(self):
+        action = BULK_ACTIONS[('users', 'archive')]
+        with self.assertRaises(BulkActionError):
+            action.select(filters={'is_superuser': True})
+        with self.assertRaises(BulkActionError):
+            action.select()
+        self.assertEqual(list(action.select(filters={'user_type': 3})), [])
+
+    def test_archive_skips_own_and_superuser_accounts(self):
+        superuser = make_user('root', user_type=1, is_superuser=True)
+        other_superuser = make_user('root2', user_type=1, is_superuser=True)
+        student = make_user('student')
+        request = RequestFactory().post('/')
+        request.user = superuser
+
+        result = BULK_ACTIONS[('users', 'archive')].run(
+            request, ids=[superuser.pk, other_superuser.pk, student.pk, 0]
+        )
+
+        self.assertEqual(result['updated'], [student.pk])
+        self.assertEqual({entry['id'] for entry in result['skipped']}, {superuser.pk, other_superuser.pk, 0})
+        student.refresh_from_db()
+        self.assertTrue(student.is_archived)
+        self.assertFalse(student.is_active)
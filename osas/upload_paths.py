@@ -0,0 +1,90 @@
+"""
+Where uploaded files go.
+
+Every FileField/ImageField uses `upload_to=UploadTo('<prefix>')`. The prefix
+keeps Django's strftime placeholders, and UPLOAD_PATH_LAYOUT (a dotted path to
+a layout class) decides what goes between it and the file name:
+
+* FlatLayout: nothing, as plain `upload_to` strings do;
+* ShardedLayout (default): the upload's year and month unless the prefix is
+  already dated, then a two hex digit shard, e.g.
+  `verification_ids/2026/10/3f/id.jpg`, so no directory holds more than a
+  month's uploads split 256 ways.
+
+Names only ever start with their prefix, so the MEDIA_RULES in osas/media.py
+apply unchanged. Files saved under an earlier layout are moved with
+`relocate_media`, which uses layout.matches() to skip the ones already in place.
+"""
+import posixpath
+import re
+import secrets
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+_DATE_PLACEHOLDERS = {'%Y': r'\d{4}', '%m': r'\d{2}', '%d': r'\d{2}'}
+
+
+def _prefix_pattern(prefix):
+    pattern = re.escape(prefix.rstrip('/') + '/')
+    for placeholder, digits in _DATE_PLACEHOLDERS.items():
+        pattern = pattern.replace(re.escape(placeholder), digits)
+    return pattern
+
+
+class FlatLayout:
+    """`<prefix>/<file name>`, Django's own layout"""
+
+    def directory(self, prefix, now):
+        return now.strftime(prefix.rstrip('/'))
+
+    def pattern(self, prefix):
+        return _prefix_pattern(prefix)
+
+    def generate(self, prefix, filename):
+        return posixpath.join(self.directory(prefix, timezone.localtime()), filename)
+
+    def matches(self, prefix, name):
+        """Whether the stored `name` is laid out the way this layout would save it"""
+        return re.fullmatch(self.pattern(prefix) + r'[^/]+', name) is not None
+
+
+class ShardedLayout(FlatLayout):
+    """`<prefix>/<year>/<month>/<shard>/<file name>`; dated prefixes only get the shard"""
+
+    def directory(self, prefix, now):
+        directory = super().directory(prefix, now)
+        if '%' not in prefix:
+            directory = posixpath.join(directory, now.strftime('%Y/%m'))
+        return posixpath.join(directory, secrets.token_hex(1))
+
+    def pattern(self, prefix):
+        pattern = super().pattern(prefix)
+        if '%' not in prefix:
+            pattern += r'\d{4}/\d{2}/'
+        return pattern + r'[0-9a-f]{2}/'
+
+
+def upload_layout():
+    return import_string(settings.UPLOAD_PATH_LAYOUT)()
+
+
+def upload_path(prefix, filename):
+    """Name for a new file saved outside a FileField, e.g. the clinic gallery"""
+    return upload_layout().generate(prefix, filename)
+
+
+@deconstructible
+class UploadTo:
+    """`upload_to` for FileFields; the layout is looked up per upload, so changing it needs no migration"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __call__(self, instance, filename):
+        return upload_path(self.prefix, posixpath.basename(filename))
+
+    def __eq__(self, other):
+        return isinstance(other, UploadTo) and self.prefix == other.prefix
@@ -0,0 +1,184 @@
+"""
+Upload limits enforced while the request body is being read.
+
+UPLOAD_RULES maps a URL name and a file field to an UploadRule. The
+UploadLimitHandler (first in FILE_UPLOAD_HANDLERS) checks each incoming file
+part against its rule: the extension as soon as the part starts, the size on
+every chunk and the leading bytes against the allowed types' magic numbers. On
+the first violation it records the reason in request.upload_rejections and
+stops reading the body, so nothing more is received or spooled to disk.
+UploadLimitMiddleware then answers with the error before the view runs.
+
+The forms keep their own size/extension validation as a second line.
+"""
+import os
+
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.urls import Resolver404, resolve
+
+MB = 1024 * 1024
+SNIFF_BYTES = 1024
+
+IMAGE_TYPES = ('jpg', 'jpeg', 'png')
+DOCUMENT_TYPES = ('pdf', 'doc', 'docx')
+OFFICE_TYPES = ('pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx')
+VIDEO_TYPES = ('mp4', 'avi', 'mov')
+
+_OLE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_ZIP = (b'PK\x03\x04', b'PK\x05\x06')
+_QUICKTIME_ATOMS = (b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip', b'pnot')
+
+
+def _is_pdf(head):
+    # Readers accept junk before the header within the first KB
+    return b'%PDF-' in head[:SNIFF_BYTES]
+
+
+def _is_avi(head):
+    return head[:4] == b'RIFF' and head[8:12] == b'AVI '
+
+
+def _is_quicktime(head):
+    return head[4:8] in _QUICKTIME_ATOMS
+
+
+# Extension -> check of the file's leading bytes; every type used in a rule needs one
+MAGIC_NUMBERS = {
+    'pdf': _is_pdf,
+    'jpg': lambda head: head.startswith(b'\xff\xd8\xff'),
+    'jpeg': lambda head: head.startswith(b'\xff\xd8\xff'),
+    'png': lambda head: head.startswith(b'\x89PNG\r\n\x1a\n'),
+    'gif': lambda head: head[:6] in (b'GIF87a', b'GIF89a'),
+    'webp': lambda head: head[:4] == b'RIFF' and head[8:12] == b'WEBP',
+    'doc': lambda head: head.startswith(_OLE),
+    'xls': lambda head: head.startswith(_OLE),
+    'ppt': lambda head: head.startswith(_OLE),
+    'docx': lambda head: head.startswith(_ZIP),
+    'xlsx': lambda head: head.startswith(_ZIP),
+    'pptx': lambda head: head.startswith(_ZIP),
+    'zip': lambda head: head.startswith(_ZIP),
+    'mp4': _is_quicktime,
+    'mov': _is_quicktime,
+    'avi': _is_avi,
+}
+
+
+class UploadRule:
+    def __init__(self, max_size, types):
+        self.max_size = max_size
+        self.types = types
+
+    def size_text(self):
+        return f"{self.max_size // MB}MB"
+
+    def types_text(self):
+        return ', '.join(extension.upper() for extension in self.types)
+
+
+_image = UploadRule(5 * MB, IMAGE_TYPES)
+_document = UploadRule(10 * MB, DOCUMENT_TYPES)
+
+ORGANIZATION_UPLOADS = {
+    'organization_logo': _image,
+    'organization_group_picture': _image,
+    **{field: _document for field in (
+        'organization_calendar_activities', 'organization_adviser_cv', 'organization_cog', 'organization_cbl',
+        'organization_list_members', 'organization_acceptance_letter', 'organization_ar',
+        'organization_previous_calendar', 'organization_financial_report', 'organization_coa',
+        'organization_member_biodata', 'organization_good_moral',
+    )},
+}
+
+# URL name -> {file field: rule}; file fields not listed are not limited here
+UPLOAD_RULES = {
+    'register': {
+        'profile_picture': _image,
+        'id_photo': _image,
+        'cor_photo': _image,
+    },
+    'add-downloadable': {'file': UploadRule(10 * MB, OFFICE_TYPES + ('zip',))},
+    'edit-downloadable': {'file': UploadRule(10 * MB, OFFICE_TYPES + ('zip',))},
+    'nstp_file_create': {'file': UploadRule(10 * MB, OFFICE_TYPES + IMAGE_TYPES)},
+    'nstp_file_edit': {'file': UploadRule(10 * MB, OFFICE_TYPES + IMAGE_TYPES)},
+    'add-accomplishment': {
+        'main_report': _document,
+        'supporting_files': UploadRule(10 * MB, DOCUMENT_TYPES + ('xls', 'xlsx') + IMAGE_TYPES + VIDEO_TYPES),
+    },
+    'complaint-create': {
+        'documents': UploadRule(10 * MB, DOCUMENT_TYPES + IMAGE_TYPES + ('gif',)),
+        'images': UploadRule(10 * MB, IMAGE_TYPES + ('gif',)),
+    },
+    'add-organization': ORGANIZATION_UPLOADS,
+    'organization_edit': ORGANIZATION_UPLOADS,
+    'renew_organization': ORGANIZATION_UPLOADS,
+}
+
+
+def upload_rules(request):
+    match = request.resolver_match
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+    return UPLOAD_RULES.get(match.view_name)
+
+
+def field_label(field_name):
+    return field_name.replace('organization_', '').replace('_', ' ').capitalize()
+
+
+class UploadLimitHandler(FileUploadHandler):
+    """Passes chunks through unchanged; stops the upload at the first file that breaks its rule"""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.rules = upload_rules(request) if request is not None else None
+        self.rule = None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.rule = self.rules.get(field_name) if self.rules else None
+        self.head = b''
+        self.sniffed = False
+        if self.rule is None:
+            return
+
+        self.extension = os.path.splitext(file_name)[1].lower().lstrip('.')
+        if self.extension not in self.rule.types:
+            self.reject(f"Invalid file type for {field_label(field_name)}. Allowed: {self.rule.types_text()}.")
+        if content_length and content_length > self.rule.max_size:
+            self.reject(self.too_large_message())
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rule is not None:
+            if start + len(raw_data) > self.rule.max_size:
+                self.reject(self.too_large_message())
+            if not self.sniffed:
+                self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+                if len(self.head) >= SNIFF_BYTES:
+                    self.sniff(abort=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.rule is not None and not self.sniffed:
+            # Files shorter than SNIFF_BYTES; too late to stop reading, the middleware rejects the request
+            self.sniff(abort=False)
+        return None
+
+    def sniff(self, abort):
+        # Any allowed type will do, so a PNG saved as .jpg still passes
+        self.sniffed = True
+        if not any(MAGIC_NUMBERS[extension](self.head) for extension in self.rule.types):
+            self.reject(f"{field_label(self.field_name)} is not a valid {self.rule.types_text()} file.", abort)
+
+    def too_large_message(self):
+        return f"File size too large for {field_label(self.field_name)}. Maximum size is {self.rule.size_text()}."
+
+    def reject(self, message, abort=True):
+        if not hasattr(self.request, 'upload_rejections'):
+            self.request.upload_rejections = {}
+        self.request.upload_rejections.setdefault(self.field_name, message)
+        if abort:
+            # Don't drain the rest of the body either
+            raise StopUpload(connection_reset=True)
@@ -1,12 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 from .views import (
     LoginView, LogoutView, DashboardView, UserCreateView,
     UserArchiveView, UserDetailView, UserUpdateView, HomePageView, AboutPageView, DownloadableListView, OJTView,
     DownloadableCreateView, DownloadableUpdateView, DownloadableArchiveView, DownloadableDetailView, UserListView,
     ProfileView, UpdateProfileView, UpdateAccountInfoView, CustomPasswordChangeView, AnnouncementListView,
     AnnouncementCreateView, AnnouncementDetailView, AnnouncementArchiveView, AnnouncementUpdateView,
-    download_downloadable, ArchivedItemDetailView, RetrieveArchivedItemView, HomeAnnouncementDetailView,
+    download_downloadable, ArchiveListView, ArchivedItemDetailView, RetrieveArchivedItemView,
+    HomeAnnouncementDetailView,
     AllAnnouncementView, TemplatePageView, AboutPageEditView, ComplaintCreateView, download_complaint_pdf,
     ComplaintDetailView, ComplaintEditView, ArchiveComplaintView, FooterView,
     FooterEditView, StudentDisciplinePageView, StudentDisciplineEditView, RegistrationView, clear_registration_session,
@@ -23,6 +25,9 @@ from .views import (
     AccomplishmentRecordUpdateView, SupportingFileDeleteView, OSASOrganizationChartView,
 )
 
+# Under ASGI the high-fanout JSON endpoints are served by their async variants
+api_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
     # User Authentication
     path('login', LoginView.as_view(), name='login'),
@@ -37,7 +42,7 @@ urlpatterns = [
     path('about/', AboutPageView.as_view(), name='about'),
     path('about/edit/', AboutPageEditView.as_view(), name='about_edit'),
     path('all_announcements', AllAnnouncementView.as_view(), name='all_announcements'),
-    path('api/announcements/all/', views.all_announcements_api, name='all_announcements_api'),
+    path('api/announcements/all/', api_views.all_announcements_api, name='all_announcements_api'),
     path('detail_announcement/<int:pk>/', HomeAnnouncementDetailView.as_view(), name='home_announcement_detail'),
     path('downloadables/', TemplatePageView.as_view(), name='downloadables'),
     path('student-discipline-unit/', StudentDisciplinePageView.as_view(), name='student_discipline_unit'),
@@ -59,7 +64,7 @@ urlpatterns = [
     path('footer/', FooterView.as_view(), name='footer'),
     path('footer/edit/', FooterEditView.as_view(), name='footer_edit'),
 
-    path('get-courses/', views.get_courses, name='get_courses'),
+    path('get-courses/', api_views.get_courses, name='get_courses'),
 
     # Admin Functionalities
     # Profile
@@ -106,6 +111,8 @@ urlpatterns = [
     path('api/scholarships/<int:pk>/', ScholarshipDetailView.as_view(), name='scholarship-detail'),
     path('api/scholarships/<int:pk>/edit/', ScholarshipUpdateView.as_view(), name='scholarship-edit'),
     path('api/scholarships/<int:pk>/archive/', ScholarshipArchiveView.as_view(), name='scholarship-archive'),
+    path('scholarships/<int:pk>/applications/bundle/', views.ScholarshipApplicationsBundleView.as_view(),
+         name='scholarship_applications_bundle'),
 
     # Scholarship Application
     path('scholarships/applications/<int:pk>/approve/', ScholarshipApplicationApproveView.as_view(),
@@ -116,6 +123,8 @@ urlpatterns = [
          name='edit_scholarship_application'),
     path('scholarships/applications/<int:pk>/archive/', ScholarshipApplicationArchiveView.as_view(),
          name='archive_application'),
+    path('scholarships/applications/<int:pk>/bundle/', views.ScholarshipApplicationBundleView.as_view(),
+         name='scholarship_application_bundle'),
     path('scholarships/applications/export/', views.export_scholarship_applications, name='export_scholarship_applications'),
 
     # Admission
@@ -127,6 +136,7 @@ urlpatterns = [
     path('admissions/<int:pk>/edit/', AdmissionUpdateView.as_view(), name='edit_admission'),
     path('admissions/<int:pk>/archive/', StudentAdmissionArchiveView.as_view(), name='archive_admission'),
     path('export-admissions/', views.export_admissions, name='export_admissions'),
+    path('admissions/bundle/', views.AdmissionBundleView.as_view(), name='admissions_bundle'),
 
     # NSTP
     path('nstp/export-template/', NSTPExportTemplateView.as_view(), name='nstp_export_template'),
@@ -152,12 +162,13 @@ urlpatterns = [
 
     # SDS Organization
     path('add-organization/', views.OrganizationCreateView.as_view(), name='add-organization'),
-    path('api/check-username/', views.check_username_availability, name='check_username_availability'),
-    path('api/check-email/', views.check_email_availability, name='check_email_availability'),
-    path('api/check-organization-email/', views.check_organization_email_availability,name='check_organization_email_availability'),
+    path('api/check-username/', api_views.check_username_availability, name='check_username_availability'),
+    path('api/check-email/', api_views.check_email_availability, name='check_email_availability'),
+    path('api/check-organization-email/', api_views.check_organization_email_availability,name='check_organization_email_availability'),
     path('organizations/<int:pk>/view/', views.OrganizationDetailView.as_view(), name='organization-view'),
     path('organizations/<int:pk>/edit/', views.OrganizationEditView.as_view(), name='organization_edit'),
     path('organizations/<int:pk>/archive/', views.OrganizationArchiveView.as_view(), name='organization_archive'),
+    path('organizations/<int:pk>/bundle/', views.OrganizationBundleView.as_view(), name='organization_bundle'),
     path('organizations/<int:pk>/reactivate/', OrganizationReactivateView.as_view(), name='organization_reactivate'),
     path('organizations/<int:organization_id>/approve/', views.approve_organization, name='approve_organization'),
     path('organizations/<int:organization_id>/renew/', views.renew_organization, name='renew_organization'),
@@ -174,16 +185,28 @@ urlpatterns = [
     path('accomplishment-reports/<int:pk>/archive/', views.AccomplishmentReportArchiveView.as_view(), name='accomplishment_report_archive'),
 
     # Activity Log
-    path('analytics/recent-activities/', views.recent_activities, name='recent_activities'),
-    path('analytics/activity-overview/', views.activity_log_overview, name='activity_overview'),
-    path('analytics/activity-users/', views.activity_users, name='activity_users'),
+    path('analytics/recent-activities/', api_views.recent_activities, name='recent_activities'),
+    path('analytics/activity-overview/', api_views.activity_log_overview, name='activity_overview'),
+    path('analytics/activity-users/', api_views.activity_users, name='activity_users'),
     path('analytics/export-activities/', views.export_activities, name='export_activities'),
 
     # Calendar
-    path('api/announcements/', views.AnnouncementCalendarAPI.as_view(), name='announcement_calendar_api'),
+    path('api/announcements/', api_views.AnnouncementCalendarAPI.as_view(), name='announcement_calendar_api'),
 
     # Archived
+    path('api/archived/', ArchiveListView.as_view(), name='archived_items'),
     path('api/archived/<str:item_type>/<int:pk>/', ArchivedItemDetailView.as_view(), name='archived_item_detail'),
     path('api/archived/<str:item_type>/<int:pk>/retrieve/', RetrieveArchivedItemView.as_view(),
          name='retrieve_archived_item'),
+
+    # Bulk Actions
+    path('bulk/<str:table>/<str:action>/', views.BulkActionView.as_view(), name='bulk_action'),
+
+    # Imports
+    path('imports/jobs/<int:pk>/', views.ImportJobStatusView.as_view(), name='import_job_status'),
+    path('imports/<str:kind>/', views.ImportView.as_view(), name='import_records'),
+
+    # Chunked uploads
+    path('api/uploads/', views.UploadSessionView.as_view(), name='upload_sessions'),
+    path('api/uploads/<uuid:pk>/', views.UploadSessionView.as_view(), name='upload_session'),
 ]
\ No newline at end of file
@@ -4,6 +4,7 @@ from django.conf import settings
 from django.utils import timezone
 import textwrap
 from .models import Certificate
+from .references import CERTIFICATE_SCOPE, issue_reference
 
 
 def generate_certificate_png(organization, certificate_date=None, venue=None, generated_by=None):
@@ -313,7 +314,8 @@ def generate_certificate_png(organization, certificate_date=None, venue=None, ge
 
         # Certificate ID
         cert_id_y = height - content_margin_y - 35
-        cert_id = f"Certificate ID: {organization.id}-{timezone.now().strftime('%Y%m%d')}"
+        certificate_number = issue_reference(CERTIFICATE_SCOPE)
+        cert_id = f"Certificate ID: {certificate_number}"
         draw.text((width // 2, cert_id_y), cert_id, fill=SUBTITLE_COLOR, font=small_font, anchor='mm')
 
         # Save Certificate
@@ -347,6 +349,7 @@ def generate_certificate_png(organization, certificate_date=None, venue=None, ge
         # Create certificate record
         certificate = Certificate.objects.create(
             organization=organization,
+            certificate_number=certificate_number,
             issue_date=issue_date,
             venue=venue or "Cavite State University - Bacoor City Campus Gymnasium",
             generated_by=generated_by
@@ -18,7 +18,7 @@ from django.core.files.storage import FileSystemStorage
 from django.core.mail import send_mail
 from django.core.paginator import PageNotAnInteger, Paginator, EmptyPage
 from django.db import transaction
-from django.db.models import Q, Count, F
+from django.db.models import Q, Count, F, Sum
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.dateparse import parse_date, parse_time
 from django.utils.decorators import method_decorator
@@ -44,7 +44,7 @@ from .models import CustomUser, UserActivityLog, Downloadable, AnnouncementImage
     HomePageContent, StudentAdmission, AdmissionPageContent, NSTPStudentInfo, NSTPFile, \
     NSTPPageContent, Course, ClinicPageContent, OJTCompany, \
     OJTPageContent, Organization, Certificate, SDSPageContent, AccomplishmentRecord, \
-    SupportingFile, Hearing
+    SupportingFile, Hearing, ImportJob, UploadSession, OrganizationMember
 
 from .forms import CustomUserCreationForm, CustomAuthenticationForm, CustomUserUpdateForm, DownloadableForm, \
     CustomPasswordChangeForm, AccountInfoForm, UserProfileForm, AnnouncementForm, AnnouncementImageFormSet, \
@@ -68,6 +68,23 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from io import BytesIO
 
+from .archive import ARCHIVE_PAGE_SIZE, ARCHIVE_TYPES, archive_page, entry_payload
+from .bundles import bundle_response, record_entries
+from .coldstorage import ColdStorageError
+from .file_metadata import file_metadata, file_size, prefetch_metadata
+from .media import send_file
+from .resumable import ChunkedUploadMixin, UploadSessionError, session_payload, start_session, write_chunk
+from .bulk import BULK_ACTIONS, BulkActionError
+from .identity import identity_taken, throttled
+from .imports import IMPORT_EXTENSIONS, IMPORT_MAX_BYTES, IMPORTERS, fail_stale_imports, job_payload, start_import, \
+    template_csv
+from .pagination import KeysetPage, KeysetPaginator, pagination_payload
+from .projections import project, project_values
+from .roles import ORGANIZATION_ROLE, assign_role_group
+from .serializers import FastJsonResponse, UserListSerializer, AdmissionListSerializer, AnnouncementListSerializer, \
+    ComplaintListSerializer, NSTPEnlistmentListSerializer, NSTPFileListSerializer, ScholarshipListSerializer, \
+    ScholarshipApplicationListSerializer, OJTCompanyListSerializer, OrganizationListSerializer, \
+    CertificateListSerializer, AccomplishmentReportListSerializer, ActivityListSerializer, image_payload
 from .utils import generate_certificate_png
 
 
@@ -398,40 +415,41 @@ class AllAnnouncementView(TemplateView):
         return context
 
 
+def announcement_api_payload(ann, first_image, widths=None):
+    """One announcement as all_announcements_api lists it; `widths` of the first image for async views"""
+    return {
+        'id': ann.id,
+        'title': ann.title,
+        'content': ann.content,
+        'category': ann.category,
+        'category_display': ann.get_category_display(),
+        'publish_date': ann.publish_date.isoformat(),
+        'author_full_name': ann.author.get_full_name(),
+        'author_unit': ann.author.user_type,
+        'author_unit_display': ann.author.get_user_type_display(),
+        'link': ann.link,
+        'first_image': {
+            **image_payload(first_image.image, widths),
+            'caption': first_image.caption
+        } if first_image else {'url': '', 'caption': ''},
+        'courses_display': ann.get_unique_courses_display(),
+        'enrollment_start': ann.enrollment_start.isoformat() if ann.enrollment_start else None,
+        'enrollment_end': ann.enrollment_end.isoformat() if ann.enrollment_end else None,
+        'event_date': ann.event_date.isoformat() if ann.event_date else None,
+        'location': ann.location,
+        'suspension_date': ann.suspension_date.isoformat() if ann.suspension_date else None,
+        'until_suspension_date': ann.until_suspension_date.isoformat() if ann.until_suspension_date else None,
+        'contact_info': ann.contact_info
+    }
+
+
 def all_announcements_api(request):
     announcements = Announcement.objects.filter(
         is_published=True,
         is_archived=False
     ).order_by('-publish_date').select_related('author')
 
-    data = []
-    for ann in announcements:
-        first_image = ann.get_first_image()
-        data.append({
-            'id': ann.id,
-            'title': ann.title,
-            'content': ann.content,
-            'category': ann.category,
-            'category_display': ann.get_category_display(),
-            'publish_date': ann.publish_date.isoformat(),
-            'author_full_name': ann.author.get_full_name(),
-            'author_unit': ann.author.user_type,
-            'author_unit_display': ann.author.get_user_type_display(),
-            'link': ann.link,
-            'first_image': {
-                'url': first_image.image.url if first_image else '',
-                'caption': first_image.caption if first_image else ''
-            },
-            'courses_display': ann.get_unique_courses_display(),
-            'enrollment_start': ann.enrollment_start.isoformat() if ann.enrollment_start else None,
-            'enrollment_end': ann.enrollment_end.isoformat() if ann.enrollment_end else None,
-            'event_date': ann.event_date.isoformat() if ann.event_date else None,
-            'location': ann.location,
-            'suspension_date': ann.suspension_date.isoformat() if ann.suspension_date else None,
-            'until_suspension_date': ann.until_suspension_date.isoformat() if ann.until_suspension_date else None,
-            'contact_info': ann.contact_info
-        })
-
+    data = [announcement_api_payload(ann, ann.get_first_image()) for ann in announcements]
     return JsonResponse(data, safe=False)
 
 
@@ -718,6 +736,7 @@ class TemplatePageView(TemplateView):
             page_obj = paginator.get_page(page_number)
         except (PageNotAnInteger, EmptyPage):
             page_obj = paginator.get_page(1)
+        prefetch_metadata(page_obj, 'file')
 
         context.update({
             'downloadables': page_obj,
@@ -1336,27 +1355,17 @@ class ClinicPageEditView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
                 # Use new image if uploaded, otherwise keep existing
                 image_path = existing_image
                 if image_file and image_file.name:
-                    # Simple file save
+                    # Normalized and given variants in the background once the page is saved (osas/images.py)
                     try:
-                        import os
-                        from django.conf import settings
                         import uuid
+                        from django.core.files.storage import default_storage
+                        from .upload_paths import upload_path
 
-                        # Create directory
-                        directory = os.path.join(settings.MEDIA_ROOT, 'clinic/gallery/')
-                        os.makedirs(directory, exist_ok=True)
-
-                        # Generate unique filename
                         file_extension = os.path.splitext(image_file.name)[1]
-                        unique_filename = f"{uuid.uuid4().hex}{file_extension}"
-                        file_path = os.path.join(directory, unique_filename)
-
-                        # Save file
-                        with open(file_path, 'wb+') as destination:
-                            for chunk in image_file.chunks():
-                                destination.write(chunk)
-
-                        image_path = f"media/clinic/gallery/{unique_filename}"
+                        stored = default_storage.save(
+                            upload_path('clinic/gallery/', f"{uuid.uuid4().hex}{file_extension}"), image_file
+                        )
+                        image_path = f"media/{stored}"
 
                     except Exception as e:
                         print(f"Error saving image: {e}")
@@ -1395,14 +1404,12 @@ class SDSOrganizationView(TemplateView):
 
         student_org_count = active_organizations.filter(organization_type='student').count()
         sociocultural_org_count = active_organizations.filter(organization_type='sociocultural').count()
-        total_members = sum(org.organization_member_count for org in active_organizations)
+        total_members = active_organizations.aggregate(total=Sum('member_count'))['total'] or 0
         total_active_certificates = Certificate.objects.filter(organization__in=active_organizations,is_active=True).count()
-        organizations_list = list(active_organizations)
-        organizations_list.sort(key=lambda x: x.organization_member_count, reverse=True)
 
-        # Pagination
+        # Pagination (sorted by the maintained member_count column)
         page = self.request.GET.get('page', 1)
-        paginator = Paginator(organizations_list, 6)
+        paginator = Paginator(active_organizations.order_by('-member_count', 'id'), 6)
 
         try:
             organizations_page = paginator.page(page)
@@ -1537,12 +1544,8 @@ class CoreOrganizationDetailView(TemplateView):
             id=organization_id
         )
 
-        # Get members from JSON field and paginate them
-        all_members = organization.organization_members or []
-        valid_members = [
-            member for member in all_members
-            if isinstance(member, dict) and member.get('first_name') and member.get('last_name')
-        ]
+        # Paginate members straight from the member table
+        valid_members = organization.members.valid().order_by('id')
 
         paginator = Paginator(valid_members, 6)
 
@@ -1630,7 +1633,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         # Check if user is an organization
         if self.request.user.is_organization:
             context['is_organization_user'] = True
-            context['current_organization'] = self.request.user.organization
+            context['current_organization'] = self.request.user_roles.organization
             context['current_user_type'] = 15  # Organization user type
         else:
             context['is_organization_user'] = False
@@ -1707,6 +1710,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def add_paginated_data(self, context):
         # NSTP Files
         context['nstp_files'] = self.get_paginated_nstp_files()
+        prefetch_metadata(context['nstp_files'], 'file')
 
         # NSTP Enlistments
         context['nstp_enlistments'] = self.get_paginated_nstp_enlistments()
@@ -1729,182 +1733,18 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
         # Downloadables, Announcements, Scholarships
         context['downloadables'] = self.get_filtered_downloadables()
+        prefetch_metadata(context['downloadables'], 'file')
         context['announcements'] = self.get_filtered_announcements()
         context['scholarships'] = self.get_filtered_scholarships()
 
     def add_archived_data(self, context):
-        if self.request.user.is_superuser:
-            self.add_superuser_archived_data(context)
-        else:
-            self.add_regular_user_archived_data(context)
-
-        # Admission Specific archived data
-        self.add_admission_archived_data(context)
-
-        # NSTP Specific archived data
-        self.add_nstp_archived_data(context)
-
-        # Complaint Specific archived data
-        self.add_complaint_archived_data(context)
-
-        # OJT Specific archived data
-        self.add_ojt_archived_data(context)
-
-        # Organization Specific archived ata
-        self.add_organizations_archived_data(context)
-
-        # Accomplishment Reports Specific archived data
-        self.add_accomplishment_archived_data(context)
-
-    def add_superuser_archived_data(self, context):
-        context['archived_users'] = CustomUser.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('archived_by')
-
-        context['archived_announcements'] = Announcement.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('archived_by', 'author')
-
-        context['archived_downloadables'] = Downloadable.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('archived_by', 'created_by')
-
-        context['archived_scholarships'] = Scholarship.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('archived_by', 'created_by', 'application_form')
-
-        context['archived_scholarship_applications'] = ScholarshipApplication.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('student', 'scholarship', 'archived_by')
-
-        context['archived_ojt_companies'] = OJTCompany.objects.filter(
-            is_archived=True
-        ).order_by('-archived_at').select_related('archived_by')
-
-    def add_regular_user_archived_data(self, context):
-        context['archived_users'] = CustomUser.objects.none()
-
-        context['archived_announcements'] = Announcement.objects.filter(
-            is_archived=True,
-            author=self.request.user
-        ).order_by('-archived_at').select_related('archived_by', 'author')
-
-        context['archived_downloadables'] = Downloadable.objects.filter(
-            is_archived=True,
-            created_by=self.request.user
-        ).order_by('-archived_at').select_related('archived_by', 'created_by')
-
-        context['archived_scholarships'] = Scholarship.objects.filter(
-            is_archived=True
-        ).filter(
-            Q(created_by=self.request.user) |
-            Q(archived_by=self.request.user)
-        ).order_by('-archived_at').select_related('archived_by', 'created_by', 'application_form')
-
-        context['archived_scholarship_applications'] = ScholarshipApplication.objects.filter(
-            is_archived=True
-        ).filter(
-            Q(student=self.request.user) |
-            Q(archived_by=self.request.user) |
-            Q(scholarship__created_by=self.request.user)
-        ).order_by('-archived_at').select_related('student', 'scholarship', 'archived_by')
-
-        context['archived_ojt_companies'] = OJTCompany.objects.filter(
-            is_archived=True,
-            archived_by=self.request.user
-        ).order_by('-archived_at').select_related('archived_by')
-
-    def add_admission_archived_data(self, context):
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 12]:
-            context['archived_admissions'] = StudentAdmission.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('archived_by')
-        else:
-            context['archived_admissions'] = StudentAdmission.objects.filter(
-                Q(is_archived=True) & (
-                        Q(user=self.request.user) |
-                        Q(archived_by=self.request.user)
-                )
-            ).order_by('-archived_at').select_related('archived_by')
-
-    def add_nstp_archived_data(self, context):
-        # NSTP Enlistment Data
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 2]:
-            context['archived_nstp_students'] = NSTPStudentInfo.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('user', 'archived_by')
-        else:
-            context['archived_nstp_students'] = NSTPStudentInfo.objects.filter(
-                Q(is_archived=True) & (
-                        Q(user=self.request.user) |
-                        Q(archived_by=self.request.user)
-                )
-            ).order_by('-archived_at').select_related('archived_by')
-
-        # NSTP Files Data
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 2]:
-            context['archived_nstp_files'] = NSTPFile.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('archived_by', 'created_by')
-        else:
-            context['archived_nstp_files'] = NSTPFile.objects.none()
-
-    def add_complaint_archived_data(self, context):
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 11]:
-            context['archived_complaints'] = Complaint.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('archived_by', 'created_by')
-        else:
-            context['archived_complaints'] = Complaint.objects.filter(
-                is_archived=True,
-                created_by=self.request.user
-            ).order_by('-archived_at').select_related('archived_by', 'created_by')
-
-    def add_ojt_archived_data(self, context):
-        if self.request.user.is_superuser:
-            context['archived_ojt_companies'] = OJTCompany.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('archived_by')
-        else:
-            context['archived_ojt_companies'] = OJTCompany.objects.filter(
-                is_archived=True,
-                archived_by=self.request.user
-            ).order_by('-archived_at').select_related('archived_by')
-
-    def add_organizations_archived_data(self, context):
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 10]:
-            context['archived_organizations'] = Organization.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('archived_by')
-        elif self.request.user.user_type == 15:
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
-                context['archived_organizations'] = Organization.objects.filter(
-                    id=self.request.user.organization.id,
-                    is_archived=True
-                ).order_by('-archived_at').select_related('archived_by')
-            else:
-                context['archived_organizations'] = Organization.objects.none()
-        else:
-            context['archived_organizations'] = Organization.objects.none()
+        # Newest page of each archive tab only; "Load more" and search go through ArchiveListView
+        roles = self.request.user_roles
+        for archive_type in ARCHIVE_TYPES.values():
+            page = archive_page(roles, archive_type.key)
+            context[f'archived_{archive_type.slot}'] = archive_type.hydrate(page.object_list)
+            context[f'archived_{archive_type.slot}_cursor'] = page.next_cursor or ''
 
-    def add_accomplishment_archived_data(self, context):
-        if self.request.user.is_superuser or self.request.user.user_type in [1, 10]:
-            # User type 1 or 10 can see all archived accomplishment reports
-            context['archived_accomplishment_reports'] = AccomplishmentRecord.objects.filter(
-                is_archived=True
-            ).order_by('-archived_at').select_related('organization', 'submitted_by', 'archived_by')
-        elif self.request.user.user_type == 15:
-            # User type 15 can only see their owned data
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
-                context['archived_accomplishment_reports'] = AccomplishmentRecord.objects.filter(
-                    organization=self.request.user.organization,
-                    is_archived=True
-                ).order_by('-archived_at').select_related('organization', 'submitted_by', 'archived_by')
-            else:
-                context['archived_accomplishment_reports'] = AccomplishmentRecord.objects.none()
-        else:
-            context['archived_accomplishment_reports'] = AccomplishmentRecord.objects.none()
-            
     def add_announcements_data(self, context):
         current_time = timezone.now()
         twenty_four_hours_ago = current_time - timedelta(hours=24)
@@ -2297,16 +2137,26 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         return self.render_to_response(context)
 
     def get_paginated_data(self, queryset, page_param, per_page=10):
-        page = self.request.GET.get(page_param, 1)
+        return self.paginate_list(queryset, self.request.GET.get(page_param, 1), per_page)
+
+    def paginate_list(self, queryset, page_number, per_page=10):
+        # Clients that send ?cursor= get keyset pages (no OFFSET, COUNT only on request);
+        # numbered-page tables keep the classic paginator.
+        if 'cursor' in self.request.GET:
+            return KeysetPaginator(queryset, per_page).page(
+                self.request.GET.get('cursor'),
+                with_count=self.request.GET.get('with_count') == '1'
+            )
+
         paginator = Paginator(queryset, per_page)
 
         try:
-            page = int(page)
+            page_number = int(page_number)
         except (ValueError, TypeError):
-            page = 1
+            page_number = 1
 
         try:
-            return paginator.page(page)
+            return paginator.page(page_number)
         except PageNotAnInteger:
             return paginator.page(1)
         except EmptyPage:
@@ -2370,52 +2220,14 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         else:
             users = users.order_by(sort_field)
 
-        page_obj = self.get_paginated_data(users, 'user_page', per_page)
+        page_obj = self.get_paginated_data(project(users, 'users'), 'user_page', per_page)
 
         # Prepare data for JSON response
-        user_data = []
-        for user in page_obj.object_list:
-            # Get the appropriate name based on user type
-            if user.is_organization and hasattr(user, 'organization_account'):
-                # For organizations, use organization name
-                display_name = user.organization_account.organization_name
-                first_name = display_name
-                last_name = ""
-            else:
-                # For regular users, use first and last name
-                first_name = user.first_name or ''
-                last_name = user.last_name or ''
-                display_name = f"{first_name} {last_name}".strip() or user.username
-
-            user_data.append({
-                'id': user.id,
-                'first_name': first_name,
-                'last_name': last_name,
-                'display_name': display_name,
-                'username': user.username,
-                'user_type': user.get_user_type_display(),
-                'is_verified': user.is_verified,
-                'is_active': user.is_active,
-                'date_joined': user.date_joined.isoformat() if hasattr(user,
-                                                                       'date_joined') else user.created_at.isoformat(),
-                'is_organization': user.is_organization,
-                'can_edit': request.user.has_perm('osas.change_customuser'),
-                'can_delete': request.user.has_perm('osas.delete_customuser'),
-                'can_view': request.user.has_perm('osas.view_customuser'),
-                'can_approve': not user.is_verified and request.user.has_perm('osas.change_customuser')
-            })
+        user_data = UserListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'users': user_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': page_obj.paginator.num_pages,
-                'count': page_obj.paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj, count_key='count')
         })
 
     def add_user_statistics(self, context):
@@ -2448,17 +2260,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             admissions = StudentAdmission.objects.none()
 
         # Apply filters
-        if search_term:
-            admissions = admissions.filter(
-                Q(control_no__icontains=search_term) |
-                Q(user__first_name__icontains=search_term) |
-                Q(user__last_name__icontains=search_term) |
-                Q(course__name__icontains=search_term) |
-                Q(remarks__icontains=search_term)
-            )
-
-        if type_filter:
-            admissions = admissions.filter(student_type=type_filter)
+        admissions = search_admissions(admissions, search_term, type_filter)
 
         # Apply sorting
         if sort_column:
@@ -2466,46 +2268,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 sort_column = f'-{sort_column}'
             admissions = admissions.order_by(sort_column)
 
-        # Create paginator
-        paginator = Paginator(admissions.select_related('user', 'course'), per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(admissions, 'admissions'), page_number, per_page)
 
         # Prepare data for JSON response
-        admission_data = []
-        for admission in page_obj.object_list:
-            admission_data.append({
-                'id': admission.id,
-                'control_no': admission.control_no,
-                'student_name': f"{admission.user.last_name}, {admission.user.first_name}" if admission.user else '(No user associated)',
-                'student_type': admission.student_type,
-                'student_type_display': admission.get_student_type_display(),
-                'course': admission.course.name if admission.course else '',
-                'status': admission.status,
-                'status_display': admission.get_status_display(),
-                'remarks': admission.remarks,
-                'created_at': admission.created_at.isoformat(),
-                'can_approve': request.user.is_superuser or request.user.user_type in [1, 12],
-                'can_edit': not request.user.is_student or admission.status != 'done',
-                'can_archive': not request.user.is_student or admission.status != 'done'
-            })
+        admission_data = AdmissionListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'admissions': admission_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_admission_statistics(self, context):
@@ -2614,45 +2385,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 sort_field = f'-{sort_field}'
             announcements = announcements.order_by(sort_field)
 
-        # Create paginator
-        paginator = Paginator(announcements.select_related('author'), per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(announcements, 'announcements'), page_number, per_page)
 
         # Prepare data for JSON response
-        announcement_data = []
-        for announcement in page_obj.object_list:
-            announcement_data.append({
-                'id': announcement.id,
-                'title': announcement.title,
-                'category': announcement.get_category_display(),
-                'category_value': announcement.category,
-                'author_name': announcement.author.get_full_name(),
-                'created_at': announcement.created_at.isoformat(),
-                'is_published': announcement.is_published,
-                'can_view': request.user.has_perm('osas.view_announcement'),
-                'can_edit': (request.user.has_perm('osas.change_announcement') and
-                             (request.user == announcement.author or request.user.is_superuser)),
-                'can_delete': (request.user.has_perm('osas.delete_announcement') and
-                               (request.user == announcement.author or request.user.is_superuser))
-            })
+        announcement_data = AnnouncementListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'announcements': announcement_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_announcement_statistics(self, context):
@@ -2798,77 +2539,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             else:
                 complaints = complaints.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(complaints, per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(complaints, 'complaints'), page_number, per_page)
 
         # Prepare data for JSON response
-        complaint_data = []
-        for complaint in page_obj.object_list:
-            # Get the latest hearing for this complaint
-            latest_hearing = complaint.hearings.order_by('-schedule_date', '-schedule_time').first()
-
-            # Determine status display - Now using the complaint's status directly
-            status_display = complaint.get_status_display()
-
-            # Get next hearing info
-            next_hearing = complaint.next_hearing
-            next_hearing_display = None
-            if next_hearing:
-                next_hearing_display = f"{next_hearing.schedule_date.strftime('%b %d, %Y')} {next_hearing.schedule_time.strftime('%I:%M %p')}"
+        complaint_data = ComplaintListSerializer(request, status=status).serialize(page_obj.object_list)
 
-            # Determine permission flags
-            is_owner = complaint.created_by == request.user
-            is_admin_user = request.user.is_superuser or request.user.user_type in [1, 11]
-
-            # View permission: everyone can view their own complaints or admin can view all
-            can_view = is_owner or is_admin_user
-
-            # Edit permission: owners can edit their complaints, admins can edit all
-            can_edit = is_owner or is_admin_user
-
-            # Delete/Archive permission: owners can archive their complaints, admins can archive all
-            can_delete = is_owner or is_admin_user
-
-            # Resolve permission: only admins can resolve complaints (for user_type 14, this should be false)
-            can_resolve = is_admin_user and status != 'resolved'
-
-            complaint_data.append({
-                'id': complaint.id,
-                'reference_number': complaint.reference_number,
-                'title': complaint.title,
-                'complainant_first_name': complaint.complainant_first_name,
-                'complainant_last_name': complaint.complainant_last_name,
-                'incident_date': complaint.incident_date.isoformat() if complaint.incident_date else None,
-                'created_at': complaint.created_at.isoformat(),
-                'updated_at': complaint.updated_at.isoformat(),
-                'status': complaint.status,
-                'status_display': status_display,
-                'next_hearing_display': next_hearing_display,
-                'hearing_count': complaint.hearing_count if hasattr(complaint, 'hearing_count') else 0,
-                'can_view': can_view,
-                'can_edit': can_edit,
-                'can_delete': can_delete,
-                'can_resolve': can_resolve
-            })
-
-        return JsonResponse({
+        return FastJsonResponse({
             'complaints': complaint_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_complaint_statistics(self, context):
@@ -3049,49 +2728,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 sort_field = f'-{sort_field}'
             nstp_queryset = nstp_queryset.order_by(sort_field)
 
-        # Create paginator
-        paginator = Paginator(nstp_queryset, per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(nstp_queryset, 'nstp_enlistments'), page_number, per_page)
 
         # Prepare data for JSON response
-        nstp_data = []
-        for enlistment in page_obj.object_list:
-            nstp_data.append({
-                'id': enlistment.id,
-                'student_number': enlistment.student_number,
-                'first_name': enlistment.first_name,
-                'last_name': enlistment.last_name,
-                'program': enlistment.program,
-                'semester': enlistment.semester,
-                'approval_status': enlistment.approval_status,
-                'approval_status_display': enlistment.get_approval_status_display(),
-                'created_at': enlistment.created_at.strftime('%Y-%m-%d'),
-                'can_approve': request.user.is_superuser or request.user.user_type in [1, 2],
-                'can_edit': (enlistment.approval_status == 'pending' or
-                             request.user.is_superuser or
-                             request.user.user_type in [1, 2]),
-                'can_archive': (enlistment.approval_status == 'pending' or
-                                request.user.is_superuser or
-                                request.user.user_type in [1, 2])
-            })
+        nstp_data = NSTPEnlistmentListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'nstp_enlistments': nstp_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_nstp_statistics(self, context):
@@ -3168,58 +2813,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             # Default sorting
             nstp_files = nstp_files.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(nstp_files.select_related('created_by'), per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(nstp_files, 'nstp_files'), page_number, per_page)
 
         # Prepare data for JSON response
-        nstp_data = []
-        for file in page_obj.object_list:
-            # Determine file icon based on extension
-            file_extension = file.file.name.split('.')[-1].lower() if file.file.name else ''
-            file_icon = 'bx bxs-file'
-            if file_extension == 'pdf':
-                file_icon = 'bx bxs-file-pdf'
-            elif file_extension in ['doc', 'docx']:
-                file_icon = 'bx bxs-file-doc'
-            elif file_extension in ['xls', 'xlsx']:
-                file_icon = 'bx bxs-file-xls'
-
-            nstp_data.append({
-                'id': file.id,
-                'title': file.title,
-                'description': file.description or "No description provided",
-                'category': file.category,
-                'category_display': file.get_category_display(),
-                'semester': file.semester,
-                'semester_display': file.get_semester_display(),
-                'school_year': file.school_year,
-                'created_at': file.created_at.isoformat(),
-                'file_url': file.file.url,
-                'file_size': file.file.size,
-                'file_icon': file_icon,
-                'can_view': request.user.has_perm('osas.view_nstpfile'),
-                'can_edit': request.user.has_perm('osas.change_nstpfile'),
-                'can_delete': request.user.has_perm('osas.delete_nstpfile')
-            })
+        nstp_data = NSTPFileListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'nstp_files': nstp_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_nstp_files_statistics(self, context):
@@ -3298,41 +2900,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             # Default sorting
             scholarships = scholarships.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(scholarships.select_related('created_by', 'application_form'), per_page)
+        # Paginate
+        page_obj = self.paginate_list(project(scholarships, 'scholarships'), page_number, per_page)
 
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
-
-        scholarship_data = []
-        for scholarship in page_obj.object_list:
-            scholarship_data.append({
-                'id': scholarship.id,
-                'name': scholarship.name,
-                'type': scholarship.scholarship_type,
-                'type_display': scholarship.get_scholarship_type_display(),
-                'is_active': scholarship.is_active,
-                'created_at': scholarship.created_at.isoformat(),
-                'can_view': request.user.has_perm('osas.view_scholarship'),
-                'can_edit': request.user.has_perm('osas.change_scholarship'),
-                'can_delete': request.user.has_perm('osas.delete_scholarship')
-            })
+        # Prepare data for JSON response
+        scholarship_data = ScholarshipListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'scholarships': scholarship_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_scholarship_statistics(self, context):
@@ -3400,49 +2976,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             # Default sorting
             applications = applications.order_by('-application_date')
 
-        # Create paginator
-        paginator = Paginator(applications, per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(applications, 'scholarship_applications'), page_number, per_page)
 
         # Prepare data for JSON response
-        application_data = []
-        for application in page_obj.object_list:
-            application_data.append({
-                'id': application.id,
-                'student_name': application.student.get_full_name() if application.student else 'Unknown',
-                'scholarship_name': application.scholarship.name if application.scholarship else 'Unknown',
-                'application_date': application.application_date.isoformat(),
-                'status': application.status,
-                'status_display': application.get_status_display(),
-                'application_form_url': application.application_form.url if application.application_form else None,
-                'cog_url': application.cog.url if application.cog else None,
-                'cor_url': application.cor.url if application.cor else None,
-                'can_approve': request.user.is_superuser or request.user.user_type in [1, 5],
-                'can_edit': (application.status == 'pending' or
-                             request.user.is_superuser or
-                             request.user.user_type in [1, 5]),
-                'can_archive': (application.status == 'pending' or
-                                request.user.is_superuser or
-                                request.user.user_type in [1, 5])
-            })
+        application_data = ScholarshipApplicationListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'applications': application_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_scholarship_application_statistics(self, context):
@@ -3529,60 +3071,15 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             # Default to newest first
             companies = companies.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(companies, per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(companies, 'ojt_companies'), page_number, per_page)
 
         # Prepare data for JSON response
-        company_data = []
-        for company in page_obj.object_list:
-            # Check user permissions for actions
-            user_type = request.user.user_type
-            is_superuser = request.user.is_superuser
-
-            # User type 1 (Super Admin) and 13 (Job Placement) can edit/archive/change status
-            can_edit = is_superuser or user_type in [1, 13]
-            can_archive = is_superuser or user_type in [1, 13]
-            can_change_status = is_superuser or user_type in [1, 13]
-
-            company_data.append({
-                'id': company.id,
-                'name': company.name,
-                'address': company.address,
-                'contact_number': company.contact_number,
-                'email': company.email or '',
-                'description': company.description or '',
-                'website': company.website or '',
-                'status': company.status,
-                'status_display': company.get_status_display(),  # Add this line
-                'is_archived': company.is_archived,
-                'created_at': company.created_at.isoformat() if company.created_at else None,
-                'updated_at': company.updated_at.isoformat() if company.updated_at else None,
-                'can_edit': can_edit,
-                'can_archive': can_archive,
-                'can_change_status': can_change_status,
-                'can_view': True,
-                'current_user_type': user_type,
-                'is_superuser': is_superuser
-            })
+        company_data = OJTCompanyListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'companies': company_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            },
+            'pagination': pagination_payload(page_obj),
             'current_user_type': request.user.user_type,
             'is_superuser': request.user.is_superuser
         })
@@ -3607,8 +3104,6 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         ).count()
 
     def add_organization_statistics(self, context):
-        from django.db.models import Sum
-
         organizations = Organization.objects.filter(
             is_archived=False  # Exclude only archived
         )
@@ -3616,13 +3111,17 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         # Total count (excluding only archived)
         context['total_organizations'] = organizations.count()
 
-        # Status counts - include ALL statuses including cancelled
-        context['active_organizations_count'] = organizations.filter(_organization_status='active').count()
-        context['pending_organizations_count'] = organizations.filter(_organization_status='pending').count()
-        context['inactive_organizations_count'] = organizations.filter(_organization_status='inactive').count()
-        context['expired_organizations_count'] = organizations.filter(_organization_status='expired').count()
-        context['rejected_organizations_count'] = organizations.filter(_organization_status='rejected').count()
-        context['cancelled_organizations_count'] = organizations.filter(_organization_status='cancelled').count()
+        # Status counts - include ALL statuses including cancelled.
+        # The status column is kept current by Organization.save() and the
+        # refresh_organization_status command, so one aggregate covers them all.
+        status_counts = organizations.aggregate(**{
+            f'{status}_organizations_count': Count('id', filter=Q(_organization_status=status))
+            for status in ['active', 'pending', 'inactive', 'expired', 'rejected', 'cancelled']
+        })
+        context.update(status_counts)
+
+        # Active organizations whose registration ends within 30 days
+        context['renewal_due_organizations_count'] = Organization.renewal_due().count()
 
         # Count of archived organizations (for reference)
         context['archived_organizations_count'] = Organization.objects.filter(is_archived=True).count()
@@ -3655,8 +3154,8 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if self.request.user.is_superuser or self.request.user.user_type in [1, 10]:
             queryset = queryset
         elif self.request.user.user_type == 15:
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
-                queryset = queryset.filter(id=self.request.user.organization.id)
+            if self.request.user_roles.organization:
+                queryset = queryset.filter(id=self.request.user_roles.organization.id)
             else:
                 queryset = Organization.objects.none()
         else:
@@ -3687,8 +3186,8 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if request.user.is_superuser or request.user.user_type in [1, 10]:
             organizations = organizations
         elif request.user.user_type == 15:
-            if hasattr(request.user, 'organization') and request.user.organization:
-                organizations = organizations.filter(id=request.user.organization.id)
+            if request.user_roles.organization:
+                organizations = organizations.filter(id=request.user_roles.organization.id)
             else:
                 organizations = Organization.objects.none()
         else:
@@ -3714,64 +3213,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
         organizations = organizations.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(organizations, per_page)
+        # Paginate
+        page_obj = self.paginate_list(project(organizations, 'organizations'), page_number, per_page)
 
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
-
-        organization_data = []
-        for org in page_obj.object_list:
-            # Get status display using the correct method name
-            status_display = org.get__organization_status_display()
-
-            # Determine if user can perform actions
-            can_edit = request.user.is_superuser or request.user.user_type in [1, 10]
-            can_archive = can_edit
-            can_approve = can_edit and org.organization_status == 'pending' and org.all_requirements_submitted
-            can_renew = can_edit and (org.organization_status == 'expired' or org.organization_needs_renewal)
-            can_reactivate = can_edit and org.organization_status == 'cancelled'
-
-            organization_data.append({
-                'id': org.id,
-                'organization_name': org.organization_name,
-                'organization_acronym': org.organization_acronym,
-                'organization_email': org.organization_email,
-                'organization_type': org.organization_type,
-                'organization_type_display': org.get_organization_type_display(),
-                'organization_status': org.organization_status,  # Use the property
-                'organization_status_display': status_display,
-                'organization_valid_until': org.organization_valid_until.isoformat() if org.organization_valid_until else None,
-                'renew_count': org.renew_count,
-                'organization_member_count': org.organization_member_count,
-                'organization_logo_url': org.organization_logo.url if org.organization_logo else None,
-                'created_at': org.created_at.isoformat(),
-                'all_requirements_submitted': org.all_requirements_submitted,
-                'organization_needs_renewal': org.organization_needs_renewal,
-                'can_edit': can_edit,
-                'can_archive': can_archive,
-                'can_approve': can_approve,
-                'can_renew': can_renew,
-                'can_reactivate': can_reactivate,
-                'can_view': True
-            })
+        # Prepare data for JSON response
+        organization_data = OrganizationListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'organizations': organization_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_certificates_data(self, context):
@@ -3883,53 +3334,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         elif date_filter == 'recently_created':
             certificates = certificates.order_by('-created_at')
 
-        # Create paginator
-        paginator = Paginator(certificates.select_related(
-            'organization', 'generated_by'
-        ), per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(certificates, 'certificates'), page_number, per_page)
 
         # Prepare data for JSON response
-        certificate_data = []
-        for certificate in page_obj.object_list:
-            # Determine file type for display
-            file_type = 'pdf' if certificate.certificate_file and certificate.certificate_file.name.lower().endswith(
-                '.pdf') else 'image'
-
-            certificate_data.append({
-                'id': certificate.id,
-                'organization_name': certificate.organization.organization_name,
-                'organization_acronym': certificate.organization.organization_acronym,
-                'organization_type': certificate.organization.organization_type,
-                'organization_type_display': certificate.organization.get_organization_type_display(),
-                'issue_date': certificate.issue_date.isoformat(),
-                'venue': certificate.venue,
-                'certificate_url': certificate.certificate_file.url if certificate.certificate_file else None,
-                'file_type': file_type,
-                'created_at': certificate.created_at.isoformat(),
-                'generated_by': certificate.generated_by.get_full_name() if certificate.generated_by else 'System',
-                'can_download': True,
-                'can_view': True
-            })
+        certificate_data = CertificateListSerializer(request).serialize(page_obj.object_list)
 
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'certificates': certificate_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
 
     def add_accomplishment_data(self, context):
@@ -3937,9 +3351,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             accomplishment_queryset = AccomplishmentRecord.objects.filter(is_archived=False)
         elif self.request.user.user_type == 15:
             # Organizations can only see their own reports
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
+            if self.request.user_roles.organization:
                 accomplishment_queryset = AccomplishmentRecord.objects.filter(
-                    organization=self.request.user.organization,
+                    organization=self.request.user_roles.organization,
                     is_archived=False
                 )
             else:
@@ -3957,9 +3371,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if self.request.user.is_superuser or self.request.user.user_type in [1, 10]:
             accomplishment_queryset = AccomplishmentRecord.objects.filter(is_archived=False)
         elif self.request.user.user_type == 15:
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
+            if self.request.user_roles.organization:
                 accomplishment_queryset = AccomplishmentRecord.objects.filter(
-                    organization=self.request.user.organization,
+                    organization=self.request.user_roles.organization,
                     is_archived=False
                 )
             else:
@@ -3977,9 +3391,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if self.request.user.is_superuser or self.request.user.user_type in [1, 10]:
             reports = AccomplishmentRecord.objects.filter(is_archived=False)
         elif self.request.user.user_type == 15:
-            if hasattr(self.request.user, 'organization') and self.request.user.organization:
+            if self.request.user_roles.organization:
                 reports = AccomplishmentRecord.objects.filter(
-                    organization=self.request.user.organization,
+                    organization=self.request.user_roles.organization,
                     is_archived=False
                 )
             else:
@@ -4014,9 +3428,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if request.user.is_superuser or request.user.user_type in [1, 10]:
             reports = AccomplishmentRecord.objects.filter(is_archived=False)
         elif request.user.user_type == 15:
-            if hasattr(request.user, 'organization') and request.user.organization:
+            if request.user_roles.organization:
                 reports = AccomplishmentRecord.objects.filter(
-                    organization=request.user.organization,
+                    organization=request.user_roles.organization,
                     is_archived=False
                 )
             else:
@@ -4049,64 +3463,16 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         # Apply default sorting
         reports = reports.order_by('-date_conducted', '-created_at')
 
-        # Create paginator
-        paginator = Paginator(reports.select_related(
-            'organization', 'submitted_by'
-        ), per_page)
-
-        try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+        # Paginate
+        page_obj = self.paginate_list(project(reports, 'accomplishment_reports'), page_number, per_page)
 
         # Prepare data for JSON response
-        report_data = []
-        for report in page_obj.object_list:
-            # Determine permission flags
-            is_owner = report.organization.user_account == request.user if report.organization and report.organization.user_account else False
-            is_admin_user = request.user.is_superuser or request.user.user_type in [1, 10]
-            is_organization_user = request.user.user_type == 15
-
-            # Edit permissions: admin OR organization owner
-            can_edit = is_admin_user or (is_organization_user and is_owner)
+        report_data = AccomplishmentReportListSerializer(request).serialize(page_obj.object_list)
 
-            report_data.append({
-                'id': report.id,
-                'title': report.title,
-                'organization_name': report.organization.organization_name if report.organization else 'N/A',
-                'organization_acronym': report.organization.organization_acronym if report.organization else 'N/A',
-                'record_type': report.record_type,
-                'record_type_display': report.get_record_type_display(),
-                'date_conducted': report.date_conducted.isoformat(),
-                'venue': report.venue or 'Not specified',
-                'semester': report.semester,
-                'semester_display': report.get_semester_display(),
-                'school_year': report.school_year,
-                'number_of_participants': report.number_of_participants,
-                'duration_hours': float(report.duration_hours),
-                'budget_utilized': float(report.budget_utilized) if report.budget_utilized else None,
-                'submitted_by': report.submitted_by.get_full_name() if report.submitted_by else 'Unknown',
-                'submitted_at': report.created_at.isoformat(),
-                'has_main_report': bool(report.main_report),
-                'can_edit': can_edit,
-                'can_archive': can_edit,
-                'can_view': True,
-            })
-
-        return JsonResponse({
+        return FastJsonResponse({
             'success': True,
             'accomplishment_reports': report_data,
-            'pagination': {
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-                'current_page': page_obj.number,
-                'num_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'start_index': page_obj.start_index(),
-                'end_index': page_obj.end_index(),
-            }
+            'pagination': pagination_payload(page_obj)
         })
     
 
@@ -4327,7 +3693,7 @@ class ApproveUserView(View):
             }, status=500)
 
     def assign_role_permissions(self, user):
-        # Clear existing permissions first
+        # Clear existing direct permissions; role permissions come from the role group
         user.user_permissions.clear()
 
         # Super User (OSAS Staff) gets all permissions
@@ -4337,143 +3703,7 @@ class ApproveUserView(View):
             user.save()
             return
 
-        # Get all permissions
-        all_permissions = Permission.objects.all()
-
-        # Function to determine if a permission should be assigned
-        def should_assign_permission(perm, role):
-            perm_name = perm.name.lower()
-            codename = perm.codename.lower()
-            content_type = perm.content_type.model.lower()
-
-            # Organization - Give full access to user types 1 and 10
-            if 'organization' in content_type or 'organization' in perm_name:
-                return role in [1, 10]
-
-            # Students (#14) get NO announcement permissions at all
-            if role == 14 and ('announcement' in perm_name or 'announcement' in content_type):
-                return False
-
-            # OJT Adviser (16) gets ALL announcement permissions (view, add, change, delete)
-            if role == 16 and ('announcement' in perm_name or 'announcement' in content_type):
-                return True  # Give all announcement permissions
-
-            # Common permissions for all non-superadmin roles (except students and OJT Adviser)
-            if role != 14 and ('announcement' in perm_name or 'announcement' in content_type):
-                # Other OSAS roles get announcement permissions too
-                return True
-
-            # OJT Permissions
-            if ('ojt' in perm_name or 'ojt' in codename or
-                    'on-the-job' in perm_name or 'on_the_job' in codename or
-                    'ojtcompany' in content_type or 'ojtapplication' in content_type or
-                    'ojtreport' in content_type or 'ojtrequirement' in content_type):
-
-                if role in [1, 13, 16]:  # Super Admin, Job Placement, OJT Adviser
-                    return True
-
-                # Student (type 14) permissions
-                elif role == 14:
-                    # View only for OJT Company
-                    if 'ojtcompany' in codename:
-                        return 'view' in codename
-
-                    # All access for OJT Application
-                    elif 'ojtapplication' in codename:
-                        return True
-
-                    # All access for OJT Reports
-                    elif 'ojtreport' in codename:
-                        return True
-
-                    # All access for OJT Requirements
-                    elif 'ojtrequirement' in codename:
-                        return True
-
-                    else:
-                        return False
-
-                else:
-                    return False
-
-            # Student Admission permissions for specific roles
-            if ('student admission' in perm_name or 'studentadmission' in codename):
-                return role in [1, 12, 14]  # Super Admin, Admission, Student
-
-            # Scholarship Role (5) gets all scholarship permissions
-            if role == 5 and ('scholarship' in perm_name or 'scholarship' in codename):
-                return True
-
-            # All roles get complaint permissions
-            if ('complaint' in perm_name or 'complaint' in codename):
-                return True
-
-            # Only OSAS Staff, NSTP, and Student can access
-            if 'nstpstudentinfo' in codename:
-                return role in [1, 2, 14]
-
-            if 'nstpfile' in codename:
-                return role in [1, 2]
-
-            # OJT Adviser permissions - FULL access
-            if role == 16:
-                # OJT Adviser gets ALL permissions for downloadables (view, add, change, delete)
-                if 'downloadable' in perm_name or 'downloadable' in content_type:
-                    return True
-
-                # Also give access to other common features
-                # View content type permission (if exists)
-                if 'view content type' in perm_name:
-                    return True
-
-                # Return True for other relevant permissions
-                # You can add more permissions here as needed
-
-            # Role-specific permissions for other roles
-            if role == 2:  # NSTP
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 3:  # Clinic
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 4:  # Alumni
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 5:  # Scholarship
-                # Scholarship gets ALL downloadable permissions
-                if 'downloadable' in perm_name or 'downloadable' in content_type:
-                    return True
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 6:  # Culture and Arts
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 7:  # Sports Development
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 8:  # Guidance Counseling
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 9:  # Student Welfare Services
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 10:  # Student Development Services
-                # SDS gets all downloadable permissions plus organization (handled above)
-                if 'downloadable' in perm_name or 'downloadable' in content_type:
-                    return True
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 11:  # Misdeamenor
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 12:  # Admission
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 13:  # Job Placement
-                # Job Placement gets all downloadable permissions
-                if 'downloadable' in perm_name or 'downloadable' in content_type:
-                    return True
-                return ('downloadable' in perm_name and ('view' in perm_name or 'add' in perm_name))
-            elif role == 14:  # Student
-                return (('downloadable' in perm_name and 'view' in perm_name) or
-                        ('scholarship application' in perm_name and
-                         ('view' in perm_name or 'change' in perm_name or 'delete' in perm_name)))
-            else:
-                return False
-
-        # Assign permissions based on role
-        for perm in all_permissions:
-            if should_assign_permission(perm, user.user_type):
-                user.user_permissions.add(perm)
+        assign_role_group(user)
 
         # Staff status for OSAS units and OJT Adviser (non-student, non-superadmin)
         if user.user_type in range(2, 14) or user.user_type == 16:
@@ -4811,6 +4041,10 @@ class UserUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         # Save the user first
         user.save()
 
+        # Move verified users to their new role's permission group
+        if original_user_type != user.user_type and user.is_verified:
+            assign_role_group(user)
+
         if new_user_type == '16' or 'permissions' in self.request.POST:
             selected_permissions = self.request.POST.getlist('permissions', [])
 
@@ -5205,7 +4439,8 @@ class DownloadableListView(LoginRequiredMixin, ListView):
 
     def get(self, request, *args, **kwargs):
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            downloadables = self.get_queryset()
+            downloadables = list(self.get_queryset())
+            prefetch_metadata(downloadables, 'file')
             data = [{
                 'id': d.id,
                 'title': d.title,
@@ -5367,13 +4602,7 @@ class DownloadableArchiveView(LoginRequiredMixin, UserPassesTestMixin, View):
 
 def download_downloadable(request, pk):
     downloadable = get_object_or_404(Downloadable, pk=pk)
-    file_path = downloadable.file.path
-
-    if os.path.exists(file_path):
-        response = FileResponse(open(file_path, 'rb'))
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-        return response
-    raise Http404("File not found")
+    return send_file(request, downloadable.file.name, as_attachment=True, public=True)
 
 
 # ---------------------------------------------- Announcement Section --------------------------------------------------
@@ -5799,12 +5028,17 @@ class ComplaintCreateView(LoginRequiredMixin, CreateView):
         return context
 
 
+@login_required
 def download_complaint_pdf(request, complaint_id):
     try:
         complaint = Complaint.objects.get(reference_number=complaint_id)
     except Complaint.DoesNotExist:
         return HttpResponse("Complaint not found", status=404)
 
+    # Reference numbers are sequential, so knowing one is no proof of access
+    if not (request.user_roles.in_units(11) or complaint.created_by_id == request.user.id):
+        return HttpResponse("Permission denied", status=403)
+
     # Create a file-like buffer to receive PDF data
     buffer = BytesIO()
 
@@ -6921,33 +6155,29 @@ def export_complaints(request):
 
 
 # ------------------------------------------------ Activity Log Section ------------------------------------------------
-@require_GET
-def recent_activities(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
+ACTIVITY_TYPE_FILTERS = {
+    'create': Q(activity__icontains='create') | Q(activity__icontains='created'),
+    'update': Q(activity__icontains='update') | Q(activity__icontains='updated'),
+    'archive': Q(activity__icontains='archive') | Q(activity__icontains='archived'),
+}
 
-    # Get filter parameters
-    activity_type = request.GET.get('type', 'all')
-    user_filter = request.GET.get('user', 'all')
-    search_query = request.GET.get('search', '')
-    date_from = request.GET.get('date_from', '')
-    date_to = request.GET.get('date_to', '')
-    page_number = request.GET.get('page', 1)
+
+def filter_activities(params):
+    """Activity log entries, newest first, matching the type/user/search/date filters in `params`"""
+    activity_type = params.get('type', 'all')
+    user_filter = params.get('user', 'all')
+    search_query = params.get('search', '')
+    date_from = params.get('date_from', '')
+    date_to = params.get('date_to', '')
 
     # Base queryset
     activities = UserActivityLog.objects.select_related('user').order_by('-timestamp')
 
     # Apply filters
-    if activity_type != 'all':
-        type_filters = {
-            'create': Q(activity__icontains='create') | Q(activity__icontains='created'),
-            'update': Q(activity__icontains='update') | Q(activity__icontains='updated'),
-            'archive': Q(activity__icontains='archive') | Q(activity__icontains='archived'),
-        }
-        if activity_type in type_filters:
-            activities = activities.filter(type_filters[activity_type])
+    if activity_type in ACTIVITY_TYPE_FILTERS:
+        activities = activities.filter(ACTIVITY_TYPE_FILTERS[activity_type])
 
-    if user_filter != 'all' and user_filter != 'all':
+    if user_filter != 'all':
         activities = activities.filter(user_id=user_filter)
 
     if search_query:
@@ -6972,30 +6202,45 @@ def recent_activities(request):
         except ValueError:
             pass
 
-    # Paginate results for normal display
-    paginator = Paginator(activities, 50)
-    page_obj = paginator.get_page(page_number)
-
-    activity_list = []
-    for activity in page_obj:
-        activity_list.append({
-            'id': activity.id,
-            'user': activity.user.get_full_name() or activity.user.username,
-            'activity': activity.activity,
-            'timestamp': activity.timestamp.isoformat(),
-            'user_type': activity.user.get_user_type_display(),
-            'ip_address': getattr(activity, 'ip_address', None),
-            'details': getattr(activity, 'details', None),
-        })
+    return activities
 
-    return JsonResponse({
-        'activities': activity_list,
+
+def activities_payload(request, page_obj):
+    """recent_activities response for a numbered page or, with ?cursor=, a keyset page"""
+    payload = {
+        'activities': ActivityListSerializer(request).serialize(page_obj),
         'has_next': page_obj.has_next(),
         'has_previous': page_obj.has_previous(),
-        'current_page': page_obj.number,
-        'total_pages': paginator.num_pages,
-        'total_activities': paginator.count
-    })
+    }
+    if isinstance(page_obj, KeysetPage):
+        payload.update(next_cursor=page_obj.next_cursor, prev_cursor=page_obj.prev_cursor,
+                       total_activities=page_obj.total_count)
+    else:
+        payload.update(current_page=page_obj.number, total_pages=page_obj.paginator.num_pages,
+                       total_activities=page_obj.paginator.count)
+    return payload
+
+
+@require_GET
+def recent_activities(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+
+    page_number = request.GET.get('page', 1)
+    activities = filter_activities(request.GET)
+
+    # Keyset pagination on (-timestamp, -id): "load more" sends back next_cursor,
+    # so deep pages cost the same as the first one.
+    activities = project(activities.order_by('-timestamp', '-id'), 'activities')
+    if 'cursor' in request.GET:
+        # The total is an extra COUNT; only clients that show it ask with ?with_count=1
+        page_obj = KeysetPaginator(activities, 50).page(
+            request.GET.get('cursor'), with_count=request.GET.get('with_count') == '1'
+        )
+    else:
+        page_obj = Paginator(activities, 50).get_page(page_number)
+
+    return FastJsonResponse(activities_payload(request, page_obj))
 
 
 @require_GET
@@ -7007,50 +6252,7 @@ def export_activities(request):
     if not (request.user.is_superuser or request.user.user_type == 1):
         return HttpResponse('Forbidden: Insufficient permissions', status=403)
 
-    # Get filter parameters
-    activity_type = request.GET.get('type', 'all')
-    user_filter = request.GET.get('user', 'all')
-    search_query = request.GET.get('search', '')
-    date_from = request.GET.get('date_from', '')
-    date_to = request.GET.get('date_to', '')
-
-    # Base queryset
-    activities = UserActivityLog.objects.select_related('user').order_by('-timestamp')
-
-    # Apply filters
-    if activity_type != 'all':
-        type_filters = {
-            'create': Q(activity__icontains='create') | Q(activity__icontains='created'),
-            'update': Q(activity__icontains='update') | Q(activity__icontains='updated'),
-            'archive': Q(activity__icontains='archive') | Q(activity__icontains='archived'),
-        }
-        if activity_type in type_filters:
-            activities = activities.filter(type_filters[activity_type])
-
-    if user_filter != 'all' and user_filter != 'all':
-        activities = activities.filter(user_id=user_filter)
-
-    if search_query:
-        activities = activities.filter(
-            Q(activity__icontains=search_query) |
-            Q(user__username__icontains=search_query) |
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query)
-        )
-
-    if date_from:
-        try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-            activities = activities.filter(timestamp__date__gte=date_from_obj)
-        except ValueError:
-            pass
-
-    if date_to:
-        try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-            activities = activities.filter(timestamp__date__lte=date_to_obj)
-        except ValueError:
-            pass
+    activities = filter_activities(request.GET)
 
     # Create CSV response with proper Excel formatting
     response = HttpResponse(
@@ -7064,19 +6266,23 @@ def export_activities(request):
     writer.writerow(['ID', 'User', 'Activity', 'User Type', 'Timestamp', 'Date', 'Time'])
 
     # Write data rows with actual data from activities
-    for activity in activities:
-        timestamp = activity.timestamp
+    # Stream plain rows; the export never needs model instances
+    user_types = dict(CustomUser.USER_TYPE_CHOICES)
+    for activity in project_values(activities, 'activities').iterator(chunk_size=2000):
+        timestamp = activity['timestamp']
 
         # Format the timestamp properly
         full_timestamp = timestamp.strftime('%Y-%m-%d %H:%M:%S')
         date_str = timestamp.strftime('%Y-%m-%d')
         time_str = timestamp.strftime('%H:%M:%S')
 
+        user_name = f"{activity['user__first_name']} {activity['user__last_name']}".strip()
+
         writer.writerow([
-            activity.id,
-            activity.user.get_full_name() or activity.user.username,
-            activity.activity,
-            activity.user.get_user_type_display(),
+            activity['id'],
+            user_name or activity['user__username'],
+            activity['activity'],
+            user_types.get(activity['user__user_type'], activity['user__user_type']),
             full_timestamp,
             date_str,
             time_str
@@ -7085,899 +6291,397 @@ def export_activities(request):
     return response
 
 
-@require_GET
-def activity_users(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-
-    # Get unique users who have activities
+def activity_users_queryset():
+    """Users who have activities"""
     user_ids = UserActivityLog.objects.values_list('user_id', flat=True).distinct()
-    users = CustomUser.objects.filter(id__in=user_ids)
+    return CustomUser.objects.filter(id__in=user_ids)
+
 
+def activity_user_choices(users):
     user_list = [{'id': 'all', 'name': 'All Users'}]
     for user in users:
         user_list.append({
             'id': user.id,
             'name': user.get_full_name() or user.username
         })
-
-    return JsonResponse(user_list, safe=False)
+    return user_list
 
 
 @require_GET
-def activity_log_overview(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Unauthorized'}, status=401)
-
-    # Calculate today's activities
-    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_activities = UserActivityLog.objects.filter(
-        timestamp__gte=today_start
-    ).count()
-
-    # Total activities
-    total_activities = UserActivityLog.objects.count()
-
-    # Activities by type (last 7 days)
-    week_ago = timezone.now() - timedelta(days=7)
-    recent_activities = UserActivityLog.objects.filter(timestamp__gte=week_ago)
-
-    activity_types = {
-        'creations': recent_activities.filter(
-            Q(activity__icontains='create') | Q(activity__icontains='created')).count(),
-        'updates': recent_activities.filter(Q(activity__icontains='update') | Q(activity__icontains='updated')).count(),
-        'archives': recent_activities.filter(
-            Q(activity__icontains='archive') | Q(activity__icontains='archived')).count(),
-    }
-
-    return JsonResponse({
-        'today_activities': today_activities,
-        'total_activities': total_activities,
-        'recent_activity_types': activity_types,
-    })
-
-
-# --------------------------------------------------- Archived Section -------------------------------------------------
-class ArchivedItemDetailView(LoginRequiredMixin, View):
-    def get_file_type_icon(self, filename):
-        ext = filename.split('.')[-1].lower() if '.' in filename else ''
-        if ext in ['pdf']:
-            return 'fas fa-file-pdf'
-        elif ext in ['doc', 'docx']:
-            return 'fas fa-file-word'
-        elif ext in ['xls', 'xlsx']:
-            return 'fas fa-file-excel'
-        elif ext in ['ppt', 'pptx']:
-            return 'fas fa-file-powerpoint'
-        elif ext in ['jpg', 'jpeg', 'png', 'gif', 'bmp']:
-            return 'fas fa-file-image'
-        elif ext in ['zip', 'rar', '7z']:
-            return 'fas fa-file-archive'
-        else:
-            return 'fas fa-file'
-
-    def get(self, request, item_type, pk):
-        if item_type == 'user':
-            item = get_object_or_404(CustomUser, pk=pk, is_archived=True)
-
-            # Base user data
-            data = {
-                'id': item.id,
-                'username': item.username,
-                'first_name': item.first_name,
-                'last_name': item.last_name,
-                'email': item.email,
-                'user_type_display': item.get_user_type_display(),
-                'gender_display': item.get_gender_display(),
-                'birth_date': item.birth_date.strftime('%B %d, %Y') if item.birth_date else None,
-                'phone_number': item.phone_number,
-                'address': item.address,
-                'is_active': item.is_active,
-                'is_verified': item.is_verified,
-                'date_joined': item.date_joined.strftime('%B %d, %Y %H:%M'),
-                'last_login': item.last_login.strftime('%B %d, %Y %H:%M') if item.last_login else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'profile_picture': item.profile_picture.url if item.profile_picture else None,
-
-                # Student-specific fields
-                'student_number': item.student_number,
-                'course': str(item.course) if item.course else None,
-                'year_level': item.year_level,
-                'section': item.section,
-
-                # OSAS staff-specific fields
-                'department': item.department,
-                'position': item.position,
-
-                # Verification documents
-                'id_photo_url': item.id_photo.url if item.id_photo else None,
-                'cor_photo_url': item.cor_photo.url if item.cor_photo else None,
-
-                # Type indicators
-                'is_student': item.is_student,
-                'is_osas_unit': item.is_osas_unit,
-                'is_organization': item.is_organization,
-            }
-
-            # Add display name based on user type
-            if item.is_organization and hasattr(item, 'organization_account'):
-                org = item.organization_account
-                data['display_name'] = org.organization_name
-            else:
-                data['display_name'] = f"{item.first_name} {item.last_name}".strip() or item.username
-
-            # Add organization-specific data if this is an organization user
-            if item.is_organization and hasattr(item, 'organization_account'):
-                org = item.organization_account
-                data.update({
-                    'organization_name': org.organization_name,
-                    'organization_acronym': org.organization_acronym,
-                    'organization_type': org.get_organization_type_display(),
-                    'organization_email': org.organization_email,
-                    'organization_status': org.organization_status,
-                    'organization_status_display': dict(org.ORGANIZATION_STATUS_CHOICES).get(org.organization_status,
-                                                                                             'Unknown'),
-                    'organization_valid_from': org.organization_valid_from.strftime(
-                        '%B %d, %Y') if org.organization_valid_from else None,
-                    'organization_valid_until': org.organization_valid_until.strftime(
-                        '%B %d, %Y') if org.organization_valid_until else None,
-                    'organization_adviser_name': org.organization_adviser_name,
-                    'organization_adviser_department': org.organization_adviser_department,
-                    'organization_adviser_email': org.organization_adviser_email,
-                    'organization_adviser_phone': org.organization_adviser_phone,
-                    'organization_member_count': org.organization_member_count,
-                    'organization_has_minimum_members': org.organization_has_minimum_members,
-                    'organization_members': org.organization_members or [],
-
-                    # Organization document URLs
-                    'organization_logo_url': org.organization_logo.url if org.organization_logo else None,
-                    'organization_calendar_activities_url': org.organization_calendar_activities.url if org.organization_calendar_activities else None,
-                    'organization_adviser_cv_url': org.organization_adviser_cv.url if org.organization_adviser_cv else None,
-                    'organization_cog_url': org.organization_cog.url if org.organization_cog else None,
-                    'organization_group_picture_url': org.organization_group_picture.url if org.organization_group_picture else None,
-                    'organization_cbl_url': org.organization_cbl.url if org.organization_cbl else None,
-                    'organization_list_members_url': org.organization_list_members.url if org.organization_list_members else None,
-                    'organization_acceptance_letter_url': org.organization_acceptance_letter.url if org.organization_acceptance_letter else None,
-                    'organization_ar_url': org.organization_ar.url if org.organization_ar else None,
-                    'organization_previous_calendar_url': org.organization_previous_calendar.url if org.organization_previous_calendar else None,
-                    'organization_financial_report_url': org.organization_financial_report.url if org.organization_financial_report else None,
-                    'organization_coa_url': org.organization_coa.url if org.organization_coa else None,
-                    'organization_member_biodata_url': org.organization_member_biodata.url if org.organization_member_biodata else None,
-                    'organization_good_moral_url': org.organization_good_moral.url if org.organization_good_moral else None,
-                })
-
-        elif item_type == 'announcement':
-            item = get_object_or_404(Announcement, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'title': item.title,
-                'content': item.content,
-                'category_display': item.get_category_display(),
-                'author_name': item.author.get_full_name(),
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'publish_date': item.publish_date.strftime('%B %d, %Y %H:%M') if item.publish_date else None,
-                'link': item.link,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'images': [{
-                    'url': img.image.url,
-                    'caption': img.caption
-                } for img in item.images.all()]
-            }
-
-        elif item_type == 'downloadable':
-            item = get_object_or_404(Downloadable, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'title': item.title,
-                'description': item.description,
-                'category_display': item.get_category_display(),
-                'file_name': item.get_file_name(),
-                'file_size': item.get_file_size(),
-                'file_url': item.file.url,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'created_by': item.created_by.get_full_name(),
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-            }
-
-        elif item_type == 'complaint':
-            item = get_object_or_404(Complaint, pk=pk, is_archived=True)
-            # Permission check
-            if not (request.user.is_superuser or
-                    request.user.user_type in [1, 11] or
-                    item.created_by == request.user or
-                    item.archived_by == request.user):
-                return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-
-            # Prepare course data
-            respondent_course_data = None
-
-            if item.respondent_course:
-                respondent_course_data = {
-                    'id': item.respondent_course.id,
-                    'name': item.respondent_course.name,
-                    'subtext': item.respondent_course.subtext,
-                    'logo_url': item.respondent_course.logo.url if item.respondent_course.logo else None
-                }
-
-            data = {
-                'id': item.id,
-                'reference_number': item.reference_number,
-                'title': item.title,
-                'status': item.status,
-                'status_display': item.get_status_display(),
-                'statement': item.statement,
-                'notes': item.notes,
-                'complainant_first_name': item.complainant_first_name,
-                'complainant_last_name': item.complainant_last_name,
-                'complainant_email': item.complainant_email,
-                'complainant_phone': item.complainant_phone,
-                'complainant_address': item.complainant_address,
-                'complainant_instructor_name': item.complainant_instructor_name,
-                'respondent_first_name': item.respondent_first_name,
-                'respondent_last_name': item.respondent_last_name,
-                'respondent_type': item.respondent_type,
-                'respondent_type_display': item.get_respondent_type_display(),
-                'respondent_course': respondent_course_data,
-                'respondent_year': item.respondent_year,
-                'respondent_section': item.respondent_section,
-                'respondent_department': item.respondent_department,
-                'incident_date': item.incident_date.strftime('%B %d, %Y') if item.incident_date else None,
-                'incident_time': item.incident_time.strftime('%H:%M') if item.incident_time else None,
-                'incident_location': item.incident_location,
-                'witnesses': item.witnesses,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'created_by': item.created_by.get_full_name() if item.created_by else None,
-
-                'documents': [{
-                    'id': doc.id,
-                    'file_url': doc.file.url,
-                    'file_name': doc.file.name.split('/')[-1],
-                    'description': doc.description,
-                    'uploaded_at': doc.uploaded_at.strftime('%B %d, %Y %H:%M')
-                } for doc in item.documents.all()],
-
-                'images': [{
-                    'id': img.id,
-                    'image_url': img.image.url,
-                    'caption': img.caption,
-                    'uploaded_at': img.uploaded_at.strftime('%B %d, %Y %H:%M')
-                } for img in item.images.all()],
-            }
-        elif item_type == 'scholarship':
-            item = get_object_or_404(Scholarship, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'name': item.name,
-                'description': item.description,
-                'scholarship_type': item.scholarship_type,
-                'scholarship_type_display': item.get_scholarship_type_display(),
-                'benefits': item.benefits,
-                'requirements': item.requirements,
-                'is_active': item.is_active,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'created_by': item.created_by.get_full_name() if item.created_by else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'application_form': {
-                    'title': item.application_form.title if item.application_form else None,
-                    'file_url': item.application_form.file.url if item.application_form else None,
-                    'file_name': item.application_form.get_file_name() if item.application_form else None,
-                } if item.application_form else None
-            }
-        elif item_type == 'scholarship-application':
-            item = get_object_or_404(ScholarshipApplication, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'status': item.status,
-                'status_display': item.get_status_display(),
-                'application_date': item.application_date.strftime('%B %d, %Y %H:%M'),
-                'status_update_date': item.status_update_date.strftime(
-                    '%B %d, %Y %H:%M') if item.status_update_date else None,
-                'notes': item.notes,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'student': {
-                    'full_name': item.student.get_full_name(),
-                    'student_number': item.student.student_number,
-                    'course': str(item.student.course) if item.student.course else None,
-                    'email': item.student.email,
-                    'phone_number': item.student.phone_number,
-                    'profile_picture': item.student.profile_picture.url if item.student.profile_picture else None,
-                },
-                'scholarship': {
-                    'name': item.scholarship.name,
-                    'description': item.scholarship.description,
-                    'type_display': item.scholarship.get_scholarship_type_display(),
-                },
-                'application_form_url': item.application_form.url if item.application_form else None,
-                'cog_url': item.cog.url if item.cog else None,
-                'cor_url': item.cor.url if item.cor else None,
-                'id_photo_url': item.id_photo.url if item.id_photo else None,
-                'other_documents_url': item.other_documents.url if item.other_documents else None,
-            }
-        elif item_type == 'admission':
-            item = get_object_or_404(StudentAdmission, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'control_no': item.control_no,
-                'student_type_display': item.get_student_type_display(),
-                'course': {
-                    'id': item.course.id if item.course else None,
-                    'name': item.course.name if item.course else None,
-                },
-                'status_display': item.get_status_display(),
-                'date': item.date.strftime('%B %d, %Y'),
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'remarks': item.remarks,
-                'admission_portal_registration': item.admission_portal_registration,
-
-                # Student type specific fields
-                'strand': item.strand,
-                'grade11_report_card': item.grade11_report_card.url if item.grade11_report_card else None,
-                'certificate_of_enrollment': item.certificate_of_enrollment.url if item.certificate_of_enrollment else None,
-                'grade12_report_card': item.grade12_report_card.url if item.grade12_report_card else None,
-                'form137': item.form137.url if item.form137 else None,
-
-                # Transferee specific fields
-                'curriculum_type_display': item.get_curriculum_type_display() if item.curriculum_type else None,
-                'first_year_first_semester_display': item.get_first_year_first_semester_display() if item.first_year_first_semester else None,
-                'first_year_second_semester_display': item.get_first_year_second_semester_display() if item.first_year_second_semester else None,
-                'second_year_first_semester_display': item.get_second_year_first_semester_display() if item.second_year_first_semester else None,
-                'other_semester_info': item.other_semester_info,
-                'transcript_of_grades': item.transcript_of_grades.url if item.transcript_of_grades else None,
-                'good_moral_certificate': item.good_moral_certificate.url if item.good_moral_certificate else None,
-                'honorable_dismissal': item.honorable_dismissal.url if item.honorable_dismissal else None,
-                'nbi_police_clearance': item.nbi_police_clearance.url if item.nbi_police_clearance else None,
-            }
-        elif item_type == 'nstp-student':
-            item = get_object_or_404(NSTPStudentInfo, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'first_name': item.first_name,
-                'last_name': item.last_name,
-                'middle_name': item.middle_name,
-                'student_number': item.student_number,
-                'program': item.program,
-                'gender': item.gender,
-                'gender_display': item.get_gender_display(),
-                'birth_date': item.birth_date.strftime('%B %d, %Y') if item.birth_date else None,
-                'contact_number': item.contact_number,
-                'email_address': item.email_address,
-                'street_or_barangay': item.street_or_barangay,
-                'municipality_or_city': item.municipality_or_city,
-                'province': item.province,
-                'approval_status': item.approval_status,
-                'approval_status_display': item.get_approval_status_display(),
-                'semester': item.semester,
-                'semester_display': item.get_semester_display(),
-                'academic_year': item.academic_year,
-                'remarks': item.remarks,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'user': {
-                    'full_name': item.user.get_full_name(),
-                    'profile_picture': item.user.profile_picture.url if item.user.profile_picture else None,
-                    'email': item.user.email,
-                }
-            }
-        elif item_type == 'nstp-file':
-            item = get_object_or_404(NSTPFile, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'title': item.title,
-                'description': item.description,
-                'category_display': item.get_category_display(),
-                'semester_display': item.get_semester_display(),
-                'school_year': item.school_year,
-                'file_name': item.get_file_name(),
-                'file_size': item.get_file_size(),
-                'file_url': item.file.url,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'created_by': item.created_by.get_full_name(),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-            }
-        elif item_type == 'ojt-company':
-            item = get_object_or_404(OJTCompany, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'name': item.name,
-                'address': item.address,
-                'contact_number': item.contact_number,
-                'description': item.description or "",
-                'website': item.website or "",
-                'email': item.email or "",
-                'status': item.display_status,  # Use display_status property
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else "",
-                'status_updated_at': item.status_updated_at.strftime(
-                    '%B %d, %Y %H:%M') if item.status_updated_at else "",
-                'status_updated_by': item.status_updated_by.get_full_name() if item.status_updated_by else "",
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else "",
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else "System",
-            }
-        elif item_type == 'organization':
-            item = get_object_or_404(Organization, pk=pk, is_archived=True)
-            data = {
-                'id': item.id,
-                'organization_name': item.organization_name,
-                'organization_acronym': item.organization_acronym,
-                'organization_description': item.organization_description,
-                'organization_mission': item.organization_mission,
-                'organization_vision': item.organization_vision,
-                'organization_type_display': item.get_organization_type_display(),
-                'organization_email': item.organization_email,
-                'organization_status': item.organization_status,
-                'organization_status_display': dict(item.ORGANIZATION_STATUS_CHOICES).get(item.organization_status,
-                                                                                          'Unknown'),
-                'organization_valid_from': item.organization_valid_from.strftime(
-                    '%B %d, %Y') if item.organization_valid_from else None,
-                'organization_valid_until': item.organization_valid_until.strftime(
-                    '%B %d, %Y') if item.organization_valid_until else None,
-                'organization_adviser_name': item.organization_adviser_name,
-                'organization_adviser_department': item.organization_adviser_department,
-                'organization_adviser_email': item.organization_adviser_email,
-                'organization_adviser_phone': item.organization_adviser_phone,
-                'organization_member_count': item.organization_member_count,
-                'organization_has_minimum_members': item.organization_has_minimum_members,
-                'all_requirements_submitted': item.all_requirements_submitted,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'organization_members': item.organization_members or [],
-
-                # Document URLs
-                'organization_logo_url': item.organization_logo.url if item.organization_logo else None,
-                'organization_calendar_activities_url': item.organization_calendar_activities.url if item.organization_calendar_activities else None,
-                'organization_adviser_cv_url': item.organization_adviser_cv.url if item.organization_adviser_cv else None,
-                'organization_cog_url': item.organization_cog.url if item.organization_cog else None,
-                'organization_group_picture_url': item.organization_group_picture.url if item.organization_group_picture else None,
-                'organization_cbl_url': item.organization_cbl.url if item.organization_cbl else None,
-                'organization_list_members_url': item.organization_list_members.url if item.organization_list_members else None,
-                'organization_acceptance_letter_url': item.organization_acceptance_letter.url if item.organization_acceptance_letter else None,
-                'organization_ar_url': item.organization_ar.url if item.organization_ar else None,
-                'organization_previous_calendar_url': item.organization_previous_calendar.url if item.organization_previous_calendar else None,
-                'organization_financial_report_url': item.organization_financial_report.url if item.organization_financial_report else None,
-                'organization_coa_url': item.organization_coa.url if item.organization_coa else None,
-                'organization_member_biodata_url': item.organization_member_biodata.url if item.organization_member_biodata else None,
-                'organization_good_moral_url': item.organization_good_moral.url if item.organization_good_moral else None,
-            }
-        elif item_type == 'accomplishment-report':
-            item = get_object_or_404(AccomplishmentRecord, pk=pk, is_archived=True)
-
-            # Check permissions based on your requirements
-            if not (request.user.is_superuser or
-                    request.user.user_type in [1, 10] or
-                    (request.user.user_type == 15 and
-                     item.organization and
-                     item.organization.user_account == request.user) or
-                    item.archived_by == request.user):
-                return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-
-            data = {
-                'id': item.id,
-                'title': item.title,
-                'record_type': item.record_type,
-                'record_type_display': item.get_record_type_display(),
-                'date_conducted': item.date_conducted.strftime('%B %d, %Y'),
-                'venue': item.venue,
-                'semester': item.semester,
-                'semester_display': item.get_semester_display(),
-                'school_year': item.school_year,
-                'objectives': item.objectives,
-                'outcomes': item.outcomes,
-                'number_of_participants': item.number_of_participants,
-                'duration_hours': float(item.duration_hours),
-                'budget_utilized': float(item.budget_utilized) if item.budget_utilized else None,
-                'archive_reason': item.archive_reason,
-                'created_at': item.created_at.strftime('%B %d, %Y %H:%M'),
-                'updated_at': item.updated_at.strftime('%B %d, %Y %H:%M') if item.updated_at else None,
-                'archived_at': item.archived_at.strftime('%B %d, %Y %H:%M') if item.archived_at else None,
-                'archived_by': item.archived_by.get_full_name() if item.archived_by else None,
-                'submitted_by': item.submitted_by.get_full_name() if item.submitted_by else None,
-                'organization': {
-                    'name': item.organization.organization_name if item.organization else None,
-                    'acronym': item.organization.organization_acronym if item.organization else None,
-                } if item.organization else None,
-                'main_report': {
-                    'url': item.main_report.url if item.main_report else None,
-                    'name': item.main_report.name.split('/')[-1] if item.main_report else None,
-                },
-                'supporting_files': [{
-                    'id': file.id,
-                    'url': file.file.url,
-                    'name': file.filename,
-                    'description': file.description,
-                    'uploaded_at': file.uploaded_at.strftime('%B %d, %Y %H:%M')
-                } for file in item.supporting_files.all()]
-            }
-        else:
-            return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
+def activity_users(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
 
-        return JsonResponse({'success': True, item_type: data})
+    return JsonResponse(activity_user_choices(activity_users_queryset()), safe=False)
 
 
-class RetrieveArchivedItemView(LoginRequiredMixin, View):
-    def post(self, request, item_type, pk):
-        if not request.user.is_authenticated:
-            return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+def activity_overview_counts():
+    """Aggregates for activity_log_overview: today's and all activities, and last week's by type, in one query"""
+    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = timezone.now() - timedelta(days=7)
+    return {
+        'today_activities': Count('pk', filter=Q(timestamp__gte=today_start)),
+        'total_activities': Count('pk'),
+        'creations': Count('pk', filter=Q(timestamp__gte=week_ago) & ACTIVITY_TYPE_FILTERS['create']),
+        'updates': Count('pk', filter=Q(timestamp__gte=week_ago) & ACTIVITY_TYPE_FILTERS['update']),
+        'archives': Count('pk', filter=Q(timestamp__gte=week_ago) & ACTIVITY_TYPE_FILTERS['archive']),
+    }
 
-        try:
-            if item_type == 'user':
-                if not request.user.is_superuser:
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-                item = get_object_or_404(CustomUser, pk=pk, is_archived=True)
+def activity_overview_payload(counts):
+    return {
+        'today_activities': counts['today_activities'],
+        'total_activities': counts['total_activities'],
+        'recent_activity_types': {key: counts[key] for key in ('creations', 'updates', 'archives')},
+    }
 
-                from django.db import transaction
-                with transaction.atomic():
-                    # Retrieve the user
-                    item.is_archived = False
-                    item.is_active = True
-                    item.archived_at = None
-                    item.archived_by = None
-                    item.save()
 
-                    organization_retrieved = False
-                    if item.user_type == 15 and hasattr(item, 'organization_account'):
-                        organization = item.organization_account
+@require_GET
+def activity_log_overview(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
 
-                        # Retrieve the organization
-                        organization.is_archived = False
-                        organization.is_active = True  # Make organization active
-                        organization.archived_at = None
-                        organization.archived_by = None
+    return JsonResponse(activity_overview_payload(UserActivityLog.objects.aggregate(**activity_overview_counts())))
 
-                        # Set organization status to 'cancelled' as requested
-                        organization._organization_status = 'cancelled'
 
-                        organization.save()
-                        organization_retrieved = True
+# --------------------------------------------------- Archived Section -------------------------------------------------
+class ArchivedItemDetailView(LoginRequiredMixin, View):
+    def get(self, request, item_type, pk):
+        archive_type = ARCHIVE_TYPES.get(item_type)
+        if archive_type is None:
+            return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
 
-                # Log the activity
-                if item.user_type == 15 and organization_retrieved:
-                    UserActivityLog.objects.create(
-                        user=request.user,
-                        activity=f"{request.user.first_name} retrieved organization user: {item.get_full_name()} and linked organization: {organization.organization_name} (Status set to: cancelled)"
-                    )
-                else:
-                    UserActivityLog.objects.create(
-                        user=request.user,
-                        activity=f"{request.user.first_name} retrieved user: {item.get_full_name()}"
-                    )
+        item = archive_type.find(pk)
+        if item is None:
+            raise Http404
+        if not archive_type.can_view(request.user_roles, item):
+            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-            elif item_type == 'announcement':
-                item = get_object_or_404(Announcement, pk=pk, is_archived=True)
+        # A frozen record is shown from its read-only copy; only retrieving it thaws it
+        return JsonResponse({'success': True, item_type: archive_type.serialize(item)})
 
-                # Check permissions - author or superuser can retrieve
-                if not (request.user.is_superuser or item.author == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+class RetrieveArchivedItemView(LoginRequiredMixin, View):
+    def post(self, request, item_type, pk):
+        if not request.user.is_authenticated:
+            return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved announcement: {item.title}"
-                )
+        archive_type = ARCHIVE_TYPES.get(item_type)
+        if archive_type is None:
+            return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
 
-            elif item_type == 'downloadable':
-                item = get_object_or_404(Downloadable, pk=pk, is_archived=True)
+        item = archive_type.find(pk)
+        if item is None:
+            raise Http404
+        if not archive_type.can_restore(request.user_roles, item):
+            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-                # Check permissions - creator or superuser can retrieve
-                if not (request.user.is_superuser or item.created_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        try:
+            with transaction.atomic():
+                item = archive_type.warm(item)
+                activity = archive_type.restore(item, request.user)
+            UserActivityLog.objects.create(user=request.user, activity=activity)
+            return JsonResponse({'success': True})
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+        except ColdStorageError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=409)
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved downloadable: {item.title}"
-                )
 
-            elif item_type == 'complaint':
-                item = get_object_or_404(Complaint, pk=pk, is_archived=True)
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 11] or
-                        item.created_by == request.user or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-
-                item.is_archived = False
-                item.status = 'under_review'
-                item.archived_at = None
-                item.archived_by = None
-
-                retrieval_note = f"\n\nRetrieved on {timezone.now().strftime('%Y-%m-%d %H:%M')} by {request.user.get_full_name()}"
-                if item.notes:
-                    item.notes += retrieval_note
-                else:
-                    item.notes = retrieval_note.strip()
-                item.save()
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved complaint: {item.reference_number} and set status to Under Review"
-                )
-            elif item_type == 'scholarship':
-                item = get_object_or_404(Scholarship, pk=pk, is_archived=True)
+class ArchiveListView(LoginRequiredMixin, View):
+    """
+    GET api/archived/?type=<item type>&q=<search>&cursor=<cursor>
 
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 5] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    Pages through the archive index newest first. Without `type` it lists every
+    archived record the user can see; with `type` and format=html it also
+    renders the dashboard table rows for that tab.
+    """
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+    def get(self, request):
+        item_type = request.GET.get('type') or None
+        if item_type and item_type not in ARCHIVE_TYPES:
+            return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved scholarship: {item.name}"
-                )
+        try:
+            per_page = min(max(int(request.GET.get('per_page', ARCHIVE_PAGE_SIZE)), 1), 100)
+        except ValueError:
+            per_page = ARCHIVE_PAGE_SIZE
+
+        page = archive_page(
+            request.user_roles,
+            item_type,
+            query=request.GET.get('q', '').strip(),
+            cursor=request.GET.get('cursor'),
+            per_page=per_page,
+            with_count=request.GET.get('with_count') == '1',
+        )
 
-            elif item_type == 'scholarship-application':
-                item = get_object_or_404(ScholarshipApplication, pk=pk, is_archived=True)
+        data = {
+            'success': True,
+            'items': [entry_payload(entry) for entry in page],
+            'pagination': pagination_payload(page),
+        }
+        if item_type and request.GET.get('format') == 'html':
+            archive_type = ARCHIVE_TYPES[item_type]
+            data['html'] = ''.join(
+                render_to_string(archive_type.row_template, {archive_type.row_var: obj}, request=request)
+                for obj in archive_type.hydrate(page.object_list)
+            )
+        return FastJsonResponse(data)
 
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 5] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+# ------------------------------------------------ Bulk Actions --------------------------------------------------------
+class BulkActionView(LoginRequiredMixin, View):
+    """
+    POST bulk/<table>/<action>/ with {"ids": [...]} or {"filter": {...}}, plus the
+    action's own parameters (e.g. "notes"). Accepts JSON or form data.
+    """
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved scholarship application for {item.student.get_full_name()}"
-                )
-            elif item_type == 'admission':
-                item = get_object_or_404(StudentAdmission, pk=pk, is_archived=True)
+    def post(self, request, table, action):
+        bulk_action = BULK_ACTIONS.get((table, action))
+        if bulk_action is None:
+            return JsonResponse({'success': False, 'error': 'Unknown bulk action'}, status=404)
 
-                # Check permissions
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 12] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        if not bulk_action.has_permission(request.user_roles):
+            return JsonResponse({
+                'success': False,
+                'error': 'You do not have permission to perform this action'
+            }, status=403)
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+        try:
+            if request.content_type == 'application/json':
+                params = json.loads(request.body or '{}')
+                if not isinstance(params, dict):
+                    raise ValueError("Expected a JSON object")
+                ids = params.get('ids') or []
+                filters = params.get('filter') or {}
+            else:
+                params = request.POST.dict()
+                ids = request.POST.getlist('ids') or request.POST.getlist('ids[]')
+                filters = json.loads(request.POST.get('filter') or '{}')
+            if not isinstance(ids, list) or not isinstance(filters, dict):
+                raise ValueError("Expected a list of ids and a filter object")
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return JsonResponse({'success': False, 'error': 'Invalid request data'}, status=400)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved student admission: {item.control_no}"
-                )
-            elif item_type == 'nstp-student':
-                item = get_object_or_404(NSTPStudentInfo, pk=pk, is_archived=True)
+        try:
+            result = bulk_action.run(request, ids=ids, filters=filters, params=params)
+        except BulkActionError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+        except Exception as e:
+            logger.error(f"Error in BulkActionView ({table}/{action}): {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'error': 'An unexpected error occurred'
+            }, status=500)
 
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 2] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        return JsonResponse(result)
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved NSTP student: {item.last_name}, {item.first_name} ({item.student_number})"
-                )
-            elif item_type == 'nstp-file':
-                item = get_object_or_404(NSTPFile, pk=pk, is_archived=True)
+# ----------------------------------------------- Import Section -------------------------------------------------------
+class ImportView(LoginRequiredMixin, View):
+    """
+    GET imports/<kind>/ returns the CSV column template; POST with a "file" (.xlsx or
+    .csv) and optional "dry_run" starts an ImportJob and returns its state.
+    """
 
-                if not (request.user.is_superuser or
-                        item.created_by == request.user or
-                        request.user.user_type in [1, 2] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    def get_importer(self, kind):
+        importer = IMPORTERS.get(kind)
+        if importer is None:
+            raise Http404("Unknown import type")
+        return importer
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+    def get(self, request, kind):
+        importer = self.get_importer(kind)
+        response = HttpResponse(template_csv(kind), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{importer.kind}_template.csv"'
+        return response
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved NSTP file: {item.title}"
-                )
-            elif item_type == 'ojt-company':
-                item = get_object_or_404(OJTCompany, pk=pk, is_archived=True)
+    def post(self, request, kind):
+        importer = self.get_importer(kind)
+        if not importer.has_permission(request.user_roles):
+            return JsonResponse({
+                'success': False,
+                'error': f'You do not have permission to import {importer.label}'
+            }, status=403)
+
+        upload = request.FILES.get('file')
+        if not upload:
+            return JsonResponse({'success': False, 'error': 'Please choose a file to import'}, status=400)
+        if not upload.name.lower().endswith(IMPORT_EXTENSIONS):
+            return JsonResponse({'success': False, 'error': 'Upload an .xlsx or .csv file'}, status=400)
+        if upload.size > IMPORT_MAX_BYTES:
+            return JsonResponse({
+                'success': False,
+                'error': f'Files larger than {IMPORT_MAX_BYTES // (1024 * 1024)} MB cannot be imported'
+            }, status=400)
 
-                # Check permissions - superuser or the user who archived it can retrieve
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 13] or
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        job = ImportJob.objects.create(
+            kind=kind,
+            file=upload,
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on'),
+            created_by=request.user
+        )
+        job = start_import(job)
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.save()
+        return JsonResponse({
+            'success': True,
+            'job': job_payload(job),
+            'status_url': reverse('import_job_status', kwargs={'pk': job.pk})
+        }, status=200 if job.finished_at else 202)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved OJT company: {item.name}"
-                )
-            elif item_type == 'organization':
-                item = get_object_or_404(Organization, pk=pk, is_archived=True)
-                if not (request.user.is_superuser or
-                        request.user.user_type == 10 or  # Student Development Services
-                        item.archived_by == request.user):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-
-                from django.db import transaction
-                with transaction.atomic():
-                    # Retrieve the organization
-                    item.is_archived = False
-                    item.archived_at = None
-                    item.archived_by = None
-                    item.is_active = True
-                    item._organization_status = 'cancelled'
-
-                    item.save()
-
-                    # Also retrieve the linked user account if it exists
-                    user_retrieved = False
-                    if item.user_account:
-                        user_account = item.user_account
-                        user_account.is_archived = False
-                        user_account.is_active = True
-                        user_account.archived_at = None
-                        user_account.archived_by = None
-                        user_account.save()
-                        user_retrieved = True
 
-                # Log the activity
-                if user_retrieved:
-                    UserActivityLog.objects.create(
-                        user=request.user,
-                        activity=f"{request.user.first_name} retrieved organization: {item.organization_name} and its linked user account - Status set to CANCELLED"
-                    )
-                else:
-                    UserActivityLog.objects.create(
-                        user=request.user,
-                        activity=f"{request.user.first_name} retrieved organization: {item.organization_name} - Status set to CANCELLED"
-                    )
-            elif item_type == 'accomplishment-report':
-                item = get_object_or_404(AccomplishmentRecord, pk=pk, is_archived=True)
+class ImportJobStatusView(LoginRequiredMixin, View):
+    def get(self, request, pk):
+        job = get_object_or_404(ImportJob, pk=pk)
+        if not (request.user.is_superuser or job.created_by_id == request.user.id):
+            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        if fail_stale_imports(ImportJob.objects.filter(pk=job.pk)):
+            job.refresh_from_db()
+        return JsonResponse({'success': True, 'job': job_payload(job)})
+
+
+# -------------------------------------------------- Chunked Uploads ---------------------------------------------------
+class UploadSessionView(LoginRequiredMixin, View):
+    """
+    POST uploads/ with {"view", "field", "file_name", "size", "sha256"?} opens an
+    UploadSession for that form field. GET uploads/<id>/ returns its offset so an
+    interrupted upload can resume; POST uploads/<id>/ with the raw chunk as the
+    body, "Upload-Offset" and "Upload-Checksum" (hex SHA-256) headers appends it.
+    """
 
-                if not (request.user.is_superuser or
-                        request.user.user_type in [1, 10] or
-                        (request.user.user_type == 15 and item.archived_by == request.user)):
-                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    def get(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        return JsonResponse({'success': True, 'upload': session_payload(session)})
 
-                item.is_archived = False
-                item.archived_at = None
-                item.archived_by = None
-                item.archive_reason = None
-                item.save()
+    def post(self, request, pk=None):
+        if pk is None:
+            return self.start(request)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Upload-Offset header is required'}, status=400)
 
-                # Log the activity
-                UserActivityLog.objects.create(
-                    user=request.user,
-                    activity=f"{request.user.first_name} retrieved accomplishment report: {item.title}"
-                )
-            else:
-                return JsonResponse({'success': False, 'error': 'Invalid item type'}, status=400)
+        try:
+            session = write_chunk(pk, request.user, offset, request, length, request.headers.get('Upload-Checksum', ''))
+        except UploadSessionError as e:
+            return JsonResponse({'success': False, 'error': str(e), 'offset': e.offset}, status=e.status)
+        return JsonResponse({'success': True, 'upload': session_payload(session)})
 
-            return JsonResponse({'success': True})
+    def start(self, request):
+        try:
+            params = json.loads(request.body or '{}')
+            size = int(params.get('size') or 0)
+        except (TypeError, ValueError):
+            return JsonResponse({'success': False, 'error': 'Invalid request data'}, status=400)
 
-        except Exception as e:
-            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+        try:
+            session = start_session(
+                request.user,
+                view_name=str(params.get('view') or ''),
+                field_name=str(params.get('field') or ''),
+                file_name=str(params.get('file_name') or ''),
+                size=size,
+                sha256=str(params.get('sha256') or ''),
+                content_type=str(params.get('content_type') or ''),
+            )
+        except UploadSessionError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+        return JsonResponse({'success': True, 'upload': session_payload(session)}, status=201)
 
 
 # ----------------------------------------------- Calendar Section -----------------------------------------------------
-class AnnouncementCalendarAPI(LoginRequiredMixin, View):
-    def get(self, request):
-        # Get all published announcements
-        announcements = Announcement.objects.filter(
-            is_published=True,
-            is_archived=False
-        ).order_by('-created_at')
+def announcement_calendar_entries(announcement):
+    """Calendar entries of an announcement: one per day it shows on, depending on its category"""
+    entries = []
+    created_at = timezone.localtime(announcement.created_at)
+
+    # Base data for all announcements
+    base_data = {
+        'id': announcement.id,
+        'title': announcement.title,
+        'content': announcement.content,
+        'category': announcement.category,
+        'created_at': created_at.isoformat(),
+        'author': announcement.author.get_full_name(),
+    }
 
-        announcements_data = []
-        for announcement in announcements:
-            created_at = timezone.localtime(announcement.created_at)
+    # For Basic and Emergency show on creation date
+    if announcement.category in ['BASIC', 'EMERGENCY']:
+        entries.append({
+            **base_data,
+            'date': created_at.strftime('%Y-%m-%d')
+        })
 
-            # Base data for all announcements
-            base_data = {
-                'id': announcement.id,
-                'title': announcement.title,
-                'content': announcement.content,
-                'category': announcement.category,
-                'created_at': created_at.isoformat(),
-                'author': announcement.author.get_full_name(),
-            }
+    # Show on event date
+    elif announcement.category == 'EVENT' and announcement.event_date:
+        event_date = timezone.localtime(announcement.event_date)
+        entries.append({
+            **base_data,
+            'date': event_date.strftime('%Y-%m-%d'),
+            'event_date': event_date.strftime('%Y-%m-%d'),
+        })
 
-            # For Basic and Emergency show on creation date
-            if announcement.category in ['BASIC', 'EMERGENCY']:
-                announcements_data.append({
+    # Show during enrollment period
+    elif announcement.category == 'ENROLLMENT':
+        if announcement.enrollment_start and announcement.enrollment_end:
+            current_date = announcement.enrollment_start.date()
+            end_date = announcement.enrollment_end.date()
+            while current_date <= end_date:
+                entries.append({
                     **base_data,
-                    'date': created_at.strftime('%Y-%m-%d')
+                    'date': current_date.strftime('%Y-%m-%d'),
+                    'enrollment_start': announcement.enrollment_start.strftime('%Y-%m-%d'),
+                    'enrollment_end': announcement.enrollment_end.strftime('%Y-%m-%d'),
                 })
-
-            # Show on event date
-            elif announcement.category == 'EVENT' and announcement.event_date:
-                event_date = timezone.localtime(announcement.event_date)
-                announcements_data.append({
+                current_date += timedelta(days=1)
+
+    # Show during suspension period
+    elif announcement.category == 'SUSPENSION':
+        if announcement.suspension_date:
+            current_date = announcement.suspension_date
+            end_date = announcement.until_suspension_date if announcement.until_suspension_date else announcement.suspension_date
+            while current_date <= end_date:
+                entries.append({
+                    **base_data,
+                    'date': current_date.strftime('%Y-%m-%d'),
+                    'suspension_date': current_date.strftime('%Y-%m-%d'),
+                    'until_suspension_date': end_date.strftime(
+                        '%Y-%m-%d') if announcement.until_suspension_date else None,
+                })
+                current_date += timedelta(days=1)
+
+    # Show during scholarship application period
+    elif announcement.category == 'SCHOLARSHIP':
+        if announcement.application_start and announcement.application_end:
+            current_date = announcement.application_start.date()
+            end_date = announcement.application_end.date()
+            while current_date <= end_date:
+                entries.append({
                     **base_data,
-                    'date': event_date.strftime('%Y-%m-%d'),
-                    'event_date': event_date.strftime('%Y-%m-%d'),
+                    'date': current_date.strftime('%Y-%m-%d'),
+                    'application_start': announcement.application_start.strftime('%Y-%m-%d'),
+                    'application_end': announcement.application_end.strftime('%Y-%m-%d'),
                 })
+                current_date += timedelta(days=1)
 
-            # Show during enrollment period
-            elif announcement.category == 'ENROLLMENT':
-                if announcement.enrollment_start and announcement.enrollment_end:
-                    current_date = announcement.enrollment_start.date()
-                    end_date = announcement.enrollment_end.date()
-                    while current_date <= end_date:
-                        announcements_data.append({
-                            **base_data,
-                            'date': current_date.strftime('%Y-%m-%d'),
-                            'enrollment_start': announcement.enrollment_start.strftime('%Y-%m-%d'),
-                            'enrollment_end': announcement.enrollment_end.strftime('%Y-%m-%d'),
-                        })
-                        current_date += timedelta(days=1)
+    return entries
 
-            # Show during suspension period
-            elif announcement.category == 'SUSPENSION':
-                if announcement.suspension_date:
-                    current_date = announcement.suspension_date
-                    end_date = announcement.until_suspension_date if announcement.until_suspension_date else announcement.suspension_date
-                    while current_date <= end_date:
-                        announcements_data.append({
-                            **base_data,
-                            'date': current_date.strftime('%Y-%m-%d'),
-                            'suspension_date': current_date.strftime('%Y-%m-%d'),
-                            'until_suspension_date': end_date.strftime(
-                                '%Y-%m-%d') if announcement.until_suspension_date else None,
-                        })
-                        current_date += timedelta(days=1)
 
-            # Show during scholarship application period
-            elif announcement.category == 'SCHOLARSHIP':
-                if announcement.application_start and announcement.application_end:
-                    current_date = announcement.application_start.date()
-                    end_date = announcement.application_end.date()
-                    while current_date <= end_date:
-                        announcements_data.append({
-                            **base_data,
-                            'date': current_date.strftime('%Y-%m-%d'),
-                            'application_start': announcement.application_start.strftime('%Y-%m-%d'),
-                            'application_end': announcement.application_end.strftime('%Y-%m-%d'),
-                        })
-                        current_date += timedelta(days=1)
+class AnnouncementCalendarAPI(LoginRequiredMixin, View):
+    def get(self, request):
+        # Get all published announcements
+        announcements = Announcement.objects.filter(
+            is_published=True,
+            is_archived=False
+        ).order_by('-created_at').select_related('author')
+
+        announcements_data = []
+        for announcement in announcements:
+            announcements_data.extend(announcement_calendar_entries(announcement))
 
         return JsonResponse(announcements_data, safe=False)
 
@@ -8449,6 +7153,70 @@ class ScholarshipApplicationUpdateView(LoginRequiredMixin, View):
                             status=400)
 
 
+class DocumentBundleView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Streams the submitted files of one or more records as a ZIP (see osas/bundles.py)"""
+
+    def test_func(self):
+        return self.has_bundle_permission(self.request.user_roles)
+
+    def has_bundle_permission(self, roles):
+        raise NotImplementedError
+
+    def get_entries(self):
+        """(arcname, stored name) pairs; may be a generator, it is consumed while the response streams"""
+        raise NotImplementedError
+
+    def get_filename(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        return bundle_response(self.get_entries(), self.get_filename())
+
+
+def _applicant_folder(application):
+    return f"{application.student.last_name}, {application.student.first_name} ({application.student.username})"
+
+
+class ScholarshipApplicationBundleView(DocumentBundleView):
+    """All documents of one scholarship application"""
+
+    def has_bundle_permission(self, roles):
+        self.application = get_object_or_404(
+            ScholarshipApplication.objects.select_related('student', 'scholarship'), pk=self.kwargs['pk']
+        )
+        return roles.in_units(5) or self.request.user in (self.application.student,
+                                                           self.application.scholarship.created_by)
+
+    def get_entries(self):
+        return record_entries(self.application, '', ScholarshipApplication.DOCUMENT_FIELDS)
+
+    def get_filename(self):
+        return f"{self.application.scholarship.name} - {_applicant_folder(self.application)}.zip"
+
+
+class ScholarshipApplicationsBundleView(DocumentBundleView):
+    """Documents of every application to a scholarship, one folder per applicant; ?status= narrows it down"""
+
+    def has_bundle_permission(self, roles):
+        self.scholarship = get_object_or_404(Scholarship, pk=self.kwargs['pk'])
+        return roles.in_units(5) or self.scholarship.created_by_id == self.request.user.pk
+
+    def get_entries(self):
+        applications = ScholarshipApplication.objects.filter(
+            scholarship=self.scholarship, is_archived=False
+        ).select_related('student').order_by('student__last_name', 'student__first_name', 'pk')
+        status = self.request.GET.get('status', 'all')
+        if status != 'all':
+            applications = applications.filter(status=status)
+
+        for application in applications.iterator(chunk_size=200):
+            yield from record_entries(application, _applicant_folder(application),
+                                      ScholarshipApplication.DOCUMENT_FIELDS)
+
+    def get_filename(self):
+        return f"{self.scholarship.name} - applications.zip"
+
+
 class ScholarshipApplicationArchiveView(View):
     def post(self, request, *args, **kwargs):
         try:
@@ -8893,6 +7661,7 @@ class AdmissionDetailView(LoginRequiredMixin, DetailView):
     def get(self, request, *args, **kwargs):
         try:
             admission = self.get_object()
+            prefetch_metadata([admission], *StudentAdmission.DOCUMENT_FIELDS)
 
             # Prepare file data
             def get_file_data(file_field):
@@ -8900,7 +7669,7 @@ class AdmissionDetailView(LoginRequiredMixin, DetailView):
                     return {
                         'url': file_field.url,
                         'name': file_field.name.split('/')[-1],
-                        'size': self.format_file_size(file_field.size)
+                        'size': self.format_file_size(file_size(file_field))
                     }
                 return None
 
@@ -9206,6 +7975,54 @@ class StudentAdmissionArchiveView(View):
             }, status=400)
 
 
+def search_admissions(admissions, search_term='', student_type=''):
+    """The admissions list's search box and student type filter"""
+    if search_term:
+        admissions = admissions.filter(
+            Q(control_no__icontains=search_term) |
+            Q(user__first_name__icontains=search_term) |
+            Q(user__last_name__icontains=search_term) |
+            Q(course__name__icontains=search_term) |
+            Q(remarks__icontains=search_term)
+        )
+    if student_type:
+        admissions = admissions.filter(student_type=student_type)
+    return admissions
+
+
+class AdmissionBundleView(DocumentBundleView):
+    """
+    Requirement uploads of the admissions matching the list filters (search,
+    type, status, start_date, end_date), one folder per control number.
+    """
+
+    def has_bundle_permission(self, roles):
+        return roles.in_units(12)
+
+    def get_entries(self):
+        params = self.request.GET
+        admissions = search_admissions(
+            StudentAdmission.objects.filter(is_archived=False).select_related('user'),
+            params.get('search', '').lower(), params.get('type', '')
+        )
+        if params.get('status'):
+            admissions = admissions.filter(status=params['status'])
+        start_date, end_date = parse_date(params.get('start_date', '')), parse_date(params.get('end_date', ''))
+        if start_date:
+            admissions = admissions.filter(created_at__date__gte=start_date)
+        if end_date:
+            admissions = admissions.filter(created_at__date__lte=end_date)
+
+        for admission in admissions.order_by('control_no').iterator(chunk_size=200):
+            last_name = admission.user.last_name if admission.user else admission.last_name
+            first_name = admission.user.first_name if admission.user else admission.first_name
+            folder = f"{admission.control_no} {last_name}, {first_name}".strip(' ,')
+            yield from record_entries(admission, folder, StudentAdmission.DOCUMENT_FIELDS)
+
+    def get_filename(self):
+        return f"admissions-{timezone.localdate():%Y%m%d}.zip"
+
+
 def export_admissions(request):
     if request.method == 'POST':
         try:
@@ -9924,6 +8741,7 @@ class NSTPFileDetailView(LoginRequiredMixin, DetailView):
     def get(self, request, *args, **kwargs):
         try:
             nstp_file = self.get_object()
+            metadata = file_metadata(nstp_file.file)
 
             data = {
                 'success': True,
@@ -9938,8 +8756,8 @@ class NSTPFileDetailView(LoginRequiredMixin, DetailView):
                     'school_year': nstp_file.school_year,
                     'file_url': nstp_file.file.url,
                     'file_name': nstp_file.get_file_name(),
-                    'file_size': nstp_file.file.size,
-                    'file_type': self.get_file_type(nstp_file.file.name),
+                    'file_size': metadata.size if metadata else 0,
+                    'file_type': metadata.kind if metadata else 'file',
                     'created_at': nstp_file.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                     'updated_at': nstp_file.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
                     'created_by': nstp_file.created_by.get_full_name() if nstp_file.created_by else None,
@@ -9952,21 +8770,6 @@ class NSTPFileDetailView(LoginRequiredMixin, DetailView):
         except Exception as e:
             return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
-    def get_file_type(self, filename):
-        extension = filename.split('.')[-1].lower()
-        if extension in ['pdf']:
-            return 'pdf'
-        elif extension in ['doc', 'docx']:
-            return 'word'
-        elif extension in ['xls', 'xlsx']:
-            return 'excel'
-        elif extension in ['ppt', 'pptx']:
-            return 'powerpoint'
-        elif extension in ['jpg', 'jpeg', 'png']:
-            return 'image'
-        else:
-            return 'file'
-
 
 class NSTPFileUpdateView(LoginRequiredMixin, View):
     def post(self, request, pk):
@@ -10401,7 +9204,7 @@ class OJTCompanyExportView(View):
 
 
 # ---------------------------------------------- Organization Section --------------------------------------------------
-class OrganizationCreateView(LoginRequiredMixin, CreateView):
+class OrganizationCreateView(LoginRequiredMixin, ChunkedUploadMixin, CreateView):
     model = Organization
     form_class = OrganizationCreateForm
     template_name = 'osas/dashboard.html'
@@ -10480,8 +9283,10 @@ class OrganizationCreateView(LoginRequiredMixin, CreateView):
                             'errors': {'organization_members_json': ['Organization must have at least 3 members.']}
                         }, status=400)
 
-                    organization.organization_members = members_data
-                    print(f"DEBUG: Successfully set organization members")
+                    # Members are saved after the organization, so check their values now
+                    for member_data in members_data:
+                        if isinstance(member_data, dict):
+                            OrganizationMember.fields_from_dict(member_data)
 
                 except json.JSONDecodeError as e:
                     print(f"DEBUG: JSON decode error: {e}")
@@ -10490,9 +9295,17 @@ class OrganizationCreateView(LoginRequiredMixin, CreateView):
                         'message': 'Invalid members data format.',
                         'errors': {'organization_members_json': ['Invalid members data format.']}
                     }, status=400)
+                except ValidationError as e:
+                    return JsonResponse({
+                        'success': False,
+                        'message': e.messages[0],
+                        'errors': {'organization_members_json': e.messages}
+                    }, status=400)
 
-            # Save the organization
+            # Save the organization, then its member rows
             organization.save()
+            if members_json:
+                organization.set_organization_members(members_data)
 
             print(f"DEBUG: Organization saved with ID: {organization.id}")
 
@@ -10518,38 +9331,55 @@ class OrganizationCreateView(LoginRequiredMixin, CreateView):
                 'errors': {'__all__': [str(e)]}
             }, status=400)
 
+
+def username_problem(username):
+    """Why `username` can't be registered, whether or not it is taken; None if it can"""
+    if not username:
+        return 'Username is required'
+    if len(username) < 3:
+        return 'Username must be at least 3 characters long'
+    # Check if username contains only allowed characters
+    if not re.match(r'^[a-zA-Z0-9_\.]+$', username):
+        return 'Username can only contain letters, numbers, underscores, and periods'
+    return None
+
+
+def email_problem(email, required_message):
+    """Why `email` can't be registered, whether or not it is taken; None if it can"""
+    if not email:
+        return required_message
+    # Basic email format validation
+    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        return 'Please enter a valid email address'
+    return None
+
+
+def availability_throttled_response():
+    return JsonResponse({
+        'available': False,
+        'message': 'Too many requests. Please wait a moment and try again.'
+    }, status=429)
+
+
 @require_POST
 @csrf_exempt
 def check_username_availability(request):
+    if throttled(request, 'username-availability'):
+        return availability_throttled_response()
+
     try:
         data = json.loads(request.body)
         username = data.get('username', '').strip()
 
-        if not username:
-            return JsonResponse({
-                'available': False,
-                'message': 'Username is required'
-            })
-
-        if len(username) < 3:
-            return JsonResponse({
-                'available': False,
-                'message': 'Username must be at least 3 characters long'
-            })
-
-        # Check if username contains only allowed characters
-        import re
-        if not re.match(r'^[a-zA-Z0-9_\.]+$', username):
+        problem = username_problem(username)
+        if problem:
             return JsonResponse({
                 'available': False,
-                'message': 'Username can only contain letters, numbers, underscores, and periods'
+                'message': problem
             })
 
         # Check both models for username availability
-        username_exists_in_organization = Organization.objects.filter(username__iexact=username).exists()
-        username_exists_in_customuser = CustomUser.objects.filter(username__iexact=username).exists()
-
-        if username_exists_in_organization or username_exists_in_customuser:
+        if identity_taken('username', username):
             return JsonResponse({
                 'available': False,
                 'message': 'This username is already taken'
@@ -10570,27 +9400,22 @@ def check_username_availability(request):
 @require_POST
 @csrf_exempt
 def check_email_availability(request):
+    if throttled(request, 'email-availability'):
+        return availability_throttled_response()
+
     try:
         data = json.loads(request.body)
         email = data.get('email', '').strip().lower()
 
-        if not email:
-            return JsonResponse({
-                'available': False,
-                'message': 'Email is required'
-            })
-
-        # Basic email format validation
-        import re
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_regex, email):
+        problem = email_problem(email, 'Email is required')
+        if problem:
             return JsonResponse({
                 'available': False,
-                'message': 'Please enter a valid email address'
+                'message': problem
             })
 
         # Check ONLY CustomUser model for email (personal email)
-        if CustomUser.objects.filter(email__iexact=email).exists():
+        if identity_taken('email', email):
             return JsonResponse({
                 'available': False,
                 'message': 'This email is already registered'
@@ -10611,27 +9436,22 @@ def check_email_availability(request):
 @require_POST
 @csrf_exempt
 def check_organization_email_availability(request):
+    if throttled(request, 'organization-email-availability'):
+        return availability_throttled_response()
+
     try:
         data = json.loads(request.body)
         email = data.get('email', '').strip().lower()
 
-        if not email:
-            return JsonResponse({
-                'available': False,
-                'message': 'Organization email is required'
-            })
-
-        # Basic email format validation
-        import re
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_regex, email):
+        problem = email_problem(email, 'Organization email is required')
+        if problem:
             return JsonResponse({
                 'available': False,
-                'message': 'Please enter a valid email address'
+                'message': problem
             })
 
         # Check ONLY Organization model for organization email
-        if Organization.objects.filter(organization_email__iexact=email).exists():
+        if identity_taken('organization_email', email):
             return JsonResponse({
                 'available': False,
                 'message': 'This organization email is already registered'
@@ -10755,6 +9575,7 @@ class OrganizationDetailView(LoginRequiredMixin, DetailView):
             ('organization_good_moral', 'Good Moral Certificate'),
         ]
 
+        prefetch_metadata([self.object], *(field_name for field_name, _ in document_fields))
         for field_name, display_name in document_fields:
             field = getattr(self.object, field_name)
             if field:
@@ -10762,7 +9583,7 @@ class OrganizationDetailView(LoginRequiredMixin, DetailView):
                     'name': display_name,
                     'file_name': field.name.split('/')[-1],
                     'file_url': field.url,
-                    'file_size': field.size,
+                    'file_size': file_size(field),
                     'uploaded_at': field.uploaded_at.strftime('%Y-%m-%d %H:%M') if hasattr(field,
                                                                                            'uploaded_at') else None,
                     'field_name': field_name
@@ -10852,6 +9673,7 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
             ('organization_good_moral', 'Good Moral Certificate'),
         ]
 
+        prefetch_metadata([self.object], *(field_name for field_name, _ in document_fields))
         for field_name, display_name in document_fields:
             field = getattr(self.object, field_name)
             if field:
@@ -10859,7 +9681,7 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
                     'name': display_name,
                     'file_name': field.name.split('/')[-1],
                     'file_url': field.url,
-                    'file_size': field.size,
+                    'file_size': file_size(field),
                     'uploaded_at': field.uploaded_at.strftime('%Y-%m-%d %H:%M') if hasattr(field,
                                                                                            'uploaded_at') else None,
                     'field_name': field_name
@@ -10932,8 +9754,9 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
 
                     # Validate and update organization members
                     if self.validate_members_data(members_data):
-                        organization.organization_members = members_data
-                        print(f"DEBUG: Successfully updated organization members")
+                        # Members are saved after the organization, so check their values now
+                        for member_data in members_data:
+                            OrganizationMember.fields_from_dict(member_data)
                     else:
                         return JsonResponse({
                             'success': False,
@@ -10946,6 +9769,11 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
                         'success': False,
                         'message': 'Invalid members data format.'
                     }, status=400)
+                except ValidationError as e:
+                    return JsonResponse({
+                        'success': False,
+                        'message': e.messages[0]
+                    }, status=400)
 
             # Handle file removals
             removed_files = []
@@ -10962,9 +9790,10 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
                     setattr(organization, field_name, file_obj)
                     uploaded_files.append(field_name)
 
-            # Save the organization
+            # Save the organization, then replace its member rows
             organization.save()
-            print(f"DEBUG: Organization saved successfully with {len(organization.organization_members or [])} members")
+            if members_json:
+                organization.set_organization_members(members_data)
 
             # Log the edit action to UserActivityLog
             activity_details = []
@@ -10975,7 +9804,7 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
             if uploaded_files:
                 activity_details.append(f"Uploaded files: {', '.join(uploaded_files)}")
             if members_json:
-                activity_details.append(f"Updated {len(organization.organization_members or [])} members")
+                activity_details.append(f"Updated {organization.member_count} members")
             if raw_password:
                 activity_details.append("Password updated")
 
@@ -11012,6 +9841,8 @@ class OrganizationEditView(LoginRequiredMixin, UpdateView):
             return False
 
         for member in members_data:
+            if not isinstance(member, dict):
+                return False
             if not member.get('first_name') or not member.get('last_name'):
                 return False
             if not member.get('position'):
@@ -11115,6 +9946,21 @@ class OrganizationArchiveView(LoginRequiredMixin, UserPassesTestMixin, View):
             }, status=500)
 
 
+class OrganizationBundleView(DocumentBundleView):
+    """An organization's registration documents"""
+
+    def has_bundle_permission(self, roles):
+        self.organization = get_object_or_404(Organization, pk=self.kwargs['pk'])
+        return roles.in_units(10) or (roles.organization is not None and roles.organization.pk == self.organization.pk)
+
+    def get_entries(self):
+        return record_entries(self.organization, '', Organization.ORGANIZATION_REQUIRED_DOCUMENTS
+                              + Organization.STUDENT_ORGANIZATION_REQUIRED_DOCUMENTS)
+
+    def get_filename(self):
+        return f"{self.organization.organization_acronym or self.organization.organization_name} - registration.zip"
+
+
 class OrganizationReactivateView(LoginRequiredMixin, UpdateView):
     model = Organization
     fields = []
@@ -11202,52 +10048,8 @@ def approve_organization(request, organization_id):
 
         # Grant Permission
         if organization.user_account:
-            from django.contrib.auth.models import Permission, Group
-            from django.contrib.contenttypes.models import ContentType
-
-            # Get content types for the models
-            organization_content_type = ContentType.objects.get_for_model(Organization)
-            announcement_content_type = ContentType.objects.get_for_model(Announcement)
-            certificate_content_type = ContentType.objects.get_for_model(Certificate)
-            accomplishment_record_content_type = ContentType.objects.get_for_model(AccomplishmentRecord)
-            supporting_file_content_type = ContentType.objects.get_for_model(SupportingFile)
-
-            # Define the permissions to grant (all CRUD operations)
-            permissions_to_grant = [
-                # Organization permissions
-                Permission.objects.get(content_type=organization_content_type, codename='add_organization'),
-                Permission.objects.get(content_type=organization_content_type, codename='change_organization'),
-                Permission.objects.get(content_type=organization_content_type, codename='delete_organization'),
-                Permission.objects.get(content_type=organization_content_type, codename='view_organization'),
-
-                # Announcement permissions
-                Permission.objects.get(content_type=announcement_content_type, codename='add_announcement'),
-                Permission.objects.get(content_type=announcement_content_type, codename='change_announcement'),
-                Permission.objects.get(content_type=announcement_content_type, codename='delete_announcement'),
-                Permission.objects.get(content_type=announcement_content_type, codename='view_announcement'),
-
-                # Certificate permissions
-                Permission.objects.get(content_type=certificate_content_type, codename='add_certificate'),
-                Permission.objects.get(content_type=certificate_content_type, codename='change_certificate'),
-                Permission.objects.get(content_type=certificate_content_type, codename='delete_certificate'),
-                Permission.objects.get(content_type=certificate_content_type, codename='view_certificate'),
-
-                # Accomplishment Record permissions
-                Permission.objects.get(content_type=accomplishment_record_content_type, codename='add_accomplishmentrecord'),
-                Permission.objects.get(content_type=accomplishment_record_content_type, codename='change_accomplishmentrecord'),
-                Permission.objects.get(content_type=accomplishment_record_content_type, codename='delete_accomplishmentrecord'),
-                Permission.objects.get(content_type=accomplishment_record_content_type, codename='view_accomplishmentrecord'),
-
-                # Supporting File permissions
-                Permission.objects.get(content_type=supporting_file_content_type, codename='add_supportingfile'),
-                Permission.objects.get(content_type=supporting_file_content_type, codename='change_supportingfile'),
-                Permission.objects.get(content_type=supporting_file_content_type, codename='delete_supportingfile'),
-                Permission.objects.get(content_type=supporting_file_content_type, codename='view_supportingfile'),
-            ]
-
-            # Grant all permissions to the organization user
-            organization.user_account.user_permissions.add(*permissions_to_grant)
-            organization.user_account.save()
+            # Full CRUD on organization, announcement, certificate, accomplishment and supporting file records
+            assign_role_group(organization.user_account, ORGANIZATION_ROLE)
 
             # Also update user type to organization user if not already set
             if organization.user_account.user_type != 15:
@@ -11329,10 +10131,31 @@ def renew_organization(request, organization_id):
         organization_description = request.POST.get('organization_description')
         organization_mission = request.POST.get('organization_mission')
         organization_vision = request.POST.get('organization_vision')
-        organization_valid_from = request.POST.get('organization_valid_from')
-        organization_valid_until = request.POST.get('organization_valid_until')
         renew_count = int(request.POST.get('renew_count', organization.renew_count + 1))
 
+        # Validity dates arrive as strings; save() compares them to today to derive the status
+        validity = {}
+        for field in ('organization_valid_from', 'organization_valid_until'):
+            value = request.POST.get(field)
+            if not value:
+                continue
+            try:
+                validity[field] = parse_date(value)
+            except ValueError:  # Well formed but not a real date, e.g. 2026-02-30
+                validity[field] = None
+            if validity[field] is None:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Enter the validity dates as YYYY-MM-DD'
+                }, status=400)
+        valid_from = validity.get('organization_valid_from', organization.organization_valid_from)
+        valid_until = validity.get('organization_valid_until', organization.organization_valid_until)
+        if valid_from and valid_until and valid_from > valid_until:
+            return JsonResponse({
+                'success': False,
+                'error': 'The validity period must end after it starts'
+            }, status=400)
+
         # Update organization information if provided
         if organization_description:
             organization.organization_description = organization_description
@@ -11342,10 +10165,8 @@ def renew_organization(request, organization_id):
             organization.organization_vision = organization_vision
 
         # Update validity period
-        if organization_valid_from:
-            organization.organization_valid_from = organization_valid_from
-        if organization_valid_until:
-            organization.organization_valid_until = organization_valid_until
+        for field, value in validity.items():
+            setattr(organization, field, value)
 
         # Update renew count
         organization.renew_count = renew_count
@@ -11451,6 +10272,7 @@ def certificate_details(request, certificate_id):
             'success': True,
             'certificate': {
                 'id': certificate.id,
+                'certificate_number': certificate.certificate_number,
                 'organization_name': certificate.organization.organization_name,
                 'organization_type': certificate.organization.organization_type,
                 'organization_type_display': certificate.organization.get_organization_type_display(),
@@ -11471,7 +10293,6 @@ def certificate_details(request, certificate_id):
 
 
 def download_certificate(request, certificate_id):
-    from django.http import FileResponse
     from django.shortcuts import get_object_or_404
 
     certificate = get_object_or_404(Certificate, id=certificate_id)
@@ -11484,16 +10305,15 @@ def download_certificate(request, certificate_id):
         return HttpResponseForbidden("Permission denied")
 
     if certificate.certificate_file:
-        response = FileResponse(certificate.certificate_file.open(),
-                                as_attachment=True,
-                                filename=f"certificate_{certificate.organization.organization_acronym}_{certificate.issue_date}.{certificate.certificate_file.name.split('.')[-1]}")
-        return response
+        return send_file(request, certificate.certificate_file.name,
+                         as_attachment=True,
+                         filename=f"certificate_{certificate.organization.organization_acronym}_{certificate.issue_date}.{certificate.certificate_file.name.split('.')[-1]}")
     else:
         from django.http import HttpResponseNotFound
         return HttpResponseNotFound("Certificate file not found")
 
 
-class AccomplishmentCreateView(LoginRequiredMixin, CreateView):
+class AccomplishmentCreateView(LoginRequiredMixin, ChunkedUploadMixin, CreateView):
     model = AccomplishmentRecord
     form_class = AccomplishmentRecordForm
     success_url = reverse_lazy('dashboard')
@@ -11504,12 +10324,8 @@ class AccomplishmentCreateView(LoginRequiredMixin, CreateView):
         return kwargs
 
     def get_organization(self):
-        if self.request.user.user_type == 15:  # Only organization users
-            try:
-                if hasattr(self.request.user, 'organization_account'):
-                    return self.request.user.organization_account
-            except Organization.DoesNotExist:
-                pass
+        if self.request.user_roles.is_organization:  # Only organization users
+            return self.request.user_roles.organization
         return None
 
     def form_valid(self, form):
@@ -11606,14 +10422,15 @@ class AccomplishmentRecordDetailView(LoginRequiredMixin, DetailView):
         self.object = self.get_object()
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             # Get supporting files
-            supporting_files = self.object.supporting_files.all()
+            supporting_files = list(self.object.supporting_files.all())
+            prefetch_metadata(supporting_files, 'file')
             supporting_files_data = []
             for file in supporting_files:
                 supporting_files_data.append({
                     'id': file.id,
                     'file_name': file.filename,
                     'file_url': file.file.url,
-                    'file_size': file.file.size,
+                    'file_size': file_size(file.file),
                     'description': file.description,
                     'uploaded_at': file.uploaded_at.strftime('%Y-%m-%d %H:%M')
                 })
@@ -11622,7 +10439,7 @@ class AccomplishmentRecordDetailView(LoginRequiredMixin, DetailView):
             main_report_data = {
                 'file_name': self.object.main_report.name.split('/')[-1],
                 'file_url': self.object.main_report.url,
-                'file_size': self.object.main_report.size
+                'file_size': file_size(self.object.main_report)
             }
 
             # Debug school year
@@ -11697,14 +10514,15 @@ class AccomplishmentRecordUpdateView(LoginRequiredMixin, UserPassesTestMixin, Vi
             report = get_object_or_404(AccomplishmentRecord, pk=kwargs['pk'])
 
             # Get supporting files
-            supporting_files = report.supporting_files.all()
+            supporting_files = list(report.supporting_files.all())
+            prefetch_metadata(supporting_files, 'file')
             supporting_files_data = []
             for file in supporting_files:
                 supporting_files_data.append({
                     'id': file.id,
                     'file_name': file.filename,
                     'file_url': file.file.url,
-                    'file_size': file.file.size,
+                    'file_size': file_size(file.file),
                     'description': file.description,
                     'uploaded_at': file.uploaded_at.strftime('%Y-%m-%d %H:%M')
                 })
@@ -11714,7 +10532,7 @@ class AccomplishmentRecordUpdateView(LoginRequiredMixin, UserPassesTestMixin, Vi
                 'id': report.id,
                 'file_name': report.main_report.name.split('/')[-1],
                 'file_url': report.main_report.url,
-                'file_size': report.main_report.size
+                'file_size': file_size(report.main_report)
             }
 
             report_data = {
@@ -11884,7 +10702,7 @@ class AccomplishmentReportArchiveView(LoginRequiredMixin, UserPassesTestMixin, V
             'main_report': {
                 'file_name': report.main_report.name.split('/')[-1] if report.main_report else None,
                 'file_url': report.main_report.url if report.main_report else None,
-                'file_size': report.main_report.size if report.main_report else 0
+                'file_size': file_size(report.main_report)
             } if report.main_report else None
         }
 
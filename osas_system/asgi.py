@@ -3,6 +3,42 @@ ASGI config for osas_system project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Loading it turns ASYNC_VIEWS on, so the high-fanout JSON endpoints are served by
+their async variants in osas/async_views.py; every other URL keeps its sync
+view, which Django runs in a thread. The middleware does not change that:
+every MiddlewareMixin entry in MIDDLEWARE (sessions, CSRF, auth,
+UserRolesMiddleware, UploadLimitMiddleware) runs its process_request and
+process_response hooks through sync_to_async, so each request still makes
+thread-pool hops on its way in and out. What the async views save is the
+view itself: its queries are awaited instead of holding a worker thread.
+`benchmark_api` numbers include those middleware hops.
+
+Worker setup, next to the WSGI service rather than replacing it:
+
+    # WSGI: pages, forms, uploads and downloads
+    gunicorn osas_system.wsgi:application --workers 4 --bind 127.0.0.1:8000
+
+    # ASGI: the JSON endpoints
+    gunicorn osas_system.asgi:application -k uvicorn_worker.UvicornWorker \
+        --workers 2 --bind 127.0.0.1:8001
+
+and in nginx, in front of both:
+
+    location ~ ^/(api/announcements/|api/check-|get-courses/|analytics/(recent-activities|activity-overview|activity-users)/) {
+        proxy_pass http://127.0.0.1:8001;
+    }
+    location / {
+        proxy_pass http://127.0.0.1:8000;
+    }
+
+Downloads stay on WSGI: under ASGI, Django 4.2 reads a sync streaming response
+(ZIP bundles, media ranges) to the end before sending any of it. ASYNC_VIEWS
+also turns persistent database connections off, as Django requires under ASGI;
+put pgbouncer in front of PostgreSQL if connecting per request shows up.
+
+`python manage.py benchmark_api` compares the two services at increasing
+concurrency.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +48,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'osas_system.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -58,11 +58,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    # 'whitenoise.middleware.WhiteNoiseMiddleware',  # ← COMMENT THIS OUT
+    'osas.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'osas.middleware.UploadLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'osas.middleware.UserRolesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -89,6 +91,9 @@ TEMPLATES = [
 WSGI_APPLICATION = 'osas_system.wsgi.application'
 
 
+# Route the high-fanout JSON endpoints to osas/async_views.py; osas_system/asgi.py turns this on
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -100,7 +105,19 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
-        'CONN_MAX_AGE': 600,  # Persistent database connections
+        # Persistent database connections; not under ASGI, where every sync_to_async thread would keep its own
+        'CONN_MAX_AGE': 0 if ASYNC_VIEWS else 600,
+    }
+}
+
+# Shared by every worker process: the availability throttle, the identity lookups and the role permission
+# cache are only right if all workers see the same entries (osas.identity refuses a per-process backend).
+# The table is created by migration 0024; point CACHE_BACKEND/CACHE_LOCATION at Redis to take the load off
+# the database (django.core.cache.backends.redis.RedisCache, redis://127.0.0.1:6379, needs `redis` installed)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('CACHE_LOCATION', default='osas_cache'),
     }
 }
 
@@ -119,6 +136,9 @@ EMAIL_TIMEOUT = 30
 # Authentication
 AUTH_USER_MODEL = 'osas.CustomUser'
 
+# Loads the session user with its organization/course and caches role group permissions (see osas/roles.py)
+AUTHENTICATION_BACKENDS = ['osas.roles.RoleGroupBackend']
+
 LOGIN_URL = 'home'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
@@ -129,20 +149,71 @@ LOGOUT_REDIRECT_URL = 'login'
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
-# WhiteNoise configuration for better performance
+# WhiteNoise serves the hashed, precompressed files collectstatic builds (see osas/assets.py); only
+# development reads straight from STATICFILES_DIRS
 WHITENOISE_MANIFEST_STRICT = False
-WHITENOISE_USE_FINDERS = True
-WHITENOISE_AUTOREFRESH = True
+WHITENOISE_USE_FINDERS = DEBUG
+WHITENOISE_AUTOREFRESH = DEBUG
+
+# Templates load the bundles from osas/assets.py instead of their separate sources
+STATIC_BUNDLES = config('STATIC_BUNDLES', default=not DEBUG, cast=bool)
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored once per distinct content, under their usual names (see osas/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'osas.storage.DedupFileSystemStorage'},
+    'staticfiles': {'BACKEND': 'osas.assets.BundledStaticFilesStorage'},
+}
+
+# collect_orphaned_media: files no row references are moved to the quarantine once older than the grace
+# period, and quarantined runs are deleted after MEDIA_GC_QUARANTINE_DAYS
+MEDIA_GC_GRACE_HOURS = config('MEDIA_GC_GRACE_HOURS', default=24, cast=int)
+MEDIA_GC_QUARANTINE_ROOT = config('MEDIA_GC_QUARANTINE_ROOT', default=os.path.join(BASE_DIR, 'media_quarantine'))
+MEDIA_GC_QUARANTINE_DAYS = config('MEDIA_GC_QUARANTINE_DAYS', default=7, cast=int)
+
+# Directory layout for new uploads (see osas/upload_paths.py); relocate_media moves older files
+UPLOAD_PATH_LAYOUT = config('UPLOAD_PATH_LAYOUT', default='osas.upload_paths.ShardedLayout')
+
+# Media is served through osas.media.protected_media; set to 'nginx' (X-Accel-Redirect) or
+# 'apache' (X-Sendfile) to let the front proxy do the transfer after the permission check
+PROTECTED_MEDIA_SERVER = config('PROTECTED_MEDIA_SERVER', default='')
+PROTECTED_MEDIA_INTERNAL_URL = config('PROTECTED_MEDIA_INTERNAL_URL', default='/protected-media/')
+
+# Reverse proxies in front of Django that append to X-Forwarded-For (nginx: 1); 0 trusts only REMOTE_ADDR.
+# Rate limits key on the address the outermost of them saw, which the client can't forge
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=0, cast=int)
+
+# UploadLimitHandler goes first so oversized or mistyped files are refused while they stream in
+FILE_UPLOAD_HANDLERS = [
+    'osas.uploads.UploadLimitHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Resumable chunked uploads (see osas/resumable.py); partial files live outside MEDIA_ROOT
+UPLOAD_SESSION_ROOT = config('UPLOAD_SESSION_ROOT', default=os.path.join(BASE_DIR, 'upload_sessions'))
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=2 * 1024 * 1024, cast=int)
+UPLOAD_SESSION_EXPIRY_HOURS = config('UPLOAD_SESSION_EXPIRY_HOURS', default=24, cast=int)
+# Unfinished sessions one user may keep at once, and their combined size
+UPLOAD_SESSION_MAX_OPEN = config('UPLOAD_SESSION_MAX_OPEN', default=20, cast=int)
+UPLOAD_SESSION_MAX_OPEN_BYTES = config('UPLOAD_SESSION_MAX_OPEN_BYTES', default=200 * 1024 * 1024, cast=int)
+
+# Uploaded photos are normalized in place by a background pool (see osas/images.py)
+IMAGE_INGEST_MAX_DIMENSION = config('IMAGE_INGEST_MAX_DIMENSION', default=2048, cast=int)
+IMAGE_INGEST_JPEG_QUALITY = config('IMAGE_INGEST_JPEG_QUALITY', default=85, cast=int)
+IMAGE_INGEST_WORKERS = config('IMAGE_INGEST_WORKERS', default=2, cast=int)
+
+# Cold storage for long-archived records and their files (see osas/coldstorage.py)
+ARCHIVE_COLD_ROOT = config('ARCHIVE_COLD_ROOT', default=os.path.join(BASE_DIR, 'cold_storage'))
+ARCHIVE_COLD_AFTER_DAYS = config('ARCHIVE_COLD_AFTER_DAYS', default=365, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -1,12 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from osas.media import protected_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>', protected_media, name='media'),
     path('', include('osas.urls')),  # your app URLs
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -235,6 +235,10 @@ document.addEventListener('DOMContentLoaded', function() {
                 imgContainer.style.display = 'block';
                 const img = imgContainer.querySelector('img');
                 img.src = ann.first_image.url;
+                if (ann.first_image.srcset) {
+                    img.srcset = ann.first_image.srcset;
+                    img.sizes = '(max-width: 768px) 100vw, 640px';
+                }
                 img.alt = ann.first_image.caption || ann.title;
 
                 if (ann.first_image.caption) {
@@ -1,6 +1,7 @@
 class ActivityLog {
     constructor() {
         this.currentPage = 1;
+        this.nextCursor = '';
         this.hasMore = true;
         this.isLoading = false;
         this.filters = {
@@ -95,7 +96,9 @@ class ActivityLog {
         }
 
         try {
+            // An empty cursor asks for the first page; "load more" continues from next_cursor
             const params = new URLSearchParams({
+                cursor: loadMore ? this.nextCursor : '',
                 page: this.currentPage,
                 type: this.filters.type,
                 user: this.filters.user,
@@ -119,6 +122,7 @@ class ActivityLog {
                 this.displayActivities(data.activities);
             }
 
+            this.nextCursor = data.next_cursor || '';
             this.hasMore = data.has_next;
             this.updateLoadMoreButton();
 
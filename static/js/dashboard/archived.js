@@ -1172,11 +1172,12 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
-    // View button functionality
-    document.querySelectorAll('.action-btn.view-btn').forEach(btn => {
-        btn.addEventListener('click', function() {
-            const id = this.getAttribute('data-id');
-            const type = this.getAttribute('data-type');
+    // View button functionality (delegated, so rows added by "Load more" work too)
+    document.addEventListener('click', function(e) {
+        const btn = e.target.closest('#archived-section .action-btn.view-btn');
+        if (btn) {
+            const id = btn.getAttribute('data-id');
+            const type = btn.getAttribute('data-type');
 
             fetch(`/api/archived/${type}/${id}/`)
                 .then(response => {
@@ -1196,7 +1197,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     console.error('Error:', error);
                     alert('An error occurred while loading details.');
                 });
-        });
+        }
     });
 
     function showViewModal(data, type) {
@@ -3062,4 +3063,114 @@ document.addEventListener('DOMContentLoaded', function() {
         document.body.appendChild(container);
         return container;
     }
-});
\ No newline at end of file
+});
+
+// ------------------------------------------------- Archive Paging ----------------------------------------------------
+// Each tab is rendered with its newest page only; "Load more" and the search box fetch further rows
+// from /api/archived/ as server-rendered table rows.
+document.addEventListener('DOMContentLoaded', function() {
+    const SEARCH_DELAY = 300;
+
+    document.querySelectorAll('#archived-section tbody[data-archive-type]').forEach(tbody => {
+        const tab = tbody.closest('.tab-content');
+        const table = tbody.closest('table');
+        const container = tbody.closest('.archived-table-container') || table;
+        const searchInput = tab ? tab.querySelector('.search-input') : null;
+
+        const section = document.createElement('div');
+        section.className = 'load-more-section';
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'load-more-btn';
+        button.innerHTML = '<i class="fas fa-chevron-down"></i> Load more';
+        section.appendChild(button);
+        container.after(section);
+
+        let cursor = tbody.dataset.nextCursor;
+        let query = '';
+        let searchTimer = null;
+        let latestRequest = 0;
+
+        function updateButton() {
+            section.style.display = cursor ? '' : 'none';
+        }
+
+        function noDataRow() {
+            const row = document.createElement('tr');
+            const cell = document.createElement('td');
+            cell.colSpan = table.querySelectorAll('thead th').length;
+            cell.className = 'no-data';
+            cell.innerHTML = '<i class="fas fa-inbox"></i><span>No archived items found</span>';
+            row.appendChild(cell);
+            return row;
+        }
+
+        function reapplyFilters() {
+            // Run the tab's own dropdown filters over the rows that just arrived
+            const select = tab ? tab.querySelector('select') : null;
+            if (select) {
+                select.dispatchEvent(new Event('change'));
+            }
+        }
+
+        function loadRows(replace) {
+            const params = new URLSearchParams({type: tbody.dataset.archiveType, format: 'html'});
+            if (query) {
+                params.set('q', query);
+            }
+            if (!replace && cursor) {
+                params.set('cursor', cursor);
+            }
+
+            const requestNumber = ++latestRequest;
+            button.disabled = true;
+
+            fetch(`/api/archived/?${params}`, {credentials: 'same-origin'})
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error('Network response was not ok');
+                    }
+                    return response.json();
+                })
+                .then(data => {
+                    if (requestNumber !== latestRequest) {
+                        return;  // A newer search replaced this one
+                    }
+                    if (replace) {
+                        tbody.innerHTML = '';
+                    }
+                    tbody.insertAdjacentHTML('beforeend', data.html);
+                    if (!tbody.rows.length) {
+                        tbody.appendChild(noDataRow());
+                    }
+                    cursor = data.pagination.next_cursor;
+                    updateButton();
+                    reapplyFilters();
+                })
+                .catch(error => {
+                    console.error('Error:', error);
+                    alert('An error occurred while loading archived items.');
+                })
+                .finally(() => {
+                    button.disabled = false;
+                });
+        }
+
+        button.addEventListener('click', () => loadRows(false));
+
+        if (searchInput) {
+            searchInput.addEventListener('input', function() {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => {
+                    const value = searchInput.value.trim();
+                    if (value !== query) {
+                        query = value;
+                        loadRows(true);
+                    }
+                }, SEARCH_DELAY);
+            });
+        }
+
+        updateButton();
+    });
+});
@@ -0,0 +1,127 @@
+// ---------------------------------------------- Chunked Uploads -------------------------------------------------------
+// Sends a form's larger files ahead of the form in checksummed chunks (osas/resumable.py),
+// then swaps each file for a "<field>_upload_id" value so the final POST stays small.
+// A dropped connection resumes from the last stored chunk instead of starting over.
+
+window.ChunkedUpload = (() => {
+    const SESSIONS_URL = '/api/uploads/';
+    const MIN_CHUNKED_SIZE = 1024 * 1024;  // Smaller files go with the form as before
+    const MAX_RETRIES = 5;
+
+    function csrfToken(form) {
+        const input = form.querySelector('[name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    async function sha256(blob) {
+        const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+        return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    async function request(url, options) {
+        const response = await fetch(url, options);
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok && response.status !== 409) {
+            const error = new Error(data.error || `Upload failed (${response.status})`);
+            error.status = response.status;
+            throw error;
+        }
+        return data;
+    }
+
+    function storageKey(viewName, field, file) {
+        return `chunked-upload:${viewName}:${field}:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    async function openSession(form, viewName, field, file) {
+        // Resume the session from an earlier, interrupted attempt at the same file
+        const key = storageKey(viewName, field, file);
+        const previous = sessionStorage.getItem(key);
+        if (previous) {
+            try {
+                const data = await request(`${SESSIONS_URL}${previous}/`, {headers: {'X-Requested-With': 'XMLHttpRequest'}});
+                if (data.success) return data.upload;
+            } catch (error) {
+                sessionStorage.removeItem(key);
+            }
+        }
+
+        const data = await request(SESSIONS_URL, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken(form),
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify({
+                view: viewName,
+                field: field,
+                file_name: file.name,
+                size: file.size,
+                content_type: file.type,
+                sha256: await sha256(file)
+            })
+        });
+        sessionStorage.setItem(key, data.upload.id);
+        return data.upload;
+    }
+
+    async function uploadFile(form, viewName, field, file) {
+        let upload = await openSession(form, viewName, field, file);
+        let retries = 0;
+
+        while (!upload.complete) {
+            const chunk = file.slice(upload.offset, upload.offset + upload.chunk_size);
+            try {
+                const data = await request(`${SESSIONS_URL}${upload.id}/`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/octet-stream',
+                        'Upload-Offset': String(upload.offset),
+                        'Upload-Checksum': await sha256(chunk),
+                        'X-CSRFToken': csrfToken(form),
+                        'X-Requested-With': 'XMLHttpRequest'
+                    },
+                    body: chunk
+                });
+                if (data.success) {
+                    upload = data.upload;
+                    retries = 0;
+                } else if (data.offset !== undefined && data.offset !== null) {
+                    upload.offset = data.offset;  // 409: continue from the server's offset
+                } else {
+                    // 409 while an earlier attempt's chunk is still arriving: give it a moment
+                    await new Promise(resolve => setTimeout(resolve, 1000));
+                }
+            } catch (error) {
+                if ((error.status && error.status !== 422) || ++retries > MAX_RETRIES) throw error;
+                // Network error or bad checksum: wait, re-read the offset and try again
+                await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+                const data = await request(`${SESSIONS_URL}${upload.id}/`, {headers: {'X-Requested-With': 'XMLHttpRequest'}});
+                upload = data.upload;
+            }
+        }
+        return upload.id;
+    }
+
+    // Resolves to the FormData to POST: large files replaced by their upload ids
+    async function prepare(form, formData, viewName) {
+        if (!window.crypto || !crypto.subtle) return formData;  // Checksums need a secure context
+
+        const prepared = new FormData();
+        const uploaded = [];
+        for (const [name, value] of formData.entries()) {
+            if (value instanceof File && value.size >= MIN_CHUNKED_SIZE) {
+                const id = await uploadFile(form, viewName, name, value);
+                uploaded.push(storageKey(viewName, name, value));
+                prepared.append(`${name}_upload_id`, id);
+            } else {
+                prepared.append(name, value);
+            }
+        }
+        uploaded.forEach(key => sessionStorage.removeItem(key));
+        return prepared;
+    }
+
+    return {prepare};
+})();
@@ -684,14 +684,16 @@ document.getElementById('accomplishmentCreateForm').addEventListener('submit', f
         return;
     }
 
-    fetch(form.action, {
+    // Large files go ahead in resumable chunks; the form then only carries their upload ids
+    const prepared = window.ChunkedUpload ? ChunkedUpload.prepare(form, formData, 'add-accomplishment') : Promise.resolve(formData);
+    prepared.then(body => fetch(form.action, {
         method: 'POST',
-        body: formData,
+        body: body,
         headers: {
             'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
             'X-Requested-With': 'XMLHttpRequest'
         }
-    })
+    }))
     .then(response => {
         if (!response.ok) {
             return response.json().then(err => { throw err; });
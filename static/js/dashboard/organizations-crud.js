@@ -120,8 +120,8 @@ function updateOrganizationTable(organizations) {
             <tr data-created-at="${organization.created_at}" data-status="${organization.organization_status}">
                 <td>
                     <div class="organization-info">
-                        ${organization.organization_logo_url ?
-                            `<img src="${organization.organization_logo_url}" alt="${organization.organization_name}" class="organization-logo">` :
+                        ${organization.organization_logo ?
+                            `<img src="${organization.organization_logo.thumbnail}" alt="${organization.organization_name}" class="organization-logo" loading="lazy">` :
                             `<div class="organization-logo placeholder">
                                 <i class='bx bxs-group'></i>
                             </div>`
@@ -1762,14 +1762,16 @@ document.addEventListener('DOMContentLoaded', function() {
 
             console.log('Submitting form data...');
 
-            fetch(form.action, {
+            // Large files go ahead in resumable chunks; the form then only carries their upload ids
+            const prepared = window.ChunkedUpload ? ChunkedUpload.prepare(form, formData, 'add-organization') : Promise.resolve(formData);
+            prepared.then(body => fetch(form.action, {
                 method: 'POST',
-                body: formData,
+                body: body,
                 headers: {
                     'X-CSRFToken': getCSRFToken(),
                     'X-Requested-With': 'XMLHttpRequest'
                 }
-            })
+            }))
             .then(response => {
                 console.log('Response status:', response.status);
 
@@ -2104,6 +2104,19 @@ function initUserTable() {
     let currentSortColumn = 'date_joined';
     let currentSortDirection = 'desc';
 
+    // Keyset paging: the server returns next/prev cursors instead of page numbers, so a deep page
+    // costs the same as the first one. The total is only counted when the filters or sort change.
+    const USERS_PER_PAGE = 10;  // DashboardView.get_filtered_users
+    let userCursor = '';
+    let userPageNumber = 1;
+    let userTotalCount = null;
+
+    function resetUserPaging() {
+        userCursor = '';
+        userPageNumber = 1;
+        userTotalCount = null;
+    }
+
     // Set initial sort indicators
     sortableHeaders.forEach(header => {
         const column = header.getAttribute('data-sort');
@@ -2143,24 +2156,29 @@ function initUserTable() {
                 }
             });
 
+            resetUserPaging();
             fetchAndDisplayUsers();
         });
     });
 
     // Initialize search and filter events
     searchInput.addEventListener('input', debounce(function() {
+        resetUserPaging();
         fetchAndDisplayUsers();
     }, 300));
 
     unitSortSelect.addEventListener('change', function() {
+        resetUserPaging();
         fetchAndDisplayUsers();
     });
 
     verifiedSortSelect.addEventListener('change', function() {
+        resetUserPaging();
         fetchAndDisplayUsers();
     });
 
     statusSortSelect.addEventListener('change', function() {
+        resetUserPaging();
         fetchAndDisplayUsers();
     });
 
@@ -2171,10 +2189,6 @@ function initUserTable() {
         const verifiedFilterValue = verifiedSortSelect.value;
         const statusFilterValue = statusSortSelect.value;
 
-        // Get current page from URL or default to 1
-        const urlParams = new URLSearchParams(window.location.search);
-        const currentPage = urlParams.get('user_page') || 1;
-
         console.log('Fetching users with params:', {
             search: searchTerm,
             unit: unitFilterValue,
@@ -2182,7 +2196,7 @@ function initUserTable() {
             status: statusFilterValue,
             sort: currentSortColumn,
             direction: currentSortDirection,
-            page: currentPage
+            cursor: userCursor
         });
 
         // Show loading indicator
@@ -2199,7 +2213,11 @@ function initUserTable() {
         params.set('status', statusFilterValue);
         params.set('sort', currentSortColumn);
         params.set('direction', currentSortDirection);
-        params.set('user_page', currentPage);
+        params.delete('user_page');
+        params.set('cursor', userCursor);
+        if (userTotalCount === null) {
+            params.set('with_count', '1');
+        }
 
         // Make AJAX request
         fetch(`?${params.toString()}`, {
@@ -2262,73 +2280,56 @@ function initUserTable() {
         }
 
         const pagination = data.pagination;
-        const totalCount = pagination.count || 0;
-        const currentPage = pagination.current_page || 1;
-        const numPages = pagination.num_pages || 1;
+        if (pagination.count !== null && pagination.count !== undefined) {
+            userTotalCount = pagination.count;
+        }
+        if (!pagination.has_previous) {
+            userPageNumber = 1;  // Back at the start, whatever was counted on the way
+        }
+        const rowCount = data.users ? data.users.length : 0;
+        const startIndex = rowCount ? (userPageNumber - 1) * USERS_PER_PAGE + 1 : 0;
+        const endIndex = startIndex + rowCount - (rowCount ? 1 : 0);
         const hasPrevious = pagination.has_previous || false;
         const hasNext = pagination.has_next || false;
-        const startIndex = pagination.start_index || 0;
-        const endIndex = pagination.end_index || 0;
-
-        console.log('Pagination data:', {
-            totalCount,
-            currentPage,
-            numPages,
-            hasPrevious,
-            hasNext,
-            startIndex,
-            endIndex
-        });
 
         // Create pagination info - ALWAYS show this
         const paginationInfo = document.createElement('div');
         paginationInfo.className = 'pagination-info';
 
-        if (totalCount === 0) {
+        if (rowCount === 0) {
             paginationInfo.textContent = 'Showing 0 entries';
+        } else if (userTotalCount !== null) {
+            paginationInfo.textContent = `Showing ${startIndex} to ${endIndex} of ${userTotalCount} entries`;
         } else {
-            paginationInfo.textContent = `Showing ${startIndex} to ${endIndex} of ${totalCount} entries`;
+            paginationInfo.textContent = `Showing ${startIndex} to ${endIndex}`;
         }
 
         // Create pagination controls container - ALWAYS create this when we have data
-        if (totalCount > 0) {
+        if (rowCount > 0) {
             const paginationControls = document.createElement('div');
             paginationControls.className = 'pagination-controls';
 
             // Previous button
-            if (hasPrevious) {
-                const prevBtn = createPaginationButton('prev', currentPage - 1, '<i class="bx bx-chevron-left"></i>', 'Previous Page');
+            if (hasPrevious && pagination.prev_cursor) {
+                const prevBtn = createPaginationButton('prev', pagination.prev_cursor, -1, '<i class="bx bx-chevron-left"></i>', 'Previous Page');
                 paginationControls.appendChild(prevBtn);
             } else {
                 const prevBtn = createDisabledPaginationButton('prev', '<i class="bx bx-chevron-left"></i>', 'Previous Page');
                 paginationControls.appendChild(prevBtn);
             }
 
-            // Page numbers - ALWAYS show when we have data
+            // Current page number; cursors only lead to the neighbouring pages
             const pageNumbers = document.createElement('div');
             pageNumbers.className = 'page-numbers';
-
-            // Show page numbers (limit to 5 pages around current page)
-            const startPage = Math.max(1, currentPage - 2);
-            const endPage = Math.min(numPages, currentPage + 2);
-
-            for (let i = startPage; i <= endPage; i++) {
-                if (i === currentPage) {
-                    const currentPageBtn = document.createElement('span');
-                    currentPageBtn.className = 'pagination-btn current-page active';
-                    currentPageBtn.textContent = i;
-                    pageNumbers.appendChild(currentPageBtn);
-                } else {
-                    const pageBtn = createPaginationButton('page', i, i, `Page ${i}`);
-                    pageNumbers.appendChild(pageBtn);
-                }
-            }
-
+            const currentPageBtn = document.createElement('span');
+            currentPageBtn.className = 'pagination-btn current-page active';
+            currentPageBtn.textContent = userPageNumber;
+            pageNumbers.appendChild(currentPageBtn);
             paginationControls.appendChild(pageNumbers);
 
             // Next button
-            if (hasNext) {
-                const nextBtn = createPaginationButton('next', currentPage + 1, '<i class="bx bx-chevron-right"></i>', 'Next Page');
+            if (hasNext && pagination.next_cursor) {
+                const nextBtn = createPaginationButton('next', pagination.next_cursor, 1, '<i class="bx bx-chevron-right"></i>', 'Next Page');
                 paginationControls.appendChild(nextBtn);
             } else {
                 const nextBtn = createDisabledPaginationButton('next', '<i class="bx bx-chevron-right"></i>', 'Next Page');
@@ -2343,17 +2344,15 @@ function initUserTable() {
     }
 
     // Helper functions for creating pagination buttons
-    function createPaginationButton(type, page, content, title) {
+    function createPaginationButton(type, cursor, step, content, title) {
         const button = document.createElement('a');
         button.href = 'javascript:void(0);';
         button.className = `pagination-btn ${type}-page`;
-        button.setAttribute('data-page', page);
         button.title = title;
         button.innerHTML = content;
 
         button.addEventListener('click', function() {
-            const page = this.getAttribute('data-page');
-            handlePageChange(page);
+            handlePageChange(cursor, step);
         });
 
         return button;
@@ -2367,14 +2366,9 @@ function initUserTable() {
         return button;
     }
 
-    function handlePageChange(page) {
-        console.log('Changing to page:', page);
-        // Update URL without reloading
-        const url = new URL(window.location);
-        url.searchParams.set('user_page', page);
-        window.history.pushState({}, '', url);
-
-        // Fetch data for the new page
+    function handlePageChange(cursor, step) {
+        userCursor = cursor;
+        userPageNumber = Math.max(1, userPageNumber + step);
         if (typeof fetchAndDisplayUsers === 'function') {
             fetchAndDisplayUsers();
         }